@@ -0,0 +1,458 @@
+"""
+Call signalling load benchmark
+
+Drives N concurrent calls end-to-end through the real Python call stack
+(JingleAdapter + CallBridge) between two accounts. Each account has its own
+FakeCallService (see fake_service.py); Jingle IQs travel over an in-memory
+XMPP loopback with configurable one-way latency, so everything runs offline.
+
+Per call: caller creates the session and offer, sends session-initiate;
+callee auto-accepts (create session, answer, session-accept) like CallBarrel
+does after the user pressed accept; candidates trickle via transport-info
+until both services report 'connected'; then the caller hangs up.
+
+Reports:
+- Setup latency percentiles (caller's call start → ICE connected) and a
+  per-phase breakdown from the call setup tracer
+- Event-stream throughput (CallEvents consumed by both bridges per second)
+- Heartbeat overhead (GoCallService heartbeat thread round trips)
+
+Usage:
+    python -m drunk_call_hook.benchmark --sessions 50
+    python -m drunk_call_hook.benchmark --sessions 20 --xmpp-latency 40 --trace-file bench.jsonl
+    python -m drunk_call_hook.trace_cli --file bench.jsonl --summary
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import time
+import uuid
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+from slixmpp.xmlstream import ET
+
+from .bridge import CallBridge, GoCallService
+from .fake_service import start_fake_call_service
+from .protocol.jingle import JingleAdapter
+from .protocol.features.trickle_ice import IncomingCallState
+from .tracing import CallSetupTracer, percentile, summarize, format_summary
+
+
+CALLER_JID = 'caller@bench.example/loopback'
+CALLEE_JID = 'callee@bench.example/loopback'
+
+
+# ============================================================================
+# In-memory XMPP loopback
+# ============================================================================
+
+class LoopbackIq:
+    """Minimal IQ stanza for JingleAdapter (xml, item access, reply, send)."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, network: 'LoopbackNetwork', sender: str, to: str,
+                 itype: str = 'set', iq_id: Optional[str] = None):
+        self.network = network
+        self.xml = ET.Element('{jabber:client}iq', {
+            'type': itype, 'from': sender, 'to': to,
+            'id': iq_id or f'bench-{next(self._ids)}',
+        })
+
+    def __getitem__(self, key: str) -> str:
+        return self.xml.get(key, '')
+
+    def reply(self) -> 'LoopbackIq':
+        return LoopbackIq(self.network, self['to'], self['from'], 'result', self['id'])
+
+    def send(self):
+        """Send a request (returns awaitable result) or a result (fire and forget)."""
+        if self['type'] == 'result':
+            return self.network.respond(self)
+        return self.network.request(self)
+
+    def exception(self, e: Exception):
+        """Called by slixmpp handlers when the IQ callback raised."""
+        self.network.logger.error(f"Handler failed for IQ {self['id']}: {e}")
+
+
+class LoopbackMessage:
+    """Minimal message stanza (XEP-0353 finish etc.): counted, not delivered."""
+
+    def __init__(self, network: 'LoopbackNetwork', to: str):
+        self.network = network
+        self.xml = ET.Element('{jabber:client}message', {'to': to})
+
+    def append(self, element):
+        self.xml.append(element)
+
+    def send(self):
+        self.network.messages += 1
+
+
+class LoopbackNetwork:
+    """Routes IQs between LoopbackXMPP clients with a fixed one-way latency."""
+
+    def __init__(self, latency_ms: float = 5.0, logger: Optional[logging.Logger] = None):
+        """
+        Initialize loopback network.
+
+        Args:
+            latency_ms: One-way stanza latency (client → server → client)
+            logger: Logger instance
+        """
+        self.latency = latency_ms / 1000.0
+        self.logger = logger or logging.getLogger(__name__)
+        self.clients: Dict[str, 'LoopbackXMPP'] = {}
+        self.stanzas = 0
+        self.messages = 0
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    def request(self, iq: LoopbackIq) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[iq['id']] = future
+        self.stanzas += 1
+        loop.call_later(self.latency, self._deliver, iq)
+        return future
+
+    def respond(self, result: LoopbackIq):
+        self.stanzas += 1
+        asyncio.get_running_loop().call_later(self.latency, self._resolve, result)
+
+    def _deliver(self, iq: LoopbackIq):
+        client = self.clients.get(iq['to'])
+        handlers = [h for h in client.handlers if h.match(iq)] if client else []
+        if not handlers:
+            future = self._pending.pop(iq['id'], None)
+            if future and not future.done():
+                future.set_exception(RuntimeError(f"service-unavailable: {iq['to']}"))
+            return
+        for handler in handlers:
+            handler.run(iq)
+
+    def _resolve(self, result: LoopbackIq):
+        future = self._pending.pop(result['id'], None)
+        if future and not future.done():
+            future.set_result(result)
+
+
+class LoopbackXMPP:
+    """The parts of DrunkXMPP that JingleAdapter uses, backed by LoopbackNetwork."""
+
+    def __init__(self, network: LoopbackNetwork, jid: str):
+        self.network = network
+        self.boundjid = jid
+        self.handlers = []
+        self.loop = None
+        network.clients[jid] = self
+
+    def register_handler(self, handler):
+        self.handlers.append(handler)
+
+    def add_event_handler(self, name, pointer):
+        pass
+
+    def make_iq_set(self, ito: str) -> LoopbackIq:
+        return LoopbackIq(self.network, self.boundjid, ito)
+
+    def make_message(self, mto: str, mtype: str = 'chat') -> LoopbackMessage:
+        return LoopbackMessage(self.network, mto)
+
+
+# ============================================================================
+# Call endpoints
+# ============================================================================
+
+class _CountingBridge(CallBridge):
+    """CallBridge that counts consumed CallEvents for throughput."""
+
+    def __init__(self, counters: Dict[str, Any], **kwargs):
+        super().__init__(**kwargs)
+        self.counters = counters
+
+    async def _handle_event(self, session_id, event):
+        now = time.monotonic()
+        self.counters['events'] += 1
+        self.counters['first_event'] = self.counters['first_event'] or now
+        self.counters['last_event'] = now
+        await super()._handle_event(session_id, event)
+
+
+class BenchEndpoint:
+    """
+    One account: loopback XMPP client, CallBridge and JingleAdapter, with the
+    CallBarrel callbacks reduced to what an auto-answering client does.
+    """
+
+    def __init__(self, network: LoopbackNetwork, jid: str, address: str,
+                 counters: Dict[str, Any], trace_path: Optional[Path] = None):
+        self.jid = jid
+        self.logger = logging.getLogger(f'{__name__}.{jid.split("@")[0]}')
+        self.tracer = CallSetupTracer(trace_path=trace_path, logger=self.logger)
+        self.xmpp = LoopbackXMPP(network, jid)
+        self.bridge = _CountingBridge(counters, logger=self.logger, tracer=self.tracer, address=address)
+        self.adapter = JingleAdapter(
+            self.xmpp, self.bridge,
+            on_incoming_call=self._on_incoming_call,
+            on_call_answered=self._on_call_answered,
+            on_call_terminated=self._on_call_terminated,
+            on_ice_candidate_received=self._on_ice_candidate_received,
+            on_call_state_changed=self._on_call_state_changed,
+            on_candidates_ready=self._on_candidates_ready,
+            logger=self.logger,
+        )
+        self.connected: Dict[str, asyncio.Future] = {}
+        self.records: List[Dict[str, Any]] = []
+        self._offers: Dict[str, str] = {}
+        self._answering = set()
+
+    def expect(self, session_id: str) -> asyncio.Future:
+        """Future resolved when the session reaches 'connected' (or fails)."""
+        if session_id not in self.connected:
+            self.connected[session_id] = asyncio.get_running_loop().create_future()
+        return self.connected[session_id]
+
+    def finish(self, session_id: str, outcome: str):
+        record = self.tracer.finish(session_id, outcome)
+        if record:
+            self.records.append(record)
+        future = self.expect(session_id)
+        if not future.done():
+            future.set_result(outcome)
+
+    async def call(self, peer_jid: str, proceed_delay: float) -> str:
+        """Place an outgoing call (CallBarrel's proceed → session-initiate path)."""
+        session_id = str(uuid.uuid4())
+        self.expect(session_id)
+        self.tracer.begin(session_id, 'outgoing')
+
+        # XEP-0353 propose → proceed round trip
+        await asyncio.sleep(proceed_delay)
+        self.tracer.mark(session_id, 'xep0353:proceed-received')
+
+        await self.bridge.create_session(peer_jid, session_id)
+        sdp_offer = await self.bridge.create_offer(session_id)
+        self.adapter.create_outgoing_session(session_id, peer_jid, sdp_offer, ['audio'])
+        await self.adapter._send_session_initiate(session_id)
+        return session_id
+
+    async def hangup(self, session_id: str):
+        await self.adapter.terminate(session_id)
+        await self.bridge.end_session(session_id)
+
+    async def _on_incoming_call(self, session_id, peer_jid, sdp_offer, media):
+        if session_id not in self._offers:
+            self.expect(session_id)
+            self.tracer.begin(session_id, 'incoming')
+            self._offers[session_id] = sdp_offer
+            await self.bridge.create_session(peer_jid, session_id)
+            self.adapter.trickle_ice.set_incoming_state(session_id, IncomingCallState.SESSION_CREATED)
+            if self.adapter.trickle_ice.should_defer_answer(sdp_offer):
+                return  # answered from _on_candidates_ready / the deferred offer replay
+        await self._answer(session_id)
+
+    async def _on_candidates_ready(self, session_id):
+        await self._answer(session_id)
+
+    async def _answer(self, session_id: str):
+        if session_id in self._answering:
+            return
+        self._answering.add(session_id)
+
+        trickle_ice = self.adapter.trickle_ice
+        sdp_answer = await self.bridge.create_answer(session_id, self._offers[session_id])
+        trickle_ice.set_incoming_state(session_id, IncomingCallState.REMOTE_SET)
+        trickle_ice.set_incoming_state(session_id, IncomingCallState.ANSWER_READY)
+        await self.adapter.send_answer(session_id, sdp_answer)
+        for candidate in trickle_ice.get_buffered_candidates(session_id):
+            await self.bridge.add_ice_candidate(session_id, candidate)
+        trickle_ice.set_incoming_state(session_id, IncomingCallState.ACTIVE)
+
+    async def _on_call_answered(self, session_id, sdp_answer):
+        await self.bridge.set_remote_description(session_id, sdp_answer, 'answer')
+
+    async def _on_ice_candidate_received(self, session_id, candidate):
+        await self.bridge.add_ice_candidate(session_id, candidate)
+
+    async def _on_call_state_changed(self, session_id, state):
+        if state in ('connected', 'failed'):
+            self.finish(session_id, state)
+
+    async def _on_call_terminated(self, session_id, reason):
+        self.finish(session_id, reason)
+        self._offers.pop(session_id, None)
+        self._answering.discard(session_id)
+        self.adapter.trickle_ice.cleanup_incoming_call(session_id)
+        await self.bridge.end_session(session_id)
+
+
+# ============================================================================
+# Benchmark
+# ============================================================================
+
+async def run_benchmark(sessions: int = 20,
+                        concurrency: Optional[int] = None,
+                        xmpp_latency_ms: float = 5.0,
+                        rpc_latency_ms: Optional[Dict[str, float]] = None,
+                        script: Optional[Dict[str, list]] = None,
+                        sdp_candidates: int = 1,
+                        heartbeat_interval: float = 0.1,
+                        timeout: float = 10.0,
+                        trace_path: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Run N calls between two loopback accounts and collect latency figures.
+
+    Args:
+        sessions: Number of calls
+        concurrency: Calls in flight at once (None = all at once)
+        xmpp_latency_ms: One-way stanza latency of the loopback
+        rpc_latency_ms: Per-RPC service time of both fake services
+        script: Fake service event script (default: fake_service.default_script())
+        sdp_candidates: Candidates bundled in offers/answers (0 = trickle-only)
+        heartbeat_interval: Heartbeat period in seconds (0 = no heartbeat)
+        timeout: Seconds to wait for each call to connect
+        trace_path: Also append caller traces to this JSONL file
+
+    Returns:
+        Result dict (see format_report())
+    """
+    counters = {'events': 0, 'first_event': None, 'last_event': None}
+    network = LoopbackNetwork(latency_ms=xmpp_latency_ms)
+    servers, services, heartbeats = [], [], []
+
+    endpoints = []
+    for jid, path in ((CALLER_JID, trace_path), (CALLEE_JID, None)):
+        server, address, service = await start_fake_call_service(
+            latency_ms=rpc_latency_ms, script=script, sdp_candidates=sdp_candidates
+        )
+        servers.append(server)
+        services.append(service)
+        endpoint = BenchEndpoint(network, jid, address, counters, trace_path=path)
+        await endpoint.bridge.connect()
+        endpoints.append(endpoint)
+        if heartbeat_interval:
+            heartbeat = GoCallService(logger=endpoint.logger, address=address,
+                                      heartbeat_interval=heartbeat_interval)
+            await heartbeat._start_heartbeat()
+            heartbeats.append(heartbeat)
+    caller, callee = endpoints
+
+    gate = asyncio.Semaphore(concurrency or sessions)
+
+    async def one_call():
+        async with gate:
+            session_id = await caller.call(CALLEE_JID, proceed_delay=2 * network.latency)
+            outcomes = [caller.expect(session_id), callee.expect(session_id)]
+            try:
+                await asyncio.wait_for(asyncio.gather(*outcomes), timeout)
+            except asyncio.TimeoutError:
+                caller.finish(session_id, 'timeout')
+                callee.finish(session_id, 'timeout')
+            await caller.hangup(session_id)
+
+    started = time.monotonic()
+    try:
+        await asyncio.gather(*(one_call() for _ in range(sessions)))
+        duration = time.monotonic() - started
+    finally:
+        for heartbeat in heartbeats:
+            await heartbeat._stop_heartbeat()
+            if heartbeat._grpc_channel:
+                heartbeat._grpc_channel.close()
+        for endpoint in endpoints:
+            await endpoint.bridge.disconnect()
+        for server in servers:
+            await server.stop(None)
+
+    connected = [r for r in caller.records if r['outcome'] == 'connected']
+    setup_ms = [r['total_ms'] for r in connected]
+    event_window = (counters['last_event'] or 0) - (counters['first_event'] or 0)
+    heartbeat_sent = sum(h.heartbeat_stats['sent'] for h in heartbeats)
+    heartbeat_ms = sum(h.heartbeat_stats['total_ms'] for h in heartbeats)
+
+    return {
+        'sessions': sessions,
+        'connected': len(connected),
+        'duration_s': duration,
+        'setup_ms': {
+            'p50': percentile(setup_ms, 50),
+            'p90': percentile(setup_ms, 90),
+            'p99': percentile(setup_ms, 99),
+            'max': max(setup_ms, default=0.0),
+        },
+        'phases': summarize(caller.records),
+        'callee_phases': summarize(callee.records),
+        'events': {
+            'count': counters['events'],
+            'per_second': counters['events'] / event_window if event_window > 0 else 0.0,
+        },
+        'stanzas': network.stanzas,
+        'rpcs': {name: sum(s.rpc_counts.get(name, 0) for s in services)
+                 for name in sorted(set().union(*(s.rpc_counts for s in services)))},
+        'heartbeat': {
+            'sent': heartbeat_sent,
+            'failed': sum(h.heartbeat_stats['failed'] for h in heartbeats),
+            'mean_ms': heartbeat_ms / heartbeat_sent if heartbeat_sent else 0.0,
+            'overhead_pct': 100.0 * heartbeat_ms / (duration * 1000) if duration else 0.0,
+        },
+    }
+
+
+def format_report(result: Dict[str, Any]) -> str:
+    """Render run_benchmark() output."""
+    setup = result['setup_ms']
+    events = result['events']
+    heartbeat = result['heartbeat']
+    lines = [
+        f"{result['connected']}/{result['sessions']} calls connected in {result['duration_s']:.2f}s",
+        f"Setup latency (ms): p50={setup['p50']:.0f} p90={setup['p90']:.0f} "
+        f"p99={setup['p99']:.0f} max={setup['max']:.0f}",
+        f"Event stream: {events['count']} events, {events['per_second']:.0f} events/s",
+        f"Signalling: {result['stanzas']} IQ stanzas, "
+        + ', '.join(f"{name}={count}" for name, count in result['rpcs'].items()),
+        f"Heartbeat: {heartbeat['sent']} sent ({heartbeat['failed']} failed), "
+        f"mean {heartbeat['mean_ms']:.2f}ms, {heartbeat['overhead_pct']:.2f}% of wall time",
+        "",
+        "Caller phases (ms):",
+        format_summary(result['phases']),
+    ]
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark call signalling against a fake call service")
+    parser.add_argument('--sessions', type=int, default=20, help="Number of calls (default: 20)")
+    parser.add_argument('--concurrency', type=int, help="Calls in flight at once (default: all)")
+    parser.add_argument('--xmpp-latency', type=float, default=5.0, help="One-way stanza latency in ms (default: 5)")
+    parser.add_argument('--rpc-latency', type=float, help="Override every RPC service time (ms)")
+    parser.add_argument('--sdp-candidates', type=int, default=1,
+                        help="Candidates bundled in the SDP (0 = trickle-only offers)")
+    parser.add_argument('--heartbeat', type=float, default=0.1, help="Heartbeat interval in seconds (0 = off)")
+    parser.add_argument('--trace-file', type=Path, help="Append caller traces to this JSONL file")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    rpc_latency = None
+    if args.rpc_latency is not None:
+        from .fake_service import DEFAULT_LATENCY_MS
+        rpc_latency = {name: args.rpc_latency for name in DEFAULT_LATENCY_MS}
+
+    result = asyncio.run(run_benchmark(
+        sessions=args.sessions,
+        concurrency=args.concurrency,
+        xmpp_latency_ms=args.xmpp_latency,
+        rpc_latency_ms=rpc_latency,
+        sdp_candidates=args.sdp_candidates,
+        heartbeat_interval=args.heartbeat,
+        trace_path=args.trace_file,
+    ))
+    print(format_report(result))
+    return 0 if result['connected'] == result['sessions'] else 1
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
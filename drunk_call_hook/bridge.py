@@ -16,11 +16,14 @@ import subprocess
 import os
 import platform
 import threading
+import time
 from pathlib import Path
 from typing import Optional, Dict, Any, Callable
 
 import grpc
 from .proto import call_pb2, call_pb2_grpc
+from .stats import CallStatsHistory
+from .tracing import CallSetupTracer, get_call_tracer
 
 # Import paths utility for proper log directory handling (dev + XDG modes)
 import sys
@@ -28,6 +31,13 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from siproxylin.utils.paths import get_paths, PATH_MODE
 
 
+# gRPC address of the call service (overridable for tests/benchmarks)
+SERVICE_ADDRESS = 'localhost:50051'
+
+# Seconds between keep-alive heartbeats
+HEARTBEAT_INTERVAL = 5.0
+
+
 class GoCallService:
     """
     Manages the Go service process lifecycle.
@@ -36,20 +46,29 @@ class GoCallService:
     Multiple CallBridge instances (one per account) connect to this service.
     """
 
-    def __init__(self, logger: Optional[logging.Logger] = None):
+    def __init__(self, logger: Optional[logging.Logger] = None,
+                 address: str = SERVICE_ADDRESS,
+                 heartbeat_interval: float = HEARTBEAT_INTERVAL):
         """
         Initialize Go service manager.
 
         Args:
             logger: Logger instance
+            address: gRPC address of the service
+            heartbeat_interval: Seconds between keep-alive heartbeats
         """
         self.logger = logger or logging.getLogger(__name__)
+        self.address = address
+        self.heartbeat_interval = heartbeat_interval
         self._process: Optional[subprocess.Popen] = None
         self._running = False
         self._heartbeat_thread: Optional[threading.Thread] = None
         self._heartbeat_stop_event = threading.Event()
         self._grpc_channel: Optional[grpc.Channel] = None  # Synchronous channel for heartbeat thread
 
+        # Heartbeat RPC counters (sent, failed, total round trip in ms)
+        self.heartbeat_stats = {'sent': 0, 'failed': 0, 'total_ms': 0.0}
+
     async def start(self) -> bool:
         """
         Start Go service process.
@@ -160,7 +179,7 @@ class GoCallService:
         # Create temporary async channel for shutdown RPC
         shutdown_channel = None
         try:
-            shutdown_channel = grpc.aio.insecure_channel('localhost:50051')
+            shutdown_channel = grpc.aio.insecure_channel(self.address)
             stub = call_pb2_grpc.CallServiceStub(shutdown_channel)
             await stub.Shutdown(call_pb2.Empty())
             self.logger.info("Sent Shutdown RPC to Go service")
@@ -246,7 +265,7 @@ class GoCallService:
         while (asyncio.get_event_loop().time() - start_time) < timeout:
             try:
                 # Try to connect
-                channel = grpc.aio.insecure_channel('localhost:50051')
+                channel = grpc.aio.insecure_channel(self.address)
                 # Simple connectivity check
                 await channel.channel_ready()
                 await channel.close()
@@ -260,7 +279,7 @@ class GoCallService:
     async def _start_heartbeat(self):
         """Start heartbeat thread to keep Go service alive (runs independently of asyncio event loop)."""
         # Create synchronous gRPC channel for heartbeat thread
-        self._grpc_channel = grpc.insecure_channel('localhost:50051')
+        self._grpc_channel = grpc.insecure_channel(self.address)
 
         # Wait for synchronous channel to be ready (avoid race condition with Go startup)
         try:
@@ -279,7 +298,9 @@ class GoCallService:
             name="GoCallServiceHeartbeat"
         )
         self._heartbeat_thread.start()
-        self.logger.info("Heartbeat thread started (5s interval, independent of GUI event loop)")
+        self.logger.info(
+            f"Heartbeat thread started ({self.heartbeat_interval:g}s interval, independent of GUI event loop)"
+        )
 
     async def _stop_heartbeat(self):
         """Stop heartbeat thread."""
@@ -287,8 +308,8 @@ class GoCallService:
             # Signal thread to stop
             self._heartbeat_stop_event.set()
 
-            # Wait for thread to finish (with timeout)
-            self._heartbeat_thread.join(timeout=2.0)
+            # Wait for thread to finish (with timeout) without blocking the event loop
+            await asyncio.get_running_loop().run_in_executor(None, self._heartbeat_thread.join, 2.0)
 
             if self._heartbeat_thread.is_alive():
                 self.logger.warning("Heartbeat thread did not stop gracefully")
@@ -299,7 +320,7 @@ class GoCallService:
 
     def _heartbeat_loop(self):
         """
-        Send heartbeat to Go service every 5 seconds (runs in separate thread).
+        Send heartbeat to Go service every heartbeat_interval seconds (runs in separate thread).
 
         This runs independently of the asyncio event loop, ensuring heartbeats
         continue even if the GUI thread is blocked by heavy operations (e.g., DB queries).
@@ -310,15 +331,19 @@ class GoCallService:
             self.logger.debug("Heartbeat loop started in thread")
 
             while not self._heartbeat_stop_event.is_set():
+                started = time.monotonic()
                 try:
                     # Synchronous gRPC call (not async)
                     stub.Heartbeat(call_pb2.Empty())
+                    self.heartbeat_stats['sent'] += 1
                     self.logger.debug("Heartbeat sent")
                 except Exception as e:
+                    self.heartbeat_stats['failed'] += 1
                     self.logger.warning(f"Heartbeat failed: {e}")
+                self.heartbeat_stats['total_ms'] += (time.monotonic() - started) * 1000
 
-                # Wait 5 seconds or until stop event is set (whichever comes first)
-                self._heartbeat_stop_event.wait(timeout=5.0)
+                # Wait for the next interval or until stop event is set (whichever comes first)
+                self._heartbeat_stop_event.wait(timeout=self.heartbeat_interval)
 
             self.logger.debug("Heartbeat loop exiting")
 
@@ -338,7 +363,8 @@ class CallBridge:
     Usage:
         bridge = CallBridge(
             on_ice_candidate=lambda sid, cand: ...,
-            on_connection_state=lambda sid, state: ...
+            on_connection_state=lambda sid, state: ...,
+            on_stats=lambda sid, stats, history: ...
         )
         await bridge.connect()
 
@@ -352,7 +378,11 @@ class CallBridge:
     def __init__(self,
                  logger: Optional[logging.Logger] = None,
                  on_ice_candidate: Optional[Callable] = None,
-                 on_connection_state: Optional[Callable] = None):
+                 on_connection_state: Optional[Callable] = None,
+                 on_stats: Optional[Callable] = None,
+                 stats_interval_ms: int = 2000,
+                 tracer: Optional[CallSetupTracer] = None,
+                 address: str = SERVICE_ADDRESS):
         """
         Initialize CallBridge gRPC client.
 
@@ -360,10 +390,18 @@ class CallBridge:
             logger: Logger instance
             on_ice_candidate: Callback for ICE candidates from Go (session_id, candidate_dict)
             on_connection_state: Callback for connection state changes (session_id, state_str)
+            on_stats: Callback for pushed stats (session_id, snapshot_dict, CallStatsHistory)
+            stats_interval_ms: StreamStats push interval requested from the service
+            tracer: Call setup tracer for RPC latency (default: global tracer)
+            address: gRPC address of the call service
         """
         self.logger = logger or logging.getLogger(__name__)
         self.on_ice_candidate = on_ice_candidate
         self.on_connection_state = on_connection_state
+        self.on_stats = on_stats
+        self.stats_interval_ms = stats_interval_ms
+        self.tracer = tracer or get_call_tracer()
+        self.address = address
 
         self._grpc_channel: Optional[grpc.aio.Channel] = None
         self._stub: Optional[call_pb2_grpc.CallServiceStub] = None
@@ -373,6 +411,10 @@ class CallBridge:
         self._event_streams: Dict[str, asyncio.Task] = {}
         self._stream_lock = asyncio.Lock()
 
+        # Stats streaming tasks + ring buffers per session
+        self._stats_streams: Dict[str, asyncio.Task] = {}
+        self._stats_history: Dict[str, CallStatsHistory] = {}
+
     async def connect(self) -> bool:
         """
         Connect to Go service via gRPC.
@@ -388,7 +430,7 @@ class CallBridge:
 
         try:
             # Connect gRPC client
-            self._grpc_channel = grpc.aio.insecure_channel('localhost:50051')
+            self._grpc_channel = grpc.aio.insecure_channel(self.address)
             self._stub = call_pb2_grpc.CallServiceStub(self._grpc_channel)
 
             # Test connection
@@ -422,6 +464,16 @@ class CallBridge:
                         pass
             self._event_streams.clear()
 
+            for session_id, task in self._stats_streams.items():
+                if not task.done():
+                    task.cancel()
+                    try:
+                        await task
+                    except asyncio.CancelledError:
+                        pass
+            self._stats_streams.clear()
+            self._stats_history.clear()
+
         # Close gRPC channel
         if self._grpc_channel:
             await self._grpc_channel.close()
@@ -525,13 +577,15 @@ class CallBridge:
             gain_control=gain_control
         )
 
-        response = await self._stub.CreateSession(request)
+        with self.tracer.span(session_id, 'rpc:CreateSession'):
+            response = await self._stub.CreateSession(request)
 
         if response.success:
             self.logger.info(f"Session {session_id} created successfully")
 
-            # Start event streaming for this session
+            # Start event + stats streaming for this session
             await self._start_event_stream(session_id)
+            await self._start_stats_stream(session_id)
 
             return True
         else:
@@ -554,7 +608,8 @@ class CallBridge:
         self.logger.debug(f"Creating offer for session {session_id}")
 
         request = call_pb2.CreateOfferRequest(session_id=session_id)
-        response = await self._stub.CreateOffer(request)
+        with self.tracer.span(session_id, 'rpc:CreateOffer'):
+            response = await self._stub.CreateOffer(request)
 
         if response.error:
             raise RuntimeError(f"Failed to create offer: {response.error}")
@@ -582,7 +637,8 @@ class CallBridge:
             session_id=session_id,
             remote_sdp=remote_sdp
         )
-        response = await self._stub.CreateAnswer(request)
+        with self.tracer.span(session_id, 'rpc:CreateAnswer'):
+            response = await self._stub.CreateAnswer(request)
 
         if response.error:
             raise RuntimeError(f"Failed to create answer: {response.error}")
@@ -610,7 +666,8 @@ class CallBridge:
             sdp_type=sdp_type
         )
 
-        await self._stub.SetRemoteDescription(request)
+        with self.tracer.span(session_id, 'rpc:SetRemoteDescription'):
+            await self._stub.SetRemoteDescription(request)
         self.logger.debug(f"Remote description set for session {session_id}")
 
     async def add_ice_candidate(self, session_id: str, candidate: Dict[str, Any]):
@@ -640,12 +697,19 @@ class CallBridge:
         """
         Get call statistics for a session.
 
+        Returns the latest pushed snapshot when StreamStats is running,
+        otherwise falls back to a one-shot GetStats RPC.
+
         Args:
             session_id: Session ID
 
         Returns:
             Dict with stats: connection_state, ice_connection_state, packets_sent, etc.
         """
+        history = self._stats_history.get(session_id)
+        if history and history.samples:
+            return dict(history.snapshot)
+
         if not self._stub:
             raise RuntimeError("gRPC stub not initialized")
 
@@ -665,6 +729,18 @@ class CallBridge:
             'connection_type': response.connection_type,
         }
 
+    def get_stats_history(self, session_id: str) -> Optional[CallStatsHistory]:
+        """
+        Get in-memory stats ring buffer for a session.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            CallStatsHistory or None if no stats stream was started
+        """
+        return self._stats_history.get(session_id)
+
     async def list_audio_devices(self) -> list:
         """
         List available audio devices.
@@ -722,8 +798,10 @@ class CallBridge:
         Args:
             session_id: Session ID
         """
-        # Stop event stream first
+        # Stop event + stats streams first
         await self._stop_event_stream(session_id)
+        await self._stop_stats_stream(session_id)
+        self._stats_history.pop(session_id, None)
 
         if not self._stub:
             self.logger.warning("gRPC stub not initialized, cannot end session")
@@ -770,6 +848,84 @@ class CallBridge:
                 except asyncio.CancelledError:
                     pass
 
+    async def _start_stats_stream(self, session_id: str):
+        """
+        Start stats streaming task for a session.
+
+        Args:
+            session_id: Session ID to stream stats for
+        """
+        async with self._stream_lock:
+            if session_id in self._stats_streams:
+                self.logger.warning(f"Stats stream already running for {session_id}")
+                return
+
+            self._stats_history[session_id] = CallStatsHistory()
+            task = asyncio.create_task(self._consume_stats(session_id))
+            self._stats_streams[session_id] = task
+            self.logger.debug(f"Started stats stream for {session_id} ({self.stats_interval_ms}ms)")
+
+    async def _stop_stats_stream(self, session_id: str):
+        """
+        Stop stats streaming task for a session (history is kept).
+
+        Args:
+            session_id: Session ID to stop streaming for
+        """
+        async with self._stream_lock:
+            task = self._stats_streams.pop(session_id, None)
+            if task and not task.done():
+                self.logger.debug(f"Cancelling stats stream for {session_id}")
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+
+    async def _consume_stats(self, session_id: str):
+        """
+        Consume pushed stats updates for a session.
+
+        Stats are best-effort: no reconnection, the stream simply ends
+        with the session.
+
+        Args:
+            session_id: Session ID to consume stats for
+        """
+        history = self._stats_history.get(session_id)
+        if not self._stub or history is None:
+            return
+
+        try:
+            request = call_pb2.StreamStatsRequest(
+                session_id=session_id,
+                interval_ms=self.stats_interval_ms
+            )
+            async for update in self._stub.StreamStats(request):
+                snapshot = history.apply_update(update)
+
+                if self.on_stats:
+                    try:
+                        result = self.on_stats(session_id, dict(snapshot), history)
+                        if asyncio.iscoroutine(result):
+                            await result
+                    except Exception as e:
+                        self.logger.error(f"Error in on_stats callback: {e}")
+
+            self.logger.debug(f"Stats stream ended normally for {session_id}")
+
+        except grpc.aio.AioRpcError as e:
+            if e.code() == grpc.StatusCode.CANCELLED:
+                self.logger.debug(f"Stats stream cancelled for {session_id}")
+            else:
+                self.logger.warning(
+                    f"Stats stream error for {session_id}: {e.code()} - {e.details()}"
+                )
+
+        except asyncio.CancelledError:
+            self.logger.debug(f"Stats stream task cancelled for {session_id}")
+            raise
+
     async def _consume_events(self, session_id: str):
         """
         Consume events from Go service for a session (with reconnection).
@@ -862,6 +1018,7 @@ class CallBridge:
             self.logger.debug(
                 f"ICE candidate event for {session_id}: {ice_event.candidate[:50]}..."
             )
+            self.tracer.mark_once(session_id, 'ice:first-local-candidate')
 
             if self.on_ice_candidate:
                 try:
@@ -889,6 +1046,7 @@ class CallBridge:
             state_str = state_map.get(state_event.state, 'unknown')
 
             self.logger.info(f"Connection state for {session_id}: {state_str}")
+            self.tracer.mark_once(session_id, f'ice:{state_str}')
 
             if self.on_connection_state:
                 try:
@@ -0,0 +1,374 @@
+"""
+FakeCallService - in-process CallService gRPC server
+
+Pure-Python grpc.aio implementation of every CallService RPC, for tests and
+benchmarks of the Python call stack (CallBridge, JingleAdapter) without the
+Go service, GStreamer or a network.
+
+Behaviour:
+- Unary RPCs answer after a configurable per-RPC latency (or with an injected error)
+- CreateOffer/CreateAnswer return a minimal Opus SDP carrying the candidates
+  gathered before the RPC returned (sdp_candidates); the rest trickle in via
+  StreamEvents like the real service
+- Events are pushed from an event script keyed by trigger:
+    'created'   - after CreateSession
+    'gathering' - after the local description is created (CreateOffer/CreateAnswer)
+    'connected' - once the remote description and a first remote candidate are set
+  Each step is (delay_ms, CallEvent); session_id is filled in by the server.
+- StreamStats pushes a StatsUpdate per interval until the session ends
+
+Usage:
+    server, address, service = await start_fake_call_service(latency_ms={'CreateOffer': 30})
+    bridge = CallBridge(address=address)
+    await bridge.connect()
+    ...
+    await server.stop(None)
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional, Dict, List, Tuple
+
+import grpc
+from .proto import call_pb2, call_pb2_grpc
+
+
+DEFAULT_LATENCY_MS = {
+    'CreateSession': 5.0,
+    'CreateOffer': 10.0,
+    'CreateAnswer': 10.0,
+    'SetRemoteDescription': 2.0,
+    'AddICECandidate': 0.5,
+    'EndSession': 2.0,
+}
+
+SDP_TEMPLATE = (
+    "v=0\r\n"
+    "o=- {origin} 0 IN IP4 0.0.0.0\r\n"
+    "s=-\r\n"
+    "t=0 0\r\n"
+    "a=group:BUNDLE 0\r\n"
+    "m=audio 9 UDP/TLS/RTP/SAVPF 111\r\n"
+    "c=IN IP4 0.0.0.0\r\n"
+    "a=ice-ufrag:{ufrag}\r\n"
+    "a=ice-pwd:{ufrag}fakepasswordfake\r\n"
+    "a=ice-options:trickle\r\n"
+    "a=fingerprint:sha-256 "
+    "AA:BB:CC:DD:EE:FF:00:11:22:33:44:55:66:77:88:99:AA:BB:CC:DD:EE:FF:00:11:22:33:44:55:66:77:88:99\r\n"
+    "a=setup:{setup}\r\n"
+    "a=mid:0\r\n"
+    "a=sendrecv\r\n"
+    "a=rtcp-mux\r\n"
+    "a=rtpmap:111 opus/48000/2\r\n"
+    "a=fmtp:111 minptime=10;useinbandfec=1\r\n"
+)
+
+ScriptStep = Tuple[float, call_pb2.CallEvent]
+
+
+def ice_candidate_event(index: int, port: int = 50000) -> call_pb2.CallEvent:
+    """Relay candidate event (what relay-only sessions gather)."""
+    return call_pb2.CallEvent(ice_candidate=call_pb2.ICECandidateEvent(
+        candidate=f"candidate:{index} 1 udp {16777215 - index} 203.0.113.10 {port + index} "
+                  f"typ relay raddr 0.0.0.0 rport 0",
+        sdp_mid='0',
+        sdp_mline_index=0,
+    ))
+
+
+def connection_state_event(state: int) -> call_pb2.CallEvent:
+    """Connection state event (call_pb2.ConnectionStateEvent.State value)."""
+    return call_pb2.CallEvent(connection_state=call_pb2.ConnectionStateEvent(state=state))
+
+
+def default_script(candidates: int = 2, gather_ms: float = 20.0,
+                   connect_ms: float = 50.0) -> Dict[str, List[ScriptStep]]:
+    """
+    Event script of a typical relay-only call.
+
+    Args:
+        candidates: Local candidates gathered per session
+        gather_ms: Delay until the first candidate (later ones follow 1ms apart)
+        connect_ms: ICE checks until 'connected' once both sides are known
+
+    Returns:
+        Dict trigger → [(delay_ms, CallEvent), ...]
+    """
+    state = call_pb2.ConnectionStateEvent
+    return {
+        'created': [(0.0, connection_state_event(state.NEW))],
+        'gathering': [(gather_ms + i, ice_candidate_event(i + 1)) for i in range(candidates)],
+        'connected': [(0.0, connection_state_event(state.CHECKING)),
+                      (connect_ms, connection_state_event(state.CONNECTED))],
+    }
+
+
+class FakeSession:
+    """Server-side state of one fake call session."""
+
+    def __init__(self, session_id: str, peer_jid: str):
+        self.session_id = session_id
+        self.peer_jid = peer_jid
+        self.events: asyncio.Queue = asyncio.Queue()
+        self.local_sdp: Optional[str] = None
+        self.remote_sdp: Optional[str] = None
+        self.remote_candidates: List[str] = []
+        self.muted = False
+        self.connected_fired = False
+        self.ended = asyncio.Event()
+        self.tasks: List[asyncio.Task] = []
+
+
+class FakeCallService(call_pb2_grpc.CallServiceServicer):
+    """
+    CallService servicer with scripted latency and events.
+
+    Counters (rpc_counts, events_sent, heartbeats) are exposed for tests and
+    benchmarks.
+    """
+
+    def __init__(self, latency_ms: Optional[Dict[str, float]] = None,
+                 script: Optional[Dict[str, List[ScriptStep]]] = None,
+                 errors: Optional[Dict[str, str]] = None,
+                 audio_devices: Optional[List[Dict[str, str]]] = None,
+                 sdp_candidates: int = 1,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Initialize fake service.
+
+        Args:
+            latency_ms: Per-RPC service time in ms (merged over DEFAULT_LATENCY_MS)
+            script: Event script (default: default_script())
+            errors: RPC name → error message returned instead of a result
+            audio_devices: Devices for ListAudioDevices (name, description, device_class)
+            sdp_candidates: Candidates included in offers/answers (0 = trickle-only SDP)
+            logger: Logger instance
+        """
+        self.latency_ms = {**DEFAULT_LATENCY_MS, **(latency_ms or {})}
+        self.script = script if script is not None else default_script()
+        self.errors = errors or {}
+        self.audio_devices = audio_devices if audio_devices is not None else [
+            {'name': 'fake-mic', 'description': 'Fake Microphone', 'device_class': 'Audio/Source'},
+            {'name': 'fake-speakers', 'description': 'Fake Speakers', 'device_class': 'Audio/Sink'},
+        ]
+        self.sdp_candidates = sdp_candidates
+        self.logger = logger or logging.getLogger(__name__)
+
+        self.sessions: Dict[str, FakeSession] = {}
+        self.rpc_counts: Dict[str, int] = {}
+        self.events_sent = 0
+        self.heartbeats = 0
+        self.shutdown_requested = asyncio.Event()
+
+    async def _rpc(self, name: str):
+        """Count the call and simulate its service time."""
+        self.rpc_counts[name] = self.rpc_counts.get(name, 0) + 1
+        delay = self.latency_ms.get(name, 0.0)
+        if delay:
+            await asyncio.sleep(delay / 1000.0)
+
+    def _run_script(self, session: FakeSession, trigger: str):
+        """Push the events of a script trigger, each after its delay."""
+        steps = self.script.get(trigger)
+        if not steps:
+            return
+
+        async def push():
+            started = time.monotonic()
+            for delay_ms, event in sorted(steps, key=lambda step: step[0]):
+                wait = delay_ms / 1000.0 - (time.monotonic() - started)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                if session.ended.is_set():
+                    return
+                scripted = call_pb2.CallEvent()
+                scripted.CopyFrom(event)
+                scripted.session_id = session.session_id
+                session.events.put_nowait(scripted)
+
+        session.tasks.append(asyncio.create_task(push()))
+
+    def _set_remote(self, session: FakeSession, remote_sdp: str):
+        """Store the remote description; candidates bundled in it count as remote candidates."""
+        session.remote_sdp = remote_sdp
+        session.remote_candidates.extend(
+            line[2:].strip() for line in remote_sdp.splitlines() if line.startswith('a=candidate:')
+        )
+        self._maybe_connect(session)
+
+    def _maybe_connect(self, session: FakeSession):
+        """Fire 'connected' once both the remote SDP and a remote candidate are known."""
+        if session.connected_fired or session.remote_sdp is None or not session.remote_candidates:
+            return
+        session.connected_fired = True
+        self._run_script(session, 'connected')
+
+    def _local_sdp(self, session_id: str, setup: str) -> str:
+        ufrag = f"{abs(hash((session_id, setup))) % 0xFFFFFFFF:08x}"
+        sdp = SDP_TEMPLATE.format(origin=abs(hash(session_id)) % 10**9, ufrag=ufrag, setup=setup)
+        for i in range(self.sdp_candidates):
+            # Foundations 100+ so they never collide with trickled candidates
+            sdp += f"a={ice_candidate_event(100 + i).ice_candidate.candidate}\r\n"
+        return sdp
+
+    # ------------------------------------------------------------------
+    # Session RPCs
+    # ------------------------------------------------------------------
+
+    async def CreateSession(self, request, context):
+        await self._rpc('CreateSession')
+        if 'CreateSession' in self.errors:
+            return call_pb2.CreateSessionResponse(success=False, error=self.errors['CreateSession'])
+        if request.session_id not in self.sessions:
+            session = FakeSession(request.session_id, request.peer_jid)
+            self.sessions[request.session_id] = session
+            self._run_script(session, 'created')
+        return call_pb2.CreateSessionResponse(success=True)
+
+    async def CreateOffer(self, request, context):
+        await self._rpc('CreateOffer')
+        session = self.sessions.get(request.session_id)
+        if session is None:
+            return call_pb2.SDPResponse(error=f"unknown session {request.session_id}")
+        if 'CreateOffer' in self.errors:
+            return call_pb2.SDPResponse(error=self.errors['CreateOffer'])
+        session.local_sdp = self._local_sdp(request.session_id, 'actpass')
+        self._run_script(session, 'gathering')
+        return call_pb2.SDPResponse(sdp=session.local_sdp)
+
+    async def CreateAnswer(self, request, context):
+        await self._rpc('CreateAnswer')
+        session = self.sessions.get(request.session_id)
+        if session is None:
+            return call_pb2.SDPResponse(error=f"unknown session {request.session_id}")
+        if 'CreateAnswer' in self.errors:
+            return call_pb2.SDPResponse(error=self.errors['CreateAnswer'])
+        session.local_sdp = self._local_sdp(request.session_id, 'active')
+        self._run_script(session, 'gathering')
+        self._set_remote(session, request.remote_sdp)
+        return call_pb2.SDPResponse(sdp=session.local_sdp)
+
+    async def SetRemoteDescription(self, request, context):
+        await self._rpc('SetRemoteDescription')
+        session = self.sessions.get(request.session_id)
+        if session is not None:
+            self._set_remote(session, request.remote_sdp)
+        return call_pb2.Empty()
+
+    async def AddICECandidate(self, request, context):
+        await self._rpc('AddICECandidate')
+        session = self.sessions.get(request.session_id)
+        if session is not None:
+            session.remote_candidates.append(request.candidate)
+            self._maybe_connect(session)
+        return call_pb2.Empty()
+
+    async def EndSession(self, request, context):
+        await self._rpc('EndSession')
+        session = self.sessions.pop(request.session_id, None)
+        if session is not None:
+            session.ended.set()
+            for task in session.tasks:
+                task.cancel()
+            session.events.put_nowait(None)
+        return call_pb2.Empty()
+
+    async def SetMute(self, request, context):
+        await self._rpc('SetMute')
+        session = self.sessions.get(request.session_id)
+        if session is not None:
+            session.muted = request.muted
+        return call_pb2.Empty()
+
+    # ------------------------------------------------------------------
+    # Streams
+    # ------------------------------------------------------------------
+
+    async def StreamEvents(self, request, context):
+        self.rpc_counts['StreamEvents'] = self.rpc_counts.get('StreamEvents', 0) + 1
+        session = self.sessions.get(request.session_id)
+        if session is None:
+            return
+        while True:
+            event = await session.events.get()
+            if event is None:
+                return
+            self.events_sent += 1
+            yield event
+
+    async def StreamStats(self, request, context):
+        self.rpc_counts['StreamStats'] = self.rpc_counts.get('StreamStats', 0) + 1
+        session = self.sessions.get(request.session_id)
+        if session is None:
+            return
+        interval = max(request.interval_ms, 10) / 1000.0
+        sent = 0
+        while not session.ended.is_set():
+            try:
+                await asyncio.wait_for(session.ended.wait(), timeout=interval)
+                return
+            except asyncio.TimeoutError:
+                pass
+            sent += 1
+            yield call_pb2.StatsUpdate(
+                timestamp_ms=int(time.time() * 1000),
+                bytes_sent=sent * 4000,
+                bytes_received=sent * 4000,
+                bandwidth_kbps=32,
+                connection_state='connected' if session.connected_fired else 'connecting',
+                connection_type='relay',
+            )
+
+    # ------------------------------------------------------------------
+    # Service RPCs
+    # ------------------------------------------------------------------
+
+    async def GetStats(self, request, context):
+        await self._rpc('GetStats')
+        session = self.sessions.get(request.session_id)
+        state = 'connected' if session and session.connected_fired else 'new'
+        return call_pb2.GetStatsResponse(
+            connection_state=state,
+            ice_connection_state=state,
+            ice_gathering_state='complete' if session and session.local_sdp else 'new',
+            connection_type='relay',
+            remote_candidates=session.remote_candidates if session else [],
+        )
+
+    async def ListAudioDevices(self, request, context):
+        await self._rpc('ListAudioDevices')
+        return call_pb2.ListAudioDevicesResponse(
+            devices=[call_pb2.AudioDevice(**device) for device in self.audio_devices]
+        )
+
+    async def Heartbeat(self, request, context):
+        # Called from the GoCallService heartbeat thread: no simulated latency
+        self.heartbeats += 1
+        return call_pb2.Empty()
+
+    async def Shutdown(self, request, context):
+        self.rpc_counts['Shutdown'] = self.rpc_counts.get('Shutdown', 0) + 1
+        self.shutdown_requested.set()
+        return call_pb2.Empty()
+
+
+async def start_fake_call_service(host: str = '127.0.0.1', port: int = 0,
+                                  **kwargs) -> Tuple[grpc.aio.Server, str, FakeCallService]:
+    """
+    Start a FakeCallService on a local port.
+
+    Args:
+        host: Bind address
+        port: Port (0 = pick a free one)
+        **kwargs: FakeCallService arguments
+
+    Returns:
+        (server, 'host:port' address, servicer); stop with `await server.stop(None)`
+    """
+    service = FakeCallService(**kwargs)
+    server = grpc.aio.server()
+    call_pb2_grpc.add_CallServiceServicer_to_server(service, server)
+    bound = server.add_insecure_port(f'{host}:{port}')
+    await server.start()
+    return server, f'{host}:{bound}', service
@@ -85,6 +85,11 @@ class CallServiceStub(object):
                 request_serializer=call__pb2.GetStatsRequest.SerializeToString,
                 response_deserializer=call__pb2.GetStatsResponse.FromString,
                 _registered_method=True)
+        self.StreamStats = channel.unary_stream(
+                '/call.CallService/StreamStats',
+                request_serializer=call__pb2.StreamStatsRequest.SerializeToString,
+                response_deserializer=call__pb2.StatsUpdate.FromString,
+                _registered_method=True)
         self.ListAudioDevices = channel.unary_unary(
                 '/call.CallService/ListAudioDevices',
                 request_serializer=call__pb2.Empty.SerializeToString,
@@ -165,7 +170,14 @@ class CallServiceServicer(object):
         raise NotImplementedError('Method not implemented!')
 
     def GetStats(self, request, context):
-        """Get call statistics for a session
+        """Get call statistics for a session (one-shot snapshot)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def StreamStats(self, request, context):
+        """Stream call statistics deltas at a client-chosen interval (C++ → Python)
         """
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
@@ -238,6 +250,11 @@ def add_CallServiceServicer_to_server(servicer, server):
                     request_deserializer=call__pb2.GetStatsRequest.FromString,
                     response_serializer=call__pb2.GetStatsResponse.SerializeToString,
             ),
+            'StreamStats': grpc.unary_stream_rpc_method_handler(
+                    servicer.StreamStats,
+                    request_deserializer=call__pb2.StreamStatsRequest.FromString,
+                    response_serializer=call__pb2.StatsUpdate.SerializeToString,
+            ),
             'ListAudioDevices': grpc.unary_unary_rpc_method_handler(
                     servicer.ListAudioDevices,
                     request_deserializer=call__pb2.Empty.FromString,
@@ -530,6 +547,33 @@ class CallService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def StreamStats(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/call.CallService/StreamStats',
+            call__pb2.StreamStatsRequest.SerializeToString,
+            call__pb2.StatsUpdate.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def ListAudioDevices(request,
             target,
@@ -19,6 +19,7 @@ from slixmpp.xmlstream import ET
 
 from drunk_call_hook.protocol.jingle_sdp_converter import JingleSDPConverter
 from drunk_call_hook.protocol.features.trickle_ice import TrickleICEHandler, IncomingCallState
+from drunk_call_hook.tracing import get_call_tracer
 
 
 class JingleAdapter:
@@ -73,6 +74,9 @@ class JingleAdapter:
         # Initialize Trickle ICE handler (manages deferred answer creation)
         self.trickle_ice = TrickleICEHandler(timeout_seconds=5.0, logger=self.logger)
 
+        # Call setup latency tracing (shared with CallBridge)
+        self.tracer = getattr(call_bridge, 'tracer', None) or get_call_tracer()
+
         # Track session_id → peer_jid mapping
         self.sessions: Dict[str, Dict[str, Any]] = {}
 
@@ -264,6 +268,7 @@ class JingleAdapter:
         self.sessions[sid]['offer_context'] = offer_context
 
         self.logger.info(f"Incoming call from {peer_jid}: {media_types}")
+        self.tracer.mark(sid, 'jingle:session-initiate-received')
 
         # Set initial state for incoming call (enables buffering of transport-info)
         self.trickle_ice.set_incoming_state(sid, IncomingCallState.HAVE_OFFER)
@@ -278,9 +283,11 @@ class JingleAdapter:
             # Defer answer creation until candidates arrive via transport-info
             async def on_timeout(session_id: str):
                 # Timeout expired - proceed with answer creation anyway
+                self.tracer.end_span(session_id, 'trickle:await-candidates', error='timeout')
                 if self.on_candidates_ready:
                     await self.on_candidates_ready(session_id)
 
+            self.tracer.start_span(sid, 'trickle:await-candidates')
             self.trickle_ice.defer_answer(sid, sdp_offer, peer_jid, media_types, on_timeout)
 
     async def _handle_session_accept(self, iq: Iq, jingle, sid: str):
@@ -319,6 +326,7 @@ class JingleAdapter:
         session['state'] = 'accepted'
 
         self.logger.info(f"Call accepted: {sid}")
+        self.tracer.mark(sid, 'jingle:session-accept-received')
 
         # We'll send XEP-0353 <accept/> when the connection actually completes
         # (DTLS handshake done), not here. Sending it too early makes Conversations.im
@@ -412,6 +420,8 @@ class JingleAdapter:
                     self.logger.info(f"Received ICE candidate for {sid}: {cand_ip}:{cand_port} ({cand_type}) component={component}")
 
         self.logger.debug(f"Received {len(candidates)} ICE candidates total for {sid}")
+        if candidates:
+            self.tracer.mark_once(sid, 'jingle:first-remote-candidate')
 
         # Track candidate statistics
         for candidate in candidates:
@@ -426,6 +436,7 @@ class JingleAdapter:
             if self.trickle_ice.candidates_arrived(sid):
                 # First candidates arrived - trigger answer creation
                 # (candidates already buffered above, will be processed later)
+                self.tracer.end_span(sid, 'trickle:await-candidates')
                 offer_data = self.trickle_ice.get_deferred_offer(sid)
                 if offer_data and self.on_incoming_call:
                     await self.on_incoming_call(
@@ -530,6 +541,7 @@ class JingleAdapter:
             msg.send()
 
             self.logger.info(f"Sent XEP-0353 proceed message for {session_id} to {peer_jid_bare}")
+            self.tracer.mark(session_id, 'xep0353:proceed-sent')
             session['state'] = 'proceeding'
         except Exception as e:
             self.logger.error(f"Failed to send proceed message: {e}", exc_info=True)
@@ -787,9 +799,10 @@ class JingleAdapter:
         stanza_xml = ET_format.tostring(iq.xml, encoding='unicode')
         self.logger.debug(f"Sending session-initiate stanza:\n{stanza_xml}")
 
-        # Send stanza
+        # Send stanza (span covers the IQ round trip until the peer's ACK)
         try:
-            await iq.send()
+            with self.tracer.span(sid, 'jingle:session-initiate'):
+                await iq.send()
             session['state'] = 'pending'
             self.logger.info(f"Sent session-initiate to {peer_id}")
 
@@ -874,9 +887,10 @@ class JingleAdapter:
         jingle_xml = ET_format.tostring(jingle_wrapper, encoding='unicode')
         self.logger.info(f"[JINGLE-ANSWER] {session_id}:\n{jingle_xml}")
 
-        # Send stanza
+        # Send stanza (span covers the IQ round trip until the peer's ACK)
         try:
-            await iq.send()
+            with self.tracer.span(session_id, 'jingle:session-accept'):
+                await iq.send()
             session['state'] = 'active'
             self.logger.info(f"Sent session-accept for {session_id}")
 
@@ -0,0 +1,152 @@
+"""
+CallStatsHistory - per-session call statistics ring buffer
+
+Responsibilities:
+- Merge compact StatsUpdate deltas (StreamStats RPC) into a full snapshot
+- Keep the last N samples in memory (sparklines in CallWindow)
+- Produce a small summary at hang-up (stored in call log)
+
+Snapshot dict keys match CallBridge.get_stats() so GUI code can consume
+either source unchanged.
+"""
+
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional
+
+
+# 2 minutes of history at the default 2s push interval
+DEFAULT_HISTORY_SIZE = 60
+
+# Fields carried by every sample (numeric, cheap to keep)
+SAMPLE_FIELDS = ('bytes_sent', 'bytes_received', 'bandwidth_kbps',
+                 'rtt_ms', 'jitter_ms', 'packet_loss_pct')
+
+
+class CallStatsHistory:
+    """
+    Ring buffer of stats samples for one call session.
+
+    Usage:
+        history = CallStatsHistory()
+        snapshot = history.apply_update(update)  # StatsUpdate from StreamStats
+        history.series('bandwidth_kbps')         # → [int, ...] for sparkline
+        history.summary()                        # → dict for call log
+    """
+
+    def __init__(self, max_samples: int = DEFAULT_HISTORY_SIZE):
+        """
+        Initialize empty history.
+
+        Args:
+            max_samples: Ring buffer capacity (oldest samples are dropped)
+        """
+        self.samples: deque = deque(maxlen=max_samples)
+        self.snapshot: Dict[str, Any] = {
+            'connection_state': '',
+            'ice_connection_state': '',
+            'ice_gathering_state': '',
+            'bytes_sent': 0,
+            'bytes_received': 0,
+            'bandwidth_kbps': 0,
+            'rtt_ms': 0,
+            'jitter_ms': 0,
+            'packet_loss_pct': 0.0,
+            'local_candidates': [],
+            'remote_candidates': [],
+            'connection_type': '',
+        }
+        self.started_at = time.time()
+
+        # Running aggregates over the whole call (ring buffer only keeps the tail)
+        self._sample_count = 0
+        self._bandwidth_sum = 0
+        self._bandwidth_peak = 0
+        self._rtt_sum = 0
+        self._rtt_count = 0
+        self._rtt_max = 0
+        self._jitter_max = 0
+        self._loss_max = 0.0
+        self._pair_changes = 0
+
+    def apply_update(self, update) -> Dict[str, Any]:
+        """
+        Merge a StatsUpdate delta into the snapshot and append a sample.
+
+        Args:
+            update: call_pb2.StatsUpdate
+
+        Returns:
+            Full snapshot dict (same shape as CallBridge.get_stats())
+        """
+        snap = self.snapshot
+
+        for field in SAMPLE_FIELDS:
+            snap[field] = getattr(update, field)
+
+        # Empty strings mean "unchanged" in the delta encoding
+        for field in ('connection_state', 'ice_connection_state',
+                      'ice_gathering_state', 'connection_type'):
+            value = getattr(update, field)
+            if value:
+                snap[field] = value
+
+        if update.candidates_changed:
+            if self._sample_count > 0:
+                self._pair_changes += 1
+            snap['local_candidates'] = list(update.local_candidates)
+            snap['remote_candidates'] = list(update.remote_candidates)
+
+        sample = {'timestamp_ms': update.timestamp_ms}
+        for field in SAMPLE_FIELDS:
+            sample[field] = snap[field]
+        self.samples.append(sample)
+
+        self._sample_count += 1
+        self._bandwidth_sum += snap['bandwidth_kbps']
+        self._bandwidth_peak = max(self._bandwidth_peak, snap['bandwidth_kbps'])
+        if snap['rtt_ms'] > 0:
+            self._rtt_sum += snap['rtt_ms']
+            self._rtt_count += 1
+            self._rtt_max = max(self._rtt_max, snap['rtt_ms'])
+        self._jitter_max = max(self._jitter_max, snap['jitter_ms'])
+        self._loss_max = max(self._loss_max, snap['packet_loss_pct'])
+
+        return snap
+
+    def series(self, field: str) -> List[float]:
+        """
+        Get values of one field across buffered samples (oldest first).
+
+        Args:
+            field: One of SAMPLE_FIELDS
+
+        Returns:
+            List of values (empty if no samples yet)
+        """
+        return [sample[field] for sample in self.samples]
+
+    def summary(self) -> Optional[Dict[str, Any]]:
+        """
+        Summarize the whole call for the call log.
+
+        Returns:
+            Summary dict, or None if no stats were ever received
+        """
+        if self._sample_count == 0:
+            return None
+
+        snap = self.snapshot
+        return {
+            'samples': self._sample_count,
+            'bytes_sent': snap['bytes_sent'],
+            'bytes_received': snap['bytes_received'],
+            'avg_bandwidth_kbps': round(self._bandwidth_sum / self._sample_count),
+            'peak_bandwidth_kbps': self._bandwidth_peak,
+            'avg_rtt_ms': round(self._rtt_sum / self._rtt_count) if self._rtt_count else 0,
+            'max_rtt_ms': self._rtt_max,
+            'max_jitter_ms': self._jitter_max,
+            'max_packet_loss_pct': round(self._loss_max, 2),
+            'connection_type': snap['connection_type'],
+            'pair_changes': self._pair_changes,
+        }
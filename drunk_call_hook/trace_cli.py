@@ -0,0 +1,54 @@
+"""
+Call setup trace CLI
+
+Prints waterfalls or latency percentiles from the JSONL trace written by
+CallSetupTracer (see tracing.py).
+
+Usage:
+    python -m drunk_call_hook.trace_cli --last 5
+    python -m drunk_call_hook.trace_cli --summary
+    python -m drunk_call_hook.trace_cli --prewarm
+    python -m drunk_call_hook.trace_cli --file bench.jsonl --summary
+"""
+
+import argparse
+from pathlib import Path
+from typing import Optional, List
+
+from .tracing import (
+    TRACE_FILENAME, default_trace_path, load_traces, summarize,
+    format_waterfall, format_summary, accept_to_media, format_accept_to_media
+)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Show call setup latency traces")
+    parser.add_argument('--file', type=Path, help=f"Trace file (default: <log_dir>/{TRACE_FILENAME})")
+    parser.add_argument('--last', type=int, default=5, help="Number of recent calls to show (default: 5)")
+    parser.add_argument('--summary', action='store_true', help="Print percentiles instead of waterfalls")
+    parser.add_argument('--prewarm', action='store_true',
+                        help="Compare accept-to-media time of incoming calls with and without pre-warm")
+    args = parser.parse_args(argv)
+
+    trace_path = args.file or default_trace_path()
+    aggregate = args.summary or args.prewarm
+    traces = load_traces(trace_path, last=args.last if not aggregate else None)
+    if not traces:
+        print(f"No call setup traces in {trace_path}")
+        return 1
+
+    if args.summary:
+        print(f"Call setup latency over {len(traces)} calls (ms):")
+        print(format_summary(summarize(traces)))
+    if args.prewarm:
+        print(f"Accept-to-media time over {len(traces)} calls (ms):")
+        print(format_accept_to_media(accept_to_media(traces)))
+    if not aggregate:
+        for trace in traces:
+            print(format_waterfall(trace))
+            print()
+    return 0
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
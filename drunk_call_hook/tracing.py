@@ -0,0 +1,384 @@
+"""
+CallSetupTracer - end-to-end call setup latency tracing
+
+Responsibilities:
+- Timestamp every call setup phase per session (XEP-0353 messages, Jingle IQs,
+  CallBridge RPCs, trickle ICE deferral, ICE connection states)
+- Append one JSON line per finished call to a trace file
+- Summarise phase latencies into percentiles across calls
+- Print a waterfall for the last N calls (CLI)
+
+Phases are either spans (start/end, e.g. an RPC or an IQ round trip) or marks
+(instants, e.g. "ice:checking"). All times are milliseconds relative to the
+first event of the session.
+
+Usage:
+    tracer = get_call_tracer()
+    tracer.begin(session_id, 'outgoing')
+    with tracer.span(session_id, 'rpc:CreateOffer'):
+        sdp = await stub.CreateOffer(request)
+    tracer.mark(session_id, 'ice:connected')
+    tracer.finish(session_id, 'connected')
+
+CLI (see trace_cli.py):
+    python -m drunk_call_hook.trace_cli --last 5
+    python -m drunk_call_hook.trace_cli --summary
+"""
+
+import json
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Callable
+
+
+TRACE_FILENAME = 'call-setup-trace.jsonl'
+
+
+class CallSetupTracer:
+    """
+    Per-session span recorder for call setup.
+
+    Thread-safe: marks may arrive from the gRPC event stream, GStreamer
+    callbacks (via run_coroutine_threadsafe) and the Qt/asyncio loop.
+    """
+
+    def __init__(self, trace_path: Optional[Path] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Initialize tracer.
+
+        Args:
+            trace_path: JSONL file to append finished traces to (None = keep in memory only)
+            clock: Monotonic clock in seconds (injectable for tests/benchmarks)
+            logger: Logger instance
+        """
+        self.trace_path = trace_path
+        self.clock = clock
+        self.logger = logger or logging.getLogger(__name__)
+        self._active: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _now_ms(self, trace: Dict[str, Any]) -> float:
+        return round((self.clock() - trace['_t0']) * 1000, 1)
+
+    def begin(self, session_id: str, direction: str):
+        """
+        Start tracing a call (idempotent).
+
+        Events for sessions that were never begun (or already finished) are
+        ignored, so late ICE state changes don't resurrect a trace.
+
+        Args:
+            session_id: Jingle/XEP-0353 session ID
+            direction: 'incoming' or 'outgoing'
+        """
+        with self._lock:
+            if session_id in self._active:
+                return
+            self._active[session_id] = {
+                'session_id': session_id,
+                'direction': direction,
+                'started_at': time.time(),
+                'spans': [],
+                'marks': [],
+                '_t0': self.clock(),
+                '_open': {},
+            }
+
+    def is_tracing(self, session_id: str) -> bool:
+        """Check if a session has an active (unfinished) trace."""
+        return session_id in self._active
+
+    def mark(self, session_id: str, name: str):
+        """
+        Record an instant event.
+
+        Args:
+            session_id: Session ID
+            name: Event name (e.g. 'xep0353:propose-received', 'ice:connected')
+        """
+        with self._lock:
+            trace = self._active.get(session_id)
+            if trace is not None:
+                trace['marks'].append({'name': name, 'at_ms': self._now_ms(trace)})
+
+    def mark_once(self, session_id: str, name: str):
+        """
+        Record an instant event only the first time it happens (e.g. first candidate).
+
+        Args:
+            session_id: Session ID
+            name: Event name
+        """
+        with self._lock:
+            trace = self._active.get(session_id)
+            if trace is None or any(m['name'] == name for m in trace['marks']):
+                return
+            trace['marks'].append({'name': name, 'at_ms': self._now_ms(trace)})
+
+    def start_span(self, session_id: str, name: str):
+        """
+        Open a span (use end_span with the same name to close it).
+
+        Args:
+            session_id: Session ID
+            name: Span name (e.g. 'rpc:CreateSession', 'jingle:session-initiate')
+        """
+        with self._lock:
+            trace = self._active.get(session_id)
+            if trace is not None:
+                trace['_open'][name] = self._now_ms(trace)
+
+    def end_span(self, session_id: str, name: str, error: Optional[str] = None):
+        """
+        Close a span opened with start_span (no-op if not open).
+
+        Args:
+            session_id: Session ID
+            name: Span name
+            error: Error description if the phase failed
+        """
+        with self._lock:
+            trace = self._active.get(session_id)
+            if trace is None or name not in trace['_open']:
+                return
+            start = trace['_open'].pop(name)
+            span = {'name': name, 'start_ms': start, 'end_ms': self._now_ms(trace)}
+            if error:
+                span['error'] = error
+            trace['spans'].append(span)
+
+    @contextmanager
+    def span(self, session_id: str, name: str):
+        """
+        Context manager recording a span around a block (works around awaits).
+
+        Args:
+            session_id: Session ID
+            name: Span name
+        """
+        self.start_span(session_id, name)
+        try:
+            yield
+        except BaseException as e:
+            self.end_span(session_id, name, error=type(e).__name__)
+            raise
+        self.end_span(session_id, name)
+
+    def finish(self, session_id: str, outcome: str) -> Optional[Dict[str, Any]]:
+        """
+        Finish a trace and append it to the trace file (idempotent).
+
+        Args:
+            session_id: Session ID
+            outcome: 'connected', or the termination reason for failed setups
+
+        Returns:
+            Finished trace record, or None if session was not traced
+        """
+        with self._lock:
+            trace = self._active.pop(session_id, None)
+            if trace is None:
+                return None
+            total = self._now_ms(trace)
+            # Spans still open at finish were cut short by the outcome
+            for name, start in trace['_open'].items():
+                trace['spans'].append({'name': name, 'start_ms': start,
+                                       'end_ms': total, 'error': 'unfinished'})
+
+        record = {k: v for k, v in trace.items() if not k.startswith('_')}
+        record['outcome'] = outcome
+        record['total_ms'] = total
+
+        if self.trace_path:
+            try:
+                self.trace_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.trace_path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps(record) + '\n')
+            except OSError as e:
+                self.logger.warning(f"Failed to write call setup trace: {e}")
+
+        self.logger.info(f"Call setup trace {session_id}: {outcome} in {total:.0f}ms")
+        return record
+
+
+def load_traces(trace_path: Path, last: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Load finished traces from a JSONL file.
+
+    Args:
+        trace_path: Trace file path
+        last: Only return the last N traces (None = all)
+
+    Returns:
+        List of trace records (oldest first), malformed lines skipped
+    """
+    if not trace_path.exists():
+        return []
+
+    traces = []
+    with open(trace_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                traces.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+
+    return traces[-last:] if last else traces
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (values need not be sorted)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def summarize(traces: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """
+    Summarise phase durations across calls.
+
+    Spans contribute their duration; marks contribute their offset from call
+    start. 'total' covers the whole setup of connected calls.
+
+    Args:
+        traces: Trace records from load_traces()
+
+    Returns:
+        Dict phase → {count, p50, p90, p99, max} (milliseconds)
+    """
+    samples: Dict[str, List[float]] = {}
+    for trace in traces:
+        for span in trace.get('spans', []):
+            samples.setdefault(span['name'], []).append(span['end_ms'] - span['start_ms'])
+        for mark in trace.get('marks', []):
+            samples.setdefault(mark['name'], []).append(mark['at_ms'])
+        if trace.get('outcome') == 'connected':
+            samples.setdefault('total', []).append(trace.get('total_ms', 0.0))
+
+    return {
+        name: {
+            'count': len(values),
+            'p50': percentile(values, 50),
+            'p90': percentile(values, 90),
+            'p99': percentile(values, 99),
+            'max': max(values),
+        }
+        for name, values in samples.items()
+    }
+
+
+def accept_to_media(traces: List[Dict[str, Any]]) -> Dict[str, List[float]]:
+    """
+    Accept-to-media latency of incoming calls, split by session pre-warm.
+
+    Measured from 'user:accepted' to 'ice:connected'; calls missing either
+    mark (declined, failed, outgoing) are skipped.
+
+    Args:
+        traces: Trace records from load_traces()
+
+    Returns:
+        Dict {'prewarmed': [ms, ...], 'cold': [ms, ...]}
+    """
+    groups: Dict[str, List[float]] = {'prewarmed': [], 'cold': []}
+    for trace in traces:
+        marks = {mark['name']: mark['at_ms'] for mark in trace.get('marks', [])}
+        if 'user:accepted' not in marks or 'ice:connected' not in marks:
+            continue
+        group = 'prewarmed' if 'prewarm:used' in marks else 'cold'
+        groups[group].append(marks['ice:connected'] - marks['user:accepted'])
+    return groups
+
+
+def format_accept_to_media(groups: Dict[str, List[float]]) -> str:
+    """Render accept_to_media() output as a table."""
+    lines = [f"  {'accept → media':<34} {'n':>4} {'p50':>8} {'p90':>8} {'max':>8}"]
+    for name, values in groups.items():
+        if not values:
+            lines.append(f"  {name:<34} {0:>4} {'-':>8} {'-':>8} {'-':>8}")
+            continue
+        lines.append(f"  {name:<34} {len(values):>4} {percentile(values, 50):>8.0f} "
+                     f"{percentile(values, 90):>8.0f} {max(values):>8.0f}")
+    return '\n'.join(lines)
+
+
+def format_waterfall(trace: Dict[str, Any], width: int = 50) -> str:
+    """
+    Render one trace as a text waterfall.
+
+    Args:
+        trace: Trace record
+        width: Bar width in characters
+
+    Returns:
+        Multi-line string
+    """
+    total = max(trace.get('total_ms', 0.0), 1.0)
+    started = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(trace.get('started_at', 0)))
+    lines = [
+        f"{trace['session_id']}  {trace.get('direction', '?')}  {started}  "
+        f"{trace.get('outcome', '?')} in {trace.get('total_ms', 0):.0f}ms"
+    ]
+
+    events = [(s['start_ms'], s['end_ms'], s['name'], s.get('error')) for s in trace.get('spans', [])]
+    events += [(m['at_ms'], m['at_ms'], m['name'], None) for m in trace.get('marks', [])]
+    events.sort(key=lambda e: (e[0], e[1]))
+
+    for start, end, name, error in events:
+        offset = int(start / total * width)
+        length = max(1, int((end - start) / total * width)) if end > start else 0
+        bar = ' ' * offset + ('█' * length if length else '|')
+        duration = f"{end - start:7.0f}ms" if end > start else f"@{start:6.0f}ms"
+        suffix = f"  ({error})" if error else ''
+        lines.append(f"  {name:<34} {duration}  {bar:<{width}}{suffix}")
+
+    return '\n'.join(lines)
+
+
+def format_summary(summary: Dict[str, Dict[str, float]]) -> str:
+    """Render summarize() output as a table."""
+    lines = [f"  {'phase':<34} {'n':>4} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}"]
+    for name in sorted(summary, key=lambda n: summary[n]['p50']):
+        s = summary[name]
+        lines.append(f"  {name:<34} {s['count']:>4} {s['p50']:>8.0f} {s['p90']:>8.0f} "
+                     f"{s['p99']:>8.0f} {s['max']:>8.0f}")
+    return '\n'.join(lines)
+
+
+# Global tracer instance (one per process, shared by all accounts)
+_tracer: Optional[CallSetupTracer] = None
+
+
+def default_trace_path() -> Path:
+    """Trace file in the application log directory."""
+    from siproxylin.utils.paths import get_paths
+    return get_paths().log_dir / TRACE_FILENAME
+
+
+def get_call_tracer() -> CallSetupTracer:
+    """Get global CallSetupTracer (writes to the log directory)."""
+    global _tracer
+    if _tracer is None:
+        try:
+            path = default_trace_path()
+        except Exception:
+            path = None
+        _tracer = CallSetupTracer(trace_path=path)
+    return _tracer
+
+
+def set_call_tracer(tracer: CallSetupTracer):
+    """Replace global tracer (benchmarks, tests)."""
+    global _tracer
+    _tracer = tracer
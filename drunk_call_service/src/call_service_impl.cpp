@@ -12,6 +12,9 @@
 #include "call_service_impl.h"
 #include "logger.h"
 #include "media_session.h"  // For DeviceEnumerator
+#include <algorithm>
+#include <chrono>
+#include <thread>
 
 // Global shutdown flag (defined in main.cpp, global namespace)
 extern std::atomic<bool> g_shutdown_requested;
@@ -690,6 +693,98 @@ grpc::Status CallServiceImpl::GetStats(
     }
 }
 
+grpc::Status CallServiceImpl::StreamStats(
+    grpc::ServerContext* context,
+    const call::StreamStatsRequest* request,
+    grpc::ServerWriter<call::StatsUpdate>* writer) {
+
+    std::string session_id = request->session_id();
+    int interval_ms = request->interval_ms() > 0 ? request->interval_ms() : 2000;
+    interval_ms = std::clamp(interval_ms, 250, 10000);
+    LOG_DEBUG("gRPC: StreamStats - session_id={}, interval={}ms", session_id, interval_ms);
+    LOG_INFO("StreamStats started: session_id={}, interval={}ms", session_id, interval_ms);
+
+    // Get session from SessionManager
+    auto session = session_manager_.get_session(session_id);
+    if (!session) {
+        LOG_ERROR("StreamStats: Session not found: {}", session_id);
+        return grpc::Status(grpc::StatusCode::NOT_FOUND, "Session not found");
+    }
+
+    // Last values sent on this stream (only changed strings/candidates are re-sent)
+    MediaSession::Stats last;
+    bool first = true;
+    int update_count = 0;
+    const auto stream_start = std::chrono::steady_clock::now();
+
+    while (session->active && !context->IsCancelled()) {
+        try {
+            auto stats = session->webrtc->get_stats();
+
+            call::StatsUpdate update;
+            update.set_timestamp_ms(std::chrono::duration_cast<std::chrono::milliseconds>(
+                std::chrono::steady_clock::now() - stream_start).count());
+            update.set_bytes_sent(stats.bytes_sent);
+            update.set_bytes_received(stats.bytes_received);
+            update.set_bandwidth_kbps(stats.bandwidth_kbps);
+            update.set_rtt_ms(stats.rtt_ms);
+            update.set_jitter_ms(stats.jitter_ms);
+            update.set_packet_loss_pct(stats.packet_loss_pct);
+
+            if (first || stats.connection_state != last.connection_state) {
+                update.set_connection_state(stats.connection_state);
+            }
+            if (first || stats.ice_connection_state != last.ice_connection_state) {
+                update.set_ice_connection_state(stats.ice_connection_state);
+            }
+            if (first || stats.ice_gathering_state != last.ice_gathering_state) {
+                update.set_ice_gathering_state(stats.ice_gathering_state);
+            }
+            if (first || stats.connection_type != last.connection_type) {
+                update.set_connection_type(stats.connection_type);
+            }
+
+            // Selected pair / candidate lists change rarely - only send on change
+            if (first || stats.local_candidates != last.local_candidates ||
+                stats.remote_candidates != last.remote_candidates) {
+                update.set_candidates_changed(true);
+                for (const auto& candidate : stats.local_candidates) {
+                    update.add_local_candidates(candidate);
+                }
+                for (const auto& candidate : stats.remote_candidates) {
+                    update.add_remote_candidates(candidate);
+                }
+            }
+
+            if (!writer->Write(update)) {
+                LOG_WARN("StreamStats: Failed to write update (client disconnected?): {}",
+                        session_id);
+                break;
+            }
+
+            last = std::move(stats);
+            first = false;
+            update_count++;
+            LOG_TRACE("StreamStats: Update #{} sent: {}", update_count, session_id);
+
+        } catch (const std::exception& e) {
+            LOG_ERROR("Exception in StreamStats: {}", e.what());
+            return grpc::Status(grpc::StatusCode::INTERNAL,
+                              std::string("Exception: ") + e.what());
+        }
+
+        // Sleep in short slices so session end / cancellation is noticed quickly
+        auto deadline = std::chrono::steady_clock::now() + std::chrono::milliseconds(interval_ms);
+        while (session->active && !context->IsCancelled() &&
+               std::chrono::steady_clock::now() < deadline) {
+            std::this_thread::sleep_for(std::chrono::milliseconds(100));
+        }
+    }
+
+    LOG_INFO("StreamStats finished: {}, updates sent: {}", session_id, update_count);
+    return grpc::Status::OK;
+}
+
 // ============================================================================
 // Service Management
 // ============================================================================
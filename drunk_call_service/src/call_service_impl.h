@@ -98,6 +98,11 @@ public:
         const call::GetStatsRequest* request,
         call::GetStatsResponse* response) override;
 
+    grpc::Status StreamStats(
+        grpc::ServerContext* context,
+        const call::StreamStatsRequest* request,
+        grpc::ServerWriter<call::StatsUpdate>* writer) override;
+
     // Service management
     grpc::Status Heartbeat(
         grpc::ServerContext* context,
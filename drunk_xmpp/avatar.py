@@ -11,6 +11,8 @@ Strategy:
 - Fallback to XEP-0153/0054 (legacy, compatible)
 - Cache avatars to avoid redundant fetches
 - Notify callback when avatar is fetched
+- Report advertised avatar hashes (XEP-0153 presence photo, XEP-0084
+  metadata notifications) so the caller can fetch only changed avatars
 """
 
 import hashlib
@@ -35,6 +37,8 @@ class AvatarMixin:
             self.avatar_cache: Dict[str, Dict] = {}
         if not hasattr(self, 'on_avatar_update_callback'):
             self.on_avatar_update_callback: Optional[Callable] = None
+        if not hasattr(self, 'on_avatar_hash_callback'):
+            self.on_avatar_hash_callback: Optional[Callable] = None
 
     async def get_avatar(self, jid: str, prefer_pep: bool = True) -> Optional[Dict]:
         """
@@ -275,6 +279,76 @@ class AvatarMixin:
             self.logger.error(traceback.format_exc())
             return None
 
+    async def _on_vcard_avatar_update(self, pres):
+        """
+        Handler for XEP-0153 photo hashes in presence.
+
+        slixmpp only fires 'vcard_avatar_update' when the presence carries a
+        non-empty <photo/> (MUC occupants are skipped by the plugin).
+
+        Args:
+            pres: Presence stanza with vcard_temp_update payload
+        """
+        photo_hash = pres['vcard_temp_update']['photo']
+        if photo_hash:
+            await self._notify_avatar_hash(pres['from'].bare, photo_hash.strip().lower(), 'xep_0054')
+
+    async def _on_avatar_metadata_publish(self, msg):
+        """
+        Handler for XEP-0084 avatar metadata PEP notifications.
+
+        The info id is the SHA-1 of the image data, so it can be compared
+        directly with the stored avatar hash. Empty metadata means the contact
+        disabled their avatar and is reported as an empty hash.
+
+        Args:
+            msg: Message stanza containing the PEP event
+        """
+        try:
+            from_jid = msg['from'].bare
+            for item in msg['pubsub_event']['items']:
+                metadata = item['avatar_metadata']
+                # Same selection as _get_avatar_pep: prefer PNG, else first
+                avatar_id = ''
+                for info in metadata.xml.findall('{urn:xmpp:avatar:metadata}info'):
+                    if info.get('type', '') == 'image/png':
+                        avatar_id = info.get('id', '')
+                        break
+                    elif not avatar_id:
+                        avatar_id = info.get('id', '')
+
+                await self._notify_avatar_hash(from_jid, avatar_id.strip().lower(), 'xep_0084')
+
+        except Exception as e:
+            self.logger.error(f"Error handling avatar metadata event: {e}")
+            import traceback
+            self.logger.error(traceback.format_exc())
+
+    async def _notify_avatar_hash(self, jid: str, avatar_hash: str, source: str):
+        """
+        Pass an advertised avatar hash to the callback.
+
+        Args:
+            jid: Bare JID
+            avatar_hash: Advertised SHA-1 hex digest ('' = no avatar)
+            source: 'xep_0084' (PEP) or 'xep_0054' (vCard)
+        """
+        self._init_avatar_cache()
+
+        if jid == self.boundjid.bare:
+            return
+
+        # Drop stale in-memory entry so the next get_avatar() refetches
+        cached = self.avatar_cache.get(jid)
+        if cached and cached.get('hash') != avatar_hash:
+            del self.avatar_cache[jid]
+
+        if self.on_avatar_hash_callback:
+            try:
+                await self.on_avatar_hash_callback(jid, avatar_hash, source)
+            except Exception as e:
+                self.logger.exception(f"Error in avatar hash callback: {e}")
+
     def get_cached_avatar(self, jid: str) -> Optional[Dict]:
         """
         Get avatar from cache without fetching.
@@ -82,6 +82,9 @@ from .file_uploads import FileUploadMixin
 from .message_extensions import MessageExtensionsMixin
 from .avatar import AvatarMixin
 from .external_services import ExternalServicesMixin
+from .http_client import HttpClient
+from .startup import StartupPipeline
+from .muc_roster import MucRosterTracker
 from . import xep_0428
 
 
@@ -311,11 +314,13 @@ class DrunkXMPP(ClientXMPP, DiscoveryMixin, MessagingMixin, BookmarksMixin, OMEM
         on_message_correction_callback: Optional[Callable] = None,
         on_room_config_changed_callback: Optional[Callable] = None,
         on_avatar_update_callback: Optional[Callable] = None,
+        on_avatar_hash_callback: Optional[Callable] = None,
         on_reaction_callback: Optional[Callable] = None,
         on_subscription_request_callback: Optional[Callable] = None,
         on_subscription_changed_callback: Optional[Callable] = None,
         on_presence_changed_callback: Optional[Callable] = None,
         on_nickname_update_callback: Optional[Callable] = None,
+        on_muc_participants_changed_callback: Optional[Callable] = None,
         own_nickname: Optional[str] = None,
         enable_omemo: bool = True,
         allow_any_message_editing: bool = False,
@@ -326,6 +331,8 @@ class DrunkXMPP(ClientXMPP, DiscoveryMixin, MessagingMixin, BookmarksMixin, OMEM
         proxy_username: Optional[str] = None,
         proxy_password: Optional[str] = None,
         client_cert_path: Optional[str] = None,
+        roster_version: Optional[str] = None,
+        roster_items: Optional[Dict[str, Dict]] = None,
     ):
         """
         Initialize DrunkXMPP client with OMEMO support.
@@ -355,7 +362,9 @@ class DrunkXMPP(ClientXMPP, DiscoveryMixin, MessagingMixin, BookmarksMixin, OMEM
             on_muc_role_changed_callback: Optional callback for MUC role changes (room_jid, old_role, new_role) - XEP-0045
             on_room_config_changed_callback: Optional callback for room config changes (room_jid, room_name) - XEP-0045 status code 104
             on_avatar_update_callback: Optional callback for avatar updates (jid, avatar_data) - XEP-0084/0153
+            on_avatar_hash_callback: Optional callback for advertised avatar hashes (jid, avatar_hash, source) - XEP-0084/0153
             on_nickname_update_callback: Optional callback for nickname updates (jid, nickname) - XEP-0172
+            on_muc_participants_changed_callback: Optional callback for coalesced MUC occupant changes (room_jid, {nick: Occupant or None}) - XEP-0045
             own_nickname: Optional nickname to publish via XEP-0172 on connect
             on_reaction_callback: Optional callback for message reactions (from_jid, message_id, emojis) - XEP-0444
             enable_omemo: Enable OMEMO encryption (default: True)
@@ -368,6 +377,9 @@ class DrunkXMPP(ClientXMPP, DiscoveryMixin, MessagingMixin, BookmarksMixin, OMEM
             proxy_username: Optional proxy authentication username
             proxy_password: Optional proxy authentication password
             client_cert_path: Path to client certificate .pem file for TLS authentication (key must be unencrypted)
+            roster_version: Cached roster version (XEP-0237); sent on login so the server only
+                            returns changes. Only meaningful together with roster_items.
+            roster_items: Cached roster {bare_jid: {'name', 'subscription', 'ask'}} matching roster_version
         """
         # Pass sasl_mech to slixmpp's ClientXMPP constructor
         # This properly configures feature_mechanisms plugin before connection
@@ -408,6 +420,10 @@ class DrunkXMPP(ClientXMPP, DiscoveryMixin, MessagingMixin, BookmarksMixin, OMEM
                     proxy_info = f"{proxy_username}@{proxy_info}"
                 logging.getLogger(__name__).info(f"{proxy_type_upper} proxy configured: {proxy_info}")
 
+        # Pooled HTTP session for uploads/downloads, through the same proxy as the stream
+        from slixmpp.version import __version__ as slixmpp_version
+        self.http_client = HttpClient(proxy_url=self.proxy_url, user_agent=f"slixmpp {slixmpp_version}")
+
         # Configure client certificate for TLS authentication (works with both STARTTLS and direct TLS)
         # NOTE: Only unencrypted keys are supported (cert should be validated by caller before passing)
         if client_cert_path:
@@ -416,6 +432,8 @@ class DrunkXMPP(ClientXMPP, DiscoveryMixin, MessagingMixin, BookmarksMixin, OMEM
             logging.getLogger(__name__).info(f"Client certificate configured: {client_cert_path}")
 
         self.rooms = rooms if rooms is not None else {}
+        self.roster_version = roster_version
+        self.roster_items = roster_items if roster_items is not None else {}
         self.on_message_callback = on_message_callback
         self.on_private_message_callback = on_private_message_callback
         self.on_message_error_callback = on_message_error_callback
@@ -432,10 +450,15 @@ class DrunkXMPP(ClientXMPP, DiscoveryMixin, MessagingMixin, BookmarksMixin, OMEM
         self.on_message_correction_callback = on_message_correction_callback
         self.on_room_config_changed_callback = on_room_config_changed_callback
         self.on_avatar_update_callback = on_avatar_update_callback
+        self.on_avatar_hash_callback = on_avatar_hash_callback
         self.on_subscription_request_callback = on_subscription_request_callback
         self.on_subscription_changed_callback = on_subscription_changed_callback
         self.on_presence_changed_callback = on_presence_changed_callback
         self.on_nickname_update_callback = on_nickname_update_callback
+        self.on_muc_participants_changed_callback = on_muc_participants_changed_callback
+
+        # Occupants of joined rooms, changes delivered in coalesced batches
+        self.muc_roster = MucRosterTracker(self._on_muc_roster_changes)
 
         # Nickname cache (XEP-0172: User Nickname)
         self.nickname_cache: Dict[str, str] = {}
@@ -582,6 +605,7 @@ class DrunkXMPP(ClientXMPP, DiscoveryMixin, MessagingMixin, BookmarksMixin, OMEM
         self.reconnect_max_delay = reconnect_max_delay
 
         # Event handlers
+        self.add_event_handler("session_bind", self._on_session_bind)
         self.add_event_handler("session_start", self._on_session_start)
         self.add_event_handler("session_resumed", self._on_session_resumed)
         self.add_event_handler("session_end", self._on_session_end)
@@ -629,6 +653,10 @@ class DrunkXMPP(ClientXMPP, DiscoveryMixin, MessagingMixin, BookmarksMixin, OMEM
         self.add_event_handler("user_nick_publish", self._on_user_nick_publish)
         self.logger.info("Registered event handler for 'user_nick_publish'")
 
+        # Avatar hash announcements (XEP-0153 presence photo, XEP-0084 metadata PEP)
+        self.add_event_handler("vcard_avatar_update", self._on_vcard_avatar_update)
+        self.add_event_handler("avatar_metadata_publish", self._on_avatar_metadata_publish)
+
         if self.omemo_enabled:
             self.add_event_handler("omemo_initialized", self._on_omemo_initialized)
 
@@ -637,6 +665,32 @@ class DrunkXMPP(ClientXMPP, DiscoveryMixin, MessagingMixin, BookmarksMixin, OMEM
         self.omemo_ready = True
         self.logger.info("OMEMO encryption initialized and ready")
 
+    def _on_session_bind(self, jid):
+        """
+        Load the cached roster into slixmpp's roster (XEP-0237 Roster Versioning).
+
+        get_roster() sends client_roster.version when the server supports
+        versioning; the server then answers with an empty result (cache is
+        current) or pushes only the changes, so the cache must be in place
+        before session_start.
+        """
+        roster = self.client_roster
+        if roster.version or not self.roster_version:
+            # Already populated (reconnect in this process) or nothing cached
+            return
+
+        for bare_jid, item in self.roster_items.items():
+            subscription = item.get('subscription') or 'none'
+            roster.add(
+                bare_jid,
+                name=item.get('name') or '',
+                afrom=subscription in ('from', 'both'),
+                ato=subscription in ('to', 'both'),
+                pending_out=item.get('ask') == 'subscribe',
+            )
+        roster.version = self.roster_version
+        self.logger.info(f"Roster cache loaded: {len(self.roster_items)} contacts (ver={self.roster_version})")
+
     async def _on_session_start(self, event):
         """Handler for successful connection."""
         print(f"[DEBUG] DrunkXMPP._on_session_start CALLED for {self.boundjid}")
@@ -663,13 +717,32 @@ class DrunkXMPP(ClientXMPP, DiscoveryMixin, MessagingMixin, BookmarksMixin, OMEM
         # Setup Jingle call handlers
         self._setup_call_handlers()
 
-        # Enable Message Carbons before sending presence
+        # Independent requests run concurrently (see StartupPipeline); only
+        # presence waits for carbons and room joins wait for presence/bookmarks
+        pipeline = StartupPipeline('session start', self.logger)
+        pipeline.add('carbons', self._enable_carbons)
+        pipeline.add('roster', self.get_roster)
+        pipeline.add('presence', self._send_initial_presence, after=('carbons',))
+        if self.own_nickname:
+            pipeline.add('nickname', self.publish_nickname)
+        if self.on_bookmarks_received_callback:
+            pipeline.add('bookmarks', self._sync_bookmarks)
+        # Joins are sent back to back (no waiting for each room's self-presence)
+        pipeline.add('rooms', self._join_all_rooms, after=('presence', 'bookmarks'))
+        # STUN/TURN credentials cached for call setup (XEP-0215)
+        pipeline.add('external services', self.warm_external_services)
+        await pipeline.run()
+
+    async def _enable_carbons(self):
+        """Enable Message Carbons (XEP-0280) - before initial presence, so no carbon is missed."""
         try:
             await self.plugin['xep_0280'].enable()
             self.logger.info("Message Carbons enabled")
         except Exception as e:
             self.logger.warning(f"Failed to enable Message Carbons: {e}")
 
+    async def _send_initial_presence(self):
+        """Broadcast initial presence with the current caps hash (XEP-0115)."""
         # Update capabilities and broadcast new presence with updated caps hash
         # This ensures Jingle features are included in the caps hash
         await self.plugin['xep_0115'].update_caps()
@@ -677,21 +750,14 @@ class DrunkXMPP(ClientXMPP, DiscoveryMixin, MessagingMixin, BookmarksMixin, OMEM
         # update_caps() already sends presence with broadcast=True, but we send again
         # to ensure all resources get updated presence
         self.send_presence()
-        await self.get_roster()
-
-        # Publish nickname if configured (XEP-0172)
-        if self.own_nickname:
-            await self.publish_nickname()
 
-        # Fetch bookmarks from server (XEP-0402)
-        if self.on_bookmarks_received_callback:
-            try:
-                bookmarks = await self.get_bookmarks()
-                await self.on_bookmarks_received_callback(bookmarks)
-            except Exception as e:
-                self.logger.warning(f"Failed to fetch bookmarks: {e}")
-
-        await self._join_all_rooms()
+    async def _sync_bookmarks(self):
+        """Fetch bookmarks from server (XEP-0402) and hand them to the callback."""
+        try:
+            bookmarks = await self.get_bookmarks()
+            await self.on_bookmarks_received_callback(bookmarks)
+        except Exception as e:
+            self.logger.warning(f"Failed to fetch bookmarks: {e}")
 
     async def _on_session_resumed(self, event):
         """Handler for session resumption (XEP-0198)."""
@@ -705,13 +771,14 @@ class DrunkXMPP(ClientXMPP, DiscoveryMixin, MessagingMixin, BookmarksMixin, OMEM
         # 1. OMEMO plugin needs presence/roster events to re-initialize after network reconnect
         # 2. Other clients need to know we're back online
         # 3. Server state may have changed during disconnection
-        await self.plugin['xep_0115'].update_caps()
-        self.send_presence()
-        await self.get_roster()
-
+        pipeline = StartupPipeline('session resume', self.logger)
+        pipeline.add('presence', self._send_initial_presence)
+        pipeline.add('roster', self.get_roster)
         # Re-publish nickname after session resumption (XEP-0172)
         if self.own_nickname:
-            await self.publish_nickname()
+            pipeline.add('nickname', self.publish_nickname)
+        pipeline.add('external services', self.warm_external_services)
+        await pipeline.run()
 
         self.logger.debug("Presence and roster refreshed after session resumption")
 
@@ -719,12 +786,16 @@ class DrunkXMPP(ClientXMPP, DiscoveryMixin, MessagingMixin, BookmarksMixin, OMEM
         """Handler for session end - clear state when session truly ends."""
         self.logger.warning("XMPP session ended")
         self.joined_rooms.clear()
+        # Occupants are re-announced on rejoin; drop the stale rosters
+        for room in list(self.muc_roster.rooms):
+            self.muc_roster.room_left(room)
         self.omemo_ready = False
 
     async def _on_disconnected(self, event):
         """Handler for disconnection."""
         self.logger.info("Disconnected from XMPP server")
         self._connection_state = False  # Mark as disconnected
+        self.cancel_external_services_refresh()
         # Do NOT clear joined_rooms/omemo_ready here - XEP-0198 may resume session
         # State is only cleared in session_end handler when session truly ends
 
@@ -884,11 +955,22 @@ class DrunkXMPP(ClientXMPP, DiscoveryMixin, MessagingMixin, BookmarksMixin, OMEM
 
             # Check if it's our own presence (status code 110)
             status_codes = presence.get('muc', {}).get('status_codes', [])
+
+            # Occupant roster (join/leave/role/affiliation/nick change)
+            if nick and ptype != 'error':
+                muc = presence['muc']
+                self.muc_roster.on_presence(
+                    room, nick, ptype != 'unavailable',
+                    jid=muc['jid'].bare or None,
+                    role=muc['role'], affiliation=muc['affiliation'],
+                    status_codes=status_codes, new_nick=muc['item_nick'] or None,
+                )
             if status_codes and 110 in status_codes:
                 if ptype == 'unavailable':
                     self.logger.warning(f"We left/got kicked from {room}")
                     if room in self.joined_rooms:
                         self.joined_rooms.remove(room)
+                    self.muc_roster.room_left(room)
                     # Clear our occupant-id, affiliation, and role for this room
                     if room in self.own_occupant_ids:
                         del self.own_occupant_ids[room]
@@ -904,6 +986,9 @@ class DrunkXMPP(ClientXMPP, DiscoveryMixin, MessagingMixin, BookmarksMixin, OMEM
                         self.logger.debug(f"Room {room} not in rooms dict, skipping rejoin (user left intentionally)")
                 else:
                     # Self-presence received - we're joined!
+                    # Occupants arrive before it: hand them to the views in one batch
+                    self.muc_roster.joined(room)
+
                     # Capture our occupant-id (XEP-0421) for reliable message direction detection
                     occupant_id = presence.get('occupant-id', {}).get('id')
                     if occupant_id:  # Check after assignment (empty string is falsy)
@@ -945,13 +1030,19 @@ class DrunkXMPP(ClientXMPP, DiscoveryMixin, MessagingMixin, BookmarksMixin, OMEM
                                 self.logger.error(f"Error in on_muc_joined_callback for {room}: {e}")
                     else:
                         self.logger.debug(f"Self-presence confirmed in {room} as {nick} (room already in joined_rooms)")
-            else:
-                self.logger.debug(f"Presence in {room}: {nick} - {ptype}")
+            elif not self.muc_roster.is_joining(room):
+                # Not logged per occupant during a join (thousands of presences)
+                self.logger.debug("Presence in %s: %s - %s", room, nick, ptype)
         except Exception as e:
             self.logger.error(f"Error in _on_muc_presence: {e}")
             import traceback
             self.logger.error(traceback.format_exc())
 
+    def _on_muc_roster_changes(self, room_jid: str, changes: Dict):
+        """Deliver a coalesced batch of occupant changes (MucRosterTracker callback)."""
+        if self.on_muc_participants_changed_callback:
+            asyncio.ensure_future(self.on_muc_participants_changed_callback(room_jid, changes))
+
     async def _on_muc_error(self, presence):
         """
         Handler for MUC presence errors.
@@ -1066,6 +1157,10 @@ class DrunkXMPP(ClientXMPP, DiscoveryMixin, MessagingMixin, BookmarksMixin, OMEM
         Args:
             presence: Presence stanza from slixmpp
         """
+        # Room occupants are tracked by _on_muc_presence (muc_roster), not as contacts
+        if presence.xml.find('{http://jabber.org/protocol/muc#user}x') is not None:
+            return
+
         from_jid = presence['from'].bare  # Strip resource to get bare JID
         ptype = presence['type']  # 'available', 'unavailable', 'error', 'probe', 'subscribe', etc.
 
@@ -2484,6 +2579,46 @@ class DrunkXMPP(ClientXMPP, DiscoveryMixin, MessagingMixin, BookmarksMixin, OMEM
         """Check if connected and authenticated to XMPP server."""
         return self._connection_state
 
+    async def wait_for_session(self, timeout: float = 30.0) -> str:
+        """
+        Wait for the outcome of a connect() attempt.
+
+        Args:
+            timeout: Seconds to wait
+
+        Returns:
+            'connected' (session started), 'auth_failed', 'failed' (connection
+            failed, slixmpp keeps retrying) or 'timeout'
+        """
+        if self._connection_state:
+            return 'connected'
+
+        outcome = asyncio.get_running_loop().create_future()
+        handlers = {
+            'session_start': 'connected',
+            'failed_auth': 'auth_failed',
+            'failed_all_auth': 'auth_failed',
+            'no_auth': 'auth_failed',
+            'connection_failed': 'failed',
+        }
+
+        def make_handler(result):
+            def handler(event):
+                if not outcome.done():
+                    outcome.set_result(result)
+            return handler
+
+        registered = [(event, make_handler(result)) for event, result in handlers.items()]
+        for event, handler in registered:
+            self.add_event_handler(event, handler)
+        try:
+            return await asyncio.wait_for(outcome, timeout)
+        except asyncio.TimeoutError:
+            return 'timeout'
+        finally:
+            for event, handler in registered:
+                self.del_event_handler(event, handler)
+
     def is_joined(self, room_jid: str) -> bool:
         """Check if joined to a specific room."""
         return room_jid in self.joined_rooms
@@ -2709,6 +2844,13 @@ class DrunkXMPP(ClientXMPP, DiscoveryMixin, MessagingMixin, BookmarksMixin, OMEM
         self.joined_rooms.clear()
         self.logger.debug("Cleared joined_rooms on disconnect")
 
+        # User-initiated: release pooled HTTP connections (kept across auto-reconnects)
+        if disable_auto_reconnect:
+            try:
+                asyncio.ensure_future(self.http_client.close())
+            except RuntimeError:
+                pass  # No event loop (shutdown)
+
         return super().disconnect(wait=wait, reason=reason, ignore_send_queue=ignore_send_queue)
 
     def is_omemo_ready(self) -> bool:
@@ -1,10 +1,50 @@
 """
 XEP-0215: External Service Discovery
 Queries XMPP server for STUN/TURN credentials for WebRTC calls.
+
+Credentials are cached per account: the cache is warmed at session start,
+refreshed in the background ahead of the earliest `expires`, and calls read
+it synchronously. Only a stale cache costs a live query at call setup.
 """
 
+import asyncio
 import logging
+import time
+from datetime import datetime, timezone
 from typing import List, Dict, Optional
+from slixmpp.exceptions import IqError
+
+
+# Lifetime of services without an 'expires' attribute (seconds)
+EXTERNAL_SERVICES_DEFAULT_TTL = 3600
+# Refresh this long before the cached credentials expire (seconds)
+EXTERNAL_SERVICES_REFRESH_AHEAD = 60
+# Never refresh more often than this, even for very short-lived credentials (seconds)
+EXTERNAL_SERVICES_MIN_REFRESH = 10
+# Credentials closer to expiry than this are not handed out to new calls (seconds)
+EXTERNAL_SERVICES_MIN_VALIDITY = 10
+# Longest background refresh delay when credentials keep arriving (nearly)
+# expired - clock skew between us and the server (seconds)
+EXTERNAL_SERVICES_MAX_BACKOFF = 600
+
+
+def parse_expires(value: str) -> Optional[float]:
+    """
+    Parse a XEP-0082 DateTime 'expires' attribute.
+
+    Args:
+        value: e.g. '2025-01-01T12:00:00Z' or '2025-01-01T12:00:00.000+02:00'
+
+    Returns:
+        Unix timestamp, or None if unparseable
+    """
+    try:
+        expires = datetime.fromisoformat(value.strip().replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+    if expires.tzinfo is None:
+        expires = expires.replace(tzinfo=timezone.utc)
+    return expires.timestamp()
 
 
 class ExternalServicesMixin:
@@ -13,6 +53,148 @@ class ExternalServicesMixin:
     Allows clients to discover STUN/TURN servers with credentials from XMPP server.
     """
 
+    def _init_external_services_cache(self):
+        """Initialize external services cache if not already initialized."""
+        if not hasattr(self, 'external_services_cache'):
+            # {'services': [...], 'fetched_at', 'expires_at' (monotonic), 'query_ms'}
+            self.external_services_cache: Optional[Dict] = None
+            self._external_services_refresh: Optional[asyncio.Task] = None
+            self._external_services_timer: Optional[asyncio.TimerHandle] = None
+            # Consecutive refreshes that returned (nearly) expired credentials
+            self._external_services_short_refreshes = 0
+            # hits/misses of get_call_external_services(), ms saved by hits
+            self.external_services_metrics: Dict[str, float] = {
+                'hits': 0, 'misses': 0, 'saved_ms': 0.0, 'last_saved_ms': 0.0,
+            }
+
+    def get_cached_external_services(self) -> Optional[List[Dict]]:
+        """
+        Get cached external services without any network round trip.
+
+        Returns:
+            Service list (may be empty if the server has none), or None if
+            the cache is empty or expired
+        """
+        self._init_external_services_cache()
+        cache = self.external_services_cache
+        if cache is None or time.monotonic() >= cache['expires_at'] - EXTERNAL_SERVICES_MIN_VALIDITY:
+            return None
+        return cache['services']
+
+    async def get_call_external_services(self) -> List[Dict]:
+        """
+        Get STUN/TURN services for call setup: from the cache when fresh,
+        otherwise with a live query (which refills the cache).
+
+        Updates external_services_metrics (hit/miss, milliseconds saved).
+
+        Returns:
+            Service list (see get_external_services())
+        """
+        self._init_external_services_cache()
+        metrics = self.external_services_metrics
+
+        services = self.get_cached_external_services()
+        if services is not None:
+            saved_ms = self.external_services_cache['query_ms']
+            metrics['hits'] += 1
+            metrics['saved_ms'] += saved_ms
+            metrics['last_saved_ms'] = saved_ms
+            self.logger.debug(f"External services cache hit (saved ~{saved_ms:.0f}ms)")
+            return services
+
+        metrics['misses'] += 1
+        metrics['last_saved_ms'] = 0.0
+        self.logger.debug("External services cache miss, querying server")
+        return await self.refresh_external_services()
+
+    async def refresh_external_services(self) -> List[Dict]:
+        """
+        Query the server and replace the cache (concurrent callers share one query).
+
+        On failure the previous cache is kept (it stays valid until it expires).
+
+        Returns:
+            Fresh service list, or the still valid cached one / [] on failure
+        """
+        self._init_external_services_cache()
+        if self._external_services_refresh is None or self._external_services_refresh.done():
+            self._external_services_refresh = asyncio.ensure_future(self._refresh_external_services())
+        return await asyncio.shield(self._external_services_refresh)
+
+    async def warm_external_services(self):
+        """Fill the cache unless it's still fresh (session start/resume)."""
+        if self.get_cached_external_services() is None:
+            await self.refresh_external_services()
+
+    def cancel_external_services_refresh(self):
+        """Stop background refreshes (on disconnect). The cache is kept until it expires."""
+        self._init_external_services_cache()
+        if self._external_services_timer is not None:
+            self._external_services_timer.cancel()
+            self._external_services_timer = None
+
+    async def _refresh_external_services(self) -> List[Dict]:
+        """Live query + cache update + next background refresh."""
+        start = time.monotonic()
+        try:
+            services = await self._query_external_services()
+        except IqError as e:
+            if e.condition not in ('feature-not-implemented', 'service-unavailable'):
+                self.logger.warning(f"Failed to refresh external services: {e}")
+                cached = self.get_cached_external_services()
+                return cached if cached is not None else []
+            # Not supported - remember that too, so calls don't ask every time
+            self.logger.info("Server does not support XEP-0215 (External Service Discovery)")
+            services = []
+        except Exception as e:
+            self.logger.warning(f"Failed to refresh external services: {e}")
+            cached = self.get_cached_external_services()
+            return cached if cached is not None else []
+
+        now = time.monotonic()
+        ttl = EXTERNAL_SERVICES_DEFAULT_TTL
+        wall_now = time.time()
+        for service in services:
+            expires = parse_expires(service['expires']) if service.get('expires') else None
+            if expires is not None:
+                ttl = min(ttl, expires - wall_now)
+
+        self.external_services_cache = {
+            'services': services,
+            'fetched_at': now,
+            'expires_at': now + max(ttl, 0),
+            'query_ms': (now - start) * 1000,
+        }
+        self.logger.debug(f"Cached {len(services)} external service(s) for {ttl:.0f}s")
+        self._schedule_external_services_refresh(ttl)
+        return services
+
+    def _schedule_external_services_refresh(self, ttl: float):
+        """
+        Refresh in the background shortly before the cached credentials expire.
+
+        Credentials that arrive already (nearly) expired - usually clock skew
+        between us and the server - would otherwise be re-queried every
+        EXTERNAL_SERVICES_MIN_REFRESH seconds forever; consecutive ones back
+        off exponentially up to EXTERNAL_SERVICES_MAX_BACKOFF. They are never
+        served from the cache meanwhile (calls fall back to a live query).
+        """
+        self.cancel_external_services_refresh()
+        delay = ttl - EXTERNAL_SERVICES_REFRESH_AHEAD
+        if delay < EXTERNAL_SERVICES_MIN_REFRESH:
+            backoff = 2 ** min(self._external_services_short_refreshes, 16)
+            delay = min(EXTERNAL_SERVICES_MIN_REFRESH * backoff, EXTERNAL_SERVICES_MAX_BACKOFF)
+            self._external_services_short_refreshes += 1
+            self.logger.debug(f"External services expire in {ttl:.0f}s (clock skew?), "
+                              f"next refresh in {delay:.0f}s")
+        else:
+            self._external_services_short_refreshes = 0
+        loop = asyncio.get_running_loop()
+        self._external_services_timer = loop.call_later(
+            delay, lambda: asyncio.ensure_future(self.refresh_external_services())
+        )
+
     async def get_external_services(self, service_type: Optional[str] = None) -> List[Dict]:
         """
         Query XMPP server for external services (STUN/TURN servers).
@@ -42,70 +224,84 @@ class ExternalServicesMixin:
             return []
 
         try:
-            from xml.etree.ElementTree import Element
+            return await self._query_external_services(service_type)
+        except Exception as e:
+            self.logger.error(f"Failed to query external services: {e}")
+            import traceback
+            self.logger.debug(traceback.format_exc())
+            return []
+
+    async def _query_external_services(self, service_type: Optional[str] = None) -> List[Dict]:
+        """
+        Send the XEP-0215 query (no caching, errors are raised).
+
+        Args:
+            service_type: Optional filter ('stun', 'turn', 'turns')
 
-            # Build XEP-0215 query
-            iq = self.make_iq_get()
-            iq['to'] = self.boundjid.domain  # Query our own server
+        Returns:
+            Service list (see get_external_services())
+        """
+        if not self.is_connected():
+            raise ConnectionError("not connected")
 
-            # Try XEP-0215 v2 first (urn:xmpp:extdisco:2)
-            services_elem = Element('{urn:xmpp:extdisco:2}services')
-            if service_type:
-                services_elem.set('type', service_type)
-            iq.append(services_elem)
+        from xml.etree.ElementTree import Element
 
-            self.logger.info(f"Querying server for external services (type={service_type})")
+        # Build XEP-0215 query
+        iq = self.make_iq_get()
+        iq['to'] = self.boundjid.domain  # Query our own server
 
-            # Send IQ and wait for response (10s timeout)
-            result = await iq.send(timeout=10)
+        # Try XEP-0215 v2 first (urn:xmpp:extdisco:2)
+        services_elem = Element('{urn:xmpp:extdisco:2}services')
+        if service_type:
+            services_elem.set('type', service_type)
+        iq.append(services_elem)
 
-            # Parse response
-            services = []
-            services_elem = result.xml.find('{urn:xmpp:extdisco:2}services')
-
-            if services_elem is None:
-                # Try XEP-0215 v1 (urn:xmpp:extdisco:1) as fallback
-                services_elem = result.xml.find('{urn:xmpp:extdisco:1}services')
-
-            if services_elem is None:
-                self.logger.info("Server does not support XEP-0215 (External Service Discovery)")
-                return []
-
-            # Parse each service entry
-            for service in services_elem:
-                service_data = {
-                    'type': service.get('type'),
-                    'host': service.get('host'),
-                    'port': int(service.get('port', 3478)),
-                }
-
-                # Optional attributes
-                if service.get('transport'):
-                    service_data['transport'] = service.get('transport')
-                if service.get('username'):
-                    service_data['username'] = service.get('username')
-                if service.get('password'):
-                    service_data['password'] = service.get('password')
-                if service.get('expires'):
-                    service_data['expires'] = service.get('expires')
+        self.logger.info(f"Querying server for external services (type={service_type})")
 
-                services.append(service_data)
+        # Send IQ and wait for response (10s timeout)
+        result = await iq.send(timeout=10)
 
-                # Log (mask password)
-                log_data = service_data.copy()
-                if 'password' in log_data:
-                    log_data['password'] = '***'
-                self.logger.debug(f"Discovered service: {log_data}")
+        # Parse response
+        services = []
+        services_elem = result.xml.find('{urn:xmpp:extdisco:2}services')
 
-            self.logger.info(f"Discovered {len(services)} external service(s)")
-            return services
+        if services_elem is None:
+            # Try XEP-0215 v1 (urn:xmpp:extdisco:1) as fallback
+            services_elem = result.xml.find('{urn:xmpp:extdisco:1}services')
 
-        except Exception as e:
-            self.logger.error(f"Failed to query external services: {e}")
-            import traceback
-            self.logger.debug(traceback.format_exc())
+        if services_elem is None:
+            self.logger.info("Server does not support XEP-0215 (External Service Discovery)")
             return []
 
+        # Parse each service entry
+        for service in services_elem:
+            service_data = {
+                'type': service.get('type'),
+                'host': service.get('host'),
+                'port': int(service.get('port', 3478)),
+            }
+
+            # Optional attributes
+            if service.get('transport'):
+                service_data['transport'] = service.get('transport')
+            if service.get('username'):
+                service_data['username'] = service.get('username')
+            if service.get('password'):
+                service_data['password'] = service.get('password')
+            if service.get('expires'):
+                service_data['expires'] = service.get('expires')
+
+            services.append(service_data)
+
+            # Log (mask password)
+            log_data = service_data.copy()
+            if 'password' in log_data:
+                log_data['password'] = '***'
+            self.logger.debug(f"Discovered service: {log_data}")
+
+        self.logger.info(f"Discovered {len(services)} external service(s)")
+        return services
+
     def format_ice_servers(self, services: List[Dict]) -> List[Dict]:
         """
         Convert XEP-0215 service list to WebRTC ICE server format.
@@ -4,12 +4,31 @@ File Upload module for DrunkXMPP.
 XEP-0363: HTTP File Upload
 
 Provides methods for uploading files and sending attachments (with optional OMEMO encryption).
+
+Slots are requested through the xep_0363 plugin, but the HTTP PUT goes through
+the account's pooled HttpClient (keep-alive, proxy) instead of the plugin's
+one-off session.
+
+Uploads are streamed from disk in fixed-size chunks (XEP-0454 files are
+encrypted chunk by chunk with AES-256-GCM, tag appended), so memory use does
+not depend on file size. Reads and encryption run in the default executor.
+Uploads report progress via an optional callback and are cancelled by
+cancelling the awaiting task.
 """
 
-from typing import Optional, Set
+import asyncio
+import os
+from typing import Optional, Set, Callable, AsyncIterator
 from slixmpp.jid import JID
 
 
+UPLOAD_CHUNK_SIZE = 256 * 1024
+GCM_TAG_SIZE = 16
+
+# progress(bytes_sent, total_bytes)
+ProgressCallback = Callable[[int, int], None]
+
+
 class FileUploadMixin:
     """
     Mixin providing file upload and attachment functionality.
@@ -18,6 +37,8 @@ class FileUploadMixin:
     - self['xep_0363']: HTTP File Upload plugin
     - self['xep_0066']: Out of Band Data plugin
     - self['xep_0380']: Explicit Message Encryption plugin
+    - self['xep_0454']: OMEMO Media Sharing plugin
+    - self.http_client: Pooled HttpClient (shared with attachment downloads)
     - self.plugin: Dict of loaded slixmpp plugins
     - self.rooms: Dict of joined rooms
     - self.omemo_enabled: Boolean indicating if OMEMO is enabled
@@ -26,13 +47,15 @@ class FileUploadMixin:
     - self.logger: Logger instance
     """
 
-    async def upload_file(self, file_path: str, content_type: Optional[str] = None) -> str:
+    async def upload_file(self, file_path: str, content_type: Optional[str] = None,
+                          progress: Optional[ProgressCallback] = None) -> str:
         """
         Upload a file using XEP-0363 (HTTP File Upload).
 
         Args:
             file_path: Path to the file to upload
             content_type: MIME type of the file (auto-detected if not provided)
+            progress: Optional callback(bytes_sent, total_bytes)
 
         Returns:
             The HTTP URL of the uploaded file
@@ -59,23 +82,186 @@ class FileUploadMixin:
 
         self.logger.info(f"Uploading file: {file_name} ({file_size} bytes, {content_type})")
 
-        # Request upload slot from server
         try:
-            slot = await self['xep_0363'].upload_file(
-                file_path,
-                domain=None,  # Auto-detect from server
-                timeout=30
-            )
+            body = self._file_body(file, file_size, progress)
+            url = await self._upload_data(file_name, body, file_size, content_type)
         except Exception as e:
             self.logger.exception(f"Failed to upload file: {e}")
             raise RuntimeError(f"File upload failed: {e}")
 
-        self.logger.info(f"File uploaded successfully: {slot}")
-        return slot
+        self.logger.info(f"File uploaded successfully: {url}")
+        return url
+
+    async def upload_encrypted_file(self, file_path: str,
+                                    progress: Optional[ProgressCallback] = None) -> str:
+        """
+        Encrypt and upload a file using XEP-0454 (OMEMO Media Sharing).
+
+        The file is encrypted while it is streamed (AES-256-GCM, random key
+        and 12 byte IV, tag appended), never held in memory as a whole. The
+        upload gets a random name (extension preserved) so the original file
+        name is not disclosed to the upload server.
+
+        Args:
+            file_path: Path to the file to upload
+            progress: Optional callback(bytes_sent, total_bytes)
+
+        Returns:
+            aesgcm:// URL (key and IV in the fragment)
+
+        Raises:
+            RuntimeError: If upload fails
+            FileNotFoundError: If file doesn't exist
+        """
+        from pathlib import Path
+        from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+
+        file = Path(file_path)
+        if not file.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        xep_0454 = self['xep_0454']
+
+        iv = os.urandom(12)
+        key = os.urandom(32)
+        encryptor = Cipher(algorithms.AES(key), modes.GCM(iv)).encryptor()
+
+        upload_name = os.urandom(12).hex()
+        if file.suffix:
+            upload_name += xep_0454.map_extensions(file.suffix)
+
+        # GCM ciphertext is as long as the plaintext, plus the tag
+        upload_size = file.stat().st_size + GCM_TAG_SIZE
+
+        try:
+            body = self._file_body(file, upload_size, progress, encryptor)
+            url = await self._upload_data(upload_name, body, upload_size, 'application/octet-stream')
+        except Exception as e:
+            self.logger.exception(f"Failed to upload encrypted file: {e}")
+            raise RuntimeError(f"File upload failed: {e}")
+
+        return xep_0454.format_url(url, iv.hex() + key.hex())
+
+    async def _file_body(self, file, total: int, progress: Optional[ProgressCallback] = None,
+                         encryptor=None) -> AsyncIterator[bytes]:
+        """
+        Stream a file as request body chunks (optionally AES-GCM encrypted).
+
+        Args:
+            file: Path of the file
+            total: Total body size in bytes (for progress)
+            progress: Optional callback(bytes_sent, total_bytes)
+            encryptor: cryptography GCM encryptor (None = plain); tag is sent last
+
+        Yields:
+            Body chunks of at most UPLOAD_CHUNK_SIZE bytes
+        """
+        loop = asyncio.get_running_loop()
+
+        def read_chunk(f) -> bytes:
+            chunk = f.read(UPLOAD_CHUNK_SIZE)
+            if encryptor is not None and chunk:
+                chunk = encryptor.update(chunk)
+            return chunk
+
+        sent = 0
+        f = await loop.run_in_executor(None, open, file, 'rb')
+        try:
+            while True:
+                chunk = await loop.run_in_executor(None, read_chunk, f)
+                if not chunk:
+                    break
+                yield chunk
+                sent += len(chunk)
+                if progress:
+                    progress(sent, total)
+        finally:
+            f.close()
+
+        if encryptor is not None:
+            encryptor.finalize()
+            yield encryptor.tag
+            sent += GCM_TAG_SIZE
+            if progress:
+                progress(sent, total)
+
+        if sent != total:
+            # File changed while uploading - server would reject/truncate it
+            raise RuntimeError(f"File size changed during upload ({sent} != {total} bytes)")
+
+    async def _request_upload_slot(self, file_name: str, size: int, content_type: str):
+        """
+        Discover the upload service (cached by the plugin) and request a slot.
+
+        Args:
+            file_name: Name announced to the server
+            size: Upload size in bytes
+            content_type: MIME type
+
+        Returns:
+            http_upload_slot stanza (put URL/headers, get URL)
+
+        Raises:
+            RuntimeError: No upload service, or file above the server limit
+        """
+        xep_0363 = self['xep_0363']
+
+        if xep_0363.upload_service is None:
+            info_iq = await xep_0363.find_upload_service(timeout=30)
+            if info_iq is None:
+                raise RuntimeError("No HTTP upload service found")
+            xep_0363.upload_service = info_iq['from']
+            for form in info_iq['disco_info'].iterables:
+                values = form['values']
+                if values['FORM_TYPE'] == ['urn:xmpp:http:upload:0']:
+                    try:
+                        xep_0363.max_file_size = int(values['max-file-size'])
+                    except (TypeError, ValueError):
+                        xep_0363.max_file_size = float('+inf')
+                    break
+
+        if size > xep_0363.max_file_size:
+            raise RuntimeError(f"File too big ({size} bytes, server limit {xep_0363.max_file_size})")
+
+        slot_iq = await xep_0363.request_slot(xep_0363.upload_service, file_name, size,
+                                              content_type, timeout=30)
+        return slot_iq['http_upload_slot']
+
+    async def _upload_data(self, file_name: str, data, size: int, content_type: str) -> str:
+        """
+        Request a slot and PUT the data through the pooled HTTP session.
+
+        Args:
+            file_name: Name announced to the server
+            data: bytes, file object or async iterable of bytes (aiohttp request body)
+            size: Body size in bytes (sent as Content-Length, so the body isn't chunk-encoded)
+            content_type: MIME type
+
+        Returns:
+            GET URL of the uploaded file
+
+        Raises:
+            RuntimeError: Slot request or PUT failed
+        """
+        slot = await self._request_upload_slot(file_name, size, content_type)
+
+        headers = {
+            'Content-Length': str(size),
+            'Content-Type': content_type,
+            **{header['name']: header['value'] for header in slot['put']['headers']},
+        }
+
+        async with self.http_client.session.put(slot['put']['url'], data=data, headers=headers) as response:
+            if response.status >= 400:
+                raise RuntimeError(f"HTTP {response.status}: {await response.text()}")
+            self.logger.debug(f"Upload response code: {response.status}")
+
+        return slot['get']['url']
 
     async def send_attachment_to_muc(self, room_jid: str, file_path: str,
                                      caption: Optional[str] = None,
-                                     content_type: Optional[str] = None) -> str:
+                                     content_type: Optional[str] = None,
+                                     progress: Optional[ProgressCallback] = None) -> str:
         """
         Upload and send a file attachment to a MUC room.
 
@@ -84,6 +270,7 @@ class FileUploadMixin:
             file_path: Path to the file to send
             caption: Optional caption/message to accompany the file
             content_type: MIME type of the file (auto-detected if not provided)
+            progress: Optional upload progress callback(bytes_sent, total_bytes)
 
         Returns:
             Message ID (origin_id for tracking/deduplication)
@@ -103,7 +290,7 @@ class FileUploadMixin:
             raise RuntimeError(f"Not joined to {room_jid}")
 
         # Upload the file first
-        url = await self.upload_file(file_path, content_type)
+        url = await self.upload_file(file_path, content_type, progress=progress)
 
         # Build message with OOB data for inline display
         from pathlib import Path
@@ -134,7 +321,8 @@ class FileUploadMixin:
 
     async def send_encrypted_attachment_to_muc(self, room_jid: str, file_path: str,
                                                caption: Optional[str] = None,
-                                               content_type: Optional[str] = None) -> str:
+                                               content_type: Optional[str] = None,
+                                               progress: Optional[ProgressCallback] = None) -> str:
         """
         Upload and send an OMEMO-encrypted file to a MUC room using XEP-0454.
         File is encrypted locally, uploaded, and sent as aesgcm:// URL in OMEMO message.
@@ -144,6 +332,7 @@ class FileUploadMixin:
             file_path: Path to the file to send
             caption: Optional caption/message to accompany the file
             content_type: MIME type (ignored, XEP-0454 uses application/octet-stream)
+            progress: Optional upload progress callback(bytes_sent, total_bytes)
 
         Returns:
             Message ID (origin_id for tracking/deduplication)
@@ -182,14 +371,8 @@ class FileUploadMixin:
         file_name = file.name
         self.logger.info(f"Encrypting and sending file to MUC {room_jid}: {file_name}")
 
-        # Use XEP-0454 plugin's upload_file method
-        # This properly handles encryption, random filename with preserved extension,
-        # upload, and aesgcm:// URL generation
-        xep_0454 = self['xep_0454']
-        aesgcm_url = await xep_0454.upload_file(
-            filename=file,
-            content_type='application/octet-stream'
-        )
+        # Encrypt, upload under a random name (extension preserved), build aesgcm:// URL
+        aesgcm_url = await self.upload_encrypted_file(file, progress=progress)
 
         self.logger.debug(f"File encrypted and uploaded: {aesgcm_url[:60]}...")
 
@@ -261,7 +444,8 @@ class FileUploadMixin:
 
     async def send_attachment_to_user(self, jid: str, file_path: str,
                                       caption: Optional[str] = None,
-                                      content_type: Optional[str] = None) -> str:
+                                      content_type: Optional[str] = None,
+                                      progress: Optional[ProgressCallback] = None) -> str:
         """
         Upload and send a file attachment to a user via private message.
 
@@ -270,6 +454,7 @@ class FileUploadMixin:
             file_path: Path to the file to send
             caption: Optional caption/message to accompany the file
             content_type: MIME type of the file (auto-detected if not provided)
+            progress: Optional upload progress callback(bytes_sent, total_bytes)
 
         Returns:
             Message ID (origin_id for tracking/deduplication)
@@ -278,7 +463,7 @@ class FileUploadMixin:
             RuntimeError: If upload fails
         """
         # Upload the file first
-        url = await self.upload_file(file_path, content_type)
+        url = await self.upload_file(file_path, content_type, progress=progress)
 
         # Build message with OOB data for inline display
         from pathlib import Path
@@ -305,7 +490,8 @@ class FileUploadMixin:
         return msg['id']
 
     async def send_encrypted_file(self, jid: str, file_path: str,
-                                   caption: Optional[str] = None) -> str:
+                                   caption: Optional[str] = None,
+                                   progress: Optional[ProgressCallback] = None) -> str:
         """
         Send an OMEMO-encrypted file using XEP-0454 (OMEMO Media Sharing).
         File is encrypted locally, uploaded, and sent as aesgcm:// URL in OMEMO message.
@@ -314,6 +500,7 @@ class FileUploadMixin:
             jid: User JID
             file_path: Path to the file to send
             caption: Optional caption/message to accompany the file
+            progress: Optional upload progress callback(bytes_sent, total_bytes)
 
         Returns:
             Message ID (origin_id for tracking/deduplication)
@@ -332,14 +519,8 @@ class FileUploadMixin:
         file_name = file.name
         self.logger.info(f"Encrypting and sending file to {jid}: {file_name}")
 
-        # Use XEP-0454 plugin's upload_file method
-        # This properly handles encryption, random filename with preserved extension,
-        # upload, and aesgcm:// URL generation
-        xep_0454 = self['xep_0454']
-        aesgcm_url = await xep_0454.upload_file(
-            filename=file,
-            content_type='application/octet-stream'
-        )
+        # Encrypt, upload under a random name (extension preserved), build aesgcm:// URL
+        aesgcm_url = await self.upload_encrypted_file(file, progress=progress)
 
         self.logger.debug(f"File encrypted and uploaded: {aesgcm_url[:60]}...")
 
@@ -358,7 +539,8 @@ class FileUploadMixin:
 
     async def send_encrypted_attachment_to_user(self, jid: str, file_path: str,
                                                 caption: Optional[str] = None,
-                                                content_type: Optional[str] = None) -> str:
+                                                content_type: Optional[str] = None,
+                                                progress: Optional[ProgressCallback] = None) -> str:
         """
         Upload and send an OMEMO-encrypted file attachment reference to a user.
         The file itself is uploaded via HTTP, but the message with the URL is encrypted.
@@ -368,6 +550,7 @@ class FileUploadMixin:
             file_path: Path to the file to send
             caption: Optional caption/message to accompany the file
             content_type: MIME type of the file (auto-detected if not provided)
+            progress: Optional upload progress callback(bytes_sent, total_bytes)
 
         Returns:
             Message ID (origin_id for tracking/deduplication)
@@ -388,7 +571,7 @@ class FileUploadMixin:
                 raise RuntimeError("OMEMO initialization timeout")
 
         # Upload the file first
-        url = await self.upload_file(file_path, content_type)
+        url = await self.upload_file(file_path, content_type, progress=progress)
 
         # Build message with OOB data for inline display
         from pathlib import Path
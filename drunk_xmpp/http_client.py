@@ -0,0 +1,104 @@
+"""
+Pooled HTTP client for DrunkXMPP.
+
+One long-lived aiohttp session per account, shared by XEP-0363 uploads
+(FileUploadMixin) and attachment downloads:
+- Keep-alive connection pooling: repeated transfers to the same upload host
+  skip the TCP/TLS/proxy handshakes
+- Connection limits (total and per host)
+- DNS cache
+- Same SOCKS5/HTTP proxy as the XMPP stream (requires aiohttp-socks)
+
+The session is created lazily inside the running event loop, and recreated
+if it was closed.
+"""
+
+import logging
+from typing import Optional
+
+import aiohttp
+
+
+# Pool sizing: a handful of parallel transfers, few upload/download hosts
+POOL_LIMIT = 16
+POOL_LIMIT_PER_HOST = 4
+DNS_CACHE_TTL = 300         # seconds
+KEEPALIVE_TIMEOUT = 60      # seconds an idle connection is kept
+
+# No total timeout (large files), but don't hang on dead connections
+CONNECT_TIMEOUT = 30
+READ_TIMEOUT = 60
+
+
+class HttpClient:
+    """Per-account pooled aiohttp session routed through the account proxy."""
+
+    def __init__(self, proxy_url: Optional[str] = None, user_agent: Optional[str] = None,
+                 limit: int = POOL_LIMIT, limit_per_host: int = POOL_LIMIT_PER_HOST,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Initialize HTTP client (no session is opened yet).
+
+        Args:
+            proxy_url: Proxy URL as used for the XMPP stream
+                       ('socks5://[user:pass@]host:port' or 'http://...'), None = direct
+            user_agent: User-Agent header for all requests
+            limit: Maximum simultaneous connections
+            limit_per_host: Maximum simultaneous connections per host
+            logger: Logger instance
+        """
+        self.proxy_url = proxy_url
+        self.user_agent = user_agent
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.logger = logger or logging.getLogger(__name__)
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _make_connector(self) -> aiohttp.TCPConnector:
+        """Build the pooled connector (proxy connector if a proxy is configured)."""
+        kwargs = {
+            'limit': self.limit,
+            'limit_per_host': self.limit_per_host,
+            'ttl_dns_cache': DNS_CACHE_TTL,
+            'keepalive_timeout': KEEPALIVE_TIMEOUT,
+        }
+
+        if not self.proxy_url:
+            return aiohttp.TCPConnector(**kwargs)
+
+        try:
+            from aiohttp_socks import ProxyConnector
+        except ImportError:
+            # Never fall back to a direct connection - that would leak the user's IP
+            self.logger.error(
+                "Proxy configured but aiohttp-socks library not installed. "
+                "Install with: pip install aiohttp-socks"
+            )
+            raise ImportError("aiohttp-socks library required for HTTP transfers through a proxy")
+
+        # rdns: let the proxy resolve hostnames (no DNS leaks, works with .onion)
+        return ProxyConnector.from_url(self.proxy_url, rdns=True, **kwargs)
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Shared session (must be used from within the event loop)."""
+        if self._session is None or self._session.closed:
+            headers = {'User-Agent': self.user_agent} if self.user_agent else None
+            self._session = aiohttp.ClientSession(
+                connector=self._make_connector(),
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=CONNECT_TIMEOUT,
+                                              sock_read=READ_TIMEOUT),
+            )
+            self.logger.debug(
+                f"HTTP session created (proxy={'yes' if self.proxy_url else 'no'}, "
+                f"limit={self.limit}, per_host={self.limit_per_host})"
+            )
+        return self._session
+
+    async def close(self):
+        """Close the session and its pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+            self.logger.debug("HTTP session closed")
+        self._session = None
@@ -6,7 +6,7 @@ XEP-0313: Message Archive Management
 Provides methods for retrieving message history from the server archive.
 """
 
-from typing import List, Dict, Optional, AsyncGenerator
+from typing import List, Dict, Optional, AsyncGenerator, Set
 from datetime import datetime
 from slixmpp.jid import JID
 from slixmpp.exceptions import IqError, IqTimeout
@@ -246,6 +246,67 @@ class MAMMixin:
             self.logger.exception(f"Failed to retrieve MAM history: {e}")
             raise
 
+    async def retrieve_archived_ids(
+        self,
+        jid: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        with_jid: Optional[str] = None
+    ) -> Set[str]:
+        """
+        Collect message IDs (stanza id and XEP-0359 origin-id) archived in a time range.
+
+        Lightweight variant of retrieve_history() for deduplication: no OMEMO
+        decryption, no filtering, no pacing between pages.
+
+        Args:
+            jid: Room JID (for MUC archive) or user JID (for 1-to-1, queries own archive)
+            start: Optional start datetime for the range
+            end: Optional end datetime for the range
+            with_jid: Optional filter - only messages with this JID (for 1-to-1 archive queries)
+
+        Returns:
+            Set of message IDs found in the archive
+
+        Raises:
+            RuntimeError: If MAM is not supported or the query failed
+        """
+        is_muc = jid in self.rooms
+        query_jid = JID(jid) if is_muc else None
+        ids: Set[str] = set()
+
+        try:
+            async for result_msg in self.plugin['xep_0313'].iterate(
+                jid=query_jid,
+                start=start,
+                end=end,
+                with_jid=JID(with_jid) if with_jid else None,
+                rsm={'max': 100}
+            ):
+                forwarded = result_msg['mam_result']['forwarded']
+                archived_msg = forwarded['stanza'] if forwarded is not None else None
+                if archived_msg is None:
+                    continue
+
+                if archived_msg.get('id'):
+                    ids.add(archived_msg['id'])
+                try:
+                    if archived_msg['origin_id']['id']:
+                        ids.add(archived_msg['origin_id']['id'])
+                except (KeyError, TypeError):
+                    pass
+
+        except IqError as e:
+            error_condition = e.iq['error']['condition']
+            if error_condition == 'feature-not-implemented':
+                raise RuntimeError(f"MAM not supported by {jid}")
+            raise RuntimeError(f"MAM query failed: {error_condition}")
+        except IqTimeout:
+            raise RuntimeError("MAM query timeout")
+
+        self.logger.debug(f"Found {len(ids)} archived message IDs for {jid} ({start} - {end})")
+        return ids
+
     async def check_mam_support(self, jid: str) -> bool:
         """
         Check if a JID supports Message Archive Management (MAM).
@@ -0,0 +1,268 @@
+"""
+MUC occupant rosters (XEP-0045) with coalesced change notifications.
+
+DrunkXMPP feeds every occupant presence into MucRosterTracker. Each room
+keeps its occupants by nick and an incrementally maintained head count, and
+reports only what actually changed (join, leave, role, affiliation, real JID,
+nick change). Changes are collected per room for MUC_ROSTER_COALESCE seconds
+and delivered as one {nick: Occupant or None} dict, so views apply a delta
+once per window instead of polling and rebuilding the whole list. Presences
+that change nothing (status/show updates, duplicates) cost no notification.
+
+Joining a room delivers every occupant's presence before our own
+self-presence (status 110). While a room is joining, occupants are applied
+to the roster silently and handed over as one bulk change when joined() is
+called at that boundary (or after MUC_JOIN_TIMEOUT if it never arrives).
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+
+logger = logging.getLogger('drunk_xmpp.muc_roster')
+
+# Window for collecting occupant changes of a room into one notification (seconds)
+MUC_ROSTER_COALESCE = 0.25
+
+# Deliver a join's buffered occupants after this long without self-presence (seconds)
+MUC_JOIN_TIMEOUT = 30.0
+
+# XEP-0045 status code: nickname change (on the unavailable presence of the old nick)
+STATUS_NICK_CHANGE = 303
+
+
+@dataclass(frozen=True)
+class Occupant:
+    """One room occupant as announced by presence."""
+    nick: str
+    jid: Optional[str]  # Real bare JID (None if the room hides it)
+    role: str  # moderator, participant, visitor, none
+    affiliation: str  # owner, admin, member, outcast, none
+
+
+class RoomRoster:
+    """
+    Occupants of one room.
+
+    The head count deduplicates by real JID (one person joined with several
+    nicks or clients counts once) and counts anonymous occupants individually.
+    """
+
+    def __init__(self):
+        self.occupants: Dict[str, Occupant] = {}
+        self._jid_nicks: Dict[str, int] = {}  # bare JID -> number of nicks
+        self._anonymous = 0
+
+    @property
+    def count(self) -> int:
+        """Number of distinct participants."""
+        return len(self._jid_nicks) + self._anonymous
+
+    def set(self, occupant: Occupant) -> bool:
+        """
+        Add or update an occupant.
+
+        Returns:
+            True if anything changed
+        """
+        old = self.occupants.get(occupant.nick)
+        if old == occupant:
+            return False
+        if old is not None:
+            self._uncount(old)
+        self.occupants[occupant.nick] = occupant
+        if occupant.jid:
+            self._jid_nicks[occupant.jid] = self._jid_nicks.get(occupant.jid, 0) + 1
+        else:
+            self._anonymous += 1
+        return True
+
+    def remove(self, nick: str) -> bool:
+        """
+        Remove an occupant.
+
+        Returns:
+            True if the nick was present
+        """
+        old = self.occupants.pop(nick, None)
+        if old is None:
+            return False
+        self._uncount(old)
+        return True
+
+    def _uncount(self, occupant: Occupant):
+        if occupant.jid:
+            remaining = self._jid_nicks[occupant.jid] - 1
+            if remaining:
+                self._jid_nicks[occupant.jid] = remaining
+            else:
+                del self._jid_nicks[occupant.jid]
+        else:
+            self._anonymous -= 1
+
+
+class MucRosterTracker:
+    """
+    Per-room rosters fed from presence, with coalesced change callbacks.
+
+    on_changes(room_jid, {nick: Occupant or None}) is called at most once per
+    room per coalescing window; None means the nick left (or was renamed).
+    A room seen for the first time is joining: its changes are held until
+    joined() and then delivered in a single call.
+    """
+
+    def __init__(self, on_changes: Optional[Callable[[str, Dict[str, Optional[Occupant]]], None]] = None,
+                 coalesce: float = MUC_ROSTER_COALESCE, buffer_joins: bool = True):
+        """
+        Initialize tracker.
+
+        Args:
+            on_changes: Callback for a room's coalesced changes
+            coalesce: Collection window in seconds (0 = next loop iteration)
+            buffer_joins: Hold a joining room's occupants until joined()
+        """
+        self.on_changes = on_changes
+        self.coalesce = coalesce
+        self.buffer_joins = buffer_joins
+        self.rooms: Dict[str, RoomRoster] = {}
+        self._pending: Dict[str, Dict[str, Optional[Occupant]]] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._joining: Dict[str, Optional[asyncio.TimerHandle]] = {}  # room -> join timeout
+        # presences fed, presences that changed the roster, callbacks made
+        self.stats = {'presences': 0, 'changes': 0, 'flushes': 0}
+
+    def is_joining(self, room_jid: str) -> bool:
+        """True while a room's initial occupant presences are being buffered."""
+        return room_jid in self._joining
+
+    def get(self, room_jid: str) -> Optional[RoomRoster]:
+        """Get a room's roster (None if no occupant presence seen yet)."""
+        return self.rooms.get(room_jid)
+
+    def on_presence(self, room_jid: str, nick: str, available: bool, jid: Optional[str] = None,
+                    role: str = 'participant', affiliation: str = 'none',
+                    status_codes=(), new_nick: Optional[str] = None):
+        """
+        Apply one occupant presence.
+
+        Args:
+            room_jid: Room bare JID
+            nick: Occupant nick (presence 'from' resource)
+            available: False for type='unavailable'
+            jid: Real JID from the muc#user item, if disclosed
+            role: Item role
+            affiliation: Item affiliation
+            status_codes: muc#user status codes
+            new_nick: Item nick (new nick on a 303 nick change)
+        """
+        self.stats['presences'] += 1
+        roster = self.rooms.get(room_jid)
+        if roster is None:
+            roster = self.rooms[room_jid] = RoomRoster()
+            if self.buffer_joins:
+                self._start_join(room_jid)
+        changes = {}
+
+        if available:
+            occupant = Occupant(nick=nick, jid=jid.split('/')[0] if jid else None,
+                                role=role or 'participant', affiliation=affiliation or 'none')
+            if roster.set(occupant):
+                changes[nick] = occupant
+        else:
+            old = roster.occupants.get(nick)
+            if roster.remove(nick):
+                changes[nick] = None
+                # Nick change: the new nick's available presence follows; keep it
+                # in the same batch so views rename instead of flickering
+                if STATUS_NICK_CHANGE in status_codes and new_nick and old is not None:
+                    renamed = Occupant(nick=new_nick, jid=old.jid, role=old.role,
+                                       affiliation=old.affiliation)
+                    if roster.set(renamed):
+                        changes[new_nick] = renamed
+
+        if changes:
+            self.stats['changes'] += 1
+            self._queue(room_jid, changes)
+
+    def joined(self, room_jid: str):
+        """
+        Mark the end of a room's initial join (our self-presence arrived).
+
+        Delivers the buffered occupants at once instead of waiting for the
+        coalescing window; later changes are coalesced as usual.
+
+        Args:
+            room_jid: Room bare JID
+        """
+        if room_jid not in self._joining:
+            return
+        timer = self._joining.pop(room_jid)
+        if timer:
+            timer.cancel()
+        roster = self.rooms.get(room_jid)
+        logger.debug("Joined %s with %d occupants", room_jid, len(roster.occupants) if roster else 0)
+        self.flush(room_jid)
+
+    def room_left(self, room_jid: str):
+        """Forget a room we left or were removed from (everyone leaves)."""
+        roster = self.rooms.pop(room_jid, None)
+        if room_jid in self._joining:
+            # Join never completed: nobody was reported, nothing to retract
+            timer = self._joining.pop(room_jid)
+            if timer:
+                timer.cancel()
+            self._pending.pop(room_jid, None)
+            return
+        if roster and roster.occupants:
+            self._queue(room_jid, {nick: None for nick in roster.occupants})
+
+    def flush(self, room_jid: Optional[str] = None):
+        """
+        Deliver pending changes now.
+
+        Args:
+            room_jid: Room to flush (default: all rooms)
+        """
+        for room in [room_jid] if room_jid else list(self._pending):
+            timer = self._timers.pop(room, None)
+            if timer:
+                timer.cancel()
+            changes = self._pending.pop(room, None)
+            if changes and self.on_changes:
+                self.stats['flushes'] += 1
+                try:
+                    self.on_changes(room, changes)
+                except Exception as e:
+                    logger.error(f"Error in MUC roster change callback for {room}: {e}")
+
+    def cancel(self):
+        """Drop pending notifications (disconnect)."""
+        for timer in list(self._timers.values()) + list(self._joining.values()):
+            if timer:
+                timer.cancel()
+        self._timers.clear()
+        self._joining.clear()
+        self._pending.clear()
+
+    def _start_join(self, room_jid: str):
+        """Buffer a room's changes until joined() (or the join timeout)."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._joining[room_jid] = None  # No loop: wait for joined()
+            return
+        self._joining[room_jid] = loop.call_later(MUC_JOIN_TIMEOUT, self.joined, room_jid)
+
+    def _queue(self, room_jid: str, changes: Dict[str, Optional[Occupant]]):
+        """Merge changes into the room's pending batch (last state per nick wins)."""
+        self._pending.setdefault(room_jid, {}).update(changes)
+        if room_jid in self._timers or room_jid in self._joining:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush(room_jid)  # No loop (tests, shutdown): deliver right away
+            return
+        self._timers[room_jid] = loop.call_later(self.coalesce, self.flush, room_jid)
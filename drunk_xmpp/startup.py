@@ -0,0 +1,94 @@
+"""
+Session start pipeline for DrunkXMPP.
+
+Runs the post-login steps (carbons, presence, roster, bookmarks, room joins,
+MAM catch-up, ...) as a small dependency graph instead of one after another:
+- Every step starts as soon as the steps it depends on have finished, so
+  independent IQs are in flight at the same time (one round trip instead of
+  one per step - matters a lot over Tor)
+- A failing step is logged and doesn't stop the others; dependents still run
+- Per-step timings are logged, plus the total time from session start
+
+Usage:
+    pipeline = StartupPipeline('session start', logger)
+    pipeline.add('carbons', enable_carbons)
+    pipeline.add('presence', send_presence, after=('carbons',))
+    pipeline.add('roster', get_roster)
+    timings = await pipeline.run()
+"""
+
+import asyncio
+import logging
+import time
+from typing import Callable, Awaitable, Dict, Iterable, Optional
+
+
+class StartupPipeline:
+    """Dependency-aware runner for session start steps."""
+
+    def __init__(self, name: str, logger: Optional[logging.Logger] = None):
+        """
+        Initialize pipeline.
+
+        Args:
+            name: Pipeline name (for log messages)
+            logger: Logger instance
+        """
+        self.name = name
+        self.logger = logger or logging.getLogger(__name__)
+        self._steps: Dict[str, tuple] = {}
+
+    def add(self, name: str, func: Callable[[], Awaitable], after: Iterable[str] = ()):
+        """
+        Add a step.
+
+        Args:
+            name: Unique step name
+            func: Coroutine function (no arguments) performing the step
+            after: Names of steps that must finish before this one starts. Only
+                   steps added earlier count (unknown names are ignored, so
+                   optional steps can be left out, and cycles are impossible)
+        """
+        if name in self._steps:
+            raise ValueError(f"Duplicate startup step: {name}")
+        self._steps[name] = (func, tuple(dep for dep in after if dep in self._steps))
+
+    async def run(self) -> Dict[str, float]:
+        """
+        Run all steps, each as soon as its dependencies are done.
+
+        Returns:
+            Dict {step name: duration in seconds}
+        """
+        start = time.monotonic()
+        timings: Dict[str, float] = {}
+        done: Dict[str, asyncio.Event] = {name: asyncio.Event() for name in self._steps}
+
+        async def run_step(name: str, func, after):
+            for dependency in after:
+                await done[dependency].wait()
+
+            step_start = time.monotonic()
+            try:
+                await func()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"[{self.name}] step '{name}' failed: {e}")
+            finally:
+                timings[name] = time.monotonic() - step_start
+                done[name].set()
+
+            self.logger.debug(
+                f"[{self.name}] {name}: {timings[name]:.3f}s "
+                f"(started at +{step_start - start:.3f}s)"
+            )
+
+        await asyncio.gather(*(
+            run_step(name, func, after) for name, (func, after) in self._steps.items()
+        ))
+
+        total = time.monotonic() - start
+        summary = ', '.join(f"{name} {seconds:.2f}s" for name, seconds in timings.items())
+        self.logger.info(f"[{self.name}] finished in {total:.2f}s ({summary})")
+        return timings
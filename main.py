@@ -7,9 +7,13 @@ Main entry point for the application.
 
 import sys
 import os
+import time
 import argparse
 from pathlib import Path
 
+# Process start reference for --profile-startup (before any heavy import)
+PROCESS_START = time.perf_counter()
+
 # Add project root to path for drunk-xmpp.py import
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -40,6 +44,11 @@ def parse_args():
         action='store_true',
         help='Use ~/.siproxylin directory for all data (default for AppImage)'
     )
+    parser.add_argument(
+        '--profile-startup',
+        action='store_true',
+        help='Log a timeline of startup phases (also printed to stderr)'
+    )
     return parser.parse_args()
 
 
@@ -61,11 +70,16 @@ def main():
     import qasync
     import asyncio
 
-    from siproxylin.utils import setup_main_logger, get_paths
+    from siproxylin.utils import setup_main_logger, get_paths, get_startup_profiler
     from siproxylin.db.database import get_db
     from siproxylin.gui.main_window import MainWindow
     from siproxylin.core import get_account_manager
 
+    profiler = get_startup_profiler()
+    if args.profile_startup:
+        profiler.enable(start=PROCESS_START)
+    profiler.mark('imports')
+
     # Get paths first (needed for config loading)
     paths = get_paths(args.profile)
 
@@ -143,22 +157,24 @@ def main():
     logger.info(f"Log dir: {paths.log_dir}")
     logger.info(f"Database: {paths.database_path}")
 
-    # Auto-fix audio card profiles (Linux only)
-    # Switches USB audio cards to duplex profiles so both mic and speakers are available
-    from siproxylin.utils.audio_profiles import fix_audio_card_profiles
-    fix_audio_card_profiles()
+    profiler.mark('logging')
+
+    # Audio card profile fix (pactl) and the call service start in the background
+    # once the window is shown - see MainWindow.start_background_services()
 
     # Initialize database
     logger.info("Initializing database...")
     try:
         db = get_db()
-        db.initialize()  # Run schema creation + migrations (blocking)
+        # Schema creation + migrations (blocking); maintenance runs after first paint
+        db.initialize(maintenance=False)
         logger.info("Database initialized successfully")
     except RuntimeError as e:
         logger.error(f"Failed to initialize database: {e}")
         print(f"\nERROR: {e}")
         print("Please close the other instance before starting a new one.\n")
         return 1
+    profiler.mark('database')
 
     # Initialize account manager (but don't load accounts yet - need asyncio loop first)
     logger.info("Initializing account manager...")
@@ -190,11 +206,18 @@ def main():
     loop = qasync.QEventLoop(app)
     asyncio.set_event_loop(loop)
     logger.info("Asyncio event loop integrated with Qt")
+    profiler.mark('qt application')
 
     # Create and show main window
     logger.info("Creating main window...")
     window = MainWindow()
+    profiler.mark('main window')
+
+    # Cached chat list first (DB only) - accounts connect after the first frame
+    window.contact_list.load_roster()
     window.show()
+    app.processEvents()
+    profiler.mark('first paint')
 
     # Setup signal handlers for graceful shutdown (Ctrl+C, SIGTERM)
     import signal
@@ -209,16 +232,28 @@ def main():
     signal.signal(signal.SIGTERM, handle_exit_signal)
     logger.info("Signal handlers registered (SIGINT, SIGTERM)")
 
-    # Now that asyncio loop is set, load and connect accounts
-    logger.info("Loading accounts...")
-    account_manager.load_accounts()
-    logger.info(f"Loaded {len(account_manager.accounts)} accounts")
+    async def deferred_startup():
+        """Everything not needed for the first frame, once the loop is running."""
+        # Maintenance must finish before accounts connect (fails interrupted transfers)
+        db.run_maintenance()
+        profiler.mark('database maintenance')
 
-    # Setup account indicators in GUI
-    window.setup_accounts()
+        logger.info("Loading accounts...")
+        account_manager.load_accounts()
+        logger.info(f"Loaded {len(account_manager.accounts)} accounts")
 
-    logger.info("Application ready!")
-    logger.info("=" * 60)
+        # Setup account indicators in GUI
+        window.setup_accounts()
+        profiler.mark('accounts')
+
+        logger.info("Application ready!")
+        logger.info("=" * 60)
+
+        await window.start_background_services()
+        profiler.report()
+
+    # Use ensure_future - works with set but not-yet-running loop
+    asyncio.ensure_future(deferred_startup())
 
     # Run application (qasync integrates asyncio with Qt's event loop)
     with loop:
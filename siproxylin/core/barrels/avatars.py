@@ -3,13 +3,34 @@ AvatarBarrel - Handles avatar fetching and storage.
 
 Responsibilities:
 - Avatar fetching (XEP-0153, XEP-0084)
-- Avatar storage to database
+- Avatar storage (bytes in the on-disk avatar store, hash in database)
 - Avatar caching and throttling
+- Hash-driven sync: only avatars whose advertised hash (XEP-0153 presence
+  photo, XEP-0084 metadata notification) differs from the stored one are
+  fetched, through a bounded-concurrency queue with retry/backoff
+- Probe markers: contacts found to publish no avatar get a contact_avatar
+  row with type -1 and an empty hash, so they are not probed again after
+  a reconnect or restart (a later presence/PEP hash still triggers a fetch)
 """
 
+import asyncio
 import logging
 import time
-from typing import Optional
+from typing import Optional, Dict, Set, Tuple
+
+from ...utils.avatar_store import get_avatar_store
+
+
+# Fetch queue tuning
+MAX_CONCURRENT_FETCHES = 4      # Parallel PEP/vCard round trips
+MAX_FETCH_ATTEMPTS = 3          # Attempts per advertised hash
+RETRY_BASE_DELAY = 2.0          # Seconds, doubled after each failed attempt
+
+# contact_avatar.type of the "probed, no avatar published" marker (hash '')
+AVATAR_TYPE_NONE = -1
+
+# In-memory only: advertised hash that didn't match the served avatar
+_ADVERTISED_MISMATCH = -2
 
 
 class AvatarBarrel:
@@ -35,6 +56,17 @@ class AvatarBarrel:
         # Throttle avatar fetches (once per minute max)
         self._last_avatar_fetch = 0
 
+        # Stored hashes: jid -> {type: hash} (loaded lazily from contact_avatar)
+        self._stored_hashes: Optional[Dict[str, Dict[int, str]]] = None
+
+        # Probes started this session (persisted as markers once answered)
+        self._probed_jids: Set[str] = set()
+
+        # Fetch queue: jid -> (expected_hash, source); queue holds JIDs in order
+        self._queued: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._fetch_queue: Optional[asyncio.Queue] = None
+        self._workers = []
+
     async def on_avatar_update(self, jid: str, avatar_data: dict):
         """
         Handle avatar update from DrunkXMPP (XEP-0084/0153).
@@ -64,12 +96,15 @@ class AvatarBarrel:
 
     def store_avatar(self, jid: str, avatar_data: dict):
         """
-        Store avatar in database.
+        Store avatar: image bytes go to the avatar store (deduplicated by
+        SHA-1), the database only keeps the hash.
 
         Args:
             jid: Bare JID
             avatar_data: Dict with 'data', 'hash', 'mime_type', 'source'
         """
+        avatar_hash = get_avatar_store().put(avatar_data['data'])
+
         # Get or create JID entry
         jid_row = self.db.fetchone("SELECT id FROM jid WHERE bare_jid = ?", (jid,))
         if jid_row:
@@ -81,31 +116,215 @@ class AvatarBarrel:
         # Determine avatar type: 0=vCard, 1=PEP
         avatar_type = 1 if avatar_data.get('source') == 'xep_0084' else 0
 
-        # Store avatar (REPLACE on conflict to update)
+        # Store avatar reference (update on conflict)
         self.db.execute("""
             INSERT INTO contact_avatar (jid_id, account_id, hash, type, data)
-            VALUES (?, ?, ?, ?, ?)
+            VALUES (?, ?, ?, ?, NULL)
             ON CONFLICT (jid_id, account_id, type) DO UPDATE SET
                 hash = excluded.hash,
-                data = excluded.data
+                data = NULL
         """, (
             jid_id,
             self.account_id,
-            avatar_data['hash'],
-            avatar_type,
-            avatar_data['data']
+            avatar_hash,
+            avatar_type
         ))
 
+        # A real avatar replaces the "no avatar" probe marker
+        self.db.execute(
+            "DELETE FROM contact_avatar WHERE jid_id = ? AND account_id = ? AND type = ?",
+            (jid_id, self.account_id, AVATAR_TYPE_NONE)
+        )
+
         self.db.commit()
 
+        hashes = self._get_stored_hashes().setdefault(jid, {})
+        hashes.pop(AVATAR_TYPE_NONE, None)
+        hashes[avatar_type] = avatar_hash
+
         if self.logger:
-            self.logger.debug(f"Avatar stored for {jid} (type={avatar_type}, hash={avatar_data['hash'][:16]}...)")
+            self.logger.debug(f"Avatar stored for {jid} (type={avatar_type}, hash={avatar_hash[:16]}...)")
+
+    def _store_probe_marker(self, jid: str):
+        """
+        Remember that jid publishes no avatar (type -1 row with empty hash).
+
+        Args:
+            jid: Bare JID
+        """
+        jid_row = self.db.fetchone("SELECT id FROM jid WHERE bare_jid = ?", (jid,))
+        if not jid_row:
+            return
+
+        self.db.execute("""
+            INSERT INTO contact_avatar (jid_id, account_id, hash, type, data)
+            VALUES (?, ?, '', ?, NULL)
+            ON CONFLICT (jid_id, account_id, type) DO NOTHING
+        """, (jid_row['id'], self.account_id, AVATAR_TYPE_NONE))
+        self.db.commit()
+
+        self._get_stored_hashes().setdefault(jid, {})[AVATAR_TYPE_NONE] = ''
+
+    def _get_stored_hashes(self) -> Dict[str, Dict[int, str]]:
+        """
+        Get stored avatar hashes for this account (one query, then kept in memory).
+
+        Returns:
+            Dict jid -> {type: hash} (probe markers included, type -1, hash '')
+        """
+        if self._stored_hashes is None:
+            rows = self.db.fetchall("""
+                SELECT j.bare_jid, a.type, a.hash
+                FROM contact_avatar a
+                JOIN jid j ON a.jid_id = j.id
+                WHERE a.account_id = ?
+            """, (self.account_id,))
+            self._stored_hashes = {}
+            for row in rows:
+                self._stored_hashes.setdefault(row['bare_jid'], {})[row['type']] = row['hash']
+        return self._stored_hashes
+
+    def _has_hash(self, jid: str, avatar_hash: str) -> bool:
+        """Check if an avatar with this hash is already stored for jid (any type)."""
+        return avatar_hash in self._get_stored_hashes().get(jid, {}).values()
+
+    async def on_avatar_hash(self, jid: str, avatar_hash: str, source: str):
+        """
+        Handle an advertised avatar hash from DrunkXMPP (XEP-0153 presence, XEP-0084 PEP).
+        Queues a fetch only if the hash differs from the stored avatar.
+
+        Args:
+            jid: Bare JID of entity
+            avatar_hash: Advertised SHA-1 hex digest ('' = avatar removed)
+            source: 'xep_0084' or 'xep_0054'
+        """
+        if not avatar_hash:
+            # Keep the last known avatar, nothing to download
+            if self.logger:
+                self.logger.debug(f"{jid} advertises no avatar ({source})")
+            return
+
+        if self._has_hash(jid, avatar_hash):
+            return
+
+        if self.logger:
+            self.logger.debug(f"Avatar changed for {jid} ({source}, hash={avatar_hash[:16]}...), queueing fetch")
+        self._enqueue(jid, avatar_hash, source)
+
+    def _enqueue(self, jid: str, expected_hash: Optional[str], source: Optional[str]):
+        """
+        Queue an avatar fetch (deduplicated per JID, latest advertised hash wins).
+
+        Args:
+            jid: Bare JID
+            expected_hash: Advertised hash, or None to probe a contact without stored avatar
+            source: Source that advertised the hash (selects PEP vs vCard first)
+        """
+        if jid in self._queued:
+            if expected_hash:
+                self._queued[jid] = (expected_hash, source)
+            return
+
+        if self._fetch_queue is None:
+            self._fetch_queue = asyncio.Queue()
+
+        self._queued[jid] = (expected_hash, source)
+        self._fetch_queue.put_nowait(jid)
+
+        # Start workers on demand
+        self._workers = [w for w in self._workers if not w.done()]
+        while len(self._workers) < min(MAX_CONCURRENT_FETCHES, self._fetch_queue.qsize() + len(self._workers)):
+            self._workers.append(asyncio.ensure_future(self._fetch_worker(self._fetch_queue)))
+
+    async def _fetch_worker(self, queue: asyncio.Queue):
+        """Fetch queued avatars until the queue is drained."""
+        while not queue.empty():
+            jid = queue.get_nowait()
+            expected_hash, source = self._queued.pop(jid, (None, None))
+            try:
+                await self._fetch_avatar(jid, expected_hash, source)
+            except Exception as e:
+                if self.logger:
+                    self.logger.debug(f"Failed to fetch avatar for {jid}: {e}")
+            finally:
+                queue.task_done()
+
+    async def _fetch_avatar(self, jid: str, expected_hash: Optional[str], source: Optional[str]):
+        """
+        Fetch one avatar, retrying with exponential backoff.
+
+        DrunkXMPP.get_avatar() stores the result through on_avatar_update().
+        Probes (no advertised hash) are tried once: a contact that publishes
+        nothing is indistinguishable from a failed request.
+
+        Args:
+            jid: Bare JID
+            expected_hash: Advertised hash, or None for a probe
+            source: Source that advertised the hash
+        """
+        if expected_hash is None:
+            self._probed_jids.add(jid)
+        elif self._has_hash(jid, expected_hash):
+            # Stored while this entry waited in the queue
+            return
+
+        prefer_pep = source != 'xep_0054'
+        attempts = MAX_FETCH_ATTEMPTS if expected_hash else 1
+
+        for attempt in range(1, attempts + 1):
+            if not self.client:
+                return
+
+            try:
+                avatar_data = await self.client.get_avatar(jid, prefer_pep=prefer_pep)
+            except Exception as e:
+                if self.logger:
+                    self.logger.debug(f"Avatar fetch for {jid} raised: {e}")
+                avatar_data = None
+
+            if avatar_data:
+                if expected_hash and avatar_data['hash'] != expected_hash:
+                    # Advertised hash doesn't match served data (e.g. PEP and vCard
+                    # out of sync) - remember it so every presence doesn't refetch
+                    if self.logger:
+                        self.logger.debug(f"Avatar for {jid} has hash {avatar_data['hash'][:16]}..., "
+                                          f"advertised {expected_hash[:16]}...")
+                    self._get_stored_hashes().setdefault(jid, {})[_ADVERTISED_MISMATCH] = expected_hash
+                return
+
+            if expected_hash is None:
+                if self.logger:
+                    self.logger.debug(f"No avatar for {jid}")
+                self._store_probe_marker(jid)
+                return
+
+            if attempt < attempts:
+                await asyncio.sleep(RETRY_BASE_DELAY * 2 ** (attempt - 1))
+
+        if self.logger:
+            self.logger.warning(f"Giving up on avatar for {jid} after {attempts} attempts")
+
+    def cancel_pending_fetches(self):
+        """
+        Drop queued fetches and stop workers (called on disconnect).
+        Hashes are re-advertised with presence after reconnect.
+        """
+        for worker in self._workers:
+            worker.cancel()
+        self._workers = []
+        self._queued.clear()
+        self._fetch_queue = None
 
     async def fetch_roster_avatars(self):
         """
-        Fetch avatars for all roster contacts.
+        Queue avatar probes for roster contacts with neither a stored avatar
+        nor a probe marker.
         Called after roster is loaded on connection.
         Throttled to once per minute to prevent spam.
+
+        Contacts with a stored avatar are only refetched when presence or PEP
+        advertises a different hash (see on_avatar_hash), so reconnecting with
+        an unchanged roster fetches nothing.
         """
         if not self.client:
             return
@@ -119,9 +338,6 @@ class AvatarBarrel:
 
         self._last_avatar_fetch = now
 
-        if self.logger:
-            self.logger.info("Fetching avatars for roster contacts...")
-
         try:
             # Get all roster JIDs
             roster_entries = self.db.fetchall("""
@@ -131,39 +347,18 @@ class AvatarBarrel:
                 WHERE r.account_id = ?
             """, (self.account_id,))
 
-            if self.logger:
-                self.logger.info(f"Found {len(roster_entries)} roster contacts")
-
-            # Fetch avatars asynchronously (don't block on each one)
-            for entry in roster_entries:
-                jid = entry['bare_jid']
-                try:
-                    # Check if we already have a recent avatar
-                    cached = self.db.fetchone("""
-                        SELECT hash FROM contact_avatar
-                        WHERE jid_id = (SELECT id FROM jid WHERE bare_jid = ?)
-                        AND account_id = ?
-                        ORDER BY type DESC
-                        LIMIT 1
-                    """, (jid, self.account_id))
-
-                    # Always fetch to ensure we have the latest
-                    # (could optimize later with timestamp checks)
-                    avatar_data = await self.client.get_avatar(jid)
-
-                    if avatar_data:
-                        if self.logger:
-                            self.logger.debug(f"Fetched avatar for {jid}")
-                    else:
-                        if self.logger:
-                            self.logger.debug(f"No avatar for {jid}")
-
-                except Exception as e:
-                    if self.logger:
-                        self.logger.debug(f"Failed to fetch avatar for {jid}: {e}")
+            stored = self._get_stored_hashes()
+            missing = [
+                entry['bare_jid'] for entry in roster_entries
+                if entry['bare_jid'] not in stored and entry['bare_jid'] not in self._probed_jids
+            ]
 
             if self.logger:
-                self.logger.info("Roster avatar fetch completed")
+                self.logger.info(f"Found {len(roster_entries)} roster contacts, "
+                                 f"{len(missing)} without avatar to probe")
+
+            for jid in missing:
+                self._enqueue(jid, None, None)
 
         except Exception as e:
             if self.logger:
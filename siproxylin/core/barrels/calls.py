@@ -15,7 +15,7 @@ import json
 import logging
 import time
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Set
 from PySide6.QtCore import QTimer
 from slixmpp import JID
 
@@ -51,6 +51,14 @@ except ImportError as e:
     logger.error("=" * 80)
 
 
+# Speculative CallBridge sessions built while an incoming call rings (all accounts)
+MAX_PREWARMED_SESSIONS = 2
+# How long teardown waits for a pre-warm that is still being built (seconds)
+PREWARM_TEARDOWN_TIMEOUT = 5.0
+
+_prewarming_sessions: Set[str] = set()
+
+
 class CallBarrel:
     """Manages audio/video calls for an account."""
 
@@ -131,10 +139,12 @@ class CallBarrel:
 
         # Call state (moved from brewery.__init__)
         self.call_bridge = None  # CallBridge instance (Go service)
+        self.tracer = None  # CallSetupTracer (shared with CallBridge, set in _setup_call_functionality)
         self.jingle_adapter = None  # JingleAdapter for Jingle signaling
         self.pending_call_offers: Dict[str, str] = {}  # session_id → sdp_offer (temp storage)
         self.accepted_calls: set = set()  # Track calls user accepted (sent proceed, waiting for session-initiate)
         self.incoming_call_timers: Dict[str, Any] = {}  # session_id → QTimer (60s timeout for unanswered calls)
+        self.prewarm_tasks: Dict[str, asyncio.Task] = {}  # session_id → speculative CreateSession (while ringing)
         self.outgoing_call_timers: Dict[str, Any] = {}  # session_id → QTimer (60s timeout for unanswered calls)
 
         # Call logging (Phase 4)
@@ -306,6 +316,37 @@ class CallBarrel:
 
         return '', '', '', '', audio_processing  # Default to system defaults
 
+    async def _get_external_services(self, session_id: str) -> list:
+        """
+        Get XEP-0215 STUN/TURN services for a call.
+
+        Served from the client's credential cache (warmed at session start);
+        a live query is only made when the cache is stale.
+
+        Args:
+            session_id: Session ID (for the call setup trace)
+
+        Returns:
+            Service list from the client (empty if none)
+        """
+        cached = self.client.get_cached_external_services() is not None
+
+        with self.tracer.span(session_id, 'xep0215:external-services'):
+            services = await self.client.get_call_external_services()
+
+        metrics = self.client.external_services_metrics
+        if cached:
+            self.tracer.mark(session_id, 'xep0215:cache-hit')
+            if self.logger:
+                self.logger.debug(
+                    f"TURN credentials from cache, saved {metrics['last_saved_ms']:.0f}ms "
+                    f"(hits={metrics['hits']}, misses={metrics['misses']}, "
+                    f"saved total={metrics['saved_ms']:.0f}ms)"
+                )
+        else:
+            self.tracer.mark(session_id, 'xep0215:cache-miss')
+        return services
+
     async def _setup_call_functionality(self):
         """
         Get singleton CallBridge (Go service) for audio/video calls.
@@ -338,9 +379,12 @@ class CallBarrel:
             self.call_bridge = CallBridge(
                 logger=self.logger,
                 on_ice_candidate=None,  # Will be set by JingleAdapter
-                on_connection_state=None  # Will be set by JingleAdapter
+                on_connection_state=None,  # Will be set by JingleAdapter
+                on_stats=self._on_call_stats  # Pushed by StreamStats (no GUI polling)
             )
 
+            self.tracer = self.call_bridge.tracer
+
             # Connect to Go service
             success = await self.call_bridge.connect()
             if not success:
@@ -447,6 +491,10 @@ class CallBarrel:
             # Don't show dialog, don't start timer, just return
             return
 
+        # Start call setup trace (ends when ICE connects or the call ends)
+        self.tracer.begin(session_id, 'incoming')
+        self.tracer.mark(session_id, 'xep0353:propose-received')
+
         # Log incoming call to database (Phase 4)
         self._log_call_to_db(session_id, peer_jid, CallDirection.INCOMING.value, CallState.RINGING.value)
 
@@ -462,6 +510,9 @@ class CallBarrel:
         if self.logger:
             self.logger.debug(f"Started 60s timeout timer for incoming call: {session_id}")
 
+        # Build the media session while ringing (nothing is sent to the peer)
+        self._start_prewarm(session_id, peer_jid)
+
         # Emit signal to GUI to show incoming call dialog
         # Use call_soon_threadsafe to avoid asyncio task conflicts
         if self.logger:
@@ -484,6 +535,7 @@ class CallBarrel:
 
         # Cancel outgoing call timeout (peer answered)
         self._cancel_outgoing_call_timer(session_id)
+        self.tracer.mark(session_id, 'xep0353:proceed-received')
 
         if not self.jingle_adapter or not self.call_bridge:
             if self.logger:
@@ -495,8 +547,8 @@ class CallBarrel:
             turn_server, turn_username, turn_password = '', '', ''
             try:
                 if self.logger:
-                    self.logger.debug("Querying server for TURN servers (XEP-0215)")
-                services = await self.client.get_external_services()
+                    self.logger.debug("Getting TURN servers (XEP-0215)")
+                services = await self._get_external_services(session_id)
                 if services:
                     ice_servers = self.client.format_ice_servers(services)
                     turn_server, turn_username, turn_password = self._extract_turn_server(ice_servers)
@@ -708,6 +760,7 @@ class CallBarrel:
 
         This is called as soon as we have the SDP offer, before creating the answer.
         This ensures the session exists before any ICE candidates arrive.
+        A session pre-warmed while ringing is committed instead of building a new one.
 
         Args:
             session_id: Jingle session ID
@@ -725,60 +778,21 @@ class CallBarrel:
             return False
 
         try:
-            # Query XEP-0215 for TURN servers
-            turn_server, turn_username, turn_password = '', '', ''
-            try:
+            if await self._commit_prewarm(session_id):
+                self.tracer.mark(session_id, 'prewarm:used')
                 if self.logger:
-                    self.logger.debug("Querying server for TURN servers (XEP-0215)")
-                services = await self.client.get_external_services()
-                if services:
-                    ice_servers = self.client.format_ice_servers(services)
-                    turn_server, turn_username, turn_password = self._extract_turn_server(ice_servers)
-                    if turn_server and self.logger:
-                        self.logger.debug(f"Using TURN server from XEP-0215: {turn_server}")
-                elif self.logger:
-                    self.logger.debug("Server does not support XEP-0215, will use Jami TURN")
-            except Exception as e:
-                if self.logger:
-                    self.logger.warning(f"Failed to query XEP-0215: {e}, will use Jami TURN")
+                    self.logger.info(f"Using pre-warmed C++ session for incoming call {session_id}")
+            else:
+                self.tracer.mark(session_id, 'prewarm:none')
+                peer_jid = self.jingle_adapter.sessions[session_id]['peer_jid']
+                if not await self._create_bridge_session(session_id, peer_jid):
+                    raise RuntimeError("Failed to create CallBridge session")
 
-            # Load audio device and processing settings
-            mic_device, mic_display, speakers_device, speakers_display, audio_proc = self._load_audio_settings()
+                if self.logger:
+                    self.logger.info(f"C++ session created for incoming call {session_id}")
 
-            # State transition: Resources (TURN credentials + devices) ready
+            # State transitions: Resources (TURN credentials + devices) ready, C++ session created
             self.jingle_adapter.trickle_ice.set_incoming_state(session_id, IncomingCallState.RESOURCES_READY)
-
-            # Create CallBridge session (incoming call)
-            # GStreamer webrtcbin will queue any ICE candidates that arrive before set-remote-description
-            success = await self.call_bridge.create_session(
-                self.jingle_adapter.sessions[session_id]['peer_jid'],
-                session_id,
-                mic_device,
-                speakers_device,
-                microphone_display_name=mic_display,
-                speakers_display_name=speakers_display,
-                proxy_host=self.proxy_host or "",
-                proxy_port=self.proxy_port or 0,
-                proxy_username=self.proxy_username or "",
-                proxy_password=self.proxy_password or "",
-                proxy_type=self.proxy_type or "",
-                turn_server=turn_server,
-                turn_username=turn_username,
-                turn_password=turn_password,
-                echo_cancel=audio_proc['echo_cancel'],
-                echo_suppression_level=audio_proc['echo_suppression_level'],
-                noise_suppression=audio_proc['noise_suppression'],
-                noise_suppression_level=audio_proc['noise_suppression_level'],
-                gain_control=audio_proc['gain_control']
-            )
-
-            if not success:
-                raise RuntimeError("Failed to create CallBridge session")
-
-            if self.logger:
-                self.logger.info(f"C++ session created for incoming call {session_id}")
-
-            # State transition: C++ session created
             self.jingle_adapter.trickle_ice.set_incoming_state(session_id, IncomingCallState.SESSION_CREATED)
 
             return True
@@ -790,6 +804,150 @@ class CallBarrel:
                 self.logger.error(traceback.format_exc())
             return False
 
+    async def _create_bridge_session(self, session_id: str, peer_jid: str) -> bool:
+        """
+        Look up TURN servers and audio settings, then create the CallBridge session.
+
+        Only talks to the local call service (and our own server for XEP-0215),
+        never to the peer - safe to run speculatively while ringing.
+
+        Args:
+            session_id: Jingle session ID
+            peer_jid: Peer JID
+
+        Returns:
+            bool: True if the CallBridge session was created
+        """
+        # Query XEP-0215 for TURN servers
+        turn_server, turn_username, turn_password = '', '', ''
+        try:
+            if self.logger:
+                self.logger.debug("Getting TURN servers (XEP-0215)")
+            services = await self._get_external_services(session_id)
+            if services:
+                ice_servers = self.client.format_ice_servers(services)
+                turn_server, turn_username, turn_password = self._extract_turn_server(ice_servers)
+                if turn_server and self.logger:
+                    self.logger.debug(f"Using TURN server from XEP-0215: {turn_server}")
+            elif self.logger:
+                self.logger.debug("Server does not support XEP-0215, will use Jami TURN")
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(f"Failed to query XEP-0215: {e}, will use Jami TURN")
+
+        # Load audio device and processing settings
+        mic_device, mic_display, speakers_device, speakers_display, audio_proc = self._load_audio_settings()
+
+        # Create CallBridge session (incoming call)
+        # GStreamer webrtcbin will queue any ICE candidates that arrive before set-remote-description
+        return await self.call_bridge.create_session(
+            peer_jid,
+            session_id,
+            mic_device,
+            speakers_device,
+            microphone_display_name=mic_display,
+            speakers_display_name=speakers_display,
+            proxy_host=self.proxy_host or "",
+            proxy_port=self.proxy_port or 0,
+            proxy_username=self.proxy_username or "",
+            proxy_password=self.proxy_password or "",
+            proxy_type=self.proxy_type or "",
+            turn_server=turn_server,
+            turn_username=turn_username,
+            turn_password=turn_password,
+            echo_cancel=audio_proc['echo_cancel'],
+            echo_suppression_level=audio_proc['echo_suppression_level'],
+            noise_suppression=audio_proc['noise_suppression'],
+            noise_suppression_level=audio_proc['noise_suppression_level'],
+            gain_control=audio_proc['gain_control']
+        )
+
+    # ============================================================================
+    # Speculative session pre-warm (incoming calls, while ringing)
+    # ============================================================================
+
+    def _start_prewarm(self, session_id: str, peer_jid: str):
+        """
+        Start building the CallBridge session for a ringing incoming call.
+
+        The SDP offer only arrives after we send proceed, so this covers
+        everything that doesn't depend on it: TURN lookup, device settings and
+        the media pipeline (CreateSession). ICE gathering starts with the answer.
+        Candidates the service emits meanwhile are held by JingleAdapter (no
+        Jingle session yet), so nothing reaches the wire before accept.
+
+        Args:
+            session_id: XEP-0353 session ID
+            peer_jid: Caller JID
+        """
+        if not self.call_bridge or session_id in self.prewarm_tasks:
+            return
+
+        if len(_prewarming_sessions) >= MAX_PREWARMED_SESSIONS:
+            self.tracer.mark(session_id, 'prewarm:skipped')
+            if self.logger:
+                self.logger.debug(f"Not pre-warming {session_id}: {len(_prewarming_sessions)} already pre-warmed")
+            return
+
+        async def prewarm() -> bool:
+            try:
+                created = await self._create_bridge_session(session_id, peer_jid)
+            except Exception as e:
+                if self.logger:
+                    self.logger.warning(f"Pre-warm failed for {session_id}: {e}")
+                created = False
+            self.tracer.mark(session_id, 'prewarm:ready' if created else 'prewarm:failed')
+            return created
+
+        _prewarming_sessions.add(session_id)
+        self.prewarm_tasks[session_id] = asyncio.ensure_future(prewarm())
+        if self.logger:
+            self.logger.debug(f"Pre-warming C++ session for incoming call {session_id}")
+
+    async def _commit_prewarm(self, session_id: str) -> bool:
+        """
+        Take over the pre-warmed session of an accepted call.
+
+        Waits for a pre-warm that is still being built (cheaper than starting over).
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            bool: True if the pre-warmed session exists and can be used
+        """
+        task = self.prewarm_tasks.pop(session_id, None)
+        if task is None:
+            return False
+        _prewarming_sessions.discard(session_id)
+
+        created = await task
+        if not created:
+            # Pre-warm failed part way - make sure nothing is left before the retry
+            await self.call_bridge.end_session(session_id)
+        return created
+
+    async def _discard_prewarm(self, session_id: str):
+        """
+        Forget the pre-warm of a call that ended before accept (reject, timeout, retract).
+
+        Waits briefly for an in-flight CreateSession so the following
+        end_session() tears down the complete session.
+
+        Args:
+            session_id: Session ID
+        """
+        task = self.prewarm_tasks.pop(session_id, None)
+        _prewarming_sessions.discard(session_id)
+        if task is None:
+            return
+
+        done, _ = await asyncio.wait({task}, timeout=PREWARM_TEARDOWN_TIMEOUT)
+        if not done:
+            task.cancel()
+        if self.logger:
+            self.logger.debug(f"Discarded pre-warmed session {session_id}")
+
     async def _on_candidates_ready(self, session_id: str):
         """
         Handle candidates arriving for trickle-only offers.
@@ -905,8 +1063,8 @@ class CallBarrel:
         turn_server, turn_username, turn_password = '', '', ''
         try:
             if self.logger:
-                self.logger.debug("Querying server for TURN servers (XEP-0215)")
-            services = await self.client.get_external_services()
+                self.logger.debug("Getting TURN servers (XEP-0215)")
+            services = await self._get_external_services(session_id)
             if services:
                 ice_servers = self.client.format_ice_servers(services)
                 turn_server, turn_username, turn_password = self._extract_turn_server(ice_servers)
@@ -1051,8 +1209,9 @@ class CallBarrel:
 
         # Update database based on connection state (Phase 4)
         if state == 'connected':
-            # Call successfully connected
+            # Call successfully connected - call setup trace is complete
             self._update_call_state_in_db(session_id, CallState.IN_PROGRESS.value)
+            self.tracer.finish(session_id, 'connected')
         elif state == 'failed':
             # Connection failed - update to FAILED before terminating
             self._update_call_state_in_db(session_id, CallState.FAILED.value, end_time=int(time.time()))
@@ -1077,6 +1236,43 @@ class CallBarrel:
         # Emit signal to GUI
         self.signals['call_state_changed'].emit(self.account_id, session_id, state)
 
+    def _on_call_stats(self, session_id: str, stats: dict, history):
+        """
+        Handle stats pushed by the call service (StreamStats).
+
+        Args:
+            session_id: Session ID
+            stats: Full stats snapshot (same keys as get_call_stats())
+            history: CallStatsHistory ring buffer for this session
+        """
+        # Attach short series for sparklines (ring buffer is bounded)
+        stats['bandwidth_history'] = history.series('bandwidth_kbps')
+        stats['rtt_history'] = history.series('rtt_ms')
+
+        self.signals['call_stats_updated'].emit(self.account_id, session_id, stats)
+
+    def _store_call_stats_summary(self, session_id: str):
+        """
+        Persist stats summary for a finished call (before CallBridge drops the history).
+
+        Args:
+            session_id: Session ID
+        """
+        try:
+            history = self.call_bridge.get_stats_history(session_id)
+            call_id = self.call_db_ids.get(session_id)
+            summary = history.summary() if history else None
+            if not call_id or not summary:
+                return
+
+            get_db().update_call_stats_summary(call_id, summary)
+
+            if self.logger:
+                self.logger.debug(f"Stored stats summary for call_id={call_id}: {summary}")
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Failed to store call stats summary: {e}")
+
     async def start_call(self, peer_jid: str, media: list = None) -> str:
         """
         Initiate outgoing call.
@@ -1126,6 +1322,10 @@ class CallBarrel:
             if self.logger:
                 self.logger.debug(f"Call propose sent (session {actual_sid})")
 
+            # Start call setup trace (ends when ICE connects or the call ends)
+            self.tracer.begin(actual_sid, 'outgoing')
+            self.tracer.mark(actual_sid, 'xep0353:propose-sent')
+
             # Log outgoing call to database (Phase 4)
             self._log_call_to_db(actual_sid, peer_jid, CallDirection.OUTGOING.value, CallState.RINGING.value)
 
@@ -1243,6 +1443,7 @@ class CallBarrel:
 
         # Cancel timeout timer (user answered)
         self._cancel_incoming_call_timer(session_id)
+        self.tracer.mark(session_id, 'user:accepted')
 
         if self.logger:
             self.logger.info(f"Accepting call (session {session_id})")
@@ -1455,6 +1656,10 @@ class CallBarrel:
 
         self._update_call_state_in_db(session_id, final_state, end_time)
 
+        # Close call setup trace if the call never connected (no-op otherwise)
+        if self.tracer:
+            self.tracer.finish(session_id, reason)
+
         # Get peer_jid BEFORE cleanup (needed for GUI signal)
         # Try multiple sources: call logging tracker, Jingle session, XEP-0353 call_sessions
         peer_jid = 'unknown'
@@ -1472,8 +1677,10 @@ class CallBarrel:
             if self.logger:
                 self.logger.debug(f"Could not get peer_jid for {session_id}: {e}")
 
-        # Layer 1: CallBridge cleanup (Go service)
+        # Layer 1: CallBridge cleanup (Go service) - includes a pre-warmed session
+        await self._discard_prewarm(session_id)
         if self.call_bridge:
+            self._store_call_stats_summary(session_id)
             try:
                 await self.call_bridge.end_session(session_id)
                 if self.logger:
@@ -150,6 +150,11 @@ class ConnectionBarrel:
         # Get client certificate path (validated by GUI before saving)
         client_cert_path = self.account_data.get('client_cert_path')
 
+        # Cached roster + version (XEP-0237): server only sends changes since then
+        roster_version, roster_items = self.db.get_roster_cache(self.account_id)
+        if self.logger and roster_version:
+            self.logger.info(f"Roster cache: {len(roster_items)} contacts (ver={roster_version})")
+
         # Create DrunkXMPP client
         try:
             self.client = DrunkXMPP(
@@ -173,7 +178,9 @@ class ConnectionBarrel:
                 on_room_config_changed_callback=callbacks.get('on_room_config_changed_callback'),
                 on_message_correction_callback=callbacks.get('on_message_correction_callback'),
                 on_avatar_update_callback=callbacks.get('on_avatar_update_callback'),
+                on_avatar_hash_callback=callbacks.get('on_avatar_hash_callback'),
                 on_nickname_update_callback=callbacks.get('on_nickname_update_callback'),
+                on_muc_participants_changed_callback=callbacks.get('on_muc_participants_changed_callback'),
                 own_nickname=self.account_data.get('nickname'),
                 on_reaction_callback=callbacks.get('on_reaction_callback'),
                 on_subscription_request_callback=callbacks.get('on_subscription_request_callback'),
@@ -187,6 +194,8 @@ class ConnectionBarrel:
                 proxy_username=proxy_username,
                 proxy_password=proxy_password,
                 client_cert_path=client_cert_path,
+                roster_version=roster_version,
+                roster_items=roster_items,
             )
 
             # Don't add duplicate event handlers - drunk-xmpp already has them
@@ -299,11 +308,15 @@ class ConnectionBarrel:
         re-query on every connect. Results stored in-memory only.
 
         Logs at INFO level for query fact, DEBUG level for full details.
+        Both queries are sent at once (independent IQs).
         """
         if not self.client:
             return
 
-        # Query server version (XEP-0092)
+        await asyncio.gather(self._query_server_version(), self._query_server_features())
+
+    async def _query_server_version(self):
+        """Query server version (XEP-0092) into self.server_version."""
         try:
             if self.logger:
                 self.logger.info("Querying server version (XEP-0092)...")
@@ -325,7 +338,8 @@ class ConnectionBarrel:
                 self.logger.error(f"Failed to query server version: {e}")
             self.server_version = {'error': str(e)}
 
-        # Query server features (XEP-0030)
+    async def _query_server_features(self):
+        """Query server features (XEP-0030) into self.server_features."""
         try:
             if self.logger:
                 self.logger.info("Querying server features (XEP-0030)...")
@@ -5,10 +5,22 @@ Responsibilities:
 - File download and upload (XEP-0363 HTTP Upload)
 - OMEMO encrypted file handling (XEP-0454)
 - File attachment storage and database tracking
+
+Downloads run as background tasks: the file_transfer row is created first
+(state=1, so the chat shows it), the body is streamed to disk (see
+utils/file_download.py) and the row is completed or marked failed at the end.
+Failed downloads keep their '.part' file and resume when the message is seen
+again (e.g. MAM replay).
 """
 
+import asyncio
 import logging
-from typing import Optional
+import time
+from pathlib import Path
+from typing import Optional, Dict
+
+# Minimum seconds between progress signals per download
+PROGRESS_INTERVAL = 0.25
 
 
 class FileBarrel:
@@ -31,6 +43,9 @@ class FileBarrel:
         self.logger = logger
         self.signals = signals
 
+        # file_transfer_id -> running download task
+        self._downloads: Dict[int, asyncio.Task] = {}
+
     async def handle_incoming_file(self, jid_id: int, from_jid: str, file_url: str,
                                     is_encrypted: bool, timestamp: int, conversation_id: int,
                                     direction: int = 0, is_from_other_device: bool = False,
@@ -39,7 +54,8 @@ class FileBarrel:
         """
         Handle incoming file attachment.
 
-        Downloads file, stores it locally, and creates file_transfer DB entry.
+        Creates the file_transfer DB entry and starts downloading the file in
+        the background (returns before the download finishes).
 
         Args:
             jid_id: JID database ID
@@ -50,154 +66,20 @@ class FileBarrel:
             conversation_id: Conversation ID for content_item linking
             direction: 0=received, 1=sent (default: 0)
         """
-        import aiohttp
-        import mimetypes
-        import os
-        from datetime import datetime
-        from urllib.parse import urlparse
-
         try:
-            # Determine if URL is encrypted (aesgcm://)
-            is_aesgcm = file_url.startswith('aesgcm://')
-
-            # Extract filename from URL
-            if is_aesgcm:
-                # aesgcm://example.com/path/file.jpg#fragment
-                # Convert to https:// for download, keep fragment for decryption
-                url_parts = file_url[len('aesgcm://'):]
-                if '#' in url_parts:
-                    http_part, fragment = url_parts.split('#', 1)
-                else:
-                    http_part = url_parts
-                    fragment = None
-
-                download_url = f'https://{http_part}'
-                parsed = urlparse(download_url)
-            else:
-                download_url = file_url
-                parsed = urlparse(file_url)
-                fragment = None
-
-            # Extract filename from URL path
-            path_parts = parsed.path.rstrip('/').split('/')
-            url_filename = path_parts[-1] if path_parts else 'attachment'
-
-            # Generate storage path: {data_dir}/attachments/{account_id}/{sender_jid}/YYYY-mm-dd_HHMMSS.ext
-            from ...utils.paths import get_paths
-            paths = get_paths()
-
-            # Create sender-specific directory (automatically uses dev or XDG path)
-            attachments_base = paths.data_dir / 'attachments'
-            sender_dir = attachments_base / str(self.account_id) / from_jid
-            sender_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
-
-            # Generate timestamped filename
-            dt = datetime.fromtimestamp(timestamp)
-            timestamp_str = dt.strftime('%Y-%m-%d_%H%M%S')
-
-            # Extract extension from original filename
-            _, ext = os.path.splitext(url_filename)
-            if not ext:
-                ext = '.bin'
-
-            local_filename = f'{timestamp_str}{ext}'
-            local_path = sender_dir / local_filename
-
-            if self.logger:
-                self.logger.info(f"Downloading file from {download_url} to {local_path}")
-
-            # Download file
-            async with aiohttp.ClientSession() as session:
-                async with session.get(download_url) as response:
-                    if response.status == 200:
-                        file_data = await response.read()
-
-                        # Decrypt if OMEMO encrypted
-                        if is_aesgcm and fragment:
-                            if self.logger:
-                                self.logger.info("Decrypting OMEMO-encrypted file")
-                            try:
-                                # Parse fragment for decryption (XEP-0454 format)
-                                # Fragment format: IV (24 hex chars) + key (64 hex chars) = 88 chars total
-                                from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-
-                                if len(fragment) != 88:
-                                    raise ValueError(f"Invalid fragment length: {len(fragment)} (expected 88)")
-
-                                # Extract IV (first 24 hex chars = 12 bytes) and key (next 64 hex chars = 32 bytes)
-                                iv = bytes.fromhex(fragment[:24])    # 12 bytes
-                                key = bytes.fromhex(fragment[24:])   # 32 bytes
-
-                                # Last 16 bytes of file_data are the GCM auth tag
-                                tag = file_data[-16:]
-                                ciphertext = file_data[:-16]
-
-                                # Decrypt using AES-256-GCM
-                                cipher = Cipher(
-                                    algorithms.AES(key),
-                                    modes.GCM(iv, tag)
-                                )
-                                decryptor = cipher.decryptor()
-                                file_data = decryptor.update(ciphertext) + decryptor.finalize()
-
-                                if self.logger:
-                                    self.logger.info("File decrypted successfully")
-
-                            except Exception as e:
-                                if self.logger:
-                                    self.logger.error(f"Failed to decrypt file: {e}")
-                                raise
-
-                        # Write to file with secure permissions
-                        local_path.write_bytes(file_data)
-                        os.chmod(local_path, 0o600)
-
-                        file_size = len(file_data)
-
-                        if self.logger:
-                            self.logger.info(f"File downloaded: {local_path} ({file_size} bytes)")
-
-                        # Guess MIME type
-                        mime_type, _ = mimetypes.guess_type(local_filename)
-
-                        # Insert file_transfer + content_item atomically with deduplication
-                        file_transfer_id, content_item_id = self.db.insert_file_transfer_atomic(
-                            account_id=self.account_id,
-                            counterpart_id=jid_id,
-                            conversation_id=conversation_id,
-                            direction=direction,  # 0=received, 1=sent
-                            time=timestamp,
-                            local_time=timestamp,
-                            file_name=url_filename,
-                            path=str(local_path),
-                            mime_type=mime_type,
-                            size=file_size,
-                            state=2,  # state=2 (complete)
-                            encryption=1 if is_encrypted else 0,
-                            provider=0,  # provider=0 (HTTP Upload)
-                            is_carbon=1 if is_from_other_device else 0,
-                            url=file_url,
-                            message_id=message_id,
-                            origin_id=origin_id,
-                            stanza_id=stanza_id
-                        )
-
-                        if file_transfer_id is None:
-                            # Duplicate file, skip
-                            if self.logger:
-                                self.logger.info(f"Skipped duplicate file: {url_filename}")
-                            return
-
-                        if self.logger:
-                            self.logger.info(f"File transfer record created (ID: {file_transfer_id})")
-
-                        # Emit signal to notify GUI (updates unread count, notifications, bold text)
-                        self.signals['message_received'].emit(self.account_id, from_jid, False)
-
-                    else:
-                        if self.logger:
-                            self.logger.error(f"Failed to download file: HTTP {response.status}")
-
+            self._receive_file(
+                jid_id=jid_id,
+                counterpart_jid=from_jid,
+                file_url=file_url,
+                is_encrypted=is_encrypted,
+                timestamp=timestamp,
+                conversation_id=conversation_id,
+                direction=direction,
+                is_carbon=is_from_other_device,
+                message_id=message_id,
+                origin_id=origin_id,
+                stanza_id=stanza_id
+            )
         except Exception as e:
             if self.logger:
                 self.logger.error(f"Failed to handle incoming file: {e}")
@@ -206,11 +88,12 @@ class FileBarrel:
 
     async def handle_carbon_file(self, jid_id: int, counterpart_jid: str, file_url: str,
                                    is_encrypted: bool, timestamp: int, conversation_id: int,
-                                   direction: int):
+                                   direction: int, message_id: Optional[str] = None,
+                                   origin_id: Optional[str] = None, stanza_id: Optional[str] = None):
         """
         Handle file attachment from a carbon copy (sent from another device).
 
-        Downloads file, stores it locally, and creates file_transfer DB entry.
+        Creates the file_transfer DB entry and starts downloading the file.
         Similar to handle_incoming_file but supports both directions for carbons.
 
         Deduplication: For sent carbons (direction=1), checks if a file_transfer already
@@ -226,12 +109,6 @@ class FileBarrel:
             conversation_id: Conversation ID for content_item linking
             direction: 0=received (carbon_received), 1=sent (carbon_sent)
         """
-        import aiohttp
-        import mimetypes
-        import os
-        from datetime import datetime
-        from urllib.parse import urlparse
-
         try:
             # DEDUPLICATION: For sent files (direction=1), check if GUI already created record
             # GUI creates file_transfer immediately without URL, carbon provides the URL
@@ -263,150 +140,187 @@ class FileBarrel:
                     self.signals['message_received'].emit(self.account_id, counterpart_jid, False)
                     return
 
-            # Determine if URL is encrypted (aesgcm://)
-            is_aesgcm = file_url.startswith('aesgcm://')
-
-            # Extract filename from URL
-            if is_aesgcm:
-                # aesgcm://example.com/path/file.jpg#fragment
-                # Convert to https:// for download, keep fragment for decryption
-                url_parts = file_url[len('aesgcm://'):]
-                if '#' in url_parts:
-                    http_part, fragment = url_parts.split('#', 1)
-                else:
-                    http_part = url_parts
-                    fragment = None
-
-                download_url = f'https://{http_part}'
-                parsed = urlparse(download_url)
-            else:
-                download_url = file_url
-                parsed = urlparse(file_url)
-                fragment = None
-
-            # Extract filename from URL path
-            path_parts = parsed.path.rstrip('/').split('/')
-            url_filename = path_parts[-1] if path_parts else 'attachment'
-
-            # Generate storage path: {data_dir}/attachments/{account_id}/{counterpart_jid}/YYYY-mm-dd_HHMMSS.ext
-            from ...utils.paths import get_paths
-            paths = get_paths()
-
-            # Create counterpart-specific directory (automatically uses dev or XDG path)
-            attachments_base = paths.data_dir / 'attachments'
-            counterpart_dir = attachments_base / str(self.account_id) / counterpart_jid
-            counterpart_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
-
-            # Generate timestamped filename
-            dt = datetime.fromtimestamp(timestamp)
-            timestamp_str = dt.strftime('%Y-%m-%d_%H%M%S')
-
-            # Extract extension from original filename
-            _, ext = os.path.splitext(url_filename)
-            if not ext:
-                ext = '.bin'
-
-            local_filename = f'{timestamp_str}{ext}'
-            local_path = counterpart_dir / local_filename
-
-            if self.logger:
-                direction_str = "sent" if direction == 1 else "received"
-                self.logger.info(f"Downloading carbon {direction_str} file from {download_url} to {local_path}")
-
-            # Download file
-            async with aiohttp.ClientSession() as session:
-                async with session.get(download_url) as response:
-                    if response.status == 200:
-                        file_data = await response.read()
-
-                        # Decrypt if OMEMO encrypted
-                        if is_aesgcm and fragment:
-                            if self.logger:
-                                self.logger.info("Decrypting OMEMO-encrypted file")
-                            try:
-                                # Parse fragment for decryption (XEP-0454 format)
-                                # Fragment format: IV (24 hex chars) + key (64 hex chars) = 88 chars total
-                                from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
-
-                                if len(fragment) != 88:
-                                    raise ValueError(f"Invalid fragment length: {len(fragment)} (expected 88)")
-
-                                # Extract IV (first 24 hex chars = 12 bytes) and key (next 64 hex chars = 32 bytes)
-                                iv = bytes.fromhex(fragment[:24])    # 12 bytes
-                                key = bytes.fromhex(fragment[24:])   # 32 bytes
-
-                                # Last 16 bytes of file_data are the GCM auth tag
-                                tag = file_data[-16:]
-                                ciphertext = file_data[:-16]
-
-                                # Decrypt using AES-256-GCM
-                                cipher = Cipher(
-                                    algorithms.AES(key),
-                                    modes.GCM(iv, tag)
-                                )
-                                decryptor = cipher.decryptor()
-                                file_data = decryptor.update(ciphertext) + decryptor.finalize()
-
-                                if self.logger:
-                                    self.logger.info("File decrypted successfully")
-
-                            except Exception as e:
-                                if self.logger:
-                                    self.logger.error(f"Failed to decrypt file: {e}")
-                                raise
-
-                        # Write to file with secure permissions
-                        local_path.write_bytes(file_data)
-                        os.chmod(local_path, 0o600)
-
-                        file_size = len(file_data)
-
-                        if self.logger:
-                            self.logger.info(f"File downloaded: {local_path} ({file_size} bytes)")
-
-                        # Guess MIME type
-                        mime_type, _ = mimetypes.guess_type(local_filename)
-
-                        # Insert file_transfer + content_item atomically with deduplication
-                        file_transfer_id, content_item_id = self.db.insert_file_transfer_atomic(
-                            account_id=self.account_id,
-                            counterpart_id=jid_id,
-                            conversation_id=conversation_id,
-                            direction=direction,  # 0=received, 1=sent
-                            time=timestamp,
-                            local_time=timestamp,
-                            file_name=url_filename,
-                            path=str(local_path),
-                            mime_type=mime_type,
-                            size=file_size,
-                            state=2,  # state=2 (complete)
-                            encryption=1 if is_encrypted else 0,
-                            provider=0,  # provider=0 (HTTP Upload)
-                            is_carbon=1,  # is_carbon=1 (carbon copy from another device)
-                            url=file_url,
-                            message_id=message_id,
-                            origin_id=origin_id,
-                            stanza_id=stanza_id
-                        )
-
-                        if file_transfer_id is None:
-                            # Duplicate file, skip
-                            if self.logger:
-                                self.logger.info(f"Skipped duplicate carbon file: {url_filename}")
-                            return
-
-                        if self.logger:
-                            self.logger.info(f"Carbon file transfer record created (ID: {file_transfer_id})")
-
-                        # Emit signal to notify GUI (updates unread count, notifications, bold text)
-                        self.signals['message_received'].emit(self.account_id, counterpart_jid, False)
-
-                    else:
-                        if self.logger:
-                            self.logger.error(f"Failed to download carbon file: HTTP {response.status}")
-
+            self._receive_file(
+                jid_id=jid_id,
+                counterpart_jid=counterpart_jid,
+                file_url=file_url,
+                is_encrypted=is_encrypted,
+                timestamp=timestamp,
+                conversation_id=conversation_id,
+                direction=direction,
+                is_carbon=True,
+                message_id=message_id,
+                origin_id=origin_id,
+                stanza_id=stanza_id
+            )
         except Exception as e:
             if self.logger:
                 self.logger.error(f"Failed to handle carbon file: {e}")
                 import traceback
                 self.logger.error(traceback.format_exc())
+
+    def _receive_file(self, jid_id: int, counterpart_jid: str, file_url: str, is_encrypted: bool,
+                      timestamp: int, conversation_id: int, direction: int, is_carbon: bool,
+                      message_id: Optional[str], origin_id: Optional[str], stanza_id: Optional[str]):
+        """
+        Create the file_transfer row (state=1) and start the download task.
+
+        Duplicates (MAM replays) are not downloaded again, unless the earlier
+        download failed - then it's resumed into the same file.
+        """
+        import mimetypes
+        import os
+        from datetime import datetime
+        from urllib.parse import urlparse
+        from ...utils.file_download import parse_attachment_url
+
+        # aesgcm://example.com/path/file.jpg#fragment -> https:// + key material
+        download_url, key, iv = parse_attachment_url(file_url)
+
+        # Extract filename from URL path
+        path_parts = urlparse(download_url).path.rstrip('/').split('/')
+        url_filename = path_parts[-1] if path_parts else 'attachment'
+
+        # Generate storage path: {data_dir}/attachments/{account_id}/{counterpart_jid}/YYYY-mm-dd_HHMMSS.ext
+        from ...utils.paths import get_paths
+        paths = get_paths()
+
+        # Create counterpart-specific directory (automatically uses dev or XDG path)
+        attachments_base = paths.data_dir / 'attachments'
+        counterpart_dir = attachments_base / str(self.account_id) / counterpart_jid
+        counterpart_dir.mkdir(parents=True, exist_ok=True, mode=0o700)
+
+        # Generate timestamped filename
+        dt = datetime.fromtimestamp(timestamp)
+        timestamp_str = dt.strftime('%Y-%m-%d_%H%M%S')
+
+        # Extract extension from original filename
+        _, ext = os.path.splitext(url_filename)
+        if not ext:
+            ext = '.bin'
+
+        local_filename = f'{timestamp_str}{ext}'
+        local_path = counterpart_dir / local_filename
+
+        # Guess MIME type
+        mime_type, _ = mimetypes.guess_type(local_filename)
+
+        # Insert file_transfer + content_item atomically with deduplication
+        # (before downloading, so duplicates never hit the network)
+        file_transfer_id, content_item_id = self.db.insert_file_transfer_atomic(
+            account_id=self.account_id,
+            counterpart_id=jid_id,
+            conversation_id=conversation_id,
+            direction=direction,  # 0=received, 1=sent
+            time=timestamp,
+            local_time=timestamp,
+            file_name=url_filename,
+            path=str(local_path),
+            mime_type=mime_type,
+            size=None,
+            state=1,  # state=1 (transferring)
+            encryption=1 if is_encrypted else 0,
+            provider=0,  # provider=0 (HTTP Upload)
+            is_carbon=1 if is_carbon else 0,
+            url=file_url,
+            message_id=message_id,
+            origin_id=origin_id,
+            stanza_id=stanza_id
+        )
+
+        if file_transfer_id is None:
+            # Duplicate file - resume it if its download never completed
+            existing = self.db.fetchone("""
+                SELECT ft.id, ft.path, ci.id AS content_item_id
+                FROM file_transfer ft
+                JOIN content_item ci ON ci.content_type = 2 AND ci.foreign_id = ft.id
+                WHERE ft.account_id = ? AND ft.url = ? AND ft.state = 3 AND ft.path IS NOT NULL
+                ORDER BY ft.id DESC
+                LIMIT 1
+            """, (self.account_id, file_url))
+            if not existing or existing['id'] in self._downloads:
+                if self.logger:
+                    self.logger.info(f"Skipped duplicate file: {url_filename}")
+                return
+
+            file_transfer_id = existing['id']
+            content_item_id = existing['content_item_id']
+            local_path = Path(existing["path"])
+            self.db.execute("UPDATE file_transfer SET state = 1 WHERE id = ?", (file_transfer_id,))
+            self.db.commit()
+            if self.logger:
+                self.logger.info(f"Retrying failed download: {url_filename} (ID: {file_transfer_id})")
+        else:
+            if self.logger:
+                self.logger.info(f"File transfer record created (ID: {file_transfer_id})")
+
+            # Emit signal to notify GUI (updates unread count, notifications, bold text)
+            self.signals['message_received'].emit(self.account_id, counterpart_jid, False)
+
+        if self.logger:
+            self.logger.info(f"Downloading file from {download_url} to {local_path}")
+
+        task = asyncio.create_task(self._download(
+            file_transfer_id, content_item_id, counterpart_jid, download_url, local_path, key, iv
+        ))
+        self._downloads[file_transfer_id] = task
+        task.add_done_callback(lambda _t: self._downloads.pop(file_transfer_id, None))
+
+    async def _download(self, file_transfer_id: int, content_item_id: int, counterpart_jid: str,
+                        download_url: str, local_path, key: Optional[bytes], iv: Optional[bytes]):
+        """
+        Stream a file to disk and complete (state=2) or fail (state=3) its row.
+
+        Progress is emitted as file_transfer_progress (rate limited), the result
+        as file_transfer_finished.
+        """
+        from ...utils.file_download import download_to_file
+
+        last_emit = 0.0
+
+        def on_progress(received: int, total: Optional[int]):
+            nonlocal last_emit
+            now = time.monotonic()
+            if now - last_emit < PROGRESS_INTERVAL:
+                return
+            last_emit = now
+            self.signals['file_transfer_progress'].emit(
+                self.account_id, counterpart_jid, content_item_id, received, total
+            )
+
+        state = 3  # state=3 (failed) unless the download completes
+        try:
+            # Account's pooled session (keep-alive, same proxy as the XMPP stream)
+            if not self.client:
+                raise RuntimeError("No XMPP client (account offline)")
+            file_size = await download_to_file(self.client.http_client.session, download_url,
+                                               local_path, key, iv, progress=on_progress)
+            state = 2  # state=2 (complete)
+            self.db.execute("UPDATE file_transfer SET state = ?, size = ? WHERE id = ?",
+                            (state, file_size, file_transfer_id))
+            self.db.commit()
+
+            if self.logger:
+                self.logger.info(f"File downloaded: {local_path} ({file_size} bytes)")
+
+        except asyncio.CancelledError:
+            if self.logger:
+                self.logger.info(f"Download cancelled: {local_path}")
+            raise
+
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Failed to download file {download_url}: {e}")
+
+        finally:
+            if state != 2:
+                self.db.execute("UPDATE file_transfer SET state = ? WHERE id = ?", (state, file_transfer_id))
+                self.db.commit()
+            self.signals['file_transfer_finished'].emit(
+                self.account_id, counterpart_jid, content_item_id, state
+            )
+
+    def cancel_downloads(self):
+        """Cancel running downloads (partial files are kept for resume)."""
+        for task in list(self._downloads.values()):
+            task.cancel()
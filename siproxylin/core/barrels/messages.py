@@ -11,8 +11,14 @@ Responsibilities:
 """
 
 import logging
-from typing import Optional
+import asyncio
+from typing import Dict, Optional
 from .message_reactions import MessageReactions
+from ...services.receipt_handler import COALESCE_DELAY
+
+
+# Per-contact MAM catch-up queries in flight at once (independent archive queries)
+MAM_CATCHUP_CONCURRENCY = 4
 
 
 class MessageBarrel:
@@ -37,8 +43,13 @@ class MessageBarrel:
         self.logger = logger
         self.signals = signals
         self.receipt_handler = receipt_handler
+        self.receipt_handler.on_update = self._on_receipts_updated
         self.files_barrel = files_barrel
 
+        # Chat states coalesced per contact (only the latest state is emitted)
+        self._pending_chat_states: Dict[str, str] = {}
+        self._chat_state_handle: Optional[asyncio.TimerHandle] = None
+
         # Reactions handler (XEP-0444) - passes self to access dynamic client reference
         self.reactions = MessageReactions(self)
 
@@ -721,9 +732,8 @@ class MessageBarrel:
             self.logger.info(f"Delivery receipt from {from_jid} for message {message_id}")
 
         try:
+            # Batched - receipts_updated is emitted once the batch is applied
             self.receipt_handler.on_delivery_receipt(self.account_id, from_jid, message_id)
-            # Emit signal to refresh UI immediately (receipt update, not new message)
-            self.signals['message_received'].emit(self.account_id, from_jid, True)
         except Exception as e:
             if self.logger:
                 self.logger.error(f"Failed to process delivery receipt: {e}")
@@ -747,8 +757,6 @@ class MessageBarrel:
             if marker_type == 'displayed':
                 # Displayed marker - mark as READ (cumulative)
                 self.receipt_handler.on_displayed_marker(self.account_id, from_jid, message_id)
-                # Emit signal to refresh UI immediately (marker update, not new message)
-                self.signals['message_received'].emit(self.account_id, from_jid, True)
             elif marker_type == 'received':
                 # Received marker - redundant with delivery receipt, ignore
                 self.receipt_handler.on_received_marker(self.account_id, from_jid, message_id)
@@ -797,8 +805,37 @@ class MessageBarrel:
         if self.logger:
             self.logger.debug(f"Chat state from {from_jid}: {state}")
 
+        # Coalesce bursts (e.g. composing/paused flapping) - keep the latest per contact
+        self._pending_chat_states[from_jid] = state
+        if self._chat_state_handle is not None:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._flush_chat_states()
+            return
+        self._chat_state_handle = loop.call_later(COALESCE_DELAY, self._flush_chat_states)
+
+    def _flush_chat_states(self):
+        """Emit the latest chat state of each contact seen since the last flush."""
+        self._chat_state_handle = None
+        pending, self._pending_chat_states = self._pending_chat_states, {}
+
         # Emit signal for GUI to update typing indicator
-        self.signals['chat_state_changed'].emit(self.account_id, from_jid, state)
+        for from_jid, state in pending.items():
+            self.signals['chat_state_changed'].emit(self.account_id, from_jid, state)
+
+    def _on_receipts_updated(self, account_id: int, jid: str, changes: Dict[int, int]):
+        """
+        Handle a flushed batch of receipts/markers/ACKs for one conversation.
+
+        Args:
+            account_id: Account ID
+            jid: Counterpart bare JID
+            changes: {content_item_id: marked} of the rows that changed
+        """
+        self.signals['receipts_updated'].emit(account_id, jid, changes)
 
     def _on_server_ack(self, ack_info):
         """
@@ -814,21 +851,8 @@ class MessageBarrel:
             self.logger.info(f"Server ACK for message {message_id}")
 
         try:
+            # Batched - receipts_updated carries the conversation JID
             self.receipt_handler.on_server_ack(self.account_id, message_id)
-
-            # Get counterpart JID to emit signal for UI refresh
-            msg_row = self.db.fetchone(
-                """
-                SELECT j.bare_jid
-                FROM message m
-                JOIN jid j ON m.counterpart_id = j.id
-                WHERE m.account_id = ? AND m.origin_id = ?
-                """,
-                (self.account_id, message_id)
-            )
-
-            if msg_row:
-                self.signals['message_received'].emit(self.account_id, msg_row['bare_jid'], True)  # Server ACK, not new message
         except Exception as e:
             if self.logger:
                 self.logger.error(f"Failed to process server ACK: {e}")
@@ -980,16 +1004,20 @@ class MessageBarrel:
             if self.logger:
                 self.logger.info(f"Found {len(conversations)} active private chats for MAM catchup")
 
-            for conv in conversations:
-                contact_jid = conv['bare_jid']
-                jid_id = conv['jid_id']
-                latest_time = conv['latest_time']
+            semaphore = asyncio.Semaphore(MAM_CATCHUP_CONCURRENCY)
 
-                try:
-                    await self._retrieve_private_chat_history(contact_jid, jid_id, latest_time, max_messages_per_chat)
-                except Exception as e:
-                    if self.logger:
-                        self.logger.warning(f"Failed to catch up messages for {contact_jid}: {e}")
+            async def catchup(conv):
+                contact_jid = conv['bare_jid']
+                async with semaphore:
+                    try:
+                        await self._retrieve_private_chat_history(
+                            contact_jid, conv['jid_id'], conv['latest_time'], max_messages_per_chat
+                        )
+                    except Exception as e:
+                        if self.logger:
+                            self.logger.warning(f"Failed to catch up messages for {contact_jid}: {e}")
+
+            await asyncio.gather(*(catchup(conv) for conv in conversations))
 
             if self.logger:
                 self.logger.info("Private chat MAM catchup completed")
@@ -12,12 +12,14 @@ Responsibilities:
 """
 
 import logging
+import asyncio
 import base64
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timezone
 from dataclasses import dataclass
 
 from ...db.database import get_db
+from ...db.conversation_registry import get_conversation_registry
 
 
 # =============================================================================
@@ -211,7 +213,7 @@ class MucBarrel:
                 self.logger.info(f"Updated bookmark name for {room_jid} to '{room_name}'")
 
             # Emit roster_updated to refresh GUI
-            self.signals['roster_updated'].emit(self.account_id)
+            self.signals['roster_updated'].emit(self.account_id, [room_jid])
 
     async def fetch_and_store_room_config(self, room_jid: str) -> bool:
         """
@@ -318,6 +320,20 @@ class MucBarrel:
                 self.logger.error(traceback.format_exc())
             return False
 
+    def expect_room_joins(self):
+        """
+        Mark all configured rooms for MAM catch-up on session start.
+
+        DrunkXMPP joins every room in client.rooms on session start; each
+        room's history is then fetched as soon as its join is confirmed
+        (on_muc_joined), instead of for all rooms after all joins.
+        """
+        if not self.client:
+            return
+        self._pending_mam_rooms.update(self.client.rooms)
+        if self.logger and self.client.rooms:
+            self.logger.debug(f"{len(self.client.rooms)} rooms marked for MAM retrieval after join")
+
     async def _perform_room_join(self, room_jid: str, nick: str, password: str = None) -> bool:
         """
         Core room join logic (no metadata fetching).
@@ -373,7 +389,7 @@ class MucBarrel:
         This is called by DrunkXMPP after status code 110 presence is received,
         ensuring OMEMO device sessions are established before MAM retrieval.
 
-        Fetches room metadata (features, config) and then retrieves MAM history.
+        Fetches room metadata (features, config) and MAM history concurrently.
 
         Args:
             room_jid: Room JID
@@ -382,8 +398,21 @@ class MucBarrel:
         if self.logger:
             self.logger.debug(f"MUC join complete for {room_jid} as {nick}")
 
+        # Metadata (features, config) and MAM history are independent requests:
+        # run them concurrently so history starts arriving right after the join
+        await asyncio.gather(
+            self._fetch_room_metadata(room_jid),
+            self._retrieve_pending_history(room_jid),
+        )
+
+    async def _fetch_room_metadata(self, room_jid: str):
+        """
+        Fetch room features and configuration after join (we're now an occupant).
+
+        Args:
+            room_jid: Room JID
+        """
         # Phase 1: Fetch room metadata (features and config)
-        # Do this AFTER join is confirmed (we're now an occupant)
         try:
             # Query room features (disco#info) for OMEMO compatibility
             room_features = await self.client.get_room_features(room_jid)
@@ -413,17 +442,25 @@ class MucBarrel:
             if self.logger:
                 self.logger.debug(f"Could not fetch room config for {room_jid}: {e}")
 
-        # Phase 3: Retrieve MAM history (if this was a new join)
-        if room_jid in self._pending_mam_rooms:
-            self._pending_mam_rooms.remove(room_jid)
-            if self.logger:
-                self.logger.info(f"Retrieving MAM for {room_jid} (after join complete)")
+    async def _retrieve_pending_history(self, room_jid: str):
+        """
+        Retrieve MAM history if the room was marked for it (new join / session start).
 
-            try:
-                await self._retrieve_muc_history(room_jid)
-            except Exception as e:
-                if self.logger:
-                    self.logger.error(f"Failed to retrieve MAM for {room_jid}: {e}")
+        Args:
+            room_jid: Room JID
+        """
+        if room_jid not in self._pending_mam_rooms:
+            return
+
+        self._pending_mam_rooms.remove(room_jid)
+        if self.logger:
+            self.logger.info(f"Retrieving MAM for {room_jid} (after join complete)")
+
+        try:
+            await self._retrieve_muc_history(room_jid)
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Failed to retrieve MAM for {room_jid}: {e}")
 
     async def _retrieve_muc_history(self, room_jid: str, max_messages: Optional[int] = None):
         """
@@ -745,6 +782,7 @@ class MucBarrel:
 
         try:
             db = get_db()
+            changed_jids = []  # New bookmarks or changed name/autojoin
 
             for bm in bookmarks:
                 room_jid = bm.get('jid')
@@ -771,6 +809,10 @@ class MucBarrel:
                     else:
                         self.logger.info(f"➕ NEW bookmark from server: {room_jid} (autojoin={autojoin})")
 
+                if (not existing or existing['autojoin'] != (1 if autojoin else 0)
+                        or (name and name != existing['name'])):
+                    changed_jids.append(room_jid)
+
                 # Get or create JID entry
                 jid_row = db.fetchone("SELECT id FROM jid WHERE bare_jid = ?", (room_jid,))
                 if jid_row:
@@ -809,8 +851,9 @@ class MucBarrel:
                 # We don't delete from local DB - server is source of truth
                 # But we could detect this as a phone "leave room" action
 
-            # Emit roster_updated to refresh GUI
-            self.signals['roster_updated'].emit(self.account_id)
+            # Emit roster_updated to refresh GUI (only changed bookmarks)
+            if changed_jids:
+                self.signals['roster_updated'].emit(self.account_id, changed_jids)
 
             if self.logger:
                 self.logger.info(f"✅ Bookmarks synced successfully ({len(bookmarks)} on server, {len(removed_jids)} removed)")
@@ -869,7 +912,7 @@ class MucBarrel:
 
         # Emit roster_updated IMMEDIATELY after disco_cache update
         # This ensures encryption button updates even if bookmark update fails
-        self.signals['roster_updated'].emit(self.account_id)
+        self.signals['roster_updated'].emit(self.account_id, [room_jid])
 
         # Update bookmark name in database
         try:
@@ -944,6 +987,24 @@ class MucBarrel:
             if self.logger:
                 self.logger.warning("muc_join_error signal not registered - error not propagated to UI")
 
+    async def on_participants_changed(self, room_jid: str, changes: Dict):
+        """
+        Forward coalesced occupant changes to the GUI.
+
+        Called by DrunkXMPP at most once per room per coalescing window
+        (MucRosterTracker), so views apply a delta instead of polling.
+
+        Args:
+            room_jid: Room JID
+            changes: {nick: Occupant or None} - None means the nick left
+        """
+        participants = {
+            nick: Participant(nick=o.nick, jid=o.jid, role=o.role, affiliation=o.affiliation) if o else None
+            for nick, o in changes.items()
+        }
+        if 'muc_participants_changed' in self.signals:
+            self.signals['muc_participants_changed'].emit(self.account_id, room_jid, participants)
+
     # =========================================================================
     # MUC Service Layer API (for GUI abstraction)
     # =========================================================================
@@ -1024,15 +1085,7 @@ class MucBarrel:
                 membersonly = config['membersonly']
 
             # Get participant count from live roster
-            participant_count = 0
-            if self.client and room_jid in self.client.joined_rooms:
-                try:
-                    xep_0045 = self.client.plugin['xep_0045']
-                    roster = xep_0045.get_roster(room_jid)
-                    if roster:
-                        participant_count = len(roster)
-                except Exception:
-                    pass  # Non-critical, just skip count
+            participant_count = self.get_participant_count(room_jid) or 0
 
             # Build RoomInfo with in-memory config
             return RoomInfo(
@@ -1143,7 +1196,8 @@ class MucBarrel:
                 raise RuntimeError(f"Room {room_jid} not found in database")
 
             jid_id = jid_row['id']
-            conversation_id = self.db.get_or_create_conversation(self.account_id, jid_id, 1)
+            conversations = get_conversation_registry()
+            conversation_id = conversations.get_or_create(self.account_id, jid_id, room_jid, 1).id
 
             # Update conversation table fields
             conv_updates = {}
@@ -1157,13 +1211,7 @@ class MucBarrel:
                 conv_updates['encryption'] = int(kwargs['encryption'])
 
             if conv_updates:
-                set_clause = ', '.join([f"{key} = ?" for key in conv_updates.keys()])
-                values = list(conv_updates.values()) + [conversation_id]
-                self.db.execute(f"""
-                    UPDATE conversation
-                    SET {set_clause}
-                    WHERE id = ?
-                """, values)
+                conversations.update(conversation_id, commit=False, **conv_updates)
 
             # Update conversation_settings
             if 'local_alias' in kwargs:
@@ -1232,7 +1280,7 @@ class MucBarrel:
             self.db.commit()
 
             # Refresh GUI roster to update star indicator
-            self.signals['roster_updated'].emit(self.account_id)
+            self.signals['roster_updated'].emit(self.account_id, [room_jid])
 
             if self.logger:
                 self.logger.info(f"Updated settings for room {room_jid}: {kwargs}")
@@ -1245,7 +1293,7 @@ class MucBarrel:
 
     def get_participants(self, room_jid: str) -> List[Participant]:
         """
-        Get list of current participants from live slixmpp roster.
+        Get list of current participants from the live occupant roster.
 
         Args:
             room_jid: Room JID
@@ -1259,32 +1307,15 @@ class MucBarrel:
             if not self.client or room_jid not in self.client.joined_rooms:
                 return participants
 
-            # Query slixmpp's in-memory MUC roster (XEP-0045)
-            xep_0045 = self.client.plugin['xep_0045']
-            roster = xep_0045.get_roster(room_jid)
-
+            # Occupants tracked from presence by DrunkXMPP (XEP-0045)
+            roster = self.client.muc_roster.get(room_jid)
             if not roster:
                 return participants
 
-            # Convert roster dict to list of Participant objects
-            from slixmpp.jid import JID
-            room_jid_obj = JID(room_jid)
-
-            for nick in roster:
-                # Get real JID if available (depends on room configuration)
-                real_jid_str = xep_0045.get_jid_property(room_jid_obj, nick, 'jid')
-                bare_jid = str(real_jid_str).split('/')[0] if real_jid_str else None
-
-                # Get role and affiliation from presence
-                role = xep_0045.get_jid_property(room_jid_obj, nick, 'role') or 'participant'
-                affiliation = xep_0045.get_jid_property(room_jid_obj, nick, 'affiliation') or 'none'
-
-                participants.append(Participant(
-                    nick=nick,
-                    jid=bare_jid,
-                    role=role,
-                    affiliation=affiliation
-                ))
+            participants = [
+                Participant(nick=o.nick, jid=o.jid, role=o.role, affiliation=o.affiliation)
+                for o in roster.occupants.values()
+            ]
 
             # Sort by nickname (case-insensitive)
             participants.sort(key=lambda p: p.nick.lower())
@@ -1295,6 +1326,21 @@ class MucBarrel:
 
         return participants
 
+    def get_participant_count(self, room_jid: str) -> Optional[int]:
+        """
+        Get number of distinct participants (deduplicated by real JID).
+
+        Args:
+            room_jid: Room JID
+
+        Returns:
+            Participant count, or None if not joined or no roster yet
+        """
+        if not self.client or room_jid not in self.client.joined_rooms:
+            return None
+        roster = self.client.muc_roster.get(room_jid)
+        return roster.count if roster else None
+
     def get_own_affiliation(self, room_jid: str) -> Optional[str]:
         """
         Get our own affiliation in a room.
@@ -1617,7 +1663,7 @@ class MucBarrel:
                         self.logger.warning(f"Failed to sync bookmark to server: {e}")
 
             # Refresh GUI
-            self.signals['roster_updated'].emit(self.account_id)
+            self.signals['roster_updated'].emit(self.account_id, [room_jid])
 
         except Exception as e:
             self.db.execute("ROLLBACK")
@@ -1705,12 +1751,13 @@ class MucBarrel:
                           (self.account_id, jid_id))
 
             self.db.commit()
+            get_conversation_registry().forget_jid(self.account_id, room_jid)
 
             if self.logger:
                 self.logger.debug(f"Cleaned local database for destroyed room: {room_jid}")
 
         # Refresh UI
-        self.signals['roster_updated'].emit(self.account_id)
+        self.signals['roster_updated'].emit(self.account_id, [room_jid])
 
         if self.logger:
             self.logger.info(f"Room destroyed and cleaned up: {room_jid}")
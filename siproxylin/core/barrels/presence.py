@@ -11,6 +11,8 @@ import logging
 import asyncio
 from typing import Optional
 
+from slixmpp.jid import JID
+
 
 class PresenceBarrel:
     """Manages roster and presence for an account."""
@@ -126,113 +128,80 @@ class PresenceBarrel:
         """
         Handle roster updates from XMPP server.
 
+        With roster versioning (XEP-0237) the login result is either empty
+        (cache is current), the full roster, or empty followed by pushes for
+        each change. Results and pushes are applied to the DB as a set
+        difference (see Database.apply_roster), so an unchanged roster writes
+        nothing.
+
         Args:
-            event: Roster update event from slixmpp
+            event: Roster IQ from slixmpp (get result or roster push)
             fetch_avatars_callback: Callback to trigger avatar fetching (callable)
         """
         if not self.client:
             return
 
-        if self.logger:
-            self.logger.info("Roster update received, syncing to database...")
+        iq_type = event['type']
+        if iq_type not in ('result', 'set'):
+            return
 
         try:
-            # Get roster from slixmpp
-            roster = self.client.client_roster
-
-            # Track JIDs from server roster (excluding self)
-            server_jids = set()
-
-            # Iterate through roster items
-            for jid_str in roster:
-                if jid_str == self.client.boundjid.bare:
-                    # Skip self
+            version = event['roster']['ver'] or None
+            own_jid = self.client.boundjid.bare
+
+            items = {}
+            removed = []
+            for jid, item in event['roster']['items'].items():
+                bare_jid = JID(jid).bare
+                if bare_jid == own_jid:
                     continue
+                if item['subscription'] == 'remove':
+                    removed.append(bare_jid)
+                    continue
+                items[bare_jid] = {
+                    'name': item['name'] or '',
+                    'subscription': item['subscription'] or 'none',
+                    'ask': item['ask'] or None,
+                }
+
+            is_push = iq_type == 'set'
+            sent_version = self.client.roster_version and 'rosterver' in self.client.features
+            if not is_push and not items and sent_version:
+                # Empty result to our cached version: nothing changed while we were away
+                # (any changes arrive as pushes)
+                if self.logger:
+                    self.logger.info(f"Roster unchanged since version {self.client.roster_version}")
+                changed, gone = [], []
+            else:
+                changed, gone = self.db.apply_roster(
+                    self.account_id, items, removed=removed, version=version, replace=not is_push
+                )
+
+                if not is_push:
+                    # A full result replaces the roster; slixmpp only merges it
+                    roster = self.client.client_roster
+                    for bare_jid in gone:
+                        if bare_jid in roster:
+                            del roster[bare_jid]
 
-                # Add to server JIDs set
-                server_jids.add(jid_str)
-
-                # Get roster item info
-                item = roster[jid_str]
-                try:
-                    name = item['name'] or ''
-                except (KeyError, TypeError):
-                    name = ''
-
-                try:
-                    subscription = item['subscription'] or 'none'
-                except (KeyError, TypeError):
-                    subscription = 'none'
-
-                try:
-                    ask = item['ask'] or None
-                except (KeyError, TypeError):
-                    ask = None
-
-                # Convert text subscription to boolean flags
-                we_see_their_presence = 1 if subscription in ('to', 'both') else 0
-                they_see_our_presence = 1 if subscription in ('from', 'both') else 0
-                we_requested_subscription = 1 if ask == 'subscribe' else 0
-
-                # Get or create JID entry
-                jid_row = self.db.fetchone("SELECT id FROM jid WHERE bare_jid = ?", (jid_str,))
-                if jid_row:
-                    jid_id = jid_row['id']
-                else:
-                    cursor = self.db.execute("INSERT INTO jid (bare_jid) VALUES (?)", (jid_str,))
-                    jid_id = cursor.lastrowid
-
-                # Insert/update roster entry with boolean fields
-                self.db.execute("""
-                    INSERT INTO roster (account_id, jid_id, name, subscription,
-                                      we_see_their_presence, they_see_our_presence,
-                                      we_requested_subscription)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ON CONFLICT (account_id, jid_id) DO UPDATE SET
-                        name = excluded.name,
-                        subscription = excluded.subscription,
-                        we_see_their_presence = excluded.we_see_their_presence,
-                        they_see_our_presence = excluded.they_see_our_presence,
-                        we_requested_subscription = excluded.we_requested_subscription
-                """, (self.account_id, jid_id, name, subscription,
-                      we_see_their_presence, they_see_our_presence, we_requested_subscription))
-
-            # Remove contacts from local DB that are no longer in server roster
-            # This handles contacts deleted from other devices or via other clients
-            # TODO: Proper event-driven architecture - hook roster properly into the
-            #       protocol callbacks rather than optimistic GUI updates. Currently
-            #       GUI deletes from DB immediately, then this sync runs. Should be:
-            #       GUI sends XMPP IQ → server processes → roster push → callback updates DB → GUI updates
-            local_contacts = self.db.fetchall("""
-                SELECT r.id, j.bare_jid
-                FROM roster r
-                JOIN jid j ON r.jid_id = j.id
-                WHERE r.account_id = ?
-            """, (self.account_id,))
-
-            for row in local_contacts:
-                jid_str = row['bare_jid']
-                roster_id = row['id']
-
-                # If contact is in local DB but NOT in server roster, delete it
-                if jid_str not in server_jids:
-                    if self.logger:
-                        self.logger.info(f"Removing contact {jid_str} - no longer in server roster")
-
-                    # Delete from roster (messages/history remain untouched by this sync)
-                    self.db.execute("DELETE FROM roster WHERE id = ?", (roster_id,))
-
-            self.db.commit()
+                if self.logger:
+                    kind = "push" if is_push else f"full roster ({len(items)} contacts)"
+                    self.logger.info(
+                        f"Roster {kind} applied: {len(changed)} added/changed, "
+                        f"{len(gone)} removed (ver={version})"
+                    )
 
-            if self.logger:
-                self.logger.info(f"Roster synced: {len(roster)} contacts")
+            # Later results on this connection (session resume) are relative to this version
+            if version:
+                self.client.roster_version = version
 
-            # Emit signal to notify GUI
-            self.signals['roster_updated'].emit(self.account_id)
+            if changed or gone:
+                # Emit signal to notify GUI (only these rows are re-read)
+                self.signals['roster_updated'].emit(self.account_id, changed + gone)
 
-            # Fetch avatars for roster contacts in background
+            # Fetch avatars for roster contacts in background (after login only, not per push)
             # (AvatarBarrel handles its own throttling - once per minute max)
-            if fetch_avatars_callback:
+            if fetch_avatars_callback and not is_push:
                 asyncio.create_task(fetch_avatars_callback())
 
         except Exception as e:
@@ -364,4 +333,4 @@ class PresenceBarrel:
         self.signals['subscription_changed'].emit(self.account_id, from_jid, change_type)
 
         # Trigger roster refresh
-        self.signals['roster_updated'].emit(self.account_id)
+        self.signals['roster_updated'].emit(self.account_id, [from_jid])
@@ -18,6 +18,7 @@ from PySide6.QtCore import QObject, Signal
 # Import from refactored drunk_xmpp package
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from drunk_xmpp import DrunkXMPP, MessageMetadata
+from drunk_xmpp.startup import StartupPipeline
 try:
     from drunk_call_hook import CallBridge
     from drunk_call_hook.protocol.jingle import JingleAdapter
@@ -32,6 +33,7 @@ from ..db.database import get_db
 from ..db.omemo_storage import OMEMOStorageDB
 from ..utils import setup_account_logger, get_account_logger, generate_resource
 from ..utils.paths import get_paths
+from ..utils.account_connect import connect_concurrently, ACCOUNT_CONNECT_CONCURRENCY, ACCOUNT_CONNECT_TIMEOUT
 from ..services.receipt_handler import ReceiptHandler
 from ..services.message_retry import get_retry_handler
 from .barrels.connection import ConnectionBarrel
@@ -55,14 +57,19 @@ class XMPPAccount(QObject):
     # Signals for connection state changes
     connection_state_changed = Signal(int, str)  # (account_id, state: 'connecting'|'connected'|'disconnected'|'error')
     connection_error = Signal(int, str)  # (account_id, error_message)
-    roster_updated = Signal(int)  # (account_id)
+    connect_finished = Signal(int, str, int, int)  # (account_id, outcome: 'connected'|'auth_failed'|'failed'|'timeout', done, total) - startup bring-up progress
+    roster_updated = Signal(int, list)  # (account_id, bare JIDs) - roster/bookmark entries that changed
     message_received = Signal(int, str, bool)  # (account_id, from_jid, is_marker) - new message or marker/receipt update
     chat_state_changed = Signal(int, str, str)  # (account_id, from_jid, state) - typing indicators
+    receipts_updated = Signal(int, str, dict)  # (account_id, jid, {content_item_id: marked}) - batched receipts/markers/ACKs
+    file_transfer_progress = Signal(int, str, int, object, object)  # (account_id, jid, content_item_id, received_bytes, total_bytes or None)
+    file_transfer_finished = Signal(int, str, int, int)  # (account_id, jid, content_item_id, state: 2=complete, 3=failed)
     presence_changed = Signal(int, str, str)  # (account_id, jid, presence) - contact presence changed
     muc_invite_received = Signal(int, str, str, str, str)  # (account_id, room_jid, inviter_jid, reason, password)
     muc_join_error = Signal(str, str, str)  # (room_jid, friendly_message, server_error_text)
     muc_join_success = Signal(int, str)  # (account_id, room_jid)
     muc_role_changed = Signal(int, str, str, str)  # (account_id, room_jid, old_role, new_role)
+    muc_participants_changed = Signal(int, str, dict)  # (account_id, room_jid, {nick: Participant or None}) - coalesced occupant changes
     avatar_updated = Signal(int, str)  # (account_id, jid) - avatar fetched/updated
     nickname_updated = Signal(int, str, str)  # (account_id, jid, nickname) - contact nickname updated (XEP-0172)
     subscription_request_received = Signal(int, str)  # (account_id, from_jid) - incoming subscription request
@@ -70,7 +77,7 @@ class XMPPAccount(QObject):
 
     # Message retry signals (Phase 4)
     retry_started = Signal(int)  # (account_id)
-    retry_completed = Signal(int, dict)  # (account_id, stats)
+    retry_completed = Signal(int, dict)  # (account_id, stats) - also progress while stats["remaining"] > 0
     retry_failed = Signal(int, str)  # (account_id, error_msg)
 
     # Call signals (DrunkCALL integration)
@@ -79,6 +86,7 @@ class XMPPAccount(QObject):
     call_accepted = Signal(int, str)  # (account_id, session_id)
     call_terminated = Signal(int, str, str, str)  # (account_id, session_id, reason, peer_jid)
     call_state_changed = Signal(int, str, str)  # (account_id, session_id, state)
+    call_stats_updated = Signal(int, str, dict)  # (account_id, session_id, stats) - pushed by StreamStats
 
     def __init__(self, account_id: int, account_data: dict):
         """
@@ -124,14 +132,19 @@ class XMPPAccount(QObject):
             'nickname_updated': self.nickname_updated,
             'message_received': self.message_received,
             'chat_state_changed': self.chat_state_changed,
+            'receipts_updated': self.receipts_updated,
+            'file_transfer_progress': self.file_transfer_progress,
+            'file_transfer_finished': self.file_transfer_finished,
             'muc_join_error': self.muc_join_error,
             'muc_role_changed': self.muc_role_changed,
+            'muc_participants_changed': self.muc_participants_changed,
             'muc_invite_received': self.muc_invite_received,
             'call_incoming': self.call_incoming,
             'call_initiated': self.call_initiated,
             'call_accepted': self.call_accepted,
             'call_terminated': self.call_terminated,
             'call_state_changed': self.call_state_changed,
+            'call_stats_updated': self.call_stats_updated,
         }
 
         # Initialize ConnectionBarrel (handles connection/disconnection)
@@ -260,9 +273,11 @@ class XMPPAccount(QObject):
             'on_muc_joined_callback': self._on_muc_joined,
             'on_muc_join_error_callback': self.muc.on_muc_join_error,
             'on_muc_role_changed_callback': self._on_muc_role_changed,
+            'on_muc_participants_changed_callback': self.muc.on_participants_changed,
             'on_room_config_changed_callback': self.muc.on_room_config_changed,
             'on_message_correction_callback': self.messages._on_message_correction,
             'on_avatar_update_callback': self.avatars.on_avatar_update,
+            'on_avatar_hash_callback': self.avatars.on_avatar_hash,
             'on_nickname_update_callback': self._on_nickname_update,
             'on_reaction_callback': self.messages._on_reaction,
             'on_subscription_request_callback': self._on_subscription_request,
@@ -277,9 +292,25 @@ class XMPPAccount(QObject):
         # Delegate to ConnectionBarrel
         self.connection.connect(callbacks)
 
+    async def connect_and_wait(self, timeout: float = ACCOUNT_CONNECT_TIMEOUT) -> str:
+        """
+        Connect and wait until the session starts or the attempt fails.
+
+        Args:
+            timeout: Seconds to wait for the outcome
+
+        Returns:
+            'connected', 'auth_failed', 'failed' or 'timeout'
+        """
+        self.connect()
+        if not self.client:
+            return 'failed'  # Client could not be created (logged by ConnectionBarrel)
+        return await self.client.wait_for_session(timeout)
+
     def disconnect(self):
         """Disconnect from XMPP server - delegates to ConnectionBarrel."""
         call_bridge = self.calls.call_bridge if hasattr(self, 'calls') else None
+        self.files.cancel_downloads()
         self.connection.disconnect(call_bridge=call_bridge)
 
     def is_connected(self) -> bool:
@@ -397,13 +428,15 @@ class XMPPAccount(QObject):
             self.retry_started.emit(self.account_id)
 
             # Call retry handler (pass THIS account's XMPP client to ensure proper routing)
+            # Intermediate stats ('remaining' > 0) report progress through the same signal
             stats = await self.retry_handler.retry_pending_messages_for_account(
                 account_id=self.account_id,
                 xmpp_client=self.client,  # Use THIS account's client for proper routing
-                db=self.db
+                db=self.db,
+                progress=lambda partial: self.retry_completed.emit(self.account_id, partial)
             )
 
-            # Emit signal: retry completed with stats
+            # Emit signal: retry completed with stats ('remaining' == 0)
             self.retry_completed.emit(self.account_id, stats)
 
             if self.app_logger:
@@ -441,25 +474,25 @@ class XMPPAccount(QObject):
         self.calls.client = self.client
         self.muc.client = self.client
 
-        # Initialize CallBridge for audio/video calls (async)
-        await self.calls._setup_call_functionality()
+        # MUC history is caught up per room as soon as its join is confirmed
+        # (MucBarrel.on_muc_joined) - mark rooms before any join can complete
+        self.muc.expect_room_joins()
 
+        # Independent steps run concurrently; per-step timings are logged
+        pipeline = StartupPipeline('account startup', self.app_logger)
+        # Initialize CallBridge for audio/video calls
+        pipeline.add('calls', self.calls._setup_call_functionality)
         # Query server information (XEP-0092 and XEP-0030)
-        await self.connection.query_server_info()
-
-        # Phase 4: Auto-join rooms FIRST (so retry can send to MUCs)
-        await self.muc.auto_join_bookmarked_rooms()
-
-        # Phase 5: Retry pending messages AFTER rooms are joined
-        await self._retry_pending_messages()
-
-        # Phase 6: Catch up 1-1 chat messages from MAM (messages sent while offline)
-        # This retrieves messages from contacts similar to how MUC rooms catch up
-        await self.messages.catchup_private_chats()
-
-        # Phase 7: Catch up MUC room messages from MAM (messages sent while offline)
-        # This retrieves MUC history for all joined rooms
-        await self.muc.catchup_muc_rooms()
+        pipeline.add('server_info', self.connection.query_server_info)
+        # Sync blocked contacts from server (XEP-0191)
+        pipeline.add('blocked', self._sync_blocked_contacts)
+        # Auto-join rooms FIRST (so retry can send to MUCs)
+        pipeline.add('autojoin', self.muc.auto_join_bookmarked_rooms)
+        # Retry pending messages AFTER rooms are joined
+        pipeline.add('retry_pending', self._retry_pending_messages, after=('autojoin',))
+        # Catch up 1-1 chat messages from MAM (messages sent while offline)
+        pipeline.add('mam_private', self.messages.catchup_private_chats)
+        await pipeline.run()
 
     async def _on_session_resumed(self, event):
         """Handle XMPP session resumption (XEP-0198)."""
@@ -472,26 +505,17 @@ class XMPPAccount(QObject):
 
         # IMPORTANT: Catch up on messages sent while connection was down
         # Session resume means stream was temporarily interrupted - we may have missed messages
-        await self.messages.catchup_private_chats()
-
-        # Also catch up MUC messages
-        await self.muc.catchup_muc_rooms()
-
-    async def _on_session_start(self, event):
-        """Handle successful XMPP session start."""
-        self.connected = True
-        self.connection._set_status('connected')
-        self.connection_state_changed.emit(self.account_id, 'connected')
-        if self.app_logger:
-            self.app_logger.info("XMPP session started - now connected")
-
-        # Sync blocked contacts from server (XEP-0191)
-        await self._sync_blocked_contacts()
+        # (1-1 and MUC archives are independent, query both at once)
+        await asyncio.gather(
+            self.messages.catchup_private_chats(),
+            self.muc.catchup_muc_rooms(),
+        )
 
     async def _on_disconnected_event(self, event):
         """Handle disconnection event."""
         self.connected = False
         self.connection._set_status('disconnected')
+        self.avatars.cancel_pending_fetches()
         self.connection_state_changed.emit(self.account_id, 'disconnected')
         if self.app_logger:
             self.app_logger.info("XMPP disconnected")
@@ -921,6 +945,7 @@ class AccountBrewery:
         """Initialize the brewery."""
         self.db = get_db()
         self.accounts: Dict[int, XMPPAccount] = {}  # account_id -> XMPPAccount
+        self.connect_task: Optional[asyncio.Future] = None  # Background bring-up of load_accounts()
         self.paths = get_paths()
 
         logger.debug("Account brewery initialized - ready to brew accounts")
@@ -1153,28 +1178,85 @@ class AccountBrewery:
         return False
 
     def load_accounts(self):
-        """Brew all enabled accounts from database and connect them."""
+        """
+        Brew all enabled accounts from database and connect them.
+
+        Account wrappers are created right away (so signals can be connected);
+        the connections are brought up concurrently in the background, at most
+        'account_connect_concurrency' at a time. Each account emits
+        connect_finished when its attempt completes.
+        """
         accounts = self.db.fetchall(
             "SELECT * FROM account WHERE enabled = 1 ORDER BY id"
         )
 
         logger.debug(f"Brewing {len(accounts)} enabled accounts...")
 
+        new_accounts = {}
         for account_data in accounts:
             account_id = account_data['id']
             bare_jid = account_data['bare_jid']
 
+            if account_id in self.accounts:
+                continue  # Already brewed (e.g. reload after registering an account)
+
             logger.debug(f"Brewing account {account_id}: {bare_jid}")
 
-            # Create account wrapper
-            account = XMPPAccount(account_id, dict(account_data))
+            # Create account wrapper (a broken account must not stop the others)
+            try:
+                account = XMPPAccount(account_id, dict(account_data))
+            except Exception as e:
+                logger.error(f"Failed to brew account {account_id} ({bare_jid}): {e}")
+                continue
             self.accounts[account_id] = account
-
-            # Connect
-            account.connect()
+            new_accounts[account_id] = account
 
         logger.debug(f"Loaded {len(self.accounts)} accounts")
 
+        if not new_accounts:
+            return
+
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop yet: initiate connections one after another
+            for account in new_accounts.values():
+                account.connect()
+            return
+
+        self.connect_task = asyncio.ensure_future(self.connect_accounts(new_accounts))
+
+    async def connect_accounts(self, accounts: Dict[int, XMPPAccount]) -> Dict[int, str]:
+        """
+        Connect accounts concurrently (bounded by 'account_connect_concurrency').
+
+        Args:
+            accounts: {account_id: XMPPAccount}
+
+        Returns:
+            {account_id: outcome}
+        """
+        try:
+            concurrency = int(self.db.get_setting('account_connect_concurrency',
+                                                  default=str(ACCOUNT_CONNECT_CONCURRENCY)))
+        except (TypeError, ValueError):
+            concurrency = ACCOUNT_CONNECT_CONCURRENCY
+
+        def on_done(account_id: int, outcome: str, done: int, total: int):
+            account = accounts.get(account_id)
+            if account:
+                account.connect_finished.emit(account_id, outcome, done, total)
+
+        logger.info(f"Connecting {len(accounts)} accounts ({concurrency} at a time)...")
+        results = await connect_concurrently(
+            {account_id: account.connect_and_wait for account_id, account in accounts.items()},
+            concurrency=concurrency,
+            on_done=on_done,
+        )
+        connected = sum(1 for outcome in results.values() if outcome == 'connected')
+        logger.info(f"Account bring-up finished: {connected}/{len(results)} connected")
+        return results
+
     def get_account(self, account_id: int) -> Optional[XMPPAccount]:
         """
         Get account by ID.
@@ -0,0 +1,136 @@
+"""
+Keyset-paged call log queries.
+
+The call log can hold years of calls, so views never select the whole table:
+fetch_call_page() returns one page (newest first unless another CallLogOrder
+is given) and the next page is requested with the (sort key, id) of the last
+row seen. Filters and sorting are applied in SQL; in the default order
+call_account_time_idx (account_id, time DESC, id DESC, direction, state)
+serves each page with about `limit` index entries, however long the history.
+Other orders sort the filtered calls in SQLite (still one page per query).
+
+Usage:
+    page = fetch_call_page(db, CallLogFilter(account_id=1, state=6))
+    more = fetch_call_page(db, filters, after=page_cursor(page))
+    longest = fetch_call_page(db, filters, CallLogOrder('duration'))
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Optional, Tuple
+
+from .database import Database
+
+
+logger = logging.getLogger('siproxylin.call_log')
+
+# Rows fetched per page (view asks for the next page when scrolled to the end)
+CALL_LOG_PAGE_SIZE = 200
+
+# Sortable columns -> SQL expression (never NULL, so keyset comparisons hold)
+CALL_LOG_SORT_KEYS = {
+    'time': "c.time",
+    'jid': "j.bare_jid",
+    'account': "COALESCE(a.nickname, a.bare_jid, '')",
+    'direction': "c.direction",
+    'state': "c.state",
+    'duration': "CASE WHEN c.end_time THEN c.end_time - c.time ELSE 0 END",
+    'type': "c.type",
+}
+
+_SELECT = """
+    SELECT
+        {sort_key} AS sort_key,
+        c.id,
+        c.account_id,
+        c.counterpart_id,
+        c.direction,
+        c.time,
+        c.end_time,
+        c.state,
+        c.type,
+        j.bare_jid,
+        a.bare_jid as account_jid,
+        a.nickname as account_alias
+    FROM call c
+    JOIN jid j ON c.counterpart_id = j.id
+    LEFT JOIN account a ON c.account_id = a.id
+"""
+
+
+@dataclass(frozen=True)
+class CallLogFilter:
+    """Call log filters (None/empty = no filter)."""
+    account_id: Optional[int] = None
+    direction: Optional[int] = None  # CallDirection value
+    state: Optional[int] = None  # CallState value
+    jid_search: str = ''  # Substring of the counterpart JID (case-insensitive)
+
+
+@dataclass(frozen=True)
+class CallLogOrder:
+    """Call log sort order (ties broken by call ID in the same direction)."""
+    column: str = 'time'  # Key of CALL_LOG_SORT_KEYS
+    descending: bool = True
+
+
+def fetch_call_page(db: Database, filters: CallLogFilter = CallLogFilter(),
+                    order: CallLogOrder = CallLogOrder(),
+                    after: Optional[Tuple[Any, int]] = None,
+                    limit: int = CALL_LOG_PAGE_SIZE) -> list:
+    """
+    Fetch one page of calls.
+
+    Args:
+        db: Database
+        filters: Filters applied in SQL
+        order: Sort order (default: newest first)
+        after: page_cursor() of the previous page in the same order (None = first page)
+        limit: Page size
+
+    Returns:
+        List of rows (see _SELECT), at most `limit`
+    """
+    where = []
+    params = []
+    if filters.account_id is not None:
+        where.append("c.account_id = ?")
+        params.append(filters.account_id)
+    if filters.direction is not None:
+        where.append("c.direction = ?")
+        params.append(filters.direction)
+    if filters.state is not None:
+        where.append("c.state = ?")
+        params.append(filters.state)
+    if filters.jid_search:
+        pattern = filters.jid_search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        where.append("j.bare_jid LIKE ? ESCAPE '\\'")
+        params.append(f"%{pattern}%")
+    sort_key = CALL_LOG_SORT_KEYS[order.column]
+    direction = "DESC" if order.descending else "ASC"
+    if after is not None:
+        where.append(f"({sort_key}, c.id) {'<' if order.descending else '>'} (?, ?)")
+        params.extend(after)
+
+    sql = _SELECT.format(sort_key=sort_key)
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += f" ORDER BY {sort_key} {direction}, c.id {direction} LIMIT ?"
+    params.append(limit)
+
+    return db.fetchall(sql, tuple(params))
+
+
+def page_cursor(rows: list) -> Optional[Tuple[Any, int]]:
+    """
+    Keyset cursor for the page after `rows`.
+
+    Args:
+        rows: Rows returned by fetch_call_page()
+
+    Returns:
+        (sort key, id) of the last row, or None if rows is empty
+    """
+    if not rows:
+        return None
+    return rows[-1]['sort_key'], rows[-1]['id']
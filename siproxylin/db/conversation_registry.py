@@ -0,0 +1,230 @@
+"""
+In-memory conversation settings registry.
+
+Loads all conversation rows of an account once (one query, on first use) and
+keeps them current through write-through updates, so hot paths - typing
+notifications, displayed markers, chat switching - read settings without
+touching SQLite.
+
+Settings writes go through update(), which executes the SQL and patches the
+cached row in the same step; deletions call forget*(). Rows created elsewhere
+(Database.get_or_create_conversation) are picked up by a one-row query on the
+first lookup that misses.
+"""
+
+import logging
+from dataclasses import dataclass, fields
+from typing import Optional, Dict, Tuple
+
+from .database import Database, get_db
+
+
+logger = logging.getLogger('siproxylin.conversation_registry')
+
+_SELECT = """
+    SELECT c.id, c.account_id, c.jid_id, j.bare_jid, c.type, c.encryption,
+           c.send_typing, c.send_marker, c.notification, c.read_up_to_item,
+           c.pinned
+    FROM conversation c
+    JOIN jid j ON j.id = c.jid_id
+"""
+
+
+@dataclass
+class ConversationSettings:
+    """One cached conversation row (typed view of the conversation table)."""
+    id: int
+    account_id: int
+    jid_id: int
+    bare_jid: str
+    type: int = 0  # 0=chat, 1=groupchat (MUC)
+    encryption: int = 0  # 0=plain, 1=OMEMO
+    send_typing: bool = True
+    send_marker: bool = True
+    notification: int = 1  # 0=off, 1=all, 2=mentions (MUC)
+    read_up_to_item: int = -1
+    pinned: bool = False
+
+    @property
+    def is_muc(self) -> bool:
+        return self.type == 1
+
+
+# Setting column → Python type (bool/int), for rows and write-through updates
+_KEYS = ('id', 'account_id', 'jid_id', 'bare_jid')
+_COLUMNS = {f.name: f.type for f in fields(ConversationSettings) if f.name not in _KEYS}
+
+
+def _from_row(row) -> ConversationSettings:
+    values = {name: row[name] for name in _KEYS}
+    for name, cast in _COLUMNS.items():
+        if row[name] is not None:  # NULL keeps the schema default
+            values[name] = cast(row[name])
+    return ConversationSettings(**values)
+
+
+class ConversationRegistry:
+    """
+    Per-account cache of conversation settings.
+
+    Lookups are dict hits once the account is loaded. Misses (conversations
+    created since) cost one query and are cached from then on.
+    """
+
+    def __init__(self, db: Optional[Database] = None):
+        """
+        Initialize registry.
+
+        Args:
+            db: Database instance (default: global database)
+        """
+        self.db = db or get_db()
+        self._by_id: Dict[int, ConversationSettings] = {}
+        self._by_jid: Dict[Tuple[int, str], ConversationSettings] = {}
+        self._loaded_accounts = set()
+
+    def load_account(self, account_id: int, reload: bool = False):
+        """
+        Load all conversation rows of an account (one query).
+
+        Args:
+            account_id: Account ID
+            reload: Drop cached rows and read them again
+        """
+        if account_id in self._loaded_accounts and not reload:
+            return
+        self.forget_account(account_id)
+        rows = self.db.fetchall(_SELECT + " WHERE c.account_id = ?", (account_id,))
+        for row in rows:
+            self._store(_from_row(row))
+        self._loaded_accounts.add(account_id)
+        logger.debug(f"Loaded {len(rows)} conversation(s) for account {account_id}")
+
+    def get(self, conversation_id: int) -> Optional[ConversationSettings]:
+        """
+        Get conversation by ID.
+
+        Args:
+            conversation_id: Conversation ID
+
+        Returns:
+            ConversationSettings or None
+        """
+        conv = self._by_id.get(conversation_id)
+        if conv is None:
+            conv = self._load_one(" WHERE c.id = ?", (conversation_id,))
+        return conv
+
+    def find(self, account_id: int, bare_jid: str) -> Optional[ConversationSettings]:
+        """
+        Get conversation by account and peer/room JID.
+
+        Args:
+            account_id: Account ID
+            bare_jid: Contact or room bare JID
+
+        Returns:
+            ConversationSettings or None if there is no conversation yet
+        """
+        self.load_account(account_id)
+        conv = self._by_jid.get((account_id, bare_jid))
+        if conv is None:
+            conv = self._load_one(" WHERE c.account_id = ? AND j.bare_jid = ?", (account_id, bare_jid))
+        return conv
+
+    def get_or_create(self, account_id: int, jid_id: int, bare_jid: str,
+                      conv_type: int) -> ConversationSettings:
+        """
+        Get or create a conversation (write-through).
+
+        Args:
+            account_id: Account ID
+            jid_id: JID ID
+            bare_jid: Contact or room bare JID
+            conv_type: Conversation type (0=chat, 1=groupchat/MUC)
+
+        Returns:
+            ConversationSettings
+        """
+        conv = self.find(account_id, bare_jid)
+        if conv is not None:
+            return conv
+        conversation_id = self.db.get_or_create_conversation(account_id, jid_id, conv_type)
+        return self._load_one(" WHERE c.id = ?", (conversation_id,))
+
+    def update(self, conversation_id: int, commit: bool = True, **values):
+        """
+        Update conversation columns in the database and in memory.
+
+        Args:
+            conversation_id: Conversation ID
+            commit: Commit right away (False when part of a larger write)
+            **values: Columns to set (send_typing=False, encryption=1, ...)
+
+        Raises:
+            ValueError: If a column is not a conversation setting
+        """
+        unknown = set(values) - set(_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown conversation column(s): {', '.join(sorted(unknown))}")
+        if not values:
+            return
+
+        set_clause = ', '.join(f"{name} = ?" for name in values)
+        params = [int(value) for value in values.values()] + [conversation_id]
+        self.db.execute(f"UPDATE conversation SET {set_clause} WHERE id = ?", tuple(params))
+        if commit:
+            self.db.commit()
+
+        conv = self._by_id.get(conversation_id)
+        if conv is not None:
+            for name, value in values.items():
+                setattr(conv, name, _COLUMNS[name](value))
+
+    def forget(self, conversation_id: int):
+        """Drop a deleted conversation from the cache."""
+        conv = self._by_id.pop(conversation_id, None)
+        if conv is not None:
+            self._by_jid.pop((conv.account_id, conv.bare_jid), None)
+
+    def forget_jid(self, account_id: int, bare_jid: str):
+        """Drop a deleted conversation by account and JID."""
+        conv = self._by_jid.get((account_id, bare_jid))
+        if conv is not None:
+            self.forget(conv.id)
+
+    def forget_account(self, account_id: int):
+        """Drop all cached conversations of an account (deleted or to be reloaded)."""
+        for conv in [c for c in self._by_id.values() if c.account_id == account_id]:
+            self.forget(conv.id)
+        self._loaded_accounts.discard(account_id)
+
+    def _load_one(self, where: str, params: tuple) -> Optional[ConversationSettings]:
+        """Read one row into the cache (lookup miss)."""
+        row = self.db.fetchone(_SELECT + where, params)
+        if row is None:
+            return None
+        conv = _from_row(row)
+        self._store(conv)
+        return conv
+
+    def _store(self, conv: ConversationSettings):
+        self._by_id[conv.id] = conv
+        self._by_jid[(conv.account_id, conv.bare_jid)] = conv
+
+
+# Global registry instance
+_registry: Optional[ConversationRegistry] = None
+
+
+def get_conversation_registry() -> ConversationRegistry:
+    """
+    Get global conversation registry instance.
+
+    Returns:
+        ConversationRegistry instance
+    """
+    global _registry
+    if _registry is None:
+        _registry = ConversationRegistry()
+    return _registry
@@ -5,11 +5,12 @@ Handles SQLite database initialization, schema management, and migrations.
 """
 
 import sqlite3
+import json
 import logging
 import os
 import fcntl
 from pathlib import Path
-from typing import Optional, Any, List, Dict
+from typing import Optional, Any, List, Dict, Iterable, Tuple
 from contextlib import contextmanager
 
 from ..utils.paths import get_paths
@@ -24,7 +25,7 @@ class Database:
     Handles schema initialization, migrations, and query execution.
     """
 
-    SCHEMA_VERSION = 17  # Current schema version (v17 = XEP-0428 Fallback Indication)
+    SCHEMA_VERSION = 21  # Current schema version (v21 = call log keyset index)
 
     def __init__(self, db_path: Optional[Path] = None):
         """
@@ -120,6 +121,11 @@ class Database:
             )
             # Enable foreign keys
             self._connection.execute("PRAGMA foreign_keys = ON")
+            # WAL + synchronous=NORMAL: a commit is an append to the WAL without
+            # an fsync, so callers that must commit every write (OMEMO key
+            # storage) stay cheap; committed data survives an application crash
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.execute("PRAGMA synchronous = NORMAL")
             # Use Row factory for dict-like access
             self._connection.row_factory = sqlite3.Row
 
@@ -167,6 +173,19 @@ class Database:
         """
         return self.connection.execute(query, params)
 
+    def executemany(self, query: str, seq_of_params: Iterable[tuple]) -> sqlite3.Cursor:
+        """
+        Execute a SQL query once per parameter tuple.
+
+        Args:
+            query: SQL query
+            seq_of_params: Iterable of parameter tuples
+
+        Returns:
+            Cursor object
+        """
+        return self.connection.executemany(query, seq_of_params)
+
     def fetchone(self, query: str, params: tuple = ()) -> Optional[sqlite3.Row]:
         """
         Execute query and fetch one row.
@@ -203,10 +222,14 @@ class Database:
     # Schema Management
     # =========================================================================
 
-    def initialize(self):
+    def initialize(self, maintenance: bool = True):
         """
         Initialize database.
         Creates tables if they don't exist, or runs migrations if needed.
+
+        Args:
+            maintenance: Run maintenance tasks right away (False = caller runs
+                         run_maintenance() later, before accounts connect)
         """
         if not self._tables_exist():
             logger.info("Database is empty, applying initial schema...")
@@ -226,7 +249,8 @@ class Database:
                 logger.info(f"Database schema up to date (v{current_version})")
 
         # Run maintenance tasks after initialization/migrations
-        self.run_maintenance()
+        if maintenance:
+            self.run_maintenance()
 
     def _tables_exist(self) -> bool:
         """Check if database tables exist."""
@@ -313,16 +337,48 @@ class Database:
 
         Tasks:
         - Clean up old recent_emojis (keep only 10 most recent unique)
+        - Move legacy avatar BLOBs to the on-disk avatar store
+        - Mark transfers interrupted by the last exit as failed
+        - Drop message renderings of an older renderer version
         - Future: VACUUM, cleanup old messages, etc.
         """
         try:
             # Clean up recent_emojis table - keep only 10 most recent unique
             self._cleanup_recent_emojis()
 
+            # Avatar bytes live in the avatar store, DB keeps only the hash
+            self._migrate_avatar_blobs()
+
+            # Downloads cut short by the last exit are failed (resumed on next sight)
+            self._fail_interrupted_transfers()
+
+            # Old renderings are never read again (re-rendered on display)
+            self._prune_message_html()
+
             logger.debug("Database maintenance completed")
         except Exception as e:
             logger.error(f"Database maintenance failed: {e}", exc_info=True)
 
+    def _fail_interrupted_transfers(self):
+        """Mark downloads/uploads still 'transferring' from a previous run as failed (state=3)."""
+        # Runs at startup, before any account connects, so nothing is in flight yet
+        cursor = self.execute(
+            "UPDATE file_transfer SET state = 3 WHERE state IN (0, 1)"
+        )
+        self.commit()
+        if cursor.rowcount:
+            logger.info(f"Marked {cursor.rowcount} interrupted file transfer(s) as failed")
+
+    def _prune_message_html(self):
+        """Delete pre-rendered message bodies of other renderer versions."""
+        from ..utils.message_markup import RENDERER_VERSION
+        cursor = self.execute(
+            "DELETE FROM message_html WHERE renderer_version != ?", (RENDERER_VERSION,)
+        )
+        self.commit()
+        if cursor.rowcount:
+            logger.info(f"Dropped {cursor.rowcount} outdated message rendering(s)")
+
     def _cleanup_recent_emojis(self):
         """Delete emojis older than the 10 most recent unique ones."""
         try:
@@ -352,6 +408,39 @@ class Database:
         except Exception as e:
             logger.warning(f"Failed to cleanup recent_emojis: {e}")
 
+    def _migrate_avatar_blobs(self):
+        """
+        Move contact_avatar.data BLOBs into the content-addressed avatar store.
+
+        Rows written before the store existed carry image bytes; they are
+        written to disk, the hash is re-keyed to the file's SHA-1 and the BLOB
+        is cleared. Unreferenced avatar files are pruned afterwards.
+        """
+        from ..utils.avatar_store import get_avatar_store
+
+        try:
+            store = get_avatar_store()
+            rows = self.fetchall("SELECT id, data FROM contact_avatar WHERE data IS NOT NULL")
+
+            for row in rows:
+                avatar_hash = store.put(bytes(row['data']))
+                self.execute(
+                    "UPDATE contact_avatar SET hash = ?, data = NULL WHERE id = ?",
+                    (avatar_hash, row['id'])
+                )
+
+            if rows:
+                self.commit()
+                # Reclaim the space the BLOBs used
+                self.connection.execute("VACUUM")
+                logger.info(f"Moved {len(rows)} avatar(s) from database to avatar store")
+
+            referenced = [r['hash'] for r in self.fetchall("SELECT DISTINCT hash FROM contact_avatar")]
+            store.prune(referenced)
+
+        except Exception as e:
+            logger.warning(f"Failed to migrate avatars to avatar store: {e}")
+
     # =========================================================================
     # Helper Methods
     # =========================================================================
@@ -444,6 +533,126 @@ class Database:
         self.commit()
         return cursor.lastrowid
 
+    # =========================================================================
+    # Roster Cache (RFC 6121 / XEP-0237 Roster Versioning)
+    # =========================================================================
+
+    @staticmethod
+    def _roster_row(item: Dict[str, Any]) -> Tuple[str, int, int, int]:
+        """Roster item dict (name/subscription/ask) -> (name, to, from, pending_out) columns."""
+        subscription = item.get('subscription') or 'none'
+        return (
+            item.get('name') or '',
+            1 if subscription in ('to', 'both') else 0,
+            1 if subscription in ('from', 'both') else 0,
+            1 if item.get('ask') == 'subscribe' else 0,
+        )
+
+    def get_roster_cache(self, account_id: int) -> Tuple[Optional[str], Dict[str, Dict[str, Any]]]:
+        """
+        Load an account's cached roster and the version it corresponds to.
+
+        Args:
+            account_id: Account ID
+
+        Returns:
+            Tuple (roster version or None, {bare_jid: {'name', 'subscription', 'ask'}})
+        """
+        row = self.fetchone("SELECT roster_version FROM account WHERE id = ?", (account_id,))
+        version = row['roster_version'] if row else None
+
+        items = {}
+        for row in self.fetchall("""
+            SELECT j.bare_jid, r.name, r.we_see_their_presence, r.they_see_our_presence,
+                   r.we_requested_subscription
+            FROM roster r
+            JOIN jid j ON r.jid_id = j.id
+            WHERE r.account_id = ?
+        """, (account_id,)):
+            to, frm = row['we_see_their_presence'], row['they_see_our_presence']
+            items[row['bare_jid']] = {
+                'name': row['name'] or '',
+                'subscription': 'both' if to and frm else 'to' if to else 'from' if frm else 'none',
+                'ask': 'subscribe' if row['we_requested_subscription'] else None,
+            }
+        return version, items
+
+    def apply_roster(self, account_id: int, items: Dict[str, Dict[str, Any]],
+                     removed: Iterable[str] = (), version: Optional[str] = None,
+                     replace: bool = False) -> Tuple[List[str], List[str]]:
+        """
+        Apply a roster result or push to the cached roster as a set difference.
+
+        Only rows that actually differ are written (batched with executemany),
+        so re-applying an unchanged roster writes nothing. Columns the server
+        doesn't own (blocked, they_requested_subscription) are preserved.
+
+        Args:
+            account_id: Account ID
+            items: {bare_jid: {'name', 'subscription', 'ask'}} from the server
+            removed: Bare JIDs removed by the server (subscription='remove')
+            version: Roster version ('ver') to store, None = keep stored one
+            replace: items is the complete roster (full roster result),
+                     cached contacts missing from it are removed (except
+                     pending incoming subscription requests)
+
+        Returns:
+            Tuple (added/changed bare JIDs, removed bare JIDs)
+        """
+        stored_version, cached = self.get_roster_cache(account_id)
+        cached_rows = {jid: self._roster_row(item) for jid, item in cached.items()}
+
+        changed = []
+        upserts = []
+        for jid, item in items.items():
+            row = self._roster_row(item)
+            if cached_rows.get(jid) != row:
+                changed.append(jid)
+                upserts.append((account_id, jid) + row + (item.get('subscription') or 'none',))
+
+        if replace:
+            # Keep pending incoming requests: those JIDs aren't in the server roster yet
+            pending_in = {row['bare_jid'] for row in self.fetchall("""
+                SELECT j.bare_jid FROM roster r JOIN jid j ON r.jid_id = j.id
+                WHERE r.account_id = ? AND r.they_requested_subscription = 1
+            """, (account_id,))}
+            gone = [jid for jid in cached_rows if jid not in items and jid not in pending_in]
+        else:
+            gone = [jid for jid in removed if jid in cached_rows]
+
+        with self.transaction():
+            if upserts:
+                self.executemany("INSERT OR IGNORE INTO jid (bare_jid) VALUES (?)",
+                                 [(jid,) for jid in changed])
+                self.executemany("""
+                    INSERT INTO roster (account_id, jid_id, name,
+                                        we_see_their_presence, they_see_our_presence,
+                                        we_requested_subscription, subscription)
+                    VALUES (?, (SELECT id FROM jid WHERE bare_jid = ?), ?, ?, ?, ?, ?)
+                    ON CONFLICT (account_id, jid_id) DO UPDATE SET
+                        name = excluded.name,
+                        subscription = excluded.subscription,
+                        we_see_their_presence = excluded.we_see_their_presence,
+                        they_see_our_presence = excluded.they_see_our_presence,
+                        we_requested_subscription = excluded.we_requested_subscription
+                """, upserts)
+            if gone:
+                # Messages/history are untouched, only the roster entry goes
+                self.executemany("""
+                    DELETE FROM roster
+                    WHERE account_id = ? AND jid_id = (SELECT id FROM jid WHERE bare_jid = ?)
+                """, [(account_id, jid) for jid in gone])
+            if version is not None and version != stored_version:
+                self.execute("UPDATE account SET roster_version = ? WHERE id = ?",
+                             (version, account_id))
+
+        return changed, gone
+
+    def clear_roster_version(self, account_id: int):
+        """Forget the stored roster version (next login fetches the full roster)."""
+        self.execute("UPDATE account SET roster_version = NULL WHERE id = ?", (account_id,))
+        self.commit()
+
     # =========================================================================
     # Message Retry Logic (Phase 4)
     # =========================================================================
@@ -981,6 +1190,22 @@ class Database:
         self.commit()
         logger.debug(f"Updated call {call_id} state to {state}")
 
+    def update_call_stats_summary(self, call_id: int, summary: dict):
+        """
+        Store media statistics summary for a finished call.
+
+        Args:
+            call_id: Call ID
+            summary: Summary dict from CallStatsHistory.summary()
+        """
+        self.execute("""
+            UPDATE call
+            SET stats_summary = ?
+            WHERE id = ?
+        """, (json.dumps(summary), call_id))
+        self.commit()
+        logger.debug(f"Stored stats summary for call {call_id}")
+
     def update_conversation_read_up_to(self, conversation_id: int, content_item_id: int):
         """
         Update conversation.read_up_to_item after sending displayed marker.
@@ -997,6 +1222,20 @@ class Database:
         self.commit()
         logger.debug(f"Updated conversation {conversation_id} read_up_to_item = {content_item_id}")
 
+    def store_message_html(self, rendered: Iterable[Tuple[int, str]], renderer_version: int):
+        """
+        Store pre-rendered message bodies (read back by the chat view's JOIN).
+
+        Args:
+            rendered: (message.id, html) pairs from message_markup.render_body_html()
+            renderer_version: message_markup.RENDERER_VERSION
+        """
+        self.executemany("""
+            INSERT OR REPLACE INTO message_html (message_id, renderer_version, html)
+            VALUES (?, ?, ?)
+        """, [(message_id, renderer_version, html) for message_id, html in rendered])
+        self.commit()
+
     # =========================================================================
     # Unread Message Tracking (for GUI indicators)
     # =========================================================================
@@ -1029,7 +1268,8 @@ class Database:
 
         return result['unread_count'] if result else 0
 
-    def _count_unread_items(self, account_id: int = None, per_conversation: bool = False):
+    def _count_unread_items(self, account_id: int = None, per_conversation: bool = False,
+                            jid: str = None):
         """
         Count unread items - canonical definition (single source of truth).
 
@@ -1046,6 +1286,7 @@ class Database:
         Args:
             account_id: Filter by account ID (None = all accounts)
             per_conversation: If True, return per-conversation breakdown; if False, return total count
+            jid: Only count this conversation's bare JID (per_conversation only)
 
         Returns:
             If per_conversation=True: List of dicts with {jid, conversation_id, type, unread_count}
@@ -1072,11 +1313,13 @@ class Database:
                   AND ci.hide = 0
             """
 
+            params = ()
             if account_id is not None:
                 query += " AND c.account_id = ?"
-                params = (account_id,)
-            else:
-                params = ()
+                params += (account_id,)
+            if jid is not None:
+                query += " AND j.bare_jid = ?"
+                params += (jid,)
 
             query += """
                 GROUP BY c.id, j.bare_jid, c.type
@@ -1109,17 +1352,18 @@ class Database:
             result = self.fetchone(query, params)
             return result['total_unread'] if result else 0
 
-    def get_unread_conversations_for_account(self, account_id: int) -> List[sqlite3.Row]:
+    def get_unread_conversations_for_account(self, account_id: int, jid: str = None) -> List[sqlite3.Row]:
         """
         Get all conversations with unread content (messages + files) for an account.
 
         Args:
             account_id: Account ID
+            jid: Only this conversation's bare JID (None = all)
 
         Returns:
             List of rows with keys: jid, conversation_id, type, unread_count
         """
-        return self._count_unread_items(account_id=account_id, per_conversation=True)
+        return self._count_unread_items(account_id=account_id, per_conversation=True, jid=jid)
 
     def get_total_unread_for_account(self, account_id: int) -> int:
         """
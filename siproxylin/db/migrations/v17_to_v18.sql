@@ -0,0 +1,11 @@
+-- Migration from schema version 17 to 18
+-- Add per-call media statistics summary
+-- Written once at hang-up from the in-memory StreamStats ring buffer
+
+-- JSON object: samples, bytes_sent, bytes_received, avg/peak bandwidth,
+-- avg/max RTT, max jitter, max packet loss, connection_type, pair_changes
+-- NULL for calls that never reached media (missed, declined, ...)
+ALTER TABLE call ADD COLUMN stats_summary TEXT;
+
+-- Update schema version
+UPDATE _meta SET int_val = 18 WHERE name = 'schema_version';
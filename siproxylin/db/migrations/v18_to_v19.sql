@@ -0,0 +1,9 @@
+-- Migration from schema version 18 to 19
+-- Index message origin_id per account
+-- Server ACKs (XEP-0198) only carry our origin_id, not the counterpart, so the
+-- existing (account_id, counterpart_id, origin_id) index can't serve them
+
+CREATE INDEX IF NOT EXISTS message_account_origin_id_idx ON message (account_id, origin_id);
+
+-- Update schema version
+UPDATE _meta SET int_val = 19 WHERE name = 'schema_version';
@@ -0,0 +1,20 @@
+-- Migration from schema version 19 to 20
+-- Pre-rendered message bodies (XEP-0393 styling + links, see utils/message_markup.py)
+-- Chat views JOIN this instead of running the markup regexes on every cold render.
+-- Rows of an older renderer_version are ignored and re-rendered.
+
+CREATE TABLE IF NOT EXISTS message_html (
+    message_id INTEGER PRIMARY KEY,     -- message.id
+    renderer_version INTEGER NOT NULL,  -- message_markup.RENDERER_VERSION
+    html TEXT NOT NULL,
+    FOREIGN KEY (message_id) REFERENCES message(id) ON DELETE CASCADE
+);
+
+-- Corrections (XEP-0308) rewrite message.body: drop the stale rendering
+CREATE TRIGGER IF NOT EXISTS message_html_au_body AFTER UPDATE OF body ON message
+WHEN old.body IS NOT new.body BEGIN
+    DELETE FROM message_html WHERE message_id = old.id;
+END;
+
+-- Update schema version
+UPDATE _meta SET int_val = 20 WHERE name = 'schema_version';
@@ -0,0 +1,8 @@
+-- Migration from schema version 20 to 21
+-- Keyset-paged call log (see db/call_log.py): pages are read newest first per
+-- account, filtered by direction/state, straight from this index.
+
+CREATE INDEX IF NOT EXISTS call_account_time_idx ON call (account_id, time DESC, id DESC, direction, state);
+
+-- Update schema version
+UPDATE _meta SET int_val = 21 WHERE name = 'schema_version';
@@ -4,10 +4,17 @@ Implements the omemo.Storage interface for use with slixmpp-omemo.
 
 This replaces JSON file storage with a proper database backend,
 storing OMEMO cryptographic material in the omemo_storage table.
+
+Decoded values (and misses) are cached per account, so repeated loads of
+sessions, bundles and device lists never hit SQLite (or json.loads) again.
+Writes and deletes are committed before the method returns, as the Storage
+contract requires (a ratchet step or consumed pre-key must be durable before
+the stanza that depends on it is sent); the cache is only updated once the
+commit succeeded.
 """
 
 import json
-from pathlib import Path
+from typing import Dict
 
 from omemo.storage import Storage, Maybe, Just, Nothing
 from omemo.types import JSONType
@@ -31,13 +38,15 @@ class OMEMOStorageDB(Storage):
             db: Database instance (from get_db())
             account_id: Account ID to scope storage to
         """
-        super().__init__()
+        # We cache ourselves, base class cache would be redundant
+        super().__init__(disable_cache=True)
         self.__db = db
         self.__account_id = account_id
+        self.__cache: Dict[str, Maybe[JSONType]] = {}
 
     async def _load(self, key: str) -> Maybe[JSONType]:
         """
-        Load a value from database.
+        Load a value (from cache, or database on first access).
 
         Args:
             key: The key identifying the value.
@@ -45,45 +54,49 @@ class OMEMOStorageDB(Storage):
         Returns:
             The loaded value, if it exists.
         """
+        cached = self.__cache.get(key)
+        if cached is not None:
+            return cached
+
         row = self.__db.fetchone(
             "SELECT value FROM omemo_storage WHERE account_id = ? AND key = ?",
             (self.__account_id, key)
         )
 
-        if row:
-            value = json.loads(row['value'])
-            return Just(value)
-
-        return Nothing()
+        value = Just(json.loads(row['value'])) if row else Nothing()
+        self.__cache[key] = value
+        return value
 
     async def _store(self, key: str, value: JSONType) -> None:
         """
-        Store a value in database.
+        Store a value in database (committed before returning).
 
         Args:
             key: The key identifying the value.
             value: The value to store under the given key.
         """
         json_value = json.dumps(value)
-        self.__db.execute(
-            """
-            INSERT INTO omemo_storage (account_id, key, value)
-            VALUES (?, ?, ?)
-            ON CONFLICT(account_id, key) DO UPDATE SET value = excluded.value
-            """,
-            (self.__account_id, key, json_value)
-        )
-        self.__db.commit()
+        with self.__db.transaction():
+            self.__db.execute(
+                """
+                INSERT INTO omemo_storage (account_id, key, value)
+                VALUES (?, ?, ?)
+                ON CONFLICT(account_id, key) DO UPDATE SET value = excluded.value
+                """,
+                (self.__account_id, key, json_value)
+            )
+        self.__cache[key] = Just(value)
 
     async def _delete(self, key: str) -> None:
         """
-        Delete a value from database, if it exists.
+        Delete a value from database, if it exists (committed before returning).
 
         Args:
             key: The key identifying the value to delete.
         """
-        self.__db.execute(
-            "DELETE FROM omemo_storage WHERE account_id = ? AND key = ?",
-            (self.__account_id, key)
-        )
-        self.__db.commit()
+        with self.__db.transaction():
+            self.__db.execute(
+                "DELETE FROM omemo_storage WHERE account_id = ? AND key = ?",
+                (self.__account_id, key)
+            )
+        self.__cache[key] = Nothing()
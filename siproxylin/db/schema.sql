@@ -149,7 +149,7 @@ CREATE TABLE contact_avatar (
     jid_id INTEGER NOT NULL,
     account_id INTEGER NOT NULL,
     hash TEXT NOT NULL,
-    type INTEGER NOT NULL,              -- 0=vCard, 1=PEP
+    type INTEGER NOT NULL,              -- 0=vCard, 1=PEP, -1=probed, none published (hash '')
     data BLOB,                          -- Avatar image data
     UNIQUE (jid_id, account_id, type) ON CONFLICT REPLACE,
     FOREIGN KEY (account_id) REFERENCES account(id) ON DELETE CASCADE,
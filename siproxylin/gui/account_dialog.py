@@ -23,6 +23,7 @@ from PySide6.QtCore import Qt, Signal, QObject
 from PySide6.QtGui import QIntValidator
 
 from ..db.database import get_db
+from ..db.conversation_registry import get_conversation_registry
 from ..utils.paths import get_paths
 from ..core.brewery import get_account_brewery
 from ..core.constants import ProxyType
@@ -748,6 +749,7 @@ class AccountDialog(QDialog):
             # Delete related data (cascading should handle most of this via foreign keys)
             self.db.execute("DELETE FROM account WHERE id = ?", (self.account_id,))
             self.db.commit()
+            get_conversation_registry().forget_account(self.account_id)
 
             logger.info(f"Account {self.account_id} ({jid}) deleted locally")
 
@@ -13,13 +13,49 @@ from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QGroupBox, QFormLayout, QSizePolicy
 )
-from PySide6.QtCore import Qt, QTimer, Signal, QSize
-from PySide6.QtGui import QFont
+from PySide6.QtCore import Qt, QTimer, Signal, QSize, QPointF
+from PySide6.QtGui import QFont, QPainter, QPen, QColor, QPolygonF
 
 
 logger = logging.getLogger('siproxylin.call_window')
 
 
+class Sparkline(QWidget):
+    """Tiny line chart for recent stats samples (bandwidth, RTT)."""
+
+    def __init__(self, color: str, parent=None):
+        super().__init__(parent)
+        self._values: list = []
+        self._color = QColor(color)
+        self.setMinimumSize(120, 24)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+
+    def set_values(self, values: list):
+        """Replace plotted samples and repaint."""
+        self._values = list(values)
+        self.update()
+
+    def paintEvent(self, event):
+        if len(self._values) < 2:
+            return
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(self._color, 1.5))
+
+        w = self.width() - 2
+        h = self.height() - 2
+        peak = max(self._values) or 1
+        step = w / (len(self._values) - 1)
+
+        points = QPolygonF([
+            QPointF(1 + i * step, 1 + h - (value / peak) * h)
+            for i, value in enumerate(self._values)
+        ])
+        painter.drawPolyline(points)
+        painter.end()
+
+
 class CallWindow(QWidget):
     """
     Separate window showing active call.
@@ -31,6 +67,7 @@ class CallWindow(QWidget):
     - Hang Up button
     - Mute button (future)
     - Tech details (collapsible): connection state, packets, bytes
+      (pushed by the call service via StreamStats, no polling)
     """
 
     # Signal to request hangup (connected to account.hangup_call)
@@ -200,6 +237,11 @@ class CallWindow(QWidget):
         self.bandwidth_label = QLabel("0 Kbps")
         self.bytes_sent_label = QLabel("0 B")
         self.bytes_received_label = QLabel("0 B")
+        self.rtt_label = QLabel("--")
+        self.jitter_label = QLabel("--")
+        self.packet_loss_label = QLabel("--")
+        self.bandwidth_sparkline = Sparkline("#27ae60")
+        self.rtt_sparkline = Sparkline("#2980b9")
 
         # Connection details
         self.our_ips_label = QLabel("--")
@@ -213,6 +255,11 @@ class CallWindow(QWidget):
         tech_layout.addRow("ICE State:", self.ice_state_label)
         tech_layout.addRow("ICE Gathering:", self.ice_gathering_label)
         tech_layout.addRow("Bandwidth:", self.bandwidth_label)
+        tech_layout.addRow("", self.bandwidth_sparkline)
+        tech_layout.addRow("Round Trip:", self.rtt_label)
+        tech_layout.addRow("", self.rtt_sparkline)
+        tech_layout.addRow("Jitter:", self.jitter_label)
+        tech_layout.addRow("Packet Loss:", self.packet_loss_label)
         tech_layout.addRow("Bytes Sent:", self.bytes_sent_label)
         tech_layout.addRow("Bytes Received:", self.bytes_received_label)
         tech_layout.addRow("Our IPs:", self.our_ips_label)
@@ -238,17 +285,12 @@ class CallWindow(QWidget):
         self.setLayout(layout)
 
     def _start_timers(self):
-        """Start timers for duration and stats updates."""
+        """Start duration timer (stats are pushed via update_stats())."""
         # Duration timer (update every second)
         self.duration_timer = QTimer(self)
         self.duration_timer.timeout.connect(self._update_duration)
         self.duration_timer.start(1000)
 
-        # Stats timer (update every 2 seconds)
-        self.stats_timer = QTimer(self)
-        self.stats_timer.timeout.connect(self._request_stats_update)
-        self.stats_timer.start(2000)
-
     def _update_duration(self):
         """Update call duration display."""
         if not self.call_start_time:
@@ -261,13 +303,6 @@ class CallWindow(QWidget):
         seconds = elapsed % 60
         self.duration_label.setText(f"Duration: {hours:02d}:{minutes:02d}:{seconds:02d}")
 
-    def _request_stats_update(self):
-        """Request stats update from account manager (via parent)."""
-        # Emit signal to parent to fetch stats
-        # Parent (MainWindow) will call update_stats() with fresh data
-        if hasattr(self.parent(), 'request_call_stats'):
-            self.parent().request_call_stats(self.account_id, self.session_id)
-
     def _on_tech_details_toggled(self, checked: bool):
         """Handle tech details checkbox toggle - show/hide content and resize window."""
         self.tech_content.setVisible(checked)
@@ -410,7 +445,6 @@ class CallWindow(QWidget):
 
             # Stop timers
             self.duration_timer.stop()
-            self.stats_timer.stop()
 
             # Close window after 2 seconds
             QTimer.singleShot(2000, self.close)
@@ -432,7 +466,6 @@ class CallWindow(QWidget):
 
         # Stop timers
         self.duration_timer.stop()
-        self.stats_timer.stop()
 
         # Close window after 2 seconds
         QTimer.singleShot(2000, self.close)
@@ -442,7 +475,7 @@ class CallWindow(QWidget):
         Update tech details with call statistics.
 
         Args:
-            stats: Statistics dict from account.get_call_stats()
+            stats: Statistics snapshot pushed via account.call_stats_updated
         """
         self.connection_state_label.setText(stats.get('connection_state', 'Unknown'))
         self.ice_state_label.setText(stats.get('ice_connection_state', 'Unknown'))
@@ -458,6 +491,16 @@ class CallWindow(QWidget):
         self.bytes_sent_label.setText(self._format_bytes(bytes_sent))
         self.bytes_received_label.setText(self._format_bytes(bytes_received))
 
+        # Quality metrics
+        rtt_ms = stats.get('rtt_ms', 0)
+        self.rtt_label.setText(f"{rtt_ms} ms" if rtt_ms else '--')
+        self.jitter_label.setText(f"{stats.get('jitter_ms', 0)} ms")
+        self.packet_loss_label.setText(f"{stats.get('packet_loss_pct', 0.0):.1f} %")
+
+        # Sparklines (recent samples from the per-session ring buffer)
+        self.bandwidth_sparkline.set_values(stats.get('bandwidth_history', []))
+        self.rtt_sparkline.set_values(stats.get('rtt_history', []))
+
         # Connection details
         our_ips = stats.get('local_candidates', [])
         peer_ips = stats.get('remote_candidates', [])
@@ -499,8 +542,6 @@ class CallWindow(QWidget):
         # Stop timers when closing
         if hasattr(self, 'duration_timer'):
             self.duration_timer.stop()
-        if hasattr(self, 'stats_timer'):
-            self.stats_timer.stop()
 
         logger.info(f"Call window closed: {self.session_id}")
         event.accept()
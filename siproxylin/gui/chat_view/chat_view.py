@@ -16,6 +16,7 @@ from PySide6.QtCore import Qt, Signal, QTimer
 from PySide6.QtGui import QStandardItemModel, QStandardItem, QAction, QKeyEvent, QTextCursor
 
 from ...db.database import get_db
+from ...db.conversation_registry import get_conversation_registry
 from ..widgets.message_delegate import MessageBubbleDelegate
 from ..widgets.spell_highlighter import EnchantHighlighter
 from ...styles.theme_manager import get_theme_manager
@@ -45,6 +46,8 @@ class ChatViewWidget(QWidget):
     edit_message = Signal(int, str, str, str, bool)  # (account_id, jid, message_id, new_body, encrypted)
     # Signal emitted when user wants to send a reply
     send_reply = Signal(int, str, str, str, str, bool)  # (account_id, jid, reply_to_id, reply_body, fallback_body, encrypted)
+    # Signal emitted when user cancels a running file upload
+    cancel_file_upload = Signal(int)  # (content_item_id)
     # Signals for welcome view actions
     add_account_requested = Signal()
     create_account_requested = Signal()
@@ -53,6 +56,7 @@ class ChatViewWidget(QWidget):
         super().__init__(parent)
 
         self.db = get_db()
+        self.conversations = get_conversation_registry()
         self.account_manager = get_account_manager()
         self.current_account_id = None
         self.current_jid = None
@@ -110,9 +114,6 @@ class ChatViewWidget(QWidget):
         # Message display widget (manager for message area, model, delegate)
         self.message_widget = MessageDisplayWidget(self.db, self.account_manager, chat_page)
 
-        # Pass MainWindow reference for polling control (Phase 2: smart polling)
-        self.message_widget.main_window = self.parent()
-
         # Pass message_widget reference to header for search highlight management
         self.header.message_widget = self.message_widget
 
@@ -183,9 +184,8 @@ class ChatViewWidget(QWidget):
         self.input_field.setContentsMargins(4, 6, 4, 6)  # left, top, right, bottom
 
         # Add spell checking to input field (attaches to document, doesn't change widget behavior)
+        # Dictionary is loaded when the first conversation is opened, not here
         spell_highlighter = EnchantHighlighter(self.input_field.document(), language='en_US')
-        if not spell_highlighter.is_available():
-            logger.info("Spell checker not available (install: apt install aspell aspell-en)")
 
         # Create spell check manager
         self.spell_check_manager = SpellCheckManager(self.db, self.input_field, spell_highlighter)
@@ -287,52 +287,34 @@ class ChatViewWidget(QWidget):
         # Switch to chat view (Page 1)
         self.stack.setCurrentIndex(1)
 
-        # Get jid_id and conversation_id
-        jid_row = self.db.fetchone("SELECT id FROM jid WHERE bare_jid = ?", (jid,))
-        if jid_row:
-            jid_id = jid_row['id']
-
-            # Check if this is a MUC room by checking the conversation type
-            # (type=1 for MUC, type=0 for 1-on-1)
-            # First try to get existing conversation to determine type
-            conv_row = self.db.fetchone("""
-                SELECT id, type FROM conversation
-                WHERE account_id = ? AND jid_id = ?
-            """, (account_id, jid_id))
-
-            if conv_row:
-                # Existing conversation - use its type
-                self.current_conversation_id = conv_row['id']
-                self.current_is_muc = conv_row['type'] == 1
-            else:
+        # Existing conversation: type and settings come from the in-memory registry
+        # (type=1 for MUC, type=0 for 1-on-1)
+        conv = self.conversations.find(account_id, jid)
+        if conv is None:
+            jid_row = self.db.fetchone("SELECT id FROM jid WHERE bare_jid = ?", (jid,))
+            if jid_row:
+                jid_id = jid_row['id']
                 # New conversation - check if it's bookmarked to determine type
                 muc_check = self.db.fetchone("""
                     SELECT 1 FROM bookmark b
                     WHERE b.account_id = ? AND b.jid_id = ?
                 """, (account_id, jid_id))
 
-                self.current_is_muc = muc_check is not None
-                conv_type = 1 if self.current_is_muc else 0
-                self.current_conversation_id = self.db.get_or_create_conversation(account_id, jid_id, conv_type)
-        else:
-            self.current_conversation_id = None
+                conv_type = 1 if muc_check is not None else 0
+                conv = self.conversations.get_or_create(account_id, jid_id, jid, conv_type)
+
+        self.current_conversation_id = conv.id if conv else None
+        if conv:
+            self.current_is_muc = conv.is_muc
 
         logger.debug(f"Loading conversation: account={account_id}, jid={jid}, is_muc={self.current_is_muc}, conv_id={self.current_conversation_id}")
 
-        # Load encryption state and typing indicator preference from conversation (if exists)
+        # Load encryption state from conversation (if exists)
         encryption_enabled = True  # default
-        send_typing = True  # default
-        if self.current_conversation_id:
-            conv = self.db.fetchone("""
-                SELECT encryption, send_typing FROM conversation WHERE id = ?
-            """, (self.current_conversation_id,))
-            if conv:
-                # Set encryption state (0 = plain, 1 = OMEMO)
-                encryption_enabled = bool(conv['encryption'])
-                self.encryption_enabled = encryption_enabled
-
-                # Get typing indicator preference (default True if NULL)
-                send_typing = conv['send_typing'] if conv['send_typing'] is not None else 1
+        if conv:
+            # Set encryption state (0 = plain, 1 = OMEMO)
+            encryption_enabled = bool(conv.encryption)
+            self.encryption_enabled = encryption_enabled
 
         # Update encryption button visibility based on conversation type and MUC features (XEP-0384, standard behavior)
         self._update_encryption_button_visibility()
@@ -386,7 +368,6 @@ class ChatViewWidget(QWidget):
             self.input_field.hide_visitor_overlay()
 
         # Load header with all conversation info
-        # Note: send_typing is still loaded from DB above but not passed to header (no button anymore)
         self.header.load_contact(
             account_id=account_id,
             jid=jid,
@@ -1046,6 +1027,13 @@ class ChatViewWidget(QWidget):
                     f"Request failed: {result['message']}"
                 )
 
+    def _typing_disabled(self) -> bool:
+        """True if typing notifications are off for the current conversation (no DB query)."""
+        if not self.current_conversation_id:
+            return False
+        conv = self.conversations.get(self.current_conversation_id)
+        return conv is not None and not conv.send_typing
+
     def _send_composing_state(self):
         """Send 'composing' chat state to peer (XEP-0085)."""
         if not self.current_account_id or not self.current_jid:
@@ -1056,14 +1044,9 @@ class ChatViewWidget(QWidget):
             return
 
         # Check if typing indicators are enabled for this conversation
-        if self.current_conversation_id:
-            conv = self.db.fetchone("""
-                SELECT send_typing FROM conversation WHERE id = ?
-            """, (self.current_conversation_id,))
-
-            if conv and conv['send_typing'] == 0:
-                logger.debug(f"Typing indicators disabled for {self.current_jid}, skipping 'composing' state")
-                return
+        if self._typing_disabled():
+            logger.debug(f"Typing indicators disabled for {self.current_jid}, skipping 'composing' state")
+            return
 
         try:
             account.client.send_chat_state(self.current_jid, 'composing')
@@ -1081,14 +1064,9 @@ class ChatViewWidget(QWidget):
             return
 
         # Check if typing indicators are enabled for this conversation
-        if self.current_conversation_id:
-            conv = self.db.fetchone("""
-                SELECT send_typing FROM conversation WHERE id = ?
-            """, (self.current_conversation_id,))
-
-            if conv and conv['send_typing'] == 0:
-                logger.debug(f"Typing indicators disabled for {self.current_jid}, skipping 'paused' state")
-                return
+        if self._typing_disabled():
+            logger.debug(f"Typing indicators disabled for {self.current_jid}, skipping 'paused' state")
+            return
 
         try:
             account.client.send_chat_state(self.current_jid, 'paused')
@@ -1106,14 +1084,9 @@ class ChatViewWidget(QWidget):
             return
 
         # Check if typing indicators are enabled for this conversation
-        if self.current_conversation_id:
-            conv = self.db.fetchone("""
-                SELECT send_typing FROM conversation WHERE id = ?
-            """, (self.current_conversation_id,))
-
-            if conv and conv['send_typing'] == 0:
-                logger.debug(f"Typing indicators disabled for {self.current_jid}, skipping 'active' state")
-                return
+        if self._typing_disabled():
+            logger.debug(f"Typing indicators disabled for {self.current_jid}, skipping 'active' state")
+            return
 
         try:
             account.client.send_chat_state(self.current_jid, 'active')
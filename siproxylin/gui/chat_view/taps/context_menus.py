@@ -12,7 +12,6 @@ from ...widgets.message_delegate import MessageBubbleDelegate
 from ...widgets.spell_highlighter import SpellingBlockData
 from ...dialogs.message_info_dialog import show_message_info_dialog
 from ...dialogs.file_properties_dialog import show_file_properties_dialog
-from ...dialogs.emoji_picker_dialog import show_emoji_picker_dialog
 
 
 logger = logging.getLogger('siproxylin.chat_view.context_menus')
@@ -23,7 +22,7 @@ class ContextMenuManager:
     Manages context menus for chat view.
 
     Handles:
-    - Message context menu (Reply, React, Edit, Info, Save As, Properties)
+    - Message context menu (Reply, React, Edit, Info, Save As, Properties, Cancel Upload)
     - Input field context menu (Spell check suggestions, Cut/Copy/Paste)
     """
 
@@ -132,6 +131,14 @@ class ContextMenuManager:
             mime_type = index.data(MessageBubbleDelegate.ROLE_MIME_TYPE) or ""
             file_size = index.data(MessageBubbleDelegate.ROLE_FILE_SIZE) or 0
 
+            # Upload in progress (sent from this device): allow cancelling it
+            if direction == 1 and not is_carbon and index.data(MessageBubbleDelegate.ROLE_FILE_STATE) == 1:
+                upload_item_id = index.data(MessageBubbleDelegate.ROLE_CONTENT_ITEM_ID)
+                cancel_action = QAction("Cancel Upload", self.parent)
+                cancel_action.triggered.connect(lambda: self.parent.cancel_file_upload.emit(upload_item_id))
+                menu.addAction(cancel_action)
+                menu.addSeparator()
+
             # Add separator before file options for images and videos
             if mime_type.startswith('image/') or mime_type.startswith('video/'):
                 menu.addSeparator()
@@ -374,6 +381,9 @@ class ContextMenuManager:
 
     def _show_emoji_picker(self, message_id, current_account_id, current_jid):
         """Show emoji picker dialog for reacting to a message."""
+        # Emoji data is large - loaded on first use
+        from ...dialogs.emoji_picker_dialog import show_emoji_picker_dialog
+
         # Show emoji picker (pure UI - returns emoji or None)
         emoji = show_emoji_picker_dialog(self.parent)
 
@@ -11,11 +11,12 @@ from PySide6.QtWidgets import (
     QFrame, QToolButton, QMessageBox, QLineEdit, QListWidget, QListWidgetItem,
     QDialog, QPushButton
 )
-from PySide6.QtCore import Qt, Signal, QTimer, QRect
+from PySide6.QtCore import Qt, Signal, QRect
 from PySide6.QtGui import QShortcut, QKeySequence, QPainter, QFont
 from PySide6.QtWidgets import QStyledItemDelegate, QStyle
 
-from ....utils.avatar import get_avatar_pixmap, get_avatar_cache
+from ....utils.avatar import get_avatar_loader, get_avatar_cache
+from ....db.conversation_registry import get_conversation_registry
 from ...utils import TooltipEventFilter
 
 
@@ -369,16 +370,12 @@ class ChatHeaderWidget(QFrame):
         # Reference to message widget (set later for search highlight management)
         self.message_widget = None
 
-        # MUC info refresh timer (for participant count)
-        self.muc_info_refresh_timer = QTimer(self)
-        self.muc_info_refresh_timer.timeout.connect(self._refresh_muc_info_once)
-        self.muc_refresh_attempts = 0
-
         # Track MUC signal connections
         self._muc_error_connection = None
         self._muc_error_account_id = None  # Track which account we're connected to
         self._muc_join_success_connection = None
         self._muc_join_success_account_id = None
+        self._muc_participants_account_id = None  # Account whose muc_participants_changed we listen to
 
         # Search result delegates (created in _setup_ui, stored for theme updates)
         self.search_dropdown_delegate = None
@@ -387,6 +384,9 @@ class ChatHeaderWidget(QFrame):
         # Setup UI
         self._setup_ui()
 
+        # Avatars decode off the GUI thread; swap in the photo when it's ready
+        get_avatar_loader().avatar_ready.connect(self._on_avatar_ready)
+
     def _setup_ui(self):
         """Create and layout all header widgets."""
         self.setObjectName("chatHeader")
@@ -624,9 +624,8 @@ class ChatHeaderWidget(QFrame):
             # Note: join_room_button visibility is managed by _update_muc_info() based on join status
             self._update_muc_info()
 
-            # Start refresh timer if participant count is not loaded yet
-            self.muc_refresh_attempts = 0
-            self.muc_info_refresh_timer.start(2000)  # Check every 2 seconds
+            # Participant count follows occupant changes (pushed, coalesced per room)
+            self._connect_muc_participants(account_id)
 
             # Connect to MUC join error signal for this account
             # Disconnect previous signal if connected to different account
@@ -655,7 +654,7 @@ class ChatHeaderWidget(QFrame):
             self.participant_count_label.hide()
             self.room_subject_label.hide()
             self.join_room_button.hide()
-            self.muc_info_refresh_timer.stop()
+            self._connect_muc_participants(None)
 
             # Disconnect MUC signals when not in MUC
             if self._muc_error_connection and self._muc_error_account_id is not None:
@@ -720,7 +719,7 @@ class ChatHeaderWidget(QFrame):
         self.participant_count_label.hide()
         self.blocked_indicator.hide()
         self.room_subject_label.hide()
-        self.muc_info_refresh_timer.stop()
+        self._connect_muc_participants(None)
 
         logger.debug("Header cleared")
 
@@ -808,8 +807,8 @@ class ChatHeaderWidget(QFrame):
             return
 
         try:
-            # Get avatar pixmap (from DB or fallback to initials)
-            avatar_pixmap = get_avatar_pixmap(
+            # Cached avatar, or initials until _on_avatar_ready (decoded in background)
+            avatar_pixmap = get_avatar_loader().request(
                 account_id=self.current_account_id,
                 jid=self.current_jid,
                 size=40
@@ -826,6 +825,11 @@ class ChatHeaderWidget(QFrame):
             # Clear avatar on error
             self.avatar_label.clear()
 
+    def _on_avatar_ready(self, account_id: int, jid: str, size: int):
+        """Replace the placeholder once the current contact's avatar is decoded."""
+        if account_id == self.current_account_id and jid == self.current_jid and size == 40:
+            self._update_avatar()
+
     def _update_presence_indicator(self):
         """Update presence indicator for current contact (1-1 chats only)."""
         if not self.current_account_id or not self.current_jid or self.current_is_muc:
@@ -871,32 +875,13 @@ class ChatHeaderWidget(QFrame):
                     self.join_room_button.show()
                     return False
 
-                # Query slixmpp's in-memory MUC roster (XEP-0045) - same as muc_details_dialog.py
-                xep_0045 = account.client.plugin['xep_0045']
-                roster = xep_0045.get_roster(self.current_jid)
-
-                if roster:
-                    # Deduplicate by real JID if available (non-anonymous rooms)
-                    # Some users may have multiple nicknames (nickname changes, stale presence)
-                    from slixmpp.jid import JID
-                    room_jid_obj = JID(self.current_jid)
-                    unique_jids = set()
-                    anonymous_count = 0
-
-                    for nick in roster:
-                        real_jid_str = xep_0045.get_jid_property(room_jid_obj, nick, 'jid')
-                        if real_jid_str:
-                            bare_jid = str(real_jid_str).split('/')[0]
-                            unique_jids.add(bare_jid)
-                        else:
-                            # Anonymous user (semi-anonymous room)
-                            anonymous_count += 1
-
-                    total_count = len(unique_jids) + anonymous_count
+                # Occupant count, deduplicated by real JID (nick changes, multiple clients)
+                total_count = account.muc.get_participant_count(self.current_jid)
+
+                if total_count:
                     self.participant_count_label.setText(f"👥 {total_count}")
                     self.participant_count_label.show()
                     self.join_room_button.hide()  # Hide join button when successfully joined
-                    logger.debug(f"MUC participant count updated: {total_count} ({len(unique_jids)} identified + {anonymous_count} anonymous)")
                     return True
                 else:
                     # Empty roster (shouldn't happen after join)
@@ -919,27 +904,42 @@ class ChatHeaderWidget(QFrame):
         self.join_room_button.show()
         return False
 
-    def _refresh_muc_info_once(self):
-        """Timer callback to refresh MUC info (participant count) until loaded."""
-        if not self.current_is_muc:
-            self.muc_info_refresh_timer.stop()
+    def _connect_muc_participants(self, account_id):
+        """
+        Listen to occupant changes of one account (None = stop listening).
+
+        Args:
+            account_id: Account ID of the displayed room, or None
+        """
+        if self._muc_participants_account_id == account_id:
             return
 
-        # Try to update
-        loaded = self._update_muc_info()
+        if self._muc_participants_account_id is not None:
+            prev_account = self.account_manager.get_account(self._muc_participants_account_id)
+            if prev_account:
+                try:
+                    prev_account.muc_participants_changed.disconnect(self._on_muc_participants_changed)
+                except:
+                    pass  # Signal may not be connected
+        self._muc_participants_account_id = None
 
-        if loaded:
-            # Successfully loaded - stop timer
-            self.muc_info_refresh_timer.stop()
-            logger.debug(f"MUC roster loaded for {self.current_jid}, stopping refresh timer")
-        else:
-            # Not loaded yet - increment attempts
-            self.muc_refresh_attempts += 1
+        account = self.account_manager.get_account(account_id) if account_id is not None else None
+        if account:
+            account.muc_participants_changed.connect(self._on_muc_participants_changed)
+            self._muc_participants_account_id = account_id
 
-            # Stop after 15 attempts (30 seconds)
-            if self.muc_refresh_attempts >= 15:
-                self.muc_info_refresh_timer.stop()
-                logger.warning(f"MUC roster not loaded after 30 seconds for {self.current_jid}, stopping refresh timer")
+    def _on_muc_participants_changed(self, account_id: int, room_jid: str, changes: dict):
+        """
+        Handle coalesced occupant changes (joins, leaves, nick/role changes).
+
+        Args:
+            account_id: Account ID
+            room_jid: Room JID
+            changes: {nick: Participant or None}
+        """
+        if account_id != self.current_account_id or room_jid != self.current_jid:
+            return
+        self._update_muc_info()
 
     def _on_join_room_clicked(self):
         """Handle Join Room button click for bookmarked-but-not-joined MUC rooms."""
@@ -1095,11 +1095,6 @@ class ChatHeaderWidget(QFrame):
 
         # Only update UI elements if this is the currently displayed room
         if room_jid == self.current_jid:
-            # Stop the MUC roster refresh timer (join failed, no roster to load)
-            if self.muc_info_refresh_timer.isActive():
-                self.muc_info_refresh_timer.stop()
-                logger.debug(f"Stopped MUC roster timer for {room_jid} (join failed)")
-
             # Re-enable join button
             self.join_room_button.setEnabled(True)
             self.join_room_button.setText("Join Room")
@@ -1482,10 +1477,7 @@ class ChatHeaderWidget(QFrame):
         # Save to database
         if self.current_conversation_id:
             encryption_value = 1 if encryption_enabled else 0
-            self.db.execute("""
-                UPDATE conversation SET encryption = ? WHERE id = ?
-            """, (encryption_value, self.current_conversation_id))
-            self.db.commit()
+            get_conversation_registry().update(self.current_conversation_id, encryption=encryption_value)
 
             logger.info(f"OMEMO encryption {'enabled' if encryption_enabled else 'disabled'} for conversation {self.current_conversation_id}")
 
@@ -5,14 +5,18 @@ Displays message history with timestamps, encryption indicators, file transfers,
 """
 
 import logging
+import os
 import time
 from datetime import datetime, timedelta
+from typing import Dict, Optional
 from PySide6.QtWidgets import QListView, QFrame, QApplication
 from PySide6.QtCore import Qt, QTimer, QLocale, QObject
 from PySide6.QtGui import QStandardItemModel, QStandardItem
 
 from ....db.database import get_db
+from ....db.conversation_registry import get_conversation_registry
 from ...widgets.message_delegate import MessageBubbleDelegate
+from ....utils.message_markup import RENDERER_VERSION, render_body_html
 from ....styles.theme_manager import get_theme_manager
 
 
@@ -113,10 +117,9 @@ class MessageDisplayWidget(QObject):
         self.mam_loading_jids = set()    # Set of JIDs currently loading MAM history
         self.mam_queried_jids = set()    # Set of account:jid keys already queried (even if empty)
 
-        # Zone tracking for smart polling control (Phase 2)
+        # Zone tracking: refresh() leaves the history zone alone (Phase 2)
         self.in_live_zone = True         # True = live zone (>50% scroll), False = history zone (<=50%)
         self.zone_locked = False         # When True, prevent auto-zone changes (e.g., during search)
-        self.main_window = None          # Reference to MainWindow for polling control
 
         # Setup UI
         self._setup_ui()
@@ -161,7 +164,7 @@ class MessageDisplayWidget(QObject):
         Handle scroll position changes to trigger infinite scroll and zone detection.
 
         When user scrolls near the top, load more older messages.
-        Zone detection controls polling: disable when viewing history, enable when at bottom.
+        Zone detection: refresh() is skipped while viewing history, resumes at the bottom.
         """
         scrollbar = self.message_area.verticalScrollBar()
 
@@ -189,7 +192,7 @@ class MessageDisplayWidget(QObject):
                 self.last_load_time = now
                 self._load_more_messages()
 
-        # 2. Zone detection: Calculate scroll percentage for polling control
+        # 2. Zone detection: Calculate scroll percentage (refresh() skips the history zone)
         # Live zone = > 50% (near bottom), History zone = <= 50% (scrolled up)
         # BUT: Only if zone is not locked (locked during search views)
         if not self.zone_locked:
@@ -203,12 +206,6 @@ class MessageDisplayWidget(QObject):
                 self.in_live_zone = in_live_zone
                 zone_name = "LIVE" if in_live_zone else "HISTORY"
                 logger.info(f"Zone changed: {zone_name} (scroll position: {percentage:.1f}%)")
-
-                # Control polling via MainWindow
-                if self.main_window:
-                    self.main_window.set_chat_polling_enabled(in_live_zone)
-                else:
-                    logger.warning("Cannot control polling - main_window reference is None!")
         else:
             logger.debug(f"Zone locked, ignoring scroll position {percentage:.1f}%")
 
@@ -340,6 +337,8 @@ class MessageDisplayWidget(QObject):
                     m.stanza_id,
                     j.bare_jid AS counterpart_jid,
                     quoted_m.body AS quoted_body,
+                    mh.html AS body_html,
+                    mh.renderer_version AS body_html_version,
                     -- File transfer fields
                     ft.id AS ft_id,
                     ft.direction AS ft_direction,
@@ -349,6 +348,7 @@ class MessageDisplayWidget(QObject):
                     ft.size,
                     ft.encryption AS ft_encryption,
                     ft.is_carbon AS ft_is_carbon,
+                    ft.state AS ft_state,
                     ft.message_id AS ft_message_id,
                     ft.origin_id AS ft_origin_id,
                     ft.stanza_id AS ft_stanza_id,
@@ -364,6 +364,7 @@ class MessageDisplayWidget(QObject):
                 LEFT JOIN jid j ON m.counterpart_id = j.id
                 LEFT JOIN reply r ON r.message_id = m.id
                 LEFT JOIN message quoted_m ON r.quoted_message_id = quoted_m.id
+                LEFT JOIN message_html mh ON mh.message_id = m.id
                 LEFT JOIN file_transfer ft ON ci.content_type = 2 AND ci.foreign_id = ft.id
                 LEFT JOIN call c ON ci.content_type = 3 AND ci.foreign_id = c.id
                 WHERE ci.conversation_id = ? AND ci.hide = 0
@@ -437,6 +438,8 @@ class MessageDisplayWidget(QObject):
                     m.stanza_id,
                     j.bare_jid AS counterpart_jid,
                     quoted_m.body AS quoted_body,
+                    mh.html AS body_html,
+                    mh.renderer_version AS body_html_version,
                     -- File transfer fields
                     ft.id AS ft_id,
                     ft.direction AS ft_direction,
@@ -446,6 +449,7 @@ class MessageDisplayWidget(QObject):
                     ft.size,
                     ft.encryption AS ft_encryption,
                     ft.is_carbon AS ft_is_carbon,
+                    ft.state AS ft_state,
                     ft.message_id AS ft_message_id,
                     ft.origin_id AS ft_origin_id,
                     ft.stanza_id AS ft_stanza_id,
@@ -461,6 +465,7 @@ class MessageDisplayWidget(QObject):
                 LEFT JOIN jid j ON m.counterpart_id = j.id
                 LEFT JOIN reply r ON r.message_id = m.id
                 LEFT JOIN message quoted_m ON r.quoted_message_id = quoted_m.id
+                LEFT JOIN message_html mh ON mh.message_id = m.id
                 LEFT JOIN file_transfer ft ON ci.content_type = 2 AND ci.foreign_id = ft.id
                 LEFT JOIN call c ON ci.content_type = 3 AND ci.foreign_id = c.id
                 WHERE ci.conversation_id = ? AND ci.hide = 0 AND ci.time < ?
@@ -613,6 +618,7 @@ class MessageDisplayWidget(QObject):
             insert_at_top: If True, prepend items (for load-more), else append
         """
         insert_position = 0
+        rendered = []  # (message.id, html) rendered now, stored below
 
         for row in rows:
             content_item_id = row['ci_id']
@@ -658,6 +664,13 @@ class MessageDisplayWidget(QObject):
                 is_carbon = bool(row['msg_is_carbon'])
                 quoted_body = row['quoted_body'] or ''
 
+                # Styled body: stored rendering, or render once and store it
+                if row['body_html_version'] == RENDERER_VERSION:
+                    body_html = row['body_html']
+                else:
+                    body_html = render_body_html(body)
+                    rendered.append((row['msg_id'], body_html))
+
                 # Get message ID for reactions/editing
                 # XEP-0444: MUC reactions MUST use stanza_id (server-assigned)
                 # 1-1 chats prefer message_id or origin_id (client-assigned)
@@ -670,6 +683,7 @@ class MessageDisplayWidget(QObject):
                 item = QStandardItem()
                 item.setData(direction, MessageBubbleDelegate.ROLE_DIRECTION)
                 item.setData(body, MessageBubbleDelegate.ROLE_BODY)
+                item.setData(body_html, MessageBubbleDelegate.ROLE_BODY_HTML)
                 item.setData(timestamp, MessageBubbleDelegate.ROLE_TIMESTAMP)
                 item.setData(row_timestamp, MessageBubbleDelegate.ROLE_TIMESTAMP_RAW)
                 item.setData(encrypted, MessageBubbleDelegate.ROLE_ENCRYPTED)
@@ -715,6 +729,18 @@ class MessageDisplayWidget(QObject):
                 file_icon = self.message_delegate._get_file_icon(mime_type)
                 file_size_text = self.message_delegate._format_file_size(file_size) if file_size else "Unknown size"
 
+                # Download not finished: plain file row (no preview yet) with its state
+                ft_state = row['ft_state']
+                if ft_state != 2 and file_path and not os.path.exists(file_path):
+                    mime_type = ''
+                    file_icon = '⏳' if ft_state in (0, 1) else '⚠'
+                    file_size_text = "Downloading..." if ft_state in (0, 1) else "Download failed"
+                elif ft_state == 1 and direction == 1 and not is_carbon:
+                    # Upload running: plain file row so progress is visible
+                    mime_type = ''
+                    file_icon = '⏫'
+                    file_size_text = "Uploading..."
+
                 # Create item for file
                 item = QStandardItem()
                 item.setData(direction, MessageBubbleDelegate.ROLE_DIRECTION)
@@ -724,6 +750,7 @@ class MessageDisplayWidget(QObject):
                 item.setData(file_size, MessageBubbleDelegate.ROLE_FILE_SIZE)
                 item.setData(file_icon, MessageBubbleDelegate.ROLE_FILE_ICON)
                 item.setData(file_size_text, MessageBubbleDelegate.ROLE_FILE_SIZE_TEXT)
+                item.setData(ft_state, MessageBubbleDelegate.ROLE_FILE_STATE)
                 item.setData(timestamp, MessageBubbleDelegate.ROLE_TIMESTAMP)
                 item.setData(row_timestamp, MessageBubbleDelegate.ROLE_TIMESTAMP_RAW)
                 item.setData(encrypted, MessageBubbleDelegate.ROLE_ENCRYPTED)
@@ -779,6 +806,13 @@ class MessageDisplayWidget(QObject):
                 else:
                     self.message_model.appendRow(item)
 
+        if rendered:
+            try:
+                self.db.store_message_html(rendered, RENDERER_VERSION)
+            except Exception as e:
+                # Rendering is cached for next time only; display is unaffected
+                logger.warning(f"Failed to store rendered message bodies: {e}")
+
     def _send_displayed_markers(self):
         """
         Send 'displayed' marker for most recent received message (XEP-0333 compliant).
@@ -802,35 +836,26 @@ class MessageDisplayWidget(QObject):
                 logger.warning(f"_send_displayed_markers: No account or client for {self.current_account_id}")
                 return
 
-            # Get jid_id
-            jid_row = self.db.fetchone("SELECT id FROM jid WHERE bare_jid = ?", (self.current_jid,))
-            if not jid_row:
-                logger.debug(f"_send_displayed_markers: JID {self.current_jid} not found in DB")
-                return
-            jid_id = jid_row['id']
-
-            # Get or create conversation (type=0 for chat, type=1 for MUC)
-            conv_type = 1 if self.current_is_muc else 0
-            conversation_id = self.db.get_or_create_conversation(self.current_account_id, jid_id, conv_type)
-
-            # Get conversation state
-            conv = self.db.fetchone("""
-                SELECT read_up_to_item, send_marker
-                FROM conversation
-                WHERE id = ?
-            """, (conversation_id,))
-
-            if not conv:
-                logger.warning(f"_send_displayed_markers: Conversation {conversation_id} not found")
-                return
+            # Get or create conversation (type=0 for chat, type=1 for MUC) - state from registry
+            conversations = get_conversation_registry()
+            conv = conversations.find(self.current_account_id, self.current_jid)
+            if conv is None:
+                jid_row = self.db.fetchone("SELECT id FROM jid WHERE bare_jid = ?", (self.current_jid,))
+                if not jid_row:
+                    logger.debug(f"_send_displayed_markers: JID {self.current_jid} not found in DB")
+                    return
+                conv_type = 1 if self.current_is_muc else 0
+                conv = conversations.get_or_create(self.current_account_id, jid_row['id'],
+                                                   self.current_jid, conv_type)
+            conversation_id = conv.id
 
             # For 1-to-1 chats: Check if markers are enabled
             # For MUCs: Skip marker check (we'll update locally but not send XMPP markers)
-            if not self.current_is_muc and conv['send_marker'] == 0:
+            if not self.current_is_muc and not conv.send_marker:
                 logger.debug(f"_send_displayed_markers: Markers disabled for {self.current_jid}")
                 return
 
-            read_up_to_item = conv['read_up_to_item']
+            read_up_to_item = conv.read_up_to_item
 
             # Get most recent received content (message OR file) that hasn't been marked yet
             # We update read_up_to_item for ANY content to clear unread counters,
@@ -881,7 +906,7 @@ class MessageDisplayWidget(QObject):
 
             # Update conversation.read_up_to_item (for both 1-to-1 and MUC, for both messages and files)
             # This clears unread counters locally regardless of whether XMPP marker was sent
-            self.db.update_conversation_read_up_to(conversation_id, content_item_id)
+            conversations.update(conversation_id, read_up_to_item=content_item_id)
             if self.current_is_muc:
                 logger.debug(f"Updated read_up_to_item for MUC {self.current_jid} (local only, no XMPP marker)")
             else:
@@ -907,6 +932,63 @@ class MessageDisplayWidget(QObject):
             import traceback
             logger.error(traceback.format_exc())
 
+    def _find_content_item_row(self, content_item_id: int):
+        """Find the model item of a content item (searching from the newest row)."""
+        for row in range(self.message_model.rowCount() - 1, -1, -1):
+            item = self.message_model.item(row)
+            if item.data(MessageBubbleDelegate.ROLE_CONTENT_ITEM_ID) == content_item_id:
+                return item
+        return None
+
+    def update_file_progress(self, content_item_id: int, received: int, total: Optional[int]):
+        """
+        Show download/upload progress on a file row (no reload).
+
+        Args:
+            content_item_id: content_item.id of the file transfer
+            received: Bytes transferred so far
+            total: Expected size in bytes (None if unknown)
+        """
+        item = self._find_content_item_row(content_item_id)
+        if item is None:
+            return
+        fmt = self.message_delegate._format_file_size
+        text = f"{fmt(received)} / {fmt(total)}" if total else fmt(received)
+        item.setData(text, MessageBubbleDelegate.ROLE_FILE_SIZE_TEXT)
+
+    def update_receipt_marks(self, changes: Dict[int, int]):
+        """
+        Patch receipt/marker indicators of the loaded rows (no reload).
+
+        Rows that aren't loaded are skipped - they read the new value from
+        the database when they are.
+
+        Args:
+            changes: {content_item_id: marked}
+        """
+        remaining = dict(changes)
+        for row in range(self.message_model.rowCount() - 1, -1, -1):
+            if not remaining:
+                break
+            item = self.message_model.item(row)
+            marked = remaining.pop(item.data(MessageBubbleDelegate.ROLE_CONTENT_ITEM_ID), None)
+            if marked is not None:
+                item.setData(marked, MessageBubbleDelegate.ROLE_MARKED)
+
+    def finish_file_transfer(self, content_item_id: int):
+        """
+        Re-render a file row once its download/upload completed or failed.
+
+        Args:
+            content_item_id: content_item.id of the file transfer
+        """
+        item = self._find_content_item_row(content_item_id)
+        if item is None:
+            return
+        # The row was rendered without preview while the file didn't exist
+        self.message_delegate.invalidate_file(item.data(MessageBubbleDelegate.ROLE_FILE_PATH))
+        self.refresh()
+
     def refresh(self, send_markers: bool = False):
         """
         Refresh the message display.
@@ -914,7 +996,7 @@ class MessageDisplayWidget(QObject):
         Args:
             send_markers: If True, send displayed markers for received messages.
                          Should only be True when opening chat or receiving new message,
-                         NOT during polling refresh for receipt updates.
+                         NOT during a background refresh.
         """
         # logger.debug(f"refresh() called: account={self.current_account_id}, jid={self.current_jid}, send_markers={send_markers}")
         if self.current_account_id and self.current_jid:
@@ -982,10 +1064,12 @@ class MessageDisplayWidget(QObject):
                         m.counterpart_resource, m.message_id, m.origin_id, m.stanza_id, m.is_carbon AS msg_is_carbon,
                         ft.id AS ft_id, ft.direction AS ft_direction, ft.path, ft.file_name, ft.mime_type, ft.size,
                         ft.encryption AS ft_encryption, ft.message_id AS ft_message_id, ft.origin_id AS ft_origin_id,
-                        ft.stanza_id AS ft_stanza_id, ft.is_carbon AS ft_is_carbon,
+                        ft.stanza_id AS ft_stanza_id, ft.is_carbon AS ft_is_carbon, ft.state AS ft_state,
                         c.id AS call_id, c.direction AS call_direction, c.state AS call_state, c.type AS call_type,
                         c.time AS call_time, c.end_time AS call_end_time,
                         quoted_m.body AS quoted_body,
+                        mh.html AS body_html,
+                        mh.renderer_version AS body_html_version,
                         j.bare_jid AS counterpart_jid
                     FROM content_item ci
                     LEFT JOIN message m ON ci.content_type = 0 AND ci.foreign_id = m.id
@@ -994,6 +1078,7 @@ class MessageDisplayWidget(QObject):
                     LEFT JOIN call c ON ci.content_type = 3 AND ci.foreign_id = c.id
                     LEFT JOIN reply r ON r.message_id = m.id
                     LEFT JOIN message quoted_m ON r.quoted_message_id = quoted_m.id
+                    LEFT JOIN message_html mh ON mh.message_id = m.id
                     WHERE ci.conversation_id = ? AND ci.hide = 0 AND ci.time < (SELECT time FROM content_item WHERE id = ?)
                     ORDER BY ci.time DESC
                     LIMIT ?
@@ -1011,10 +1096,12 @@ class MessageDisplayWidget(QObject):
                     m.counterpart_resource, m.message_id, m.origin_id, m.stanza_id, m.is_carbon AS msg_is_carbon,
                     ft.id AS ft_id, ft.direction AS ft_direction, ft.path, ft.file_name, ft.mime_type, ft.size,
                     ft.encryption AS ft_encryption, ft.message_id AS ft_message_id, ft.origin_id AS ft_origin_id,
-                    ft.stanza_id AS ft_stanza_id, ft.is_carbon AS ft_is_carbon,
+                    ft.stanza_id AS ft_stanza_id, ft.is_carbon AS ft_is_carbon, ft.state AS ft_state,
                     c.id AS call_id, c.direction AS call_direction, c.state AS call_state, c.type AS call_type,
                     c.time AS call_time, c.end_time AS call_end_time,
                     quoted_m.body AS quoted_body,
+                    mh.html AS body_html,
+                    mh.renderer_version AS body_html_version,
                     j.bare_jid AS counterpart_jid
                 FROM content_item ci
                 LEFT JOIN message m ON ci.content_type = 0 AND ci.foreign_id = m.id
@@ -1023,6 +1110,7 @@ class MessageDisplayWidget(QObject):
                 LEFT JOIN call c ON ci.content_type = 3 AND ci.foreign_id = c.id
                 LEFT JOIN reply r ON r.message_id = m.id
                 LEFT JOIN message quoted_m ON r.quoted_message_id = quoted_m.id
+                LEFT JOIN message_html mh ON mh.message_id = m.id
                 WHERE ci.id = ?
 
                 UNION ALL
@@ -1038,10 +1126,12 @@ class MessageDisplayWidget(QObject):
                         m.counterpart_resource, m.message_id, m.origin_id, m.stanza_id, m.is_carbon AS msg_is_carbon,
                         ft.id AS ft_id, ft.direction AS ft_direction, ft.path, ft.file_name, ft.mime_type, ft.size,
                         ft.encryption AS ft_encryption, ft.message_id AS ft_message_id, ft.origin_id AS ft_origin_id,
-                        ft.stanza_id AS ft_stanza_id, ft.is_carbon AS ft_is_carbon,
+                        ft.stanza_id AS ft_stanza_id, ft.is_carbon AS ft_is_carbon, ft.state AS ft_state,
                         c.id AS call_id, c.direction AS call_direction, c.state AS call_state, c.type AS call_type,
                         c.time AS call_time, c.end_time AS call_end_time,
                         quoted_m.body AS quoted_body,
+                        mh.html AS body_html,
+                        mh.renderer_version AS body_html_version,
                         j.bare_jid AS counterpart_jid
                     FROM content_item ci
                     LEFT JOIN message m ON ci.content_type = 0 AND ci.foreign_id = m.id
@@ -1050,6 +1140,7 @@ class MessageDisplayWidget(QObject):
                     LEFT JOIN call c ON ci.content_type = 3 AND ci.foreign_id = c.id
                     LEFT JOIN reply r ON r.message_id = m.id
                     LEFT JOIN message quoted_m ON r.quoted_message_id = quoted_m.id
+                    LEFT JOIN message_html mh ON mh.message_id = m.id
                     WHERE ci.conversation_id = ? AND ci.hide = 0 AND ci.time > (SELECT time FROM content_item WHERE id = ?)
                     ORDER BY ci.time ASC
                     LIMIT ?
@@ -1074,7 +1165,7 @@ class MessageDisplayWidget(QObject):
         # Process and add rows to model (same logic as _load_messages)
         self._populate_model_with_rows(rows)
 
-        # Enter HISTORY zone to disable polling (we're viewing old messages, not live)
+        # Enter HISTORY zone to stop live refreshes (we're viewing old messages, not live)
         # Lock the zone so scroll events don't override this
         self._lock_zone_to_history()
 
@@ -1109,22 +1200,18 @@ class MessageDisplayWidget(QObject):
         QTimer.singleShot(100, scroll_to_target)
 
     def _lock_zone_to_history(self):
-        """Lock zone to HISTORY (disable polling during search)."""
+        """Lock zone to HISTORY (no live refreshes during search)."""
         self.zone_locked = True
         if self.in_live_zone:
             self.in_live_zone = False
             logger.info("Entered HISTORY zone (search result) - zone locked")
-            if self.main_window:
-                self.main_window.set_chat_polling_enabled(False)
 
     def _unlock_zone_to_live(self):
-        """Unlock zone and return to LIVE (enable polling)."""
+        """Unlock zone and return to LIVE (live refreshes resume)."""
         self.zone_locked = False
         if not self.in_live_zone:
             self.in_live_zone = True
             logger.info("Re-entered LIVE zone (returning from search) - zone unlocked")
-            if self.main_window:
-                self.main_window.set_chat_polling_enabled(True)
 
     def _clear_highlight_only(self):
         """Clear highlight visual state without zone changes."""
@@ -1170,7 +1257,7 @@ class MessageDisplayWidget(QObject):
         # Clear highlight visual state
         self._clear_highlight_only()
 
-        # Unlock zone and re-enter LIVE zone to re-enable polling
+        # Unlock zone and re-enter LIVE zone to resume live refreshes
         self._unlock_zone_to_live()
 
         # Reload recent messages to get back to live area
@@ -19,8 +19,9 @@ from PySide6.QtCore import Qt, Signal, QTimer
 from PySide6.QtGui import QFont
 
 from ..db.database import get_db
+from ..db.conversation_registry import get_conversation_registry
 from ..core import get_account_manager
-from ..utils.avatar import get_avatar_pixmap
+from ..utils.avatar import get_avatar_loader
 
 
 logger = logging.getLogger('siproxylin.contact_details_dialog')
@@ -111,6 +112,9 @@ class ContactDetailsDialog(QDialog):
 
         layout.addLayout(button_layout)
 
+        # Avatars decode off the GUI thread; swap in the photo when it's ready
+        get_avatar_loader().avatar_ready.connect(self._on_avatar_ready)
+
         # Load initial data
         self._load_devices()
         self._load_info()
@@ -660,16 +664,8 @@ class ContactDetailsDialog(QDialog):
             self.contact_jid_label.setText(self.jid)
             self.subscription_label.setText("Not in roster")
 
-        # Load avatar
-        try:
-            avatar_pixmap = get_avatar_pixmap(
-                account_id=self.account_id,
-                jid=self.jid,
-                size=80
-            )
-            self.avatar_label.setPixmap(avatar_pixmap)
-        except Exception as e:
-            logger.error(f"Failed to load avatar: {e}")
+        # Load avatar (initials until the photo is decoded, see _on_avatar_ready)
+        self._update_avatar()
 
         # Get presence
         account = self.account_manager.get_account(self.account_id)
@@ -705,6 +701,23 @@ class ContactDetailsDialog(QDialog):
         else:
             self.last_seen_label.setText("Unknown")
 
+    def _update_avatar(self):
+        """Show the contact avatar (cached, or initials while it decodes)."""
+        try:
+            avatar_pixmap = get_avatar_loader().request(
+                account_id=self.account_id,
+                jid=self.jid,
+                size=80
+            )
+            self.avatar_label.setPixmap(avatar_pixmap)
+        except Exception as e:
+            logger.error(f"Failed to load avatar: {e}")
+
+    def _on_avatar_ready(self, account_id: int, jid: str, size: int):
+        """Replace the placeholder once the contact avatar is decoded."""
+        if account_id == self.account_id and jid == self.jid and size == 80:
+            self._update_avatar()
+
     def _load_settings(self):
         """Load contact settings from database."""
         # Get conversation
@@ -713,22 +726,13 @@ class ContactDetailsDialog(QDialog):
             return
 
         jid_id = jid_row['id']
-        conv = self.db.fetchone("""
-            SELECT
-                id,
-                notification,
-                send_typing,
-                send_marker
-            FROM conversation
-            WHERE account_id = ? AND jid_id = ? AND type = 0
-        """, (self.account_id, jid_id))
+        conv = get_conversation_registry().find(self.account_id, self.jid)
 
-        if conv:
-            conversation_id = conv['id']
+        if conv and not conv.is_muc:
             # Load conversation settings
-            self.notifications_checkbox.setChecked(bool(conv['notification']))
-            self.read_receipts_checkbox.setChecked(bool(conv['send_marker']))
-            self.typing_send_checkbox.setChecked(bool(conv['send_typing']))
+            self.notifications_checkbox.setChecked(bool(conv.notification))
+            self.read_receipts_checkbox.setChecked(conv.send_marker)
+            self.typing_send_checkbox.setChecked(conv.send_typing)
 
         # Get roster name and blocked status
         roster = self.db.fetchone("""
@@ -754,19 +758,17 @@ class ContactDetailsDialog(QDialog):
                 return
 
             jid_id = jid_row['id']
-            conversation_id = self.db.get_or_create_conversation(self.account_id, jid_id, 0)
-
-            # Update conversation settings
-            self.db.execute("""
-                UPDATE conversation
-                SET notification = ?, send_typing = ?, send_marker = ?
-                WHERE id = ?
-            """, (
-                1 if self.notifications_checkbox.isChecked() else 0,
-                1 if self.typing_send_checkbox.isChecked() else 0,
-                1 if self.read_receipts_checkbox.isChecked() else 0,
-                conversation_id
-            ))
+            conversations = get_conversation_registry()
+            conversation_id = conversations.get_or_create(self.account_id, jid_id, self.jid, 0).id
+
+            # Update conversation settings (committed with the rest below)
+            conversations.update(
+                conversation_id,
+                commit=False,
+                notification=1 if self.notifications_checkbox.isChecked() else 0,
+                send_typing=self.typing_send_checkbox.isChecked(),
+                send_marker=self.read_receipts_checkbox.isChecked(),
+            )
 
             # Get contact name and subscription states
             new_name = self.name_input.text().strip()
@@ -883,6 +885,7 @@ class ContactDetailsDialog(QDialog):
             """, (conversation_id,))
 
             self.db.commit()
+            get_conversation_registry().forget(conversation_id)
 
             logger.info(f"Deleted chat with {self.jid}")
             QMessageBox.information(self, "Chat Deleted", f"Chat with {self.jid} has been deleted.")
@@ -926,6 +929,9 @@ class ContactDetailsDialog(QDialog):
 
             self.db.commit()
 
+            # Local-only change: cached roster no longer matches the server's version
+            self.db.clear_roster_version(self.account_id)
+
             # TODO: Send roster removal IQ to server (RFC 6121)
 
             logger.info(f"Removed contact {self.jid}")
@@ -2,27 +2,36 @@
 Contact list widget for Siproxylin.
 
 Displays roster contacts with presence indicators, grouped by account.
+
+The tree is a QTreeView over ContactTreeModel (sorted/filtered by
+ContactFilterProxy). Only the first load_roster() resets the model; later
+loads and per-account syncs are diffed, and live events (presence, unread,
+typing, calls) update single rows.
 """
 
 import logging
-from typing import Optional
+from typing import Optional, List
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QTreeWidget, QTreeWidgetItem,
+    QWidget, QVBoxLayout, QTreeView,
     QLabel, QLineEdit, QHBoxLayout, QMenu, QPushButton, QFrame, QToolButton, QMessageBox,
     QListWidget, QListWidgetItem
 )
-from PySide6.QtCore import Qt, Signal, QEvent
-from PySide6.QtGui import QIcon, QAction, QColor
+from PySide6.QtCore import Qt, Signal, QEvent, QModelIndex
+from PySide6.QtGui import QIcon, QAction
 
 from ..db.database import get_db
+from ..db.conversation_registry import get_conversation_registry
 from ..core import get_account_manager
 from ..styles.theme_manager import get_theme_manager
-from .models import ContactDisplayData, AccountDisplayData
+from .models import ContactDisplayData, AccountDisplayData, ContactTreeModel, ContactFilterProxy
 from .utils import TooltipEventFilter
 
 
 logger = logging.getLogger('siproxylin.contact_list')
 
+# Changed entries above which a roster/bookmark update re-diffs the whole account
+SYNC_CONTACTS_MAX = 50
+
 
 class ContactListWidget(QWidget):
     """Contact list widget displaying roster contacts."""
@@ -106,12 +115,24 @@ class ContactListWidget(QWidget):
         # Install event filter on search box for key handling
         self.search_box.installEventFilter(self)
 
-        # Contact tree
-        self.contact_tree = QTreeWidget()
+        # Contact tree (model → sort/filter proxy → view)
+        self.model = ContactTreeModel(participant_count=self._get_muc_participant_count, parent=self)
+        self.proxy = ContactFilterProxy(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.sort(0, Qt.AscendingOrder)
+        self._model_loaded = False
+
+        self.contact_tree = QTreeView()
+        self.contact_tree.setModel(self.proxy)
         self.contact_tree.setHeaderHidden(True)
         self.contact_tree.setIndentation(15)
         self.contact_tree.setRootIsDecorated(True)
-        self.contact_tree.itemClicked.connect(self._on_item_clicked)
+        self.contact_tree.setUniformRowHeights(True)
+        self.contact_tree.setEditTriggers(QTreeView.NoEditTriggers)
+        self.contact_tree.clicked.connect(self._on_item_clicked)
+
+        # Keep new accounts expanded (rows inserted at top level)
+        self.proxy.rowsInserted.connect(self._on_proxy_rows_inserted)
 
         # Enable context menu
         self.contact_tree.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -190,180 +211,281 @@ class ContactListWidget(QWidget):
         logger.debug("Contact list widget created")
 
     def load_roster(self):
-        """Load roster from database and populate tree."""
-        self.contact_tree.clear()
+        """
+        Load roster from database into the model.
+
+        The first call (startup) resets the model; later calls diff every
+        account against the database, so the view keeps selection, scroll
+        position and expansion and only changed rows are repainted.
+        """
+        self._apply_roster_style()
 
-        # Get all accounts
         accounts = self.db.fetchall(
             "SELECT id, bare_jid, nickname FROM account WHERE enabled = 1 ORDER BY id"
         )
 
-        for account in accounts:
-            account_id = account['id']
-            account_label = account['nickname'] or account['bare_jid']
+        loaded = [(self._load_account_data(account), self._load_entries(account['id']))
+                  for account in accounts]
 
-            # Get unread counts for this account
-            unread_by_jid = {}
-            unread_conversations = self.db.get_unread_conversations_for_account(account_id)
-            for conv in unread_conversations:
-                unread_by_jid[conv['jid']] = conv['unread_count']
+        if not self._model_loaded:
+            self.model.reset(loaded)
+            self.contact_tree.expandAll()
+            self._model_loaded = True
+        else:
+            self.model.remove_accounts_except(account['id'] for account in accounts)
+            for account_data, entries in loaded:
+                self.model.sync_account(account_data, entries)
+
+        logger.info(f"Loaded roster for {len(accounts)} accounts")
+
+    def sync_account(self, account_id: int):
+        """
+        Diff one account against the database (connection state change,
+        large roster result). Single roster/bookmark changes use sync_contacts().
+
+        Args:
+            account_id: Account ID
+        """
+        if not self._model_loaded:
+            self.load_roster()
+            return
+
+        account = self.db.fetchone(
+            "SELECT id, bare_jid, nickname FROM account WHERE id = ? AND enabled = 1", (account_id,)
+        )
+        if not account:
+            self.model.remove_account(account_id)
+            return
+
+        self.model.sync_account(self._load_account_data(account), self._load_entries(account_id))
+        logger.debug(f"Synced contact list for account {account_id}")
 
-            account_total_unread = self.db.get_total_unread_for_account(account_id)
+    def sync_contact(self, account_id: int, jid: str):
+        """
+        Add, refresh or drop a single room/contact row.
 
-            # Create account node with data model
-            account_item = QTreeWidgetItem(self.contact_tree)
+        Used for the first message from a new sender or a deleted chat,
+        without touching the rest of the account.
 
-            # Get connection status
-            account_obj = self.account_manager.get_account(account_id)
-            is_connected = account_obj.is_connected() if account_obj else False
+        Args:
+            account_id: Account ID
+            jid: Bare JID
+        """
+        if self.model.get_account(account_id) is None:
+            self.sync_account(account_id)
+            return
+
+        entries = self._load_entries(account_id, jid=jid)
+        if not entries:
+            self.model.remove_entry(account_id, jid)
+        for data in entries:
+            self.model.upsert_entry(data)
+
+    def sync_contacts(self, account_id: int, jids: List[str]):
+        """
+        Apply a roster push or bookmark change: re-read only the given rows.
+
+        A large batch (full roster result after a long absence) diffs the
+        whole account instead, which is fewer queries than one lookup per JID.
+
+        Args:
+            account_id: Account ID
+            jids: Bare JIDs whose roster/bookmark entry changed
+        """
+        if len(jids) > SYNC_CONTACTS_MAX:
+            self.sync_account(account_id)
+            return
 
-            # Create AccountDisplayData model
-            account_data = AccountDisplayData(
+        for jid in dict.fromkeys(jids):
+            self.sync_contact(account_id, jid)
+        logger.debug(f"Synced {len(jids)} contact list entries for account {account_id}")
+
+    def update_account_state(self, account_id: int):
+        """
+        Update account connection indicator.
+
+        Args:
+            account_id: Account ID
+        """
+        account_obj = self.account_manager.get_account(account_id)
+        is_connected = account_obj.is_connected() if account_obj else False
+        self.model.update_account_fields(account_id, is_connected=is_connected)
+
+    def update_display_name(self, account_id: int, jid: str, display_name: str):
+        """
+        Update a contact's display name (roster name / nickname change).
+
+        Args:
+            account_id: Account ID
+            jid: Bare JID
+            display_name: Resolved display name
+        """
+        data = self.model.get_entry(account_id, jid)
+        if data and not data.is_muc:
+            self.model.update_entry(account_id, jid, name=display_name)
+
+    def has_contact(self, account_id: int, jid: str) -> bool:
+        """Check if a room/contact is shown for an account."""
+        bare_jid = jid.split('/')[0] if '/' in jid else jid
+        return self.model.get_entry(account_id, bare_jid) is not None
+
+    def _load_account_data(self, account) -> AccountDisplayData:
+        """Build AccountDisplayData for an account row."""
+        account_id = account['id']
+        account_obj = self.account_manager.get_account(account_id)
+        return AccountDisplayData(
+            account_id=account_id,
+            bare_jid=account['bare_jid'],
+            name=account['nickname'] or account['bare_jid'],
+            is_connected=account_obj.is_connected() if account_obj else False,
+            total_unread=self.db.get_total_unread_for_account(account_id)
+        )
+
+    def _load_entries(self, account_id: int, jid: Optional[str] = None) -> List[ContactDisplayData]:
+        """
+        Load rooms and contacts of an account from the database.
+
+        Candidates are collected from the account's own bookmark/roster/
+        conversation rows (indexed by account) instead of scanning every jid.
+
+        Args:
+            account_id: Account ID
+            jid: Only load this JID (None = whole account)
+
+        Returns:
+            List of ContactDisplayData (rooms and contacts, unsorted)
+        """
+        if jid is not None:
+            jid_row = self.db.fetchone("SELECT id FROM jid WHERE bare_jid = ?", (jid,))
+            if not jid_row:
+                return []
+            only = " AND jid_id = ?"
+            only_params = (jid_row['id'],)
+        else:
+            only = ""
+            only_params = ()
+
+        # Unread counts (one conversation or whole account)
+        unread_by_jid = {}
+        for conv in self.db.get_unread_conversations_for_account(account_id, jid=jid):
+            unread_by_jid[conv['jid']] = conv['unread_count']
+
+        # MUC rooms: bookmarked OR have a MUC conversation with messages
+        # Trust the protocol: conversation.type is set from XMPP msg['type']
+        rooms = self.db.fetchall(f"""
+            SELECT
+                j.bare_jid,
+                COALESCE(NULLIF(b.name, ''), NULLIF(r.name, ''), j.bare_jid) as name,
+                b.id as bookmark_id,
+                b.autojoin,
+                r.id as roster_id
+            FROM (
+                SELECT jid_id FROM bookmark WHERE account_id = ?{only}
+                UNION
+                SELECT c.jid_id FROM conversation c
+                WHERE c.account_id = ? AND c.type = 1{only.replace('jid_id', 'c.jid_id')}
+                  AND EXISTS (SELECT 1 FROM content_item ci WHERE ci.conversation_id = c.id)
+            ) m
+            JOIN jid j ON j.id = m.jid_id
+            LEFT JOIN bookmark b ON b.jid_id = j.id AND b.account_id = ?
+            LEFT JOIN roster r ON r.jid_id = j.id AND r.account_id = ?
+            WHERE j.bare_jid LIKE '%@%'
+        """, (account_id, *only_params, account_id, *only_params, account_id, account_id))
+
+        # 1-to-1 contacts: roster contacts OR conversations with messages
+        contacts = self.db.fetchall(f"""
+            SELECT
+                r.id,
+                j.bare_jid,
+                r.name,
+                r.subscription,
+                r.blocked
+            FROM (
+                SELECT jid_id FROM roster WHERE account_id = ?{only}
+                UNION
+                SELECT c.jid_id FROM conversation c
+                WHERE c.account_id = ? AND c.type = 0{only.replace('jid_id', 'c.jid_id')}
+                  AND EXISTS (SELECT 1 FROM content_item ci WHERE ci.conversation_id = c.id)
+            ) m
+            JOIN jid j ON j.id = m.jid_id
+            LEFT JOIN roster r ON r.jid_id = j.id AND r.account_id = ?
+        """, (account_id, *only_params, account_id, *only_params, account_id))
+
+        account = self.account_manager.get_account(account_id)
+        joined_rooms = account.client.joined_rooms if account and account.client else set()
+
+        entries = []
+        for room in rooms:
+            entries.append(ContactDisplayData(
+                jid=room['bare_jid'],
+                name=room['name'],
                 account_id=account_id,
-                bare_jid=account['bare_jid'],
-                name=account_label,
-                is_connected=is_connected,
-                total_unread=account_total_unread
-            )
+                item_type='muc',
+                is_muc=True,
+                roster_id=room['roster_id'],
+                bookmark_id=room['bookmark_id'],
+                autojoin=bool(room['autojoin']) if room['autojoin'] is not None else False,
+                unread_count=unread_by_jid.get(room['bare_jid'], 0),
+                presence='available' if room['bare_jid'] in joined_rooms else 'unavailable'
+            ))
+
+        # Filter out MUCs from contacts list
+        muc_jids = {room['bare_jid'] for room in rooms}
+        for contact in contacts:
+            contact_jid = contact['bare_jid']
+            if contact_jid in muc_jids:
+                continue
 
-            # Store data model and update display
-            account_item.setData(0, Qt.UserRole, account_data)
-            self._update_account_item(account_item, account_data)
-            account_item.setExpanded(True)
-
-            # Get MUC rooms from bookmarks, roster, OR conversations with messages
-            # A MUC can be: bookmarked OR have MUC conversation with messages
-            # Trust the protocol: conversation.type is set from XMPP msg['type']
-            rooms = self.db.fetchall("""
-                SELECT
-                    j.bare_jid,
-                    COALESCE(NULLIF(b.name, ''), NULLIF(r.name, ''), j.bare_jid) as name,
-                    b.id as bookmark_id,
-                    b.autojoin,
-                    r.id as roster_id
-                FROM jid j
-                LEFT JOIN bookmark b ON b.jid_id = j.id AND b.account_id = ?
-                LEFT JOIN roster r ON r.jid_id = j.id AND r.account_id = ?
-                WHERE (
-                    b.id IS NOT NULL  -- Bookmarked (definite MUC)
-                    OR EXISTS (  -- OR has MUC conversation (type=1 from protocol)
-                        SELECT 1 FROM conversation c
-                        JOIN content_item ci ON ci.conversation_id = c.id
-                        WHERE c.account_id = ? AND c.jid_id = j.id AND c.type = 1
-                    )
-                  )
-                  AND j.bare_jid LIKE '%@%'
-                GROUP BY j.bare_jid
-                ORDER BY name, j.bare_jid
-            """, (account_id, account_id, account_id))
-
-            # Get 1-to-1 contacts: roster contacts OR conversations with messages
-            muc_jids = {room['bare_jid'] for room in rooms}
-            contacts = self.db.fetchall("""
-                SELECT DISTINCT
-                    r.id,
-                    COALESCE(r.account_id, ?) as account_id,
-                    j.bare_jid,
-                    r.name,
-                    r.subscription,
-                    r.blocked
-                FROM jid j
-                LEFT JOIN roster r ON r.jid_id = j.id AND r.account_id = ?
-                WHERE (
-                    r.id IS NOT NULL  -- In roster
-                    OR EXISTS (       -- OR has conversation with messages
-                        SELECT 1 FROM conversation c
-                        JOIN content_item ci ON ci.conversation_id = c.id
-                        WHERE c.account_id = ? AND c.jid_id = j.id AND c.type = 0
-                    )
-                )
-                ORDER BY COALESCE(r.name, j.bare_jid), j.bare_jid
-            """, (account_id, account_id, account_id))
-
-            # Filter out MUCs from contacts list
-            contacts = [c for c in contacts if c['bare_jid'] not in muc_jids]
-
-            # Add MUC rooms first
-            if rooms:
-                for room in rooms:
-                    room_item = QTreeWidgetItem(account_item)
-
-                    # Check if room is actually joined (not just bookmarked)
-                    account = self.account_manager.get_account(account_id)
-                    is_joined = (account and account.client and
-                                room['bare_jid'] in account.client.joined_rooms)
-
-                    # Create ContactDisplayData for MUC
-                    room_data = ContactDisplayData(
-                        jid=room['bare_jid'],
-                        name=room['name'],
-                        account_id=account_id,
-                        item_type='muc',
-                        is_muc=True,
-                        roster_id=room['roster_id'],
-                        bookmark_id=room['bookmark_id'],
-                        autojoin=bool(room['autojoin']) if room['autojoin'] is not None else False,
-                        unread_count=unread_by_jid.get(room['bare_jid'], 0),
-                        presence='available' if is_joined else 'unavailable'
-                    )
-
-                    # Store data model and update display
-                    room_item.setData(0, Qt.UserRole, room_data)
-                    self._update_item_from_data(room_item, room_data)
-
-            if not contacts and not rooms:
-                # No contacts or rooms yet
-                no_contacts_item = QTreeWidgetItem(account_item)
-                no_contacts_item.setText(0, "(No contacts)")
-                no_contacts_item.setForeground(0, Qt.gray)
-                # No data needed for placeholder item
-            elif contacts:
-                # Add contacts
-                for contact in contacts:
-                    contact_item = QTreeWidgetItem(account_item)
-
-                    # Get presence from account manager
-                    account = self.account_manager.get_account(account_id)
-                    if account:
-                        presence = account.get_contact_presence(contact['bare_jid'])
-                        # Use 3-source priority: roster.name > contact_nickname > jid
-                        if contact['name']:
-                            # Roster name has highest priority
-                            display_name = contact['name']
-                        elif contact['bare_jid'] in account.contact_nicknames:
-                            # Contact's self-set nickname (XEP-0172)
-                            display_name = account.contact_nicknames[contact['bare_jid']]
-                        else:
-                            # Fall back to JID
-                            display_name = contact['bare_jid']
-                    else:
-                        presence = 'unavailable'
-                        display_name = contact['name'] or contact['bare_jid']
-
-                    # Create ContactDisplayData
-                    contact_data = ContactDisplayData(
-                        jid=contact['bare_jid'],
-                        name=display_name,
-                        account_id=contact['account_id'],
-                        item_type='contact',
-                        is_muc=False,
-                        roster_id=contact['id'],
-                        presence=presence,
-                        subscription=contact['subscription'] or 'none',
-                        blocked=bool(contact['blocked']),
-                        unread_count=unread_by_jid.get(contact['bare_jid'], 0)
-                    )
-
-                    # Store data model and update display
-                    contact_item.setData(0, Qt.UserRole, contact_data)
-                    self._update_item_from_data(contact_item, contact_data)
+            if account:
+                presence = account.get_contact_presence(contact_jid)
+                # Use 3-source priority: roster.name > contact_nickname > jid
+                if contact['name']:
+                    display_name = contact['name']
+                elif contact_jid in account.contact_nicknames:
+                    display_name = account.contact_nicknames[contact_jid]
+                else:
+                    display_name = contact_jid
+            else:
+                presence = 'unavailable'
+                display_name = contact['name'] or contact_jid
+
+            entries.append(ContactDisplayData(
+                jid=contact_jid,
+                name=display_name,
+                account_id=account_id,
+                item_type='contact',
+                is_muc=False,
+                roster_id=contact['id'],
+                presence=presence,
+                subscription=contact['subscription'] or 'none',
+                blocked=bool(contact['blocked']),
+                unread_count=unread_by_jid.get(contact_jid, 0),
+                typing=self.typing_states.get((account_id, contact_jid)) == 'composing'
+            ))
+
+        return entries
+
+    def _apply_roster_style(self):
+        """Pass current theme/roster mode styling to the model."""
+        theme_manager = get_theme_manager()
+        roster_style = theme_manager.get_roster_style() if theme_manager else None
+        if roster_style:
+            self.model.set_roster_style(roster_style)
 
-        logger.info(f"Loaded roster for {len(accounts)} accounts")
+    def _on_proxy_rows_inserted(self, parent: QModelIndex, first: int, last: int):
+        """Expand account rows added after startup."""
+        if parent.isValid():
+            return
+        for row in range(first, last + 1):
+            self.contact_tree.expand(self.proxy.index(row, 0))
 
     def _on_search(self, text: str):
         """Filter contacts based on search text - show dropdown with results."""
         search_text = text.strip()
 
+        # Filter the tree too (in memory, via the proxy)
+        self.proxy.setFilterFixedString(search_text if len(search_text) >= 2 else '')
+
         # Hide dropdown if less than 2 characters
         if len(search_text) < 2:
             self.contact_search_dropdown.hide()
@@ -444,9 +566,9 @@ class ContactListWidget(QWidget):
         if main_window and hasattr(main_window, '_on_contact_selected'):
             main_window._on_contact_selected(account_id, jid)
 
-    def _on_item_clicked(self, item: QTreeWidgetItem, column: int):
+    def _on_item_clicked(self, index: QModelIndex):
         """Handle contact/room item click."""
-        data = item.data(0, Qt.UserRole)
+        data = index.data(Qt.UserRole)
         if not data or not isinstance(data, ContactDisplayData):
             return
 
@@ -461,7 +583,7 @@ class ContactListWidget(QWidget):
         self.contact_selected.emit(account_id, jid)
 
     def refresh(self):
-        """Refresh contact list from database (full rebuild)."""
+        """Refresh contact list from database (diffed, see load_roster)."""
         self.load_roster()
 
     def refresh_display(self):
@@ -470,23 +592,7 @@ class ContactListWidget(QWidget):
 
         Useful for updating colors after theme change or roster mode change.
         """
-        # Iterate through all top-level items (accounts)
-        for i in range(self.contact_tree.topLevelItemCount()):
-            account_item = self.contact_tree.topLevelItem(i)
-            account_data = account_item.data(0, Qt.UserRole)
-
-            # Refresh account item
-            if account_data and isinstance(account_data, AccountDisplayData):
-                self._update_account_item(account_item, account_data)
-
-            # Refresh all children (contacts and MUCs)
-            for j in range(account_item.childCount()):
-                child_item = account_item.child(j)
-                child_data = child_item.data(0, Qt.UserRole)
-
-                if child_data and isinstance(child_data, ContactDisplayData):
-                    self._update_item_from_data(child_item, child_data)
-
+        self._apply_roster_style()
         logger.debug("Roster display refreshed (theme-aware colors updated)")
 
     def select_contact(self, account_id: int, jid: str):
@@ -497,17 +603,15 @@ class ContactListWidget(QWidget):
             account_id: Account ID
             jid: Contact JID
         """
-        # Use helper method to find item
-        item = self._find_contact_item(account_id, jid)
-        if item:
+        bare_jid = jid.split('/')[0] if '/' in jid else jid
+        index = self.proxy.mapFromSource(self.model.index_for(account_id, bare_jid))
+        if index.isValid():
             # Expand parent account node
-            parent = item.parent()
-            if parent:
-                parent.setExpanded(True)
+            self.contact_tree.expand(index.parent())
 
             # Select and scroll to item
-            self.contact_tree.setCurrentItem(item)
-            self.contact_tree.scrollToItem(item)
+            self.contact_tree.setCurrentIndex(index)
+            self.contact_tree.scrollTo(index)
             logger.debug(f"Selected contact {jid} in roster")
         else:
             logger.debug(f"Contact {jid} not found in account {account_id} roster")
@@ -531,140 +635,16 @@ class ContactListWidget(QWidget):
                 logger.debug(f"Cannot get participant count for {room_jid}: account not available or not connected")
                 return None
 
-            # Get room roster from XEP-0045 plugin
-            xep_0045 = account.client.plugin['xep_0045']
-            if not xep_0045:
-                logger.debug(f"Cannot get participant count for {room_jid}: XEP-0045 plugin not available")
-                return None
-
-            # Access rooms dictionary (only has rooms we're actively joined to)
-            if room_jid not in xep_0045.rooms:
-                logger.debug(f"Cannot get participant count for {room_jid}: room not joined (not in xep_0045.rooms)")
-                return None
-
-            # Count participants (same logic as chat_view.py)
-            room_roster = xep_0045.rooms[room_jid]
-            count = len(room_roster)
-            logger.debug(f"MUC {room_jid} has {count} participants")
+            # Occupant roster tracked from presence (deduplicated by real JID)
+            count = account.muc.get_participant_count(room_jid)
+            if count is None:
+                logger.debug(f"Cannot get participant count for {room_jid}: room not joined")
             return count
 
         except Exception as e:
             logger.error(f"Failed to get participant count for {room_jid}: {e}")
             return None
 
-    def _find_contact_item(self, account_id: int, jid: str):
-        """
-        Find contact/MUC tree item by (account_id, bare_jid).
-
-        Args:
-            account_id: Account ID
-            jid: Contact JID (bare or full - will be normalized)
-
-        Returns:
-            QTreeWidgetItem if found, None otherwise
-        """
-        # Normalize to bare JID (strip resource if present)
-        bare_jid = jid.split('/')[0] if '/' in jid else jid
-
-        # Traverse tree to find matching item
-        root = self.contact_tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            account_item = root.child(i)
-            account_data = account_item.data(0, Qt.UserRole)
-
-            if not account_data or not isinstance(account_data, AccountDisplayData):
-                continue
-
-            if account_data.account_id != account_id:
-                continue
-
-            # Search children for contact/MUC
-            for j in range(account_item.childCount()):
-                child_item = account_item.child(j)
-                child_data = child_item.data(0, Qt.UserRole)
-
-                if not child_data or not isinstance(child_data, ContactDisplayData):
-                    continue
-
-                if child_data.jid == bare_jid:
-                    return child_item
-
-        return None
-
-    def _update_item_from_data(self, item, data: ContactDisplayData):
-        """
-        Update tree item text and font from ContactDisplayData.
-
-        Args:
-            item: QTreeWidgetItem to update
-            data: ContactDisplayData with current state
-        """
-        # Get complete roster styling from theme manager
-        theme_manager = get_theme_manager()
-        roster_style = theme_manager.get_roster_style() if theme_manager else None
-        if not roster_style:
-            return  # Can't style without theme manager
-
-        # Update text from data model (uses_emoji determines icon vs text)
-        item.setText(0, data.to_display_string(uses_emoji=roster_style.uses_emoji))
-
-        # Update font style
-        style = data.get_font_style()
-        font = item.font(0)
-        font.setBold(style['bold'])
-        font.setItalic(style['italic'])
-        font.setUnderline(style['underline'])
-        item.setFont(0, font)
-
-        # Apply text color (roster style handles steady vs dynamic)
-        color = roster_style.get_text_color_for_contact(
-            presence=data.presence,
-            is_muc=data.is_muc,
-            call_state=data.call_state
-        )
-        item.setForeground(0, color)
-
-        # Fetch live participant count for MUCs
-        if data.is_muc:
-            participant_count = self._get_muc_participant_count(data.account_id, data.jid)
-            if participant_count is not None:
-                data.participant_count = participant_count
-
-        # Set tooltip
-        item.setToolTip(0, data.get_tooltip())
-
-    def _update_account_item(self, item, data: AccountDisplayData):
-        """
-        Update account tree item text and font from AccountDisplayData.
-
-        Args:
-            item: QTreeWidgetItem to update
-            data: AccountDisplayData with current state
-        """
-        # Get complete roster styling from theme manager
-        theme_manager = get_theme_manager()
-        roster_style = theme_manager.get_roster_style() if theme_manager else None
-        if not roster_style:
-            return  # Can't style without theme manager
-
-        # Update text from data model (uses_emoji determines icon vs text)
-        item.setText(0, data.to_display_string(uses_emoji=roster_style.uses_emoji))
-
-        # Update font style
-        style = data.get_font_style()
-        font = item.font(0)
-        font.setBold(style['bold'])
-        font.setItalic(style['italic'])
-        font.setUnderline(style['underline'])
-        item.setFont(0, font)
-
-        # Apply text color (roster style handles steady vs dynamic)
-        color = roster_style.get_text_color_for_account(connected=data.is_connected)
-        item.setForeground(0, color)
-
-        # Set tooltip
-        item.setToolTip(0, data.get_tooltip())
-
     # === Update Methods ===
 
     def update_presence_single(self, account_id: int, jid: str, presence: str):
@@ -676,18 +656,10 @@ class ContactListWidget(QWidget):
             jid: Contact JID
             presence: Presence show value ('available', 'away', 'xa', 'dnd', 'unavailable')
         """
-        item = self._find_contact_item(account_id, jid)
-        if not item:
+        bare_jid = jid.split('/')[0] if '/' in jid else jid
+        if not self.model.update_entry(account_id, bare_jid, presence=presence):
             logger.debug(f"Contact {jid} not found for presence update")
             return
-
-        data = item.data(0, Qt.UserRole)
-        if not data or not isinstance(data, ContactDisplayData):
-            return
-
-        # Update data model
-        data.presence = presence
-        self._update_item_from_data(item, data)
         logger.debug(f"Updated presence for {jid}: {presence}")
 
     def update_unread_indicators(self, account_id: int = None, jid: str = None):
@@ -698,68 +670,37 @@ class ContactListWidget(QWidget):
             account_id: Account ID to update (or None for all accounts)
             jid: Specific JID to update (or None for all in account)
         """
-        root = self.contact_tree.invisibleRootItem()
-
-        # Iterate through account nodes
-        for i in range(root.childCount()):
-            account_item = root.child(i)
-            account_data = account_item.data(0, Qt.UserRole)
+        account_ids = [account_id] if account_id is not None else self.model.account_ids()
 
-            if not account_data or not isinstance(account_data, AccountDisplayData):
+        for acc_id in account_ids:
+            if self.model.get_account(acc_id) is None:
                 continue
 
-            acc_id = account_data.account_id
-
-            # Skip if specific account requested and this isn't it
-            if account_id is not None and acc_id != account_id:
-                continue
-
-            # Get unread counts for this account
+            # Get unread counts (only the requested conversation if jid given)
             unread_by_jid = {}
-            unread_conversations = self.db.get_unread_conversations_for_account(acc_id)
-            for conv in unread_conversations:
+            for conv in self.db.get_unread_conversations_for_account(acc_id, jid=jid):
                 unread_by_jid[conv['jid']] = conv['unread_count']
 
-            account_total_unread = self.db.get_total_unread_for_account(acc_id)
-
-            # Update account item with new unread count
-            account_data.total_unread = account_total_unread
-            self._update_account_item(account_item, account_data)
-
-            # Iterate through contacts/MUCs under this account
-            for j in range(account_item.childCount()):
-                child_item = account_item.child(j)
-                child_data = child_item.data(0, Qt.UserRole)
-
-                if not child_data or not isinstance(child_data, ContactDisplayData):
-                    continue
-
-                if child_data.item_type not in ('contact', 'muc'):
-                    continue
-
-                child_jid = child_data.jid
-
-                # Skip if specific jid requested and this isn't it
-                if jid is not None and child_jid != jid:
-                    continue
-
-                # Get unread count for this contact/MUC
-                unread_count = unread_by_jid.get(child_jid, 0)
+            self.model.update_account_fields(
+                acc_id, total_unread=self.db.get_total_unread_for_account(acc_id)
+            )
 
-                # Update data model
-                child_data.unread_count = unread_count
-                self._update_item_from_data(child_item, child_data)
+            if jid is not None:
+                self.model.update_entry(acc_id, jid, unread_count=unread_by_jid.get(jid, 0))
+            else:
+                for data in self.model.entries(acc_id):
+                    self.model.update_entry(acc_id, data.jid, unread_count=unread_by_jid.get(data.jid, 0))
 
         logger.debug(f"Updated unread indicators (account_id={account_id}, jid={jid})")
 
     def _on_context_menu(self, position):
         """Show context menu for contact list items."""
-        item = self.contact_tree.itemAt(position)
-        if not item:
+        index = self.contact_tree.indexAt(position)
+        if not index.isValid():
             return
 
         # Get item data
-        data = item.data(0, Qt.UserRole)
+        data = index.data(Qt.UserRole)
         if not data:
             return
 
@@ -897,12 +838,13 @@ class ContactListWidget(QWidget):
             """, (conversation_id,))
 
             self.db.commit()
+            get_conversation_registry().forget(conversation_id)
 
             logger.info(f"Deleted chat with {contact_data.jid}")
             QMessageBox.information(self, "Chat Deleted", f"Chat with {contact_data.name} has been deleted.")
 
-            # Refresh contact list to remove from UI
-            self.load_roster()
+            # Drop the row unless it's still a roster contact/bookmark
+            self.sync_contact(contact_data.account_id, contact_data.jid)
 
         except Exception as e:
             logger.error(f"Failed to delete chat: {e}")
@@ -1042,18 +984,9 @@ class ContactListWidget(QWidget):
             jid: Contact JID
             call_state: Call state ('incoming', 'outgoing', 'active', or None to clear)
         """
-        item = self._find_contact_item(account_id, jid)
-        if not item:
+        if not self.model.update_entry(account_id, jid, call_state=call_state):
             logger.debug(f"Contact {jid} not found for call indicator update")
             return
-
-        data = item.data(0, Qt.UserRole)
-        if not data or not isinstance(data, ContactDisplayData):
-            return
-
-        # Update data model
-        data.call_state = call_state
-        self._update_item_from_data(item, data)
         logger.debug(f"Updated call indicator for {jid}: {call_state}")
 
     def update_typing_indicator(self, account_id: int, jid: str, state: str):
@@ -1074,19 +1007,9 @@ class ContactListWidget(QWidget):
             # Clear typing state for non-composing states
             self.typing_states.pop(key, None)
 
-        # Find contact item
-        item = self._find_contact_item(account_id, jid)
-        if not item:
+        if not self.model.update_entry(account_id, jid, typing=(state == 'composing')):
             logger.debug(f"Contact {jid} not found for typing indicator update")
             return
-
-        data = item.data(0, Qt.UserRole)
-        if not data or not isinstance(data, ContactDisplayData):
-            return
-
-        # Update data model
-        data.typing = (state == 'composing')
-        self._update_item_from_data(item, data)
         logger.debug(f"Updated typing indicator for {jid}: {state}")
 
     def eventFilter(self, obj, event):
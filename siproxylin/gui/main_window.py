@@ -11,6 +11,7 @@ Layout:
 import logging
 import asyncio
 import base64
+import platform
 import subprocess
 from datetime import datetime
 from typing import Optional
@@ -23,12 +24,6 @@ from PySide6.QtGui import QAction, QActionGroup
 
 from ..db.database import get_db
 from ..utils.paths import get_paths
-from .log_viewer import LogViewer
-from .account_dialog import AccountDialog
-from .registration_wizard import RegistrationWizard
-from .contact_dialog import ContactDialog
-from .join_room_dialog import JoinRoomDialog
-from .contact_details_dialog import ContactDetailsDialog
 from .contact_list import ContactListWidget
 from .chat_view import ChatViewWidget
 from ..core import get_account_manager
@@ -95,6 +90,7 @@ class MainWindow(QMainWindow):
         self.chat_view.send_file.connect(self.message_manager.on_send_file)
         self.chat_view.edit_message.connect(self.message_manager.on_edit_message)
         self.chat_view.send_reply.connect(self.message_manager.on_send_reply)
+        self.chat_view.cancel_file_upload.connect(self.message_manager.on_cancel_file_upload)
 
         # Dialog manager - handles dialog creation and launching
         self.dialog_manager = DialogManager(self)
@@ -115,21 +111,41 @@ class MainWindow(QMainWindow):
 
         logger.debug("Main window created")
 
-    def setup_accounts(self):
-        """Setup after accounts are loaded."""
-        # Start Go call service (use ensure_future - works with set but not-yet-running loop)
-        if self.call_manager.go_call_service:
-            asyncio.ensure_future(self.call_manager.start_service())
+    async def start_background_services(self):
+        """
+        Start subsystems that aren't needed for the first frame.
+
+        Called once after the window is shown: fixes audio card profiles
+        (several pactl calls, run in a worker thread), starts the audio
+        device registry (hot-plug aware device cache), then starts the Go
+        call service.
+        """
+        from ..utils.audio_profiles import fix_audio_card_profiles
+        from ..utils.audio_devices import get_audio_device_registry
+        from ..utils.startup_profiler import get_startup_profiler
 
-        # Start timer to refresh chat view for receipt updates every 2 seconds
-        self.receipt_timer = QTimer(self)
-        self.receipt_timer.timeout.connect(self._update_chat_receipts)
-        self.receipt_timer.start(2000)  # Update every 2 seconds
+        profiler = get_startup_profiler()
 
+        # Auto-fix audio card profiles (Linux only)
+        # Switches USB audio cards to duplex profiles so both mic and speakers are available
+        await asyncio.get_running_loop().run_in_executor(None, fix_audio_card_profiles)
+        profiler.mark('audio profiles')
+
+        if platform.system() == 'Linux':
+            await get_audio_device_registry().start()
+            profiler.mark('audio devices')
+
+        await self.call_manager.start_service()
+        profiler.mark('call service')
+
+    def setup_accounts(self):
+        """Setup after accounts are loaded."""
+        # Receipt/marker changes arrive batched via receipts_updated (RosterManager)
         # Connect signals from all accounts
         for account_id, account in self.account_manager.accounts.items():
             account.connection_state_changed.connect(self._on_connection_state_changed)
             account.connection_error.connect(self._on_connection_error)
+            account.connect_finished.connect(self._on_account_connect_finished)
 
             # Roster signals - handled by RosterManager
             self.roster_manager.connect_account_signals(account)
@@ -522,6 +538,7 @@ class MainWindow(QMainWindow):
         if account_id is None:
             return
 
+        from .contact_dialog import ContactDialog
         dialog = ContactDialog(account_id=account_id, parent=self)
         dialog.contact_saved.connect(self._on_contact_saved)
         dialog.accepted.connect(lambda: logger.debug("Contact saved successfully"))
@@ -552,6 +569,7 @@ class MainWindow(QMainWindow):
             )
             return
 
+        from .join_room_dialog import JoinRoomDialog
         dialog = JoinRoomDialog(account_id=account_id, parent=self)
 
         def on_accepted():
@@ -605,8 +623,8 @@ class MainWindow(QMainWindow):
         logger.debug(f"Contact selected: {jid} (account {account_id})")
         self.chat_view.load_conversation(account_id, jid)
 
-        # Refresh contact list (in case conversation was just created)
-        self.contact_list.load_roster()
+        # Add the row if the conversation was just created
+        self.contact_list.sync_contact(account_id, jid)
 
         # Select the contact in the roster (useful when opened from dialog)
         self.contact_list.select_contact(account_id, jid)
@@ -677,6 +695,7 @@ class MainWindow(QMainWindow):
             asyncio.create_task(self._sync_and_show_contact_details_dialog(account, jid))
         else:
             # Offline - show what's in DB
+            from .contact_details_dialog import ContactDetailsDialog
             dialog = ContactDetailsDialog(account_id, jid, self)
             dialog.contact_saved.connect(self._on_contact_saved)
             dialog.block_status_changed.connect(self._on_block_status_changed)
@@ -731,6 +750,7 @@ class MainWindow(QMainWindow):
             asyncio.create_task(self._sync_and_show_contact_details_dialog(account, jid))
         else:
             # Offline - show what's in DB
+            from .contact_details_dialog import ContactDetailsDialog
             dialog = ContactDetailsDialog(account_id, jid, self)
             dialog.contact_saved.connect(self._on_contact_saved)
             dialog.block_status_changed.connect(self._on_block_status_changed)
@@ -749,6 +769,7 @@ class MainWindow(QMainWindow):
             logger.warning(f"Failed to sync OMEMO devices: {e}")
 
         # Show dialog with synced data
+        from .contact_details_dialog import ContactDetailsDialog
         dialog = ContactDetailsDialog(account.account_id, jid, self)
         dialog.contact_saved.connect(self._on_contact_saved)
         dialog.block_status_changed.connect(self._on_block_status_changed)
@@ -1430,6 +1451,7 @@ class MainWindow(QMainWindow):
             return
 
         # Open contact dialog with pre-selected account
+        from .contact_dialog import ContactDialog
         dialog = ContactDialog(account_id=account_id, parent=self)
         dialog.contact_saved.connect(self._on_contact_saved)
         dialog.accepted.connect(lambda: logger.debug("Contact saved successfully"))
@@ -1451,6 +1473,7 @@ class MainWindow(QMainWindow):
             return
 
         # Open join room dialog with pre-selected account
+        from .join_room_dialog import JoinRoomDialog
         dialog = JoinRoomDialog(account_id=account_id, parent=self)
         if dialog.exec() == QDialog.Accepted:
             # Get joined room info
@@ -1481,11 +1504,28 @@ class MainWindow(QMainWindow):
             state: New connection state ('connecting'|'connected'|'disconnected'|'error')
         """
         logger.info(f"Connection state changed for account {account_id}: {state}")
-        # Refresh contact list to update account connection indicator
-        self.contact_list.refresh()
+        # Re-sync this account (connection indicator, presence, joined rooms)
+        self.contact_list.sync_account(account_id)
         # Update status bar to reflect new connection state
         self._update_status_bar_stats()
 
+    @Slot(int, str, int, int)
+    def _on_account_connect_finished(self, account_id: int, outcome: str, done: int, total: int):
+        """
+        Handle startup bring-up progress (one signal per account, in completion order).
+
+        Args:
+            account_id: Account ID that finished connecting
+            outcome: 'connected', 'auth_failed', 'failed' or 'timeout'
+            done: Accounts finished so far
+            total: Accounts being brought up
+        """
+        logger.info(f"Account {account_id} connect finished: {outcome} ({done}/{total})")
+        if done < total:
+            self.status_accounts_label.setText(f"Accounts: connecting... {done}/{total} done")
+        else:
+            self._update_status_bar_stats()
+
     @Slot(int, str)
     def _on_connection_error(self, account_id: int, error_message: str):
         """Handle connection error signal from account."""
@@ -1521,18 +1561,6 @@ class MainWindow(QMainWindow):
         """Delegate to SubscriptionManager."""
         return self.subscription_manager.update_subscription(account_id, jid, can_see_theirs, they_can_see_ours)
 
-    def request_call_stats(self, account_id: int, session_id: str):
-        """
-        Request call statistics update for a session.
-
-        Called by CallWindow every 2 seconds to update tech details.
-
-        Args:
-            account_id: Account ID
-            session_id: Jingle session ID
-        """
-        self.call_manager.request_call_stats(account_id, session_id)
-
     def request_call_mute(self, account_id: int, session_id: str, muted: bool):
         """
         Request microphone mute state change for a session.
@@ -1550,34 +1578,6 @@ class MainWindow(QMainWindow):
     # Other Signal Handlers
     # =========================================================================
 
-    def _update_chat_receipts(self):
-        """Poll and update receipt indicators in chat view."""
-        # Only refresh if a chat is open AND the account still exists
-        if self.chat_view.current_account_id and self.chat_view.current_jid:
-            # Check if account still exists (could have been deleted)
-            if self.account_manager.get_account(self.chat_view.current_account_id):
-                self.chat_view.refresh(send_markers=False)  # Just update UI, don't send markers
-
-    def set_chat_polling_enabled(self, enabled: bool):
-        """
-        Enable/disable chat polling timer based on scroll zone.
-
-        Called by MessageDisplayWidget when user scrolls between live and history zones.
-        Live zone (>50% scroll) = enable polling for real-time updates.
-        History zone (<=50% scroll) = disable polling for better performance.
-
-        Args:
-            enabled: True to enable polling (live zone), False to disable (history zone)
-        """
-        if enabled:
-            if not self.receipt_timer.isActive():
-                self.receipt_timer.start(2000)
-                logger.debug("Chat polling ENABLED (live zone - bottom 50%)")
-        else:
-            if self.receipt_timer.isActive():
-                self.receipt_timer.stop()
-                logger.debug("Chat polling DISABLED (history zone - top 50%)")
-
     @Slot(int, str, str, bool)
 
     def closeEvent(self, event):
@@ -1601,5 +1601,9 @@ class MainWindow(QMainWindow):
         # Step 2: Stop Go call service via CallManager
         self.call_manager.shutdown_service(signal_shutdown=self._signal_shutdown)
 
+        # Step 3: Stop following audio device hot-plug events (terminates pactl now)
+        from ..utils.audio_devices import get_audio_device_registry
+        get_audio_device_registry().shutdown()
+
         # Accept close event
         event.accept()
@@ -335,6 +335,14 @@ class CallManager:
                 )
             )
 
+            # Update tech details when call service pushes stats (StreamStats)
+            account.call_stats_updated.connect(
+                lambda aid, sid, stats: (
+                    call_window.update_stats(stats)
+                    if sid == session_id else None
+                )
+            )
+
             # Update call window when call terminates
             account.call_terminated.connect(
                 lambda aid, sid, reason, peer: (
@@ -444,34 +452,3 @@ class CallManager:
 
         # Schedule async work
         asyncio.ensure_future(set_mute())
-
-    def request_call_stats(self, account_id: int, session_id: str):
-        """
-        Request call statistics update for a session.
-
-        Called by CallWindow every 2 seconds to update tech details.
-
-        Args:
-            account_id: Account ID
-            session_id: Jingle session ID
-        """
-        async def fetch_and_update():
-            try:
-                # Get account manager for this account
-                account = self.account_manager.get_account(account_id)
-                if not account or not hasattr(account, 'calls'):
-                    return
-
-                # Get stats from CallBarrel
-                stats = await account.calls.get_call_stats(session_id)
-
-                # Update call window if still open
-                if session_id in self.call_windows:
-                    call_window = self.call_windows[session_id]
-                    call_window.update_stats(stats)
-
-            except Exception as e:
-                logger.error(f"Error fetching call stats: {e}")
-
-        # Schedule async task
-        asyncio.ensure_future(fetch_and_update())
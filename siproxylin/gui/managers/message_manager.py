@@ -9,6 +9,7 @@ import asyncio
 import uuid
 import os
 import mimetypes
+import time
 from pathlib import Path
 from datetime import datetime
 from PySide6.QtWidgets import QMessageBox
@@ -17,6 +18,9 @@ from PySide6.QtCore import Slot, QTimer
 
 logger = logging.getLogger('siproxylin.message_manager')
 
+# Minimum seconds between upload progress updates of a chat row
+UPLOAD_PROGRESS_INTERVAL = 0.25
+
 
 class MessageManager:
     """
@@ -43,6 +47,9 @@ class MessageManager:
         self.db = main_window.db
         self.chat_view = main_window.chat_view
 
+        # Running uploads: content_item_id -> task (for cancellation)
+        self._uploads = {}
+
         logger.debug("MessageManager initialized")
 
     def on_send_message(self, account_id: int, jid: str, message: str, encrypted: bool):
@@ -268,6 +275,18 @@ class MessageManager:
         # Refresh chat view immediately (shows file with uploading state)
         QTimer.singleShot(0, lambda: self.chat_view.refresh(send_markers=False))
 
+        self._uploads[content_item_id] = asyncio.current_task()
+        last_update = 0.0
+
+        def progress(sent: int, total: int):
+            nonlocal last_update
+            now = time.monotonic()
+            if sent < total and now - last_update < UPLOAD_PROGRESS_INTERVAL:
+                return
+            last_update = now
+            if self.chat_view.current_account_id == account.account_id and self.chat_view.current_jid == jid:
+                self.chat_view.message_widget.update_file_progress(content_item_id, sent, total)
+
         try:
             logger.debug(f"Starting file upload: {file_path} to {jid} (encrypted={encrypted})")
 
@@ -276,14 +295,14 @@ class MessageManager:
             message_id = None
             if is_muc:
                 if encrypted:
-                    message_id = await account.client.send_encrypted_attachment_to_muc(jid, file_path)
+                    message_id = await account.client.send_encrypted_attachment_to_muc(jid, file_path, progress=progress)
                 else:
-                    message_id = await account.client.send_attachment_to_muc(jid, file_path)
+                    message_id = await account.client.send_attachment_to_muc(jid, file_path, progress=progress)
             else:
                 if encrypted:
-                    message_id = await account.client.send_encrypted_file(jid, file_path)
+                    message_id = await account.client.send_encrypted_file(jid, file_path, progress=progress)
                 else:
-                    message_id = await account.client.send_attachment_to_user(jid, file_path)
+                    message_id = await account.client.send_attachment_to_user(jid, file_path, progress=progress)
 
             # Update file_transfer with real origin_id and mark as complete
             # This allows duplicate detection when server reflects the message back
@@ -294,8 +313,17 @@ class MessageManager:
 
             logger.debug(f"✓ File '{filename}' sent to {jid} (id={file_transfer_id}, origin_id={message_id})")
 
-            # Refresh to update state indicator
-            QTimer.singleShot(0, lambda: self.chat_view.refresh(send_markers=False))
+            # Re-render the row (preview instead of upload progress)
+            QTimer.singleShot(0, lambda: self._finish_upload_row(account.account_id, jid, content_item_id))
+
+        except asyncio.CancelledError:
+            logger.info(f"Upload of '{filename}' to {jid} cancelled (id={file_transfer_id})")
+            self.db.execute("""
+                UPDATE file_transfer SET state = ? WHERE id = ?
+            """, (3, file_transfer_id))  # state=3 (failed)
+            self.db.commit()
+            QTimer.singleShot(0, lambda: self._finish_upload_row(account.account_id, jid, content_item_id))
+            raise  # Let cancellation (user cancel, shutdown, account removal) reach the task
 
         except Exception as e:
             error_msg = str(e)
@@ -310,7 +338,7 @@ class MessageManager:
             self.db.commit()
 
             # Refresh to show error state
-            QTimer.singleShot(0, lambda: self.chat_view.refresh(send_markers=False))
+            QTimer.singleShot(0, lambda: self._finish_upload_row(account.account_id, jid, content_item_id))
 
             # Show error dialog safely using QTimer to call from main thread
             QTimer.singleShot(0, lambda: QMessageBox.critical(
@@ -319,6 +347,31 @@ class MessageManager:
                 f"Failed to send '{filename}':\n\n{error_msg}"
             ))
 
+        finally:
+            self._uploads.pop(content_item_id, None)
+
+    def _finish_upload_row(self, account_id: int, jid: str, content_item_id: int):
+        """Re-render an upload's chat row if its conversation is open."""
+        if self.chat_view.current_account_id == account_id and self.chat_view.current_jid == jid:
+            self.chat_view.message_widget.finish_file_transfer(content_item_id)
+
+    def on_cancel_file_upload(self, content_item_id: int):
+        """
+        Handle cancel upload signal from chat view.
+
+        Cancelling the task aborts the HTTP PUT; _send_file_async marks the
+        transfer as failed.
+
+        Args:
+            content_item_id: content_item.id of the upload
+        """
+        task = self._uploads.get(content_item_id)
+        if task is None:
+            logger.debug(f"No running upload for content item {content_item_id}")
+            return
+        logger.debug(f"Cancelling upload of content item {content_item_id}")
+        task.cancel()
+
     @Slot(int, str, str, str, bool)
     def on_edit_message(self, account_id: int, jid: str, message_id: str, new_body: str, encrypted: bool):
         """
@@ -9,6 +9,8 @@ import asyncio
 import base64
 from PySide6.QtWidgets import QMessageBox, QInputDialog, QLineEdit
 
+from ...db.conversation_registry import get_conversation_registry
+
 
 logger = logging.getLogger('siproxylin.muc_manager')
 
@@ -294,6 +296,7 @@ class MUCManager:
                                (account_id, jid_id))
 
                 self.db.commit()
+                get_conversation_registry().forget_jid(account_id, room_jid)
                 logger.debug(f"Removed MUC bookmark, roster, and conversation (with all messages): {room_jid}")
 
             # Refresh contact list to remove MUC entry
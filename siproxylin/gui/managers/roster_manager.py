@@ -50,23 +50,28 @@ class RosterManager:
         account.roster_updated.connect(self.on_roster_updated)
         account.message_received.connect(self.on_message_received)
         account.chat_state_changed.connect(self.on_chat_state_changed)
+        account.receipts_updated.connect(self.on_receipts_updated)
         account.presence_changed.connect(self.on_presence_changed)
         account.nickname_updated.connect(self.on_nickname_updated)
         account.avatar_updated.connect(self.on_avatar_updated)
+        account.file_transfer_progress.connect(self.on_file_transfer_progress)
+        account.file_transfer_finished.connect(self.on_file_transfer_finished)
         logger.debug(f"Connected roster signals for account {account.account_id}")
 
-    def on_roster_updated(self, account_id: int):
+    def on_roster_updated(self, account_id: int, jids: list):
         """
         Handle roster update signal from account.
 
         Args:
             account_id: Account ID whose roster was updated
+            jids: Bare JIDs of the roster/bookmark entries that changed
         """
-        logger.debug(f"Roster updated for account {account_id}, refreshing contact list")
-        self.contact_list.refresh()
+        logger.debug(f"Roster updated for account {account_id} ({len(jids)} entries), syncing contact list")
+        self.contact_list.sync_contacts(account_id, jids)
 
-        # If the currently open chat is from this account, update its header display name
-        if self.chat_view.current_account_id == account_id and self.chat_view.current_jid:
+        # If the open chat is one of the changed entries, update its header display name
+        if (self.chat_view.current_account_id == account_id and self.chat_view.current_jid
+                and self.chat_view.current_jid in jids):
             jid = self.chat_view.current_jid
             logger.debug(f"Updating chat header display name for open chat: {jid}")
             # Use unified display name refresh (applies 3-source priority)
@@ -101,13 +106,12 @@ class RosterManager:
             logger.debug(f"Chat view refreshed for {event_type}")
 
         # Check if this is a new conversation (not currently in chat list)
-        # Only refresh roster for new conversations to avoid expensive reloads
+        # Only add that one row - the rest of the list is untouched
         if not is_marker:
-            item = self.contact_list._find_contact_item(account_id, from_jid)
-            if item is None:
+            if not self.contact_list.has_contact(account_id, from_jid):
                 # New conversation - contact not in chat list yet
-                logger.debug(f"New conversation from {from_jid}, refreshing chat list")
-                self.contact_list.load_roster()
+                logger.debug(f"New conversation from {from_jid}, adding to chat list")
+                self.contact_list.sync_contact(account_id, from_jid)
 
         # Update unread indicators in contact list (always, even if chat is open)
         self.contact_list.update_unread_indicators(account_id, from_jid)
@@ -120,6 +124,51 @@ class RosterManager:
         if not is_marker and not is_current_chat:
             self.notification_manager.send_message_notification(account_id, from_jid)
 
+    def on_file_transfer_progress(self, account_id: int, jid: str, content_item_id: int,
+                                  received: int, total):
+        """
+        Handle download progress signal from account.
+
+        Args:
+            account_id: Account ID
+            jid: Counterpart JID
+            content_item_id: content_item.id of the file transfer
+            received: Bytes downloaded so far
+            total: Expected size in bytes (None if unknown)
+        """
+        if self.chat_view.current_account_id == account_id and self.chat_view.current_jid == jid:
+            self.chat_view.message_widget.update_file_progress(content_item_id, received, total)
+
+    def on_file_transfer_finished(self, account_id: int, jid: str, content_item_id: int, state: int):
+        """
+        Handle download completion/failure signal from account.
+
+        Args:
+            account_id: Account ID
+            jid: Counterpart JID
+            content_item_id: content_item.id of the file transfer
+            state: 2=complete, 3=failed
+        """
+        logger.debug(f"File transfer {content_item_id} from {jid} finished (state={state})")
+        if self.chat_view.current_account_id == account_id and self.chat_view.current_jid == jid:
+            self.chat_view.message_widget.finish_file_transfer(content_item_id)
+
+    def on_receipts_updated(self, account_id: int, jid: str, changes: dict):
+        """
+        Handle a batch of receipt/marker/ACK updates for one conversation.
+
+        Only the changed rows of the open chat are patched - receipts on our
+        own messages don't affect unread counts.
+
+        Args:
+            account_id: Account ID
+            jid: Counterpart bare JID
+            changes: {content_item_id: marked}
+        """
+        logger.debug(f"{len(changes)} receipt update(s) for {jid} on account {account_id}")
+        if self.chat_view.current_account_id == account_id and self.chat_view.current_jid == jid:
+            self.chat_view.message_widget.update_receipt_marks(changes)
+
     def on_chat_state_changed(self, account_id: int, from_jid: str, state: str):
         """
         Handle chat state change (typing indicators).
@@ -182,8 +231,8 @@ class RosterManager:
         # Get display name using 3-source priority
         display_name = account.get_contact_display_name(jid, roster_name=roster_name)
 
-        # Refresh contact list (for now, reload entire roster - can optimize later)
-        self.contact_list.load_roster()
+        # Update the single contact row
+        self.contact_list.update_display_name(account_id, jid, display_name)
 
         # If this chat is open, update header
         if (self.chat_view.current_account_id == account_id and
@@ -217,12 +266,13 @@ class RosterManager:
         """
         logger.debug(f"Avatar updated for {jid} on account {account_id}")
 
+        # Drop remembered hash and rendered pixmaps (new hash = new cache key)
+        from ...utils.avatar import get_avatar_cache
+        get_avatar_cache().invalidate(jid, account_id)
+
         # If this is the currently open chat, refresh the avatar
         if (self.chat_view.current_account_id == account_id and
             self.chat_view.current_jid == jid):
             logger.debug(f"Refreshing avatar for current chat: {jid}")
-            # Invalidate cache for this JID
-            from ...utils.avatar import get_avatar_cache
-            get_avatar_cache().invalidate(jid)
             # Refresh avatar display in header
             self.chat_view.header._update_avatar()
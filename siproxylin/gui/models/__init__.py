@@ -5,5 +5,9 @@ Clean separation of data and presentation.
 """
 
 from .contact_display import ContactDisplayData, AccountDisplayData
+from .contact_tree_model import ContactTreeModel, ContactFilterProxy
+from .call_log_model import CallLogModel
+from .participant_table_model import ParticipantTableModel, ParticipantFilterProxy
 
-__all__ = ['ContactDisplayData', 'AccountDisplayData']
+__all__ = ['ContactDisplayData', 'AccountDisplayData', 'ContactTreeModel', 'ContactFilterProxy', 'CallLogModel',
+           'ParticipantTableModel', 'ParticipantFilterProxy']
@@ -0,0 +1,203 @@
+"""
+Call log table model for Siproxylin.
+
+QAbstractTableModel over db/call_log.py: the first page is fetched when the
+filter or sort order is set and further pages only when the view scrolls to
+the end (canFetchMore/fetchMore, keyset-paged on (sort key, id)). Opening
+the call log costs one page regardless of how many calls are stored;
+clicking a column header re-queries in that order (sort()); cells are
+formatted on demand in data().
+"""
+
+import logging
+from datetime import datetime
+from typing import Optional
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PySide6.QtGui import QFont
+
+from ...db.database import get_db
+from ...db.call_log import CallLogFilter, CallLogOrder, CALL_LOG_PAGE_SIZE, fetch_call_page, page_cursor
+from ...core.constants import CallState, CallDirection
+
+
+logger = logging.getLogger('siproxylin.call_log_model')
+
+
+def format_duration(duration_sec: int) -> str:
+    """Format call duration (e.g. '1h 02m 03s', '4m 05s', '6s')."""
+    if duration_sec >= 3600:
+        hours = duration_sec // 3600
+        minutes = (duration_sec % 3600) // 60
+        seconds = duration_sec % 60
+        return f"{hours:d}h {minutes:02d}m {seconds:02d}s"
+    if duration_sec >= 60:
+        minutes = duration_sec // 60
+        seconds = duration_sec % 60
+        return f"{minutes:d}m {seconds:02d}s"
+    return f"{duration_sec:d}s"
+
+
+class CallLogModel(QAbstractTableModel):
+    """
+    Calls, newest first, loaded page by page.
+
+    Qt.UserRole on column 0 returns {'call_id', 'account_id', 'timestamp'} and
+    on the Duration column the duration in seconds (same as the old
+    QTableWidgetItem data).
+    """
+
+    HEADERS = ["Date/Time", "JID", "Account", "Direction", "State", "Duration", "Type"]
+    # CALL_LOG_SORT_KEYS column of each header
+    SORT_COLUMNS = ['time', 'jid', 'account', 'direction', 'state', 'duration', 'type']
+
+    # Call state emoji/text mapping
+    STATE_DISPLAY = {
+        CallState.RINGING.value: "📞 Ringing",
+        CallState.ESTABLISHING.value: "🔄 Connecting",
+        CallState.IN_PROGRESS.value: "✓ Connected",
+        CallState.OTHER_DEVICE.value: "📱 Other Device",
+        CallState.ENDED.value: "✓ Ended",
+        CallState.DECLINED.value: "✗ Declined",
+        CallState.MISSED.value: "⚠ Missed",
+        CallState.FAILED.value: "⚠ Failed",
+        CallState.ANSWERED_ELSEWHERE.value: "✓ Answered on other device",
+        CallState.REJECTED_ELSEWHERE.value: "✗ Rejected on other device",
+    }
+
+    DIRECTION_DISPLAY = {
+        CallDirection.INCOMING.value: "← Incoming",
+        CallDirection.OUTGOING.value: "→ Outgoing",
+    }
+
+    def __init__(self, db=None, page_size: int = CALL_LOG_PAGE_SIZE, parent=None):
+        """
+        Initialize model (empty until set_filter() or reload()).
+
+        Args:
+            db: Database (default: global database)
+            page_size: Rows fetched per page
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.db = db if db is not None else get_db()
+        self.page_size = page_size
+        self.filters = CallLogFilter()
+        self.order = CallLogOrder()
+        self._rows = []
+        self._exhausted = True
+        self._bold = QFont()
+        self._bold.setBold(True)
+
+    # =========================================================================
+    # Loading
+    # =========================================================================
+
+    def set_filter(self, filters: CallLogFilter):
+        """
+        Apply new filters (reloads from the first page).
+
+        Args:
+            filters: Call log filters
+        """
+        self.filters = filters
+        self.reload()
+
+    def reload(self):
+        """Drop loaded rows and fetch the first page."""
+        self.beginResetModel()
+        self._rows = fetch_call_page(self.db, self.filters, self.order, limit=self.page_size)
+        self._exhausted = len(self._rows) < self.page_size
+        self.endResetModel()
+        logger.debug(f"Loaded first call log page ({len(self._rows)} calls)")
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        if parent.isValid():
+            return False
+        return not self._exhausted
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()):
+        if parent.isValid() or self._exhausted:
+            return
+        page = fetch_call_page(self.db, self.filters, self.order, after=page_cursor(self._rows),
+                               limit=self.page_size)
+        self._exhausted = len(page) < self.page_size
+        if not page:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self._rows.extend(page)
+        self.endInsertRows()
+
+    # =========================================================================
+    # QAbstractTableModel interface
+    # =========================================================================
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and 0 <= section < len(self.HEADERS):
+            return self.HEADERS[section]
+        return None
+
+    def sort(self, column: int, order: Qt.SortOrder = Qt.AscendingOrder):
+        """Re-query in the order of a column (header click); unchanged order is a no-op."""
+        if not 0 <= column < len(self.SORT_COLUMNS):
+            return
+        new_order = CallLogOrder(self.SORT_COLUMNS[column], order == Qt.DescendingOrder)
+        if new_order == self.order:
+            return
+        self.order = new_order
+        self.reload()
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        call = self._rows[index.row()]
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            return self._display(call, column)
+
+        if role == Qt.UserRole:
+            if column == 0:
+                return {'call_id': call['id'], 'account_id': call['account_id'], 'timestamp': call['time']}
+            if column == 5:
+                return call['end_time'] - call['time'] if call['end_time'] else 0
+            return None
+
+        # Color code by state
+        if column == 4:
+            if role == Qt.ForegroundRole:
+                if call['state'] in (CallState.MISSED.value, CallState.FAILED.value):
+                    return Qt.red
+                if call['state'] == CallState.ENDED.value:
+                    return Qt.darkGreen
+            elif role == Qt.FontRole and call['state'] == CallState.MISSED.value:
+                return self._bold
+
+        return None
+
+    def _display(self, call, column: int) -> Optional[str]:
+        """Display text of one cell."""
+        if column == 0:
+            return datetime.fromtimestamp(call['time']).strftime("%Y-%m-%d %H:%M:%S")
+        if column == 1:
+            return call['bare_jid']
+        if column == 2:
+            if call['account_jid']:
+                return call['account_alias'] or call['account_jid']
+            return f"[DELETED: {call['account_id']}]"
+        if column == 3:
+            return self.DIRECTION_DISPLAY.get(call['direction'], f"Unknown ({call['direction']})")
+        if column == 4:
+            return self.STATE_DISPLAY.get(call['state'], f"Unknown ({call['state']})")
+        if column == 5:
+            return format_duration(call['end_time'] - call['time']) if call['end_time'] else "—"
+        if column == 6:
+            return "🎤 Audio" if call['type'] == 0 else "📹 Video"
+        return None
@@ -0,0 +1,486 @@
+"""
+Contact tree model for Siproxylin.
+
+Two-level QAbstractItemModel (accounts → rooms/contacts) fed by incremental
+updates. Each entry is looked up by (account_id, jid) in a dict, so presence,
+unread, typing and call updates touch exactly one row (dataChanged) instead
+of rebuilding the tree. Sorting and filtering are done by ContactFilterProxy.
+"""
+
+import logging
+from typing import Optional, Dict, List, Tuple, Callable, Iterable
+
+from PySide6.QtCore import (
+    Qt, QAbstractItemModel, QModelIndex, QSortFilterProxyModel
+)
+from PySide6.QtGui import QFont, QColor
+
+from .contact_display import ContactDisplayData, AccountDisplayData
+
+
+logger = logging.getLogger('siproxylin.contact_tree_model')
+
+
+# Fields only known from live events (the loader can't rebuild them) - kept
+# when an entry is re-read from the database during a diff
+_TRANSIENT_FIELDS = ('call_state', 'participant_count')
+
+
+class _Node:
+    """Tree node: account (parent None), entry, or '(No contacts)' placeholder."""
+
+    __slots__ = ('data', 'parent', 'children', 'row')
+
+    def __init__(self, data, parent: Optional['_Node'] = None, row: int = 0):
+        self.data = data  # AccountDisplayData, ContactDisplayData or None (placeholder)
+        self.parent = parent
+        self.children: List['_Node'] = []
+        self.row = row
+
+
+class ContactTreeModel(QAbstractItemModel):
+    """
+    Accounts, rooms and contacts as an item model.
+
+    Qt.UserRole returns the AccountDisplayData/ContactDisplayData object (same
+    as the old QTreeWidgetItem data), so view code can keep using it.
+    """
+
+    SortKeyRole = Qt.UserRole + 1
+    FilterRole = Qt.UserRole + 2
+
+    PLACEHOLDER_TEXT = "(No contacts)"
+
+    def __init__(self, participant_count: Optional[Callable[[int, str], Optional[int]]] = None,
+                 parent=None):
+        """
+        Initialize model.
+
+        Args:
+            participant_count: Callback (account_id, room_jid) -> live MUC participant
+                               count or None, queried lazily for tooltips
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self._accounts: List[_Node] = []
+        self._account_nodes: Dict[int, _Node] = {}
+        self._entries: Dict[Tuple[int, str], _Node] = {}
+        self._placeholders: Dict[int, _Node] = {}
+        self._placeholder_hidden = set()  # Accounts whose placeholder row is not in the view
+        self._participant_count = participant_count
+        self._roster_style = None
+        self._fonts: Dict[Tuple[bool, bool, bool], QFont] = {}
+
+    # =========================================================================
+    # QAbstractItemModel interface
+    # =========================================================================
+
+    def index(self, row: int, column: int, parent: QModelIndex = QModelIndex()) -> QModelIndex:
+        if column != 0 or row < 0:
+            return QModelIndex()
+
+        if not parent.isValid():
+            if row < len(self._accounts):
+                return self.createIndex(row, 0, self._accounts[row])
+            return QModelIndex()
+
+        account_node = parent.internalPointer()
+        if account_node.parent is not None:
+            return QModelIndex()  # Entries have no children
+
+        if row < len(account_node.children):
+            return self.createIndex(row, 0, account_node.children[row])
+        if row == 0 and self._has_placeholder(account_node):
+            return self.createIndex(0, 0, self._placeholders[account_node.data.account_id])
+        return QModelIndex()
+
+    def parent(self, index: QModelIndex = QModelIndex()) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+        node = index.internalPointer()
+        if node.parent is None:
+            return QModelIndex()
+        return self.createIndex(node.parent.row, 0, node.parent)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if not parent.isValid():
+            return len(self._accounts)
+        node = parent.internalPointer()
+        if node.parent is not None:
+            return 0
+        if node.children:
+            return len(node.children)
+        return 1 if self._has_placeholder(node) else 0
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 1
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        if index.internalPointer().data is None:
+            return Qt.ItemIsEnabled
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        data = index.internalPointer().data
+
+        if data is None:
+            # '(No contacts)' placeholder
+            if role == Qt.DisplayRole:
+                return self.PLACEHOLDER_TEXT
+            if role == Qt.ForegroundRole:
+                return QColor(Qt.gray)
+            return None
+
+        if role == Qt.UserRole:
+            return data
+
+        if role == self.SortKeyRole:
+            if isinstance(data, AccountDisplayData):
+                return (data.account_id,)
+            # Rooms first, then contacts, each by name then JID
+            return (0 if data.is_muc else 1, data.name.casefold(), data.jid)
+
+        if role == self.FilterRole:
+            if isinstance(data, AccountDisplayData):
+                return ''
+            return f"{data.name}\n{data.jid}"
+
+        style = self._roster_style
+        if style is None:
+            return None
+
+        if role == Qt.DisplayRole:
+            return data.to_display_string(uses_emoji=style.uses_emoji)
+
+        if role == Qt.FontRole:
+            font_style = data.get_font_style()
+            return self._font(font_style['bold'], font_style['italic'], font_style['underline'])
+
+        if role == Qt.ForegroundRole:
+            if isinstance(data, AccountDisplayData):
+                return style.get_text_color_for_account(connected=data.is_connected)
+            return style.get_text_color_for_contact(
+                presence=data.presence,
+                is_muc=data.is_muc,
+                call_state=data.call_state
+            )
+
+        if role == Qt.ToolTipRole:
+            if isinstance(data, ContactDisplayData) and data.is_muc and self._participant_count:
+                # Live count, only fetched when the tooltip is actually shown
+                count = self._participant_count(data.account_id, data.jid)
+                if count is not None:
+                    data.participant_count = count
+            return data.get_tooltip()
+
+        return None
+
+    def _has_placeholder(self, account_node: _Node) -> bool:
+        """'(No contacts)' row is shown for accounts without entries."""
+        return not account_node.children and account_node.data.account_id not in self._placeholder_hidden
+
+    def _font(self, bold: bool, italic: bool, underline: bool) -> QFont:
+        key = (bold, italic, underline)
+        font = self._fonts.get(key)
+        if font is None:
+            font = QFont()
+            font.setBold(bold)
+            font.setItalic(italic)
+            font.setUnderline(underline)
+            self._fonts[key] = font
+        return font
+
+    # =========================================================================
+    # Styling
+    # =========================================================================
+
+    def set_roster_style(self, roster_style):
+        """
+        Set roster style (theme colors, emoji vs ASCII) and repaint all rows.
+
+        Args:
+            roster_style: RosterStyle from ThemeManager.get_roster_style()
+        """
+        self._roster_style = roster_style
+        self._fonts.clear()
+        if not self._accounts:
+            return
+        self.dataChanged.emit(self.index(0, 0), self.index(len(self._accounts) - 1, 0))
+        for account_node in self._accounts:
+            rows = self.rowCount(self.createIndex(account_node.row, 0, account_node))
+            if rows:
+                parent_index = self.createIndex(account_node.row, 0, account_node)
+                self.dataChanged.emit(self.index(0, 0, parent_index), self.index(rows - 1, 0, parent_index))
+
+    # =========================================================================
+    # Lookup
+    # =========================================================================
+
+    def get_entry(self, account_id: int, jid: str) -> Optional[ContactDisplayData]:
+        """Get entry data for (account_id, bare JID), or None."""
+        node = self._entries.get((account_id, jid))
+        return node.data if node else None
+
+    def get_account(self, account_id: int) -> Optional[AccountDisplayData]:
+        """Get account data, or None."""
+        node = self._account_nodes.get(account_id)
+        return node.data if node else None
+
+    def account_ids(self) -> List[int]:
+        """Account IDs currently in the model."""
+        return list(self._account_nodes)
+
+    def entries(self, account_id: Optional[int] = None) -> Iterable[ContactDisplayData]:
+        """Iterate entries (optionally of one account)."""
+        if account_id is None:
+            return [node.data for node in self._entries.values()]
+        account_node = self._account_nodes.get(account_id)
+        return [node.data for node in account_node.children] if account_node else []
+
+    def index_for(self, account_id: int, jid: Optional[str] = None) -> QModelIndex:
+        """
+        Model index for an entry (or the account row if jid is None).
+
+        Args:
+            account_id: Account ID
+            jid: Bare JID
+
+        Returns:
+            QModelIndex (invalid if not in model)
+        """
+        if jid is None:
+            node = self._account_nodes.get(account_id)
+        else:
+            node = self._entries.get((account_id, jid))
+        if node is None:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    # =========================================================================
+    # Updates
+    # =========================================================================
+
+    def reset(self, accounts: List[Tuple[AccountDisplayData, List[ContactDisplayData]]]):
+        """
+        Replace the whole model (startup only - views lose selection/expansion).
+
+        Args:
+            accounts: List of (account data, entries)
+        """
+        self.beginResetModel()
+        self._accounts = []
+        self._account_nodes = {}
+        self._entries = {}
+        self._placeholders = {}
+        self._placeholder_hidden = set()
+        for account_data, entries in accounts:
+            account_node = self._new_account_node(account_data)
+            if entries:
+                self._placeholder_hidden.add(account_data.account_id)
+            for data in entries:
+                node = _Node(data, account_node, len(account_node.children))
+                account_node.children.append(node)
+                self._entries[(data.account_id, data.jid)] = node
+        self.endResetModel()
+
+    def sync_account(self, account_data: AccountDisplayData, entries: List[ContactDisplayData]):
+        """
+        Diff one account against freshly loaded data.
+
+        Rows that didn't change emit nothing; changed rows emit dataChanged,
+        new rows are inserted and vanished rows removed.
+
+        Args:
+            account_data: Account data
+            entries: All rooms and contacts of the account
+        """
+        account_id = account_data.account_id
+        if account_id not in self._account_nodes:
+            self._insert_account(account_data)
+        else:
+            self.update_account(account_data)
+
+        wanted = {data.jid for data in entries}
+        account_node = self._account_nodes[account_id]
+        for node in [n for n in account_node.children if n.data.jid not in wanted]:
+            self.remove_entry(account_id, node.data.jid)
+
+        for data in entries:
+            self.upsert_entry(data)
+
+    def remove_accounts_except(self, account_ids: Iterable[int]):
+        """Remove accounts not in account_ids (deleted/disabled accounts)."""
+        keep = set(account_ids)
+        for account_id in [a for a in self._account_nodes if a not in keep]:
+            self.remove_account(account_id)
+
+    def update_account(self, account_data: AccountDisplayData):
+        """Replace account data (emits dataChanged if it differs)."""
+        node = self._account_nodes.get(account_data.account_id)
+        if node is None or node.data == account_data:
+            return
+        node.data = account_data
+        index = self.createIndex(node.row, 0, node)
+        self.dataChanged.emit(index, index)
+
+    def update_account_fields(self, account_id: int, **changes) -> bool:
+        """
+        Change account fields in place (e.g. is_connected, total_unread).
+
+        Returns:
+            True if the account exists
+        """
+        node = self._account_nodes.get(account_id)
+        if node is None:
+            return False
+        self._apply_changes(node, changes)
+        return True
+
+    def upsert_entry(self, data: ContactDisplayData):
+        """
+        Insert an entry or update it from database-derived data.
+
+        Call state and participant count of an existing entry are kept.
+
+        Args:
+            data: Entry data (account must already be in the model)
+        """
+        node = self._entries.get((data.account_id, data.jid))
+        if node is None:
+            self._insert_entry(data)
+            return
+
+        for field in _TRANSIENT_FIELDS:
+            setattr(data, field, getattr(node.data, field))
+        if node.data != data:
+            node.data = data
+            index = self.createIndex(node.row, 0, node)
+            self.dataChanged.emit(index, index)
+
+    def update_entry(self, account_id: int, jid: str, **changes) -> bool:
+        """
+        Change entry fields in place (presence, unread_count, typing, ...).
+
+        Args:
+            account_id: Account ID
+            jid: Bare JID
+            **changes: ContactDisplayData field values
+
+        Returns:
+            True if the entry exists
+        """
+        node = self._entries.get((account_id, jid))
+        if node is None:
+            return False
+        self._apply_changes(node, changes)
+        return True
+
+    def remove_entry(self, account_id: int, jid: str):
+        """Remove an entry (shows placeholder when the account becomes empty)."""
+        node = self._entries.pop((account_id, jid), None)
+        if node is None:
+            return
+        account_node = node.parent
+        parent_index = self.createIndex(account_node.row, 0, account_node)
+
+        self.beginRemoveRows(parent_index, node.row, node.row)
+        del account_node.children[node.row]
+        for row in range(node.row, len(account_node.children)):
+            account_node.children[row].row = row
+        self.endRemoveRows()
+
+        if not account_node.children:
+            # Placeholder row appears again
+            self.beginInsertRows(parent_index, 0, 0)
+            self._placeholder_hidden.discard(account_id)
+            self.endInsertRows()
+
+    def remove_account(self, account_id: int):
+        """Remove an account and all its entries."""
+        node = self._account_nodes.get(account_id)
+        if node is None:
+            return
+        self.beginRemoveRows(QModelIndex(), node.row, node.row)
+        del self._accounts[node.row]
+        for row in range(node.row, len(self._accounts)):
+            self._accounts[row].row = row
+        del self._account_nodes[account_id]
+        del self._placeholders[account_id]
+        self._placeholder_hidden.discard(account_id)
+        for child in node.children:
+            self._entries.pop((account_id, child.data.jid), None)
+        self.endRemoveRows()
+
+    # =========================================================================
+    # Internals
+    # =========================================================================
+
+    def _new_account_node(self, account_data: AccountDisplayData) -> _Node:
+        node = _Node(account_data, None, len(self._accounts))
+        self._accounts.append(node)
+        self._account_nodes[account_data.account_id] = node
+        self._placeholders[account_data.account_id] = _Node(None, node, 0)
+        return node
+
+    def _insert_account(self, account_data: AccountDisplayData):
+        row = len(self._accounts)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._new_account_node(account_data)
+        self.endInsertRows()
+
+    def _insert_entry(self, data: ContactDisplayData):
+        account_node = self._account_nodes.get(data.account_id)
+        if account_node is None:
+            logger.debug(f"Account {data.account_id} not in model, dropping {data.jid}")
+            return
+        parent_index = self.createIndex(account_node.row, 0, account_node)
+
+        if self._has_placeholder(account_node):
+            # Placeholder row goes away
+            self.beginRemoveRows(parent_index, 0, 0)
+            self._placeholder_hidden.add(data.account_id)
+            self.endRemoveRows()
+
+        row = len(account_node.children)
+        self.beginInsertRows(parent_index, row, row)
+        node = _Node(data, account_node, row)
+        account_node.children.append(node)
+        self._entries[(data.account_id, data.jid)] = node
+        self.endInsertRows()
+
+    def _apply_changes(self, node: _Node, changes: dict):
+        changed = False
+        for field, value in changes.items():
+            if getattr(node.data, field) != value:
+                setattr(node.data, field, value)
+                changed = True
+        if changed:
+            index = self.createIndex(node.row, 0, node)
+            self.dataChanged.emit(index, index)
+
+
+class ContactFilterProxy(QSortFilterProxyModel):
+    """
+    Sorts the contact tree (accounts by ID; rooms before contacts, by name)
+    and filters entries by name/JID. Accounts stay visible while filtering.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSortRole(ContactTreeModel.SortKeyRole)
+        self.setFilterRole(ContactTreeModel.FilterRole)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.setDynamicSortFilter(True)
+
+    def lessThan(self, left: QModelIndex, right: QModelIndex) -> bool:
+        return (left.data(ContactTreeModel.SortKeyRole) or ()) < (right.data(ContactTreeModel.SortKeyRole) or ())
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        if not source_parent.isValid():
+            return True  # Account rows
+        return super().filterAcceptsRow(source_row, source_parent)
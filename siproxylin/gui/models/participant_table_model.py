@@ -0,0 +1,233 @@
+"""
+MUC participant table model for Siproxylin.
+
+QAbstractTableModel over the unified participant list of a room (online
+occupants + offline affiliated users). Rows are keyed by nickname (online)
+or bare JID (offline), so a coalesced occupant change inserts, removes or
+updates only the affected rows instead of rebuilding the table. Checkbox
+and search filtering is done by ParticipantFilterProxy.
+"""
+
+import logging
+from typing import Optional, Dict, List, Tuple, Callable, Iterable
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from PySide6.QtGui import QColor, QBrush
+
+
+logger = logging.getLogger('siproxylin.participant_table_model')
+
+
+def participant_key(participant: dict) -> Tuple[str, str]:
+    """
+    Row key of a participant dict.
+
+    Returns:
+        ('nick', nickname) for online occupants, ('jid', bare JID) for offline
+        affiliated users
+    """
+    if participant['is_online']:
+        return ('nick', participant['nickname'])
+    return ('jid', participant['jid'])
+
+
+class ParticipantTableModel(QAbstractTableModel):
+    """
+    Room participants as a 5-column table.
+
+    Qt.UserRole on column 0 returns the participant dict ('nickname', 'jid',
+    'status', 'role', 'affiliation', 'is_online'), same as the old
+    QTableWidgetItem data, so the context menu code can keep using it.
+    """
+
+    HEADERS = ["Nickname", "JID", "Status", "Role", "Affiliation"]
+
+    AFFILIATION_COLORS = {
+        'owner': QColor(255, 140, 0),  # Orange
+        'admin': QColor(70, 130, 180),  # Steel blue
+        'outcast': QColor(Qt.red),
+        'none': QColor(Qt.gray),
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[dict] = []
+        self._row_of: Dict[Tuple[str, str], int] = {}
+        self.self_jid: Optional[str] = None  # Our bare JID (own row is highlighted)
+        self.self_brush: Optional[QBrush] = None
+
+    # =========================================================================
+    # Updates
+    # =========================================================================
+
+    def reset(self, participants: List[dict], self_jid: Optional[str] = None,
+              self_brush: Optional[QBrush] = None):
+        """
+        Replace all rows (full load).
+
+        Args:
+            participants: Participant dicts
+            self_jid: Our bare JID (lowercase), for highlighting our own row
+            self_brush: Background of our own row
+        """
+        self.beginResetModel()
+        self._rows = list(participants)
+        self._row_of = {participant_key(p): row for row, p in enumerate(self._rows)}
+        self.self_jid = self_jid
+        self.self_brush = self_brush
+        self.endResetModel()
+
+    def upsert(self, participant: dict):
+        """Insert a participant, or update its row if the key is already listed."""
+        key = participant_key(participant)
+        row = self._row_of.get(key)
+        if row is None:
+            row = len(self._rows)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._rows.append(participant)
+            self._row_of[key] = row
+            self.endInsertRows()
+        elif self._rows[row] != participant:
+            self._rows[row] = participant
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+
+    def remove(self, key: Tuple[str, str]) -> Optional[dict]:
+        """
+        Remove a participant row.
+
+        Returns:
+            The removed participant dict, or None if the key wasn't listed
+        """
+        row = self._row_of.pop(key, None)
+        if row is None:
+            return None
+        self.beginRemoveRows(QModelIndex(), row, row)
+        participant = self._rows.pop(row)
+        for index in range(row, len(self._rows)):
+            self._row_of[participant_key(self._rows[index])] = index
+        self.endRemoveRows()
+        return participant
+
+    def get(self, key: Tuple[str, str]) -> Optional[dict]:
+        """Participant dict for a key, or None."""
+        row = self._row_of.get(key)
+        return self._rows[row] if row is not None else None
+
+    def participants(self) -> Iterable[dict]:
+        """All participant dicts, in row order."""
+        return iter(self._rows)
+
+    def participant(self, row: int) -> Optional[dict]:
+        """Participant dict of a row, or None."""
+        return self._rows[row] if 0 <= row < len(self._rows) else None
+
+    def is_jid_online(self, jid: str) -> bool:
+        """Whether any online occupant has this bare JID."""
+        return any(p['is_online'] and p['jid'] == jid for p in self._rows)
+
+    # =========================================================================
+    # QAbstractTableModel interface
+    # =========================================================================
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section: int, orientation, role: int = Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and 0 <= section < len(self.HEADERS):
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        p = self._rows[index.row()]
+        column = index.column()
+        is_self = bool(self.self_jid) and (p.get('jid') or '').lower() == self.self_jid
+
+        if role == Qt.DisplayRole:
+            return self._display(p, column, is_self)
+
+        if role == Qt.UserRole and column == 0:
+            return p
+
+        if role == Qt.BackgroundRole and is_self:
+            return self.self_brush
+
+        if role == Qt.ForegroundRole:
+            return self._foreground(p, column, is_self)
+
+        return None
+
+    def _display(self, p: dict, column: int, is_self: bool) -> Optional[str]:
+        """Display text of one cell."""
+        if column == 0:
+            nick_text = p.get('nickname') or ''
+            if is_self:
+                return f"{nick_text} (You)" if nick_text else "(You)"
+            return nick_text
+        if column == 1:
+            return p.get('jid', '(hidden)')
+        if column == 2:
+            return p.get('status', 'Unknown')
+        if column == 3:
+            return p.get('role') or 'none'
+        if column == 4:
+            return p.get('affiliation', 'none').capitalize()
+        return None
+
+    def _foreground(self, p: dict, column: int, is_self: bool):
+        """Text color of one cell (None = default)."""
+        if column == 0:
+            return QColor(Qt.gray) if not (p.get('nickname') or is_self) else None  # Offline, no nickname
+        if column == 1:
+            return QColor(Qt.gray) if p.get('jid', '(hidden)') == '(hidden)' else None
+        if column == 2:
+            return QColor(Qt.darkGreen) if p.get('status') == 'Online' else QColor(Qt.gray)
+        if column == 3:
+            return QColor(Qt.gray) if (p.get('role') or 'none') == 'none' or not p['is_online'] else None
+        if column == 4:
+            return self.AFFILIATION_COLORS.get(p.get('affiliation', 'none'))
+        return None
+
+
+class ParticipantFilterProxy(QSortFilterProxyModel):
+    """
+    Filters participants with a predicate on the participant dict (checkboxes
+    + search in the dialog). Source inserts/removes/changes are applied to
+    the view incrementally; refilter() re-evaluates all rows.
+    """
+
+    def __init__(self, accepts: Optional[Callable[[dict], bool]] = None, parent=None):
+        """
+        Initialize proxy.
+
+        Args:
+            accepts: Predicate (participant dict) -> visible (default: all visible)
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.accepts = accepts
+        self.setDynamicSortFilter(True)
+
+    def refilter(self):
+        """Re-evaluate the predicate for all rows (filter settings changed)."""
+        if hasattr(self, 'beginFilterChange'):  # Newer Qt deprecates invalidateFilter()
+            self.beginFilterChange()
+            self.endFilterChange()
+        else:
+            self.invalidateFilter()
+
+    def participants(self) -> Iterable[dict]:
+        """Visible participant dicts, in view order."""
+        source = self.sourceModel()
+        for row in range(self.rowCount()):
+            yield source.participant(self.mapToSource(self.index(row, 0)).row())
+
+    def filterAcceptsRow(self, source_row: int, source_parent: QModelIndex) -> bool:
+        if self.accepts is None:
+            return True
+        participant = self.sourceModel().participant(source_row)
+        return participant is not None and self.accepts(participant)
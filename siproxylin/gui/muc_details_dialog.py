@@ -9,14 +9,15 @@ import logging
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QTabWidget, QWidget, QFormLayout, QCheckBox, QLineEdit,
-    QTableWidget, QTableWidgetItem, QHeaderView, QGroupBox,
+    QTableView, QHeaderView, QGroupBox,
     QSpinBox, QMessageBox, QTextEdit, QComboBox
 )
-from PySide6.QtCore import Qt, QTimer, Signal
+from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QFont, QColor, QBrush, QPalette
 
 from ..core import get_account_manager
-from ..utils.avatar import get_avatar_pixmap
+from ..utils.avatar import get_avatar_loader
+from .models.participant_table_model import ParticipantTableModel, ParticipantFilterProxy
 
 
 logger = logging.getLogger('siproxylin.muc_details_dialog')
@@ -41,16 +42,19 @@ class MUCDetailsDialog(QDialog):
         # Shared room info for both Info and Config tabs
         self.room_info = None
 
-        # Auto-refresh timer for participant list
-        self.refresh_timer = QTimer(self)
-        self.refresh_timer.timeout.connect(self._auto_refresh_participants)
-        self.refresh_attempts = 0
-        self.max_refresh_attempts = 15  # Stop after 30 seconds (15 * 2s)
+        # Affiliations from the last full load (JID -> affiliation; empty if not admin/owner)
+        self.affiliated_users = {}
+
+        # Participant list state: occupant changes are applied once a full load is in
+        self._participants_loaded = False
+        self._participants_loading = False
 
         # Get room name using barrel API
         account = self.account_manager.get_account(account_id)
         room_name = room_jid
         if account:
+            # Participant list follows occupant changes (pushed, coalesced per room)
+            account.muc_participants_changed.connect(self._on_participants_changed)
             room_info = account.muc.get_room_info(room_jid)
             if room_info and room_info.name:
                 room_name = room_info.name
@@ -95,6 +99,9 @@ class MUCDetailsDialog(QDialog):
 
         layout.addLayout(button_layout)
 
+        # Avatars decode off the GUI thread; swap in the photo when it's ready
+        get_avatar_loader().avatar_ready.connect(self._on_avatar_ready)
+
         # Load initial data
         self._load_room_info()
         self._load_participants()
@@ -130,10 +137,16 @@ class MUCDetailsDialog(QDialog):
         # Mark dialog as destroyed to prevent async callbacks from accessing UI
         self._destroyed = True
 
-        # Stop auto-refresh timer to prevent memory leaks
-        if self.refresh_timer.isActive():
-            self.refresh_timer.stop()
-            logger.debug("Stopped participant auto-refresh timer")
+        account = self.account_manager.get_account(self.account_id)
+        if account:
+            try:
+                account.muc_participants_changed.disconnect(self._on_participants_changed)
+            except:
+                pass  # Signal may not be connected
+        try:
+            get_avatar_loader().avatar_ready.disconnect(self._on_avatar_ready)
+        except:
+            pass
         super().closeEvent(event)
 
     def _create_info_tab(self):
@@ -338,16 +351,18 @@ class MUCDetailsDialog(QDialog):
         self.sync_notice_label.setVisible(False)
         layout.addWidget(self.sync_notice_label)
 
-        # Participants table (unified)
-        self.participants_table = QTableWidget()
-        self.participants_table.setColumnCount(5)
-        self.participants_table.setHorizontalHeaderLabels([
-            "Nickname", "JID", "Status", "Role", "Affiliation"
-        ])
+        # Participants table (unified): model keyed by nick/JID, filtered by a proxy
+        self.participants_model = ParticipantTableModel(self)
+        self.participants_proxy = ParticipantFilterProxy(self._participant_visible, self)
+        self.participants_proxy.setSourceModel(self.participants_model)
+        self.participant_search_text = ''
+
+        self.participants_table = QTableView()
+        self.participants_table.setModel(self.participants_proxy)
 
         # Configure table
-        self.participants_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.participants_table.setSelectionMode(QTableWidget.SingleSelection)
+        self.participants_table.setSelectionBehavior(QTableView.SelectRows)
+        self.participants_table.setSelectionMode(QTableView.SingleSelection)
         self.participants_table.setAlternatingRowColors(True)
         self.participants_table.verticalHeader().setVisible(False)
         self.participants_table.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -363,8 +378,11 @@ class MUCDetailsDialog(QDialog):
 
         layout.addWidget(self.participants_table)
 
-        # Store all participants (online + affiliated) for filtering
-        self.all_participants = []
+        # Shown instead of rows when there is nothing to list ("Not connected", errors)
+        self.participants_placeholder = QLabel()
+        self.participants_placeholder.setStyleSheet("color: gray;")
+        self.participants_placeholder.setVisible(False)
+        layout.addWidget(self.participants_placeholder)
 
         return tab
 
@@ -758,9 +776,13 @@ class MUCDetailsDialog(QDialog):
                     "Only room owners can refresh configuration (not yet joined)"
                 )
 
-        # Load avatar
+        # Load avatar (initials until the photo is decoded, see _on_avatar_ready)
+        self._update_avatar()
+
+    def _update_avatar(self):
+        """Show the room avatar (cached, or initials while it decodes)."""
         try:
-            avatar_pixmap = get_avatar_pixmap(
+            avatar_pixmap = get_avatar_loader().request(
                 account_id=self.account_id,
                 jid=self.room_jid,
                 size=60
@@ -769,6 +791,11 @@ class MUCDetailsDialog(QDialog):
         except Exception as e:
             logger.error(f"Failed to load avatar: {e}")
 
+    def _on_avatar_ready(self, account_id: int, jid: str, size: int):
+        """Replace the placeholder once the room avatar is decoded."""
+        if not self._destroyed and account_id == self.account_id and jid == self.room_jid and size == 60:
+            self._update_avatar()
+
     def _load_participants(self):
         """
         Load and display ALL room participants (online + offline with affiliations).
@@ -779,12 +806,12 @@ class MUCDetailsDialog(QDialog):
         if not account or not account.client:
             self.sync_notice_label.setVisible(False)
             self._show_no_participants("Not connected")
-            self.refresh_timer.stop()
             self.refresh_participants_button.setEnabled(False)
             return
 
         # Disable refresh button while loading
         self.refresh_participants_button.setEnabled(False)
+        self._participants_loading = True
 
         # Show loading state
         self.sync_notice_label.setText("Loading participants and affiliations...")
@@ -792,10 +819,7 @@ class MUCDetailsDialog(QDialog):
 
         async def fetch_unified_list():
             try:
-                # 1. Fetch online participants from barrel
-                online_participants = account.muc.get_participants(self.room_jid) or []
-
-                # 2. Fetch all affiliations from server (if admin/owner)
+                # 1. Fetch all affiliations from server (if admin/owner)
                 our_affiliation = account.muc.get_own_affiliation(self.room_jid) or 'none'
                 affiliated_users = {}  # Map: JID -> affiliation
 
@@ -817,57 +841,33 @@ class MUCDetailsDialog(QDialog):
                     except Exception as e:
                         logger.warning(f"Failed to fetch affiliations (non-admin?): {e}")
 
+                # 2. Online participants from barrel - read after the awaits above,
+                # so occupant changes that arrived meanwhile are included
+                online_participants = account.muc.get_participants(self.room_jid) or []
+
                 # 3. Build unified participant list
-                unified_list = []
-                online_jids = set()
-
-                # Add online participants
-                for p in online_participants:
-                    bare_jid = p.jid.split('/')[0] if p.jid and '/' in p.jid else p.jid
-                    if bare_jid:
-                        bare_jid = bare_jid.lower()
-                        online_jids.add(bare_jid)
-
-                    unified_list.append({
-                        'nickname': p.nick,
-                        'jid': bare_jid or '(hidden)',
-                        'status': 'Online',
-                        'role': p.role or 'none',
-                        'affiliation': p.affiliation or 'none',
-                        'is_online': True
-                    })
+                unified_list = [self._online_entry(p) for p in online_participants]
+                online_jids = {entry['jid'] for entry in unified_list}
 
                 # Add offline affiliated users (not currently online)
                 for jid, affiliation in affiliated_users.items():
                     if jid not in online_jids:
-                        unified_list.append({
-                            'nickname': None,
-                            'jid': jid,
-                            'status': 'Offline',
-                            'role': None,
-                            'affiliation': affiliation,
-                            'is_online': False
-                        })
-
-                # Store for filtering
-                self.all_participants = unified_list
-
-                # Update count label
-                total_count = len(unified_list)
-                online_count = len([p for p in unified_list if p['is_online']])
-                self.participant_count_label.setText(
-                    f"👥 {total_count} total ({online_count} online, {total_count - online_count} offline)"
-                )
+                        unified_list.append(self._offline_entry(jid, affiliation))
+
+                # Store for filtering (and for applying occupant changes)
+                our_bare_jid = str(account.client.boundjid.bare).lower() if account.client else None
+                self.participants_model.reset(unified_list, our_bare_jid, self._get_self_highlight_color())
+                self.affiliated_users = affiliated_users
+                self._participants_loaded = True
 
                 # Hide loading notice
                 self.sync_notice_label.setVisible(False)
 
-                # Stop auto-refresh timer
-                self.refresh_timer.stop()
-
-                # Apply current filters
+                # Apply current filters (also updates the count label)
                 self._filter_participants()
 
+                total_count = len(unified_list)
+                online_count = len(online_participants)
                 logger.info(f"Loaded {total_count} participants for {self.room_jid} ({online_count} online, {total_count - online_count} offline)")
 
             except Exception as e:
@@ -878,10 +878,44 @@ class MUCDetailsDialog(QDialog):
                 self.sync_notice_label.setStyleSheet("color: #721c24; background-color: #f8d7da; padding: 8px; border-radius: 4px;")
                 self._show_no_participants("Error loading participants")
             finally:
+                self._participants_loading = False
                 self.refresh_participants_button.setEnabled(True)
 
         asyncio.create_task(fetch_unified_list())
 
+    @staticmethod
+    def _online_entry(participant) -> dict:
+        """
+        Participant dict for an online occupant.
+
+        Args:
+            participant: Participant from the MUC barrel
+
+        Returns:
+            Unified list entry (bare JID, '(hidden)' in anonymous rooms)
+        """
+        bare_jid = participant.jid.split('/')[0].lower() if participant.jid else None
+        return {
+            'nickname': participant.nick,
+            'jid': bare_jid or '(hidden)',
+            'status': 'Online',
+            'role': participant.role or 'none',
+            'affiliation': participant.affiliation or 'none',
+            'is_online': True
+        }
+
+    @staticmethod
+    def _offline_entry(jid: str, affiliation: str) -> dict:
+        """Participant dict for an affiliated user who is not in the room."""
+        return {
+            'nickname': None,
+            'jid': jid,
+            'status': 'Offline',
+            'role': None,
+            'affiliation': affiliation,
+            'is_online': False
+        }
+
     def _show_no_participants(self, message: str):
         """
         Show message in participants table when no participants available.
@@ -890,34 +924,53 @@ class MUCDetailsDialog(QDialog):
             message: Message to display
         """
         self.participant_count_label.setText("0 participants")
-        self.participants_table.setRowCount(1)
-        no_participants_item = QTableWidgetItem(message)
-        no_participants_item.setFlags(no_participants_item.flags() & ~Qt.ItemIsEditable)
-        no_participants_item.setForeground(Qt.gray)
-        self.participants_table.setItem(0, 0, no_participants_item)
-        self.participants_table.setSpan(0, 0, 1, 4)
-
-    def _auto_refresh_participants(self):
+        self.participants_model.reset([])
+        self.participants_placeholder.setText(message)
+        self.participants_placeholder.setVisible(True)
+
+    def _on_participants_changed(self, account_id: int, room_jid: str, changes: dict):
         """
-        Auto-refresh timer callback to reload participant list.
-        Stops after max_refresh_attempts to avoid infinite polling.
+        Apply coalesced occupant changes to the participant list, row by row.
+
+        Args:
+            account_id: Account ID
+            room_jid: Room JID
+            changes: {nick: Participant or None} - None means the nick left
         """
-        self.refresh_attempts += 1
-
-        # Stop if we've tried too many times (30 seconds)
-        if self.refresh_attempts >= self.max_refresh_attempts:
-            self.refresh_timer.stop()
-            logger.warning(f"Auto-refresh stopped after {self.refresh_attempts} attempts")
-            # Update message to indicate loading timed out
-            self.sync_notice_label.setText(
-                "⚠️ Participant list loading timed out. The room may have connection issues."
-            )
-            self.sync_notice_label.setStyleSheet("color: #721c24; background-color: #f8d7da; padding: 8px; border-radius: 4px;")
+        if self._destroyed or account_id != self.account_id or room_jid != self.room_jid:
+            return
+        if not self._participants_loaded:
+            # A running load reads the occupants once its affiliation queries are done
+            if not self._participants_loading:
+                self._load_participants()
             return
 
-        # Reload participants
-        logger.debug(f"Auto-refreshing participants (attempt {self.refresh_attempts})")
-        self._load_participants()
+        model = self.participants_model
+
+        # Joins and updates first, so a nick change of the same user never
+        # lists them offline in between
+        for participant in changes.values():
+            if participant is None:
+                continue
+            entry = self._online_entry(participant)
+            model.remove(('jid', entry['jid']))  # Affiliated user came online
+            model.upsert(entry)
+
+        for nick, participant in changes.items():
+            if participant is not None:
+                continue
+            left = model.remove(('nick', nick))
+            if not left:
+                continue
+            # Affiliated users who left entirely are listed offline again
+            affiliation = self.affiliated_users.get(left['jid'])
+            if affiliation and not model.is_jid_online(left['jid']):
+                model.upsert(self._offline_entry(left['jid'], affiliation))
+
+        if model.rowCount():
+            self._update_participant_count()
+        else:
+            self._show_no_participants("No participants")
 
     def _participant_matches_search(self, participant: dict, search_text: str) -> bool:
         """Check if participant matches search text."""
@@ -974,138 +1027,52 @@ class MUCDetailsDialog(QDialog):
 
         return QBrush(result)
 
+    def _participant_visible(self, participant: dict) -> bool:
+        """Proxy predicate: checkbox filters + current search text."""
+        if not self._participant_matches_filters(participant):
+            return False
+        search_text = self.participant_search_text
+        return not search_text or self._participant_matches_search(participant, search_text)
+
     def _filter_participants(self, search_text=None):
         """Filter participants table based on search text and checkbox filters."""
         # Handle both checkbox state changes (int) and text changes (str)
         if isinstance(search_text, int) or search_text is None:
             search_text = self.participant_search_input.text()
 
-        search_text = search_text.strip().lower()
+        self.participant_search_text = search_text.strip().lower()
+        self.participants_proxy.refilter()
+        self._update_participant_count()
 
-        # Get total count
-        total_count = len(self.all_participants)
+    def _update_participant_count(self):
+        """Update the count label from the model (all) and the proxy (shown)."""
+        total_count = self.participants_model.rowCount()
         if total_count == 0:
             return  # No data yet
+        self.participants_placeholder.setVisible(False)
 
-        # Filter participants by checkboxes and search
-        filtered_participants = []
-        for p in self.all_participants:
-            # Apply checkbox filters
-            if not self._participant_matches_filters(p):
-                continue
-            # Apply search filter
-            if search_text and not self._participant_matches_search(p, search_text):
-                continue
-            filtered_participants.append(p)
-
-        # Update count label
-        online_count = len([p for p in filtered_participants if p['is_online']])
-        offline_count = len(filtered_participants) - online_count
+        shown = list(self.participants_proxy.participants())
+        online_count = len([p for p in shown if p['is_online']])
+        offline_count = len(shown) - online_count
 
-        if search_text or len(filtered_participants) != total_count:
+        if self.participant_search_text or len(shown) != total_count:
             self.participant_count_label.setText(
-                f"👥 {len(filtered_participants)} of {total_count} ({online_count} online, {offline_count} offline)"
+                f"👥 {len(shown)} of {total_count} ({online_count} online, {offline_count} offline)"
             )
         else:
             self.participant_count_label.setText(
                 f"👥 {total_count} total ({online_count} online, {offline_count} offline)"
             )
 
-        # Get our JID for highlighting own entry
-        account = self.account_manager.get_account(self.account_id)
-        our_bare_jid = None
-        if account and account.client:
-            our_bare_jid = str(account.client.boundjid.bare).lower()
-
-        # Get theme-aware highlight color
-        highlight_brush = self._get_self_highlight_color()
-
-        # Populate 5-column table
-        self.participants_table.setRowCount(len(filtered_participants))
-
-        for row_idx, p in enumerate(filtered_participants):
-            # Check if this is our own entry
-            is_self = our_bare_jid and p.get('jid', '').lower() == our_bare_jid
-
-            # Column 0: Nickname
-            nick_text = p.get('nickname') or ''
-            if is_self and nick_text:
-                nick_text = f"{nick_text} (You)"
-            elif is_self:
-                nick_text = "(You)"
-            nick_item = QTableWidgetItem(nick_text)
-            nick_item.setFlags(nick_item.flags() & ~Qt.ItemIsEditable)
-            # Store participant data for context menu
-            nick_item.setData(Qt.UserRole, p)
-            if is_self:
-                nick_item.setBackground(highlight_brush)
-            if not nick_text:  # Offline user with no nickname
-                nick_item.setForeground(Qt.gray)
-            self.participants_table.setItem(row_idx, 0, nick_item)
-
-            # Column 1: JID
-            jid_text = p.get('jid', '(hidden)')
-            jid_item = QTableWidgetItem(jid_text)
-            jid_item.setFlags(jid_item.flags() & ~Qt.ItemIsEditable)
-            if is_self:
-                jid_item.setBackground(highlight_brush)
-            if jid_text == '(hidden)':
-                jid_item.setForeground(Qt.gray)
-            self.participants_table.setItem(row_idx, 1, jid_item)
-
-            # Column 2: Status
-            status_text = p.get('status', 'Unknown')
-            status_item = QTableWidgetItem(status_text)
-            status_item.setFlags(status_item.flags() & ~Qt.ItemIsEditable)
-            if is_self:
-                status_item.setBackground(highlight_brush)
-            # Color code status
-            if status_text == 'Online':
-                status_item.setForeground(Qt.darkGreen)
-            else:
-                status_item.setForeground(Qt.gray)
-            self.participants_table.setItem(row_idx, 2, status_item)
-
-            # Column 3: Role
-            role_text = p.get('role') or 'none'
-            role_item = QTableWidgetItem(role_text)
-            role_item.setFlags(role_item.flags() & ~Qt.ItemIsEditable)
-            if is_self:
-                role_item.setBackground(highlight_brush)
-            if role_text == 'none' or not p['is_online']:
-                role_item.setForeground(Qt.gray)
-            self.participants_table.setItem(row_idx, 3, role_item)
-
-            # Column 4: Affiliation
-            affiliation_text = p.get('affiliation', 'none')
-            affiliation_item = QTableWidgetItem(affiliation_text.capitalize())
-            affiliation_item.setFlags(affiliation_item.flags() & ~Qt.ItemIsEditable)
-            if is_self:
-                affiliation_item.setBackground(highlight_brush)
-            # Color code affiliation
-            if affiliation_text == 'owner':
-                affiliation_item.setForeground(QColor(255, 140, 0))  # Orange
-            elif affiliation_text == 'admin':
-                affiliation_item.setForeground(QColor(70, 130, 180))  # Steel blue
-            elif affiliation_text == 'outcast':
-                affiliation_item.setForeground(Qt.red)
-            elif affiliation_text == 'none':
-                affiliation_item.setForeground(Qt.gray)
-            self.participants_table.setItem(row_idx, 4, affiliation_item)
-
     def _show_participant_context_menu(self, position):
         """Show context menu for participant with permission-based actions (adapts to online/offline)."""
         # Get selected row
-        row = self.participants_table.rowAt(position.y())
-        if row < 0:
+        index = self.participants_table.indexAt(position)
+        if not index.isValid():
             return
 
         # Get participant data from first column
-        nick_item = self.participants_table.item(row, 0)
-        if not nick_item:
-            return
-
-        participant = nick_item.data(Qt.UserRole)
+        participant = index.siblingAtColumn(0).data(Qt.UserRole)
         if not participant:
             return
 
@@ -14,6 +14,7 @@ from PySide6.QtCore import Qt
 
 from ..utils.logger import setup_main_logger
 from ..utils.paths import get_paths
+from ..utils.audio_devices import get_audio_device_registry
 from ..db.database import get_db
 
 logger = setup_main_logger()
@@ -52,7 +53,11 @@ class SettingsDialog(QDialog):
                     logger.debug(f"Found call_bridge from account {account.account_id}")
                     break
 
-        if self.call_bridge:
+        registry = get_audio_device_registry()
+        if registry.loaded:
+            # Cached device list (kept current from hot-plug events) - no pactl/gRPC round trip
+            self._fill_device_combos(registry.list_devices())
+        elif self.call_bridge:
             # Start device population - _load_current_settings() will be called when it completes
             asyncio.create_task(self._populate_devices())
         else:
@@ -433,32 +438,7 @@ class SettingsDialog(QDialog):
         """Populate device dropdowns from call service."""
         try:
             devices = await self.call_bridge.list_audio_devices()
-
-            # Clear existing items (except Default)
-            self.microphone_combo.clear()
-            self.speakers_combo.clear()
-
-            # Re-add Default option
-            self.microphone_combo.addItem("Default (System)", "")
-            self.speakers_combo.addItem("Default (System)", "")
-
-            # Add devices
-            for device in devices:
-                if device['device_class'] == 'Audio/Source':
-                    # Microphone
-                    self.microphone_combo.addItem(device['description'], device['name'])
-                elif device['device_class'] == 'Audio/Sink':
-                    # Speakers
-                    self.speakers_combo.addItem(device['description'], device['name'])
-
-            logger.info(f"Populated {len(devices)} audio devices")
-
-            # Update info label to show successful enumeration
-            self.devices_info_label.setText("Devices are enumerated from GStreamer/PulseAudio.")
-            self.devices_info_label.setStyleSheet("color: gray; font-size: 10pt;")
-
-            # Restore saved selections
-            self._load_current_settings()
+            self._fill_device_combos(devices)
 
         except Exception as e:
             logger.error(f"Failed to populate devices: {e}")
@@ -469,6 +449,39 @@ class SettingsDialog(QDialog):
             )
             self.devices_info_label.setStyleSheet("color: #cc0000; font-size: 10pt;")
 
+    def _fill_device_combos(self, devices: list):
+        """
+        Fill device dropdowns and restore saved selections.
+
+        Args:
+            devices: List of dicts with keys: name (device ID), description, device_class
+        """
+        # Clear existing items (except Default)
+        self.microphone_combo.clear()
+        self.speakers_combo.clear()
+
+        # Re-add Default option
+        self.microphone_combo.addItem("Default (System)", "")
+        self.speakers_combo.addItem("Default (System)", "")
+
+        # Add devices
+        for device in devices:
+            if device['device_class'] == 'Audio/Source':
+                # Microphone
+                self.microphone_combo.addItem(device['description'], device['name'])
+            elif device['device_class'] == 'Audio/Sink':
+                # Speakers
+                self.speakers_combo.addItem(device['description'], device['name'])
+
+        logger.info(f"Populated {len(devices)} audio devices")
+
+        # Update info label to show successful enumeration
+        self.devices_info_label.setText("Devices are enumerated from GStreamer/PulseAudio.")
+        self.devices_info_label.setStyleSheet("color: gray; font-size: 10pt;")
+
+        # Restore saved selections
+        self._load_current_settings()
+
     def _load_settings(self):
         """Load settings from JSON file."""
         if self.settings_path.exists():
@@ -8,9 +8,9 @@ rounded corners in Qt without using QWebEngineView.
 from PySide6.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem
 from PySide6.QtCore import Qt, QSize, QRect, QPoint, QUrl, QRegularExpression
 from PySide6.QtGui import QPainter, QPen, QColor, QFont, QFontMetrics, QPainterPath, QTextDocument, QAbstractTextDocumentLayout, QSyntaxHighlighter, QTextCharFormat, QDesktopServices
-import re
 
 from ...styles.bubble_themes import get_bubble_colors
+from ...utils.message_markup import URL_PATTERN, render_body_html, apply_url_color
 
 
 class XEP0393Highlighter(QSyntaxHighlighter):
@@ -61,20 +61,8 @@ class XEP0393Highlighter(QSyntaxHighlighter):
 class MessageBubbleDelegate(QStyledItemDelegate):
     """Delegate for rendering chat messages as rounded bubbles."""
 
-    # URL detection regex pattern
-    # Matches http://, https://, and www. URLs
-    URL_PATTERN = re.compile(
-        r'(?i)\b(?:'
-        r'(?:https?://)'  # http:// or https://
-        r'|(?:www\.)'     # or www.
-        r')'
-        r'(?:[a-z0-9][-a-z0-9]*[a-z0-9]\.)*'  # subdomains
-        r'[a-z][-a-z0-9]*[a-z0-9]'            # domain
-        r'(?:\.[a-z]{2,})?'                    # TLD
-        r'(?::[0-9]{1,5})?'                    # optional port
-        r'(?:[/?#][^\s]*)?',                   # path/query/fragment
-        re.IGNORECASE
-    )
+    # URL detection regex pattern (shared with message body rendering)
+    URL_PATTERN = URL_PATTERN
 
     # User roles for storing message data
     ROLE_DIRECTION = Qt.UserRole + 1  # 0=received, 1=sent
@@ -104,6 +92,8 @@ class MessageBubbleDelegate(QStyledItemDelegate):
     ROLE_SEPARATOR_TEXT = Qt.UserRole + 22  # Text to display (e.g., "Today", "Yesterday", "Fri, 29 Jan")
     ROLE_TIMESTAMP_RAW = Qt.UserRole + 23   # Raw Unix timestamp (for Info dialog full date/time)
     ROLE_OMEMO_CAPABLE = Qt.UserRole + 24   # True if this chat supports OMEMO (has devices)
+    ROLE_FILE_STATE = Qt.UserRole + 25      # file_transfer.state: 0=pending, 1=transferring, 2=complete, 3=failed
+    ROLE_BODY_HTML = Qt.UserRole + 26       # Pre-rendered body (message_markup.render_body_html), if stored
 
     def __init__(self, parent=None, theme_name='dark', db=None, account_id=None):
         super().__init__(parent)
@@ -165,6 +155,11 @@ class MessageBubbleDelegate(QStyledItemDelegate):
         """Clear the reaction cache (call when messages are reloaded)."""
         self._reaction_cache.clear()
 
+    def invalidate_file(self, file_path: str):
+        """Drop cached documents of a file (e.g. placeholder rendered while downloading)."""
+        for key in [k for k in self._doc_cache if k[1] == file_path]:
+            del self._doc_cache[key]
+
     def set_account(self, account_id):
         """
         Set the current account ID for querying reactions.
@@ -225,12 +220,6 @@ class MessageBubbleDelegate(QStyledItemDelegate):
         """
         Convert plain text to HTML with URL links and XEP-0393 formatting.
 
-        This function:
-        1. Escapes HTML in plain text
-        2. Applies XEP-0393 formatting (*bold*, _italic_, ~strike~, `code`, ```blocks```)
-        3. Converts URLs to clickable links
-        4. Converts newlines to <br />
-
         Args:
             text: Plain text with XEP-0393 formatting and possible URLs
             url_color: QColor for the URL links
@@ -238,136 +227,7 @@ class MessageBubbleDelegate(QStyledItemDelegate):
         Returns:
             HTML string ready for QTextDocument
         """
-        from html import escape
-        import re
-
-        # Step 1: Process multi-line code blocks FIRST (before escaping)
-        # Pattern: ```language\ncode\n``` or ```\ncode\n```
-        # This must be done before escaping to preserve newlines and avoid conflicts with inline `code`
-
-        code_blocks = []
-        def save_code_block(match):
-            """Replace code blocks with placeholders and save them."""
-            lang = match.group(1) if match.group(1) else ''
-            code = match.group(2)
-
-            # Escape HTML in code content
-            escaped_code = escape(code)
-
-            # Create styled code block with language hint if present
-            # Using <small> for font size since QTextDocument doesn't respect font-size CSS well
-            # Using table to limit width (QTextDocument doesn't respect inline-block well)
-            lang_label = f'<small><small><span style="color: rgba(127,127,127,0.6);">{escape(lang)}</span></small></small><br />' if lang else ''
-
-            # Preserve whitespace (spaces, tabs) and newlines:
-            # - Replace tabs with 4 non-breaking spaces (standard tab width)
-            # - Replace spaces with non-breaking spaces to preserve indentation
-            # - Replace newlines with <br />
-            code_with_br = (escaped_code
-                .replace('\t', '&nbsp;&nbsp;&nbsp;&nbsp;')  # Tab = 4 spaces
-                .replace(' ', '&nbsp;')                      # Preserve spaces
-                .replace('\n', '<br />')                     # Newlines
-            )
-
-            block_html = (
-                f'<small><table cellpadding="0" cellspacing="0" style="margin: 4px 0;"><tr><td style="'
-                f'font-family: monospace; '
-                f'background-color: rgba(127,127,127,0.2); '
-                f'padding: 8px; border-radius: 4px; '
-                f'border-left: 3px solid rgba(127,127,127,0.4);">'
-                f'{lang_label}'
-                f'{code_with_br}'
-                f'</td></tr></table></small>'
-            )
-
-            # Use a placeholder that won't be affected by HTML escaping
-            # Using Unicode private use area characters to ensure uniqueness
-            placeholder = f'\uE000CODEBLOCK{len(code_blocks)}\uE001'
-            code_blocks.append(block_html)
-            return placeholder
-
-        # Match ```optional_language\ncode\n``` or ```code...```
-        # Pattern matches:
-        # - ```language (optional, only letters/numbers, no spaces)
-        # - Followed by either newline OR any content
-        # - Captures everything until closing ```
-        # - Content can start on same line or next line
-        text = re.sub(
-            r'```(?:([a-zA-Z0-9]+)\n|\n?)(.+?)```',
-            save_code_block,
-            text,
-            flags=re.DOTALL
-        )
-
-        # Step 2: Escape HTML entities (after extracting code blocks)
-        escaped = escape(text)
-
-        # Step 3: Apply XEP-0393 inline formatting
-        # Process in order - monospace first to protect code from URL detection
-        # XEP-0393 pattern: (^|\s)MARKER(\S|\S.*?\S)MARKER
-
-        # Monospace `code` - with background and smaller font
-        # Using <small> tag which QTextDocument respects better than font-size CSS
-        escaped = re.sub(
-            r'(^|\s)(`)((?:\S|\S.*?\S))\2',
-            r'\1<small><code style="font-family: monospace; background-color: rgba(127,127,127,0.2); padding: 2px 4px; border-radius: 3px;">\3</code></small>',
-            escaped
-        )
-
-        # Bold *text*
-        escaped = re.sub(r'(^|\s)(\*)((?:\S|\S.*?\S))\2', r'\1<b>\3</b>', escaped)
-
-        # Italic _text_
-        escaped = re.sub(r'(^|\s)(_)((?:\S|\S.*?\S))\2', r'\1<i>\3</i>', escaped)
-
-        # Strikethrough ~text~
-        escaped = re.sub(r'(^|\s)(~)((?:\S|\S.*?\S))\2', r'\1<s>\3</s>', escaped)
-
-        # Step 4: Restore code blocks (they're already HTML, don't process further)
-        for i, block_html in enumerate(code_blocks):
-            escaped = escaped.replace(f'\uE000CODEBLOCK{i}\uE001', block_html)
-
-        # Step 5: Convert URLs to anchors (but NOT inside <code> or <table> tags)
-        # Split by <code>...</code> and <table>...</table> to process only plain text sections
-        parts = re.split(r'(<code[^>]*>.*?</code>|<table[^>]*>.*?</table>)', escaped, flags=re.DOTALL)
-
-        result = []
-        for i, part in enumerate(parts):
-            if part.startswith('<code') or part.startswith('<table'):
-                # This is a code span or code block, don't process URLs
-                result.append(part)
-            else:
-                # Process URLs in non-code text
-                urls = list(self.URL_PATTERN.finditer(part))
-                if urls:
-                    url_result = []
-                    last_end = 0
-                    for match in urls:
-                        start, end = match.span()
-                        url = match.group(0)
-
-                        # Add text before URL
-                        if start > last_end:
-                            url_result.append(part[last_end:start])
-
-                        # Add URL as anchor
-                        href = url if url.startswith(('http://', 'https://')) else f'http://{url}'
-                        url_result.append(f'<a href="{href}" style="color: {url_color.name()};">{url}</a>')
-
-                        last_end = end
-
-                    # Add remaining text
-                    if last_end < len(part):
-                        url_result.append(part[last_end:])
-
-                    result.append(''.join(url_result))
-                else:
-                    result.append(part)
-
-        # Step 6: Convert newlines to <br /> (only in non-code-block text)
-        # Code blocks preserve their newlines as actual newlines, not <br />
-        html = ''.join(result).replace('\n', '<br />')
-        return html
+        return apply_url_color(render_body_html(text), url_color.name())
 
     def _convert_urls_to_anchors(self, text, url_color):
         """
@@ -477,8 +337,15 @@ class MessageBubbleDelegate(QStyledItemDelegate):
         self._reaction_cache[content_item_id] = seen_emojis
         return seen_emojis
 
-    def _get_content_document(self, body, is_file, file_path, file_name, mime_type, font, text_width, text_color=None, direction=None):
-        """Get or create cached QTextDocument for content."""
+    def _get_content_document(self, body, is_file, file_path, file_name, mime_type, font, text_width, text_color=None, direction=None,
+                              body_html=None):
+        """
+        Get or create cached QTextDocument for content.
+
+        body_html is the stored render_body_html() output (ROLE_BODY_HTML); with
+        it, a cache miss only fills in the link color instead of re-running the
+        XEP-0393/link regexes.
+        """
         # Create cache key (v7 = with text_color and direction for URL color)
         cache_key = ('v7', body if not is_file else file_path, text_width, font.toString(), text_color.name() if text_color else None, direction)
 
@@ -518,7 +385,10 @@ class MessageBubbleDelegate(QStyledItemDelegate):
             url_color = self.url_sent_color if direction == 1 else self.url_received_color
 
             # Convert text to HTML (escapes, applies XEP-0393, converts URLs)
-            html_content = self._convert_text_to_html(body, url_color)
+            if body_html is not None:
+                html_content = apply_url_color(body_html, url_color.name())
+            else:
+                html_content = self._convert_text_to_html(body, url_color)
 
             # Wrap in HTML with color if provided
             if text_color:
@@ -684,7 +554,8 @@ class MessageBubbleDelegate(QStyledItemDelegate):
         # Calculate bubble rect (needs to know about file content and reactions)
         bubble_rect = self._calculate_bubble_rect(
             painter, option.rect, body, timestamp_text, marker_text, direction, msg_type, nickname,
-            is_file, file_path, file_name, mime_type, reactions
+            is_file, file_path, file_name, mime_type, reactions,
+            body_html=index.data(self.ROLE_BODY_HTML)
         )
 
         # Draw bubble background
@@ -828,7 +699,8 @@ class MessageBubbleDelegate(QStyledItemDelegate):
         else:
             # Regular text: use QTextDocument for XEP-0393 formatting
             # Use max_text_width (same as _calculate_bubble_rect) for consistent wrapping
-            doc, _, _ = self._get_content_document(body, is_file, file_path, file_name, mime_type, base_font, max_text_width, text_color, direction)
+            doc, _, _ = self._get_content_document(body, is_file, file_path, file_name, mime_type, base_font, max_text_width, text_color, direction,
+                                                   body_html=index.data(self.ROLE_BODY_HTML))
             painter.save()
             painter.translate(body_rect.topLeft())
             doc.drawContents(painter)
@@ -1000,7 +872,8 @@ class MessageBubbleDelegate(QStyledItemDelegate):
         else:
             # Text, images, and videos: use cached QTextDocument
             _, _, text_rect_height = self._get_content_document(
-                body, is_file, file_path, file_name, mime_type, font, text_width, None, direction
+                body, is_file, file_path, file_name, mime_type, font, text_width, None, direction,
+                body_html=index.data(self.ROLE_BODY_HTML)
             )
 
         # Add timestamp height
@@ -1033,7 +906,8 @@ class MessageBubbleDelegate(QStyledItemDelegate):
         return QSize(option.rect.width(), total_height)
 
     def _calculate_bubble_rect(self, painter, item_rect, body, timestamp_text, marker_text, direction, msg_type, nickname,
-                               is_file=False, file_path=None, file_name=None, mime_type=None, reactions=None, font=None):
+                               is_file=False, file_path=None, file_name=None, mime_type=None, reactions=None, font=None,
+                               body_html=None):
         """Calculate the rectangle for the bubble."""
         if font is None:
             font = painter.font()
@@ -1046,7 +920,8 @@ class MessageBubbleDelegate(QStyledItemDelegate):
 
         # Calculate content dimensions using QTextDocument (consistent with paint())
         _, text_rect_width, text_rect_height = self._get_content_document(
-            body, is_file, file_path, file_name, mime_type, font, text_width, None, direction
+            body, is_file, file_path, file_name, mime_type, font, text_width, None, direction,
+            body_html=body_html
         )
 
         # Calculate timestamp width
@@ -1314,7 +1189,8 @@ class MessageBubbleDelegate(QStyledItemDelegate):
         # Calculate bubble rect without QPainter
         bubble_rect = self._calculate_bubble_rect(
             None, option.rect, body, timestamp_text, marker_text, direction, msg_type, nickname,
-            is_file, file_path, file_name, mime_type, reactions, font=option.font
+            is_file, file_path, file_name, mime_type, reactions, font=option.font,
+            body_html=index.data(self.ROLE_BODY_HTML)
         )
 
         # Calculate text area within bubble
@@ -1351,7 +1227,8 @@ class MessageBubbleDelegate(QStyledItemDelegate):
         max_text_width = max_bubble_width - 2 * self.padding
         text_color = self.sent_text_color if direction == 1 else self.received_text_color
 
-        doc, _, _ = self._get_content_document(body, is_file, file_path, file_name, mime_type, option.font, max_text_width, text_color, direction)
+        doc, _, _ = self._get_content_document(body, is_file, file_path, file_name, mime_type, option.font, max_text_width, text_color, direction,
+                                               body_html=index.data(self.ROLE_BODY_HTML))
 
         # Calculate position relative to document
         doc_pos = mouse_pos - text_rect.topLeft()
@@ -2,23 +2,40 @@
 Spell checking highlighter for Siproxylin.
 
 Uses PyEnchant to highlight misspelled words with red wavy underlines.
+Verdicts are cached per dictionary and unknown words are checked in budgeted
+batches per event-loop tick (see utils/spell_cache.py), so typing stays
+responsive in long drafts and after large pastes.
 """
 
 import logging
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer
 from PySide6.QtGui import (
     QSyntaxHighlighter, QTextCharFormat, QColor,
     QTextBlockUserData
 )
 
-try:
-    import enchant
-    ENCHANT_AVAILABLE = True
-except ImportError:
-    ENCHANT_AVAILABLE = False
+from ...utils.spell_cache import SpellChecker, get_spell_cache
 
 logger = logging.getLogger('siproxylin.spell_highlighter')
 
+# PyEnchant (and its C library/providers) is imported on first use, not at startup
+_enchant = None
+_enchant_checked = False
+
+
+def _get_enchant():
+    """Import PyEnchant on first call; None if not installed."""
+    global _enchant, _enchant_checked
+    if not _enchant_checked:
+        _enchant_checked = True
+        try:
+            import enchant
+            _enchant = enchant
+        except ImportError:
+            logger.warning("PyEnchant not available, spell checking disabled")
+            logger.info("Install: pip install pyenchant && apt install aspell aspell-en")
+    return _enchant
+
 
 class SpellingBlockData(QTextBlockUserData):
     """Store misspelling positions for a text block."""
@@ -45,25 +62,32 @@ class EnchantHighlighter(QSyntaxHighlighter):
         """
         super().__init__(document)
 
-        self.dict = None
         self.language = language
+        self._dict = None
+        self._dict_loaded = False  # Dictionary is loaded on first use
+        self._checker = None  # SpellChecker for self._dict
+        self._tick_scheduled = False
         self._spell_format = QTextCharFormat()
         self._spell_format.setUnderlineColor(QColor(Qt.red))
         self._spell_format.setUnderlineStyle(QTextCharFormat.WaveUnderline)
 
-        if ENCHANT_AVAILABLE:
-            try:
-                # Try to load dictionary
-                self.dict = enchant.Dict(language)
-                logger.debug(f"Spell checker initialized with language: {language}")
-            except enchant.errors.DictNotFoundError:
-                logger.warning(f"Dictionary not found for language '{language}', spell checking disabled")
-                logger.info("Install language dictionaries: apt install aspell aspell-en aspell-de ...")
-            except Exception as e:
-                logger.error(f"Failed to initialize spell checker: {e}")
-        else:
-            logger.warning("PyEnchant not available, spell checking disabled")
-            logger.info("Install: pip install pyenchant && apt install aspell aspell-en")
+    @property
+    def dict(self):
+        """Enchant dictionary for the current language (loaded on first access, None if unavailable)."""
+        if not self._dict_loaded:
+            self._dict_loaded = True
+            enchant = _get_enchant()
+            if enchant:
+                try:
+                    self._dict = enchant.Dict(self.language)
+                    self._checker = SpellChecker(self._dict, get_spell_cache(self.language))
+                    logger.debug(f"Spell checker initialized with language: {self.language}")
+                except enchant.errors.DictNotFoundError:
+                    logger.warning(f"Dictionary not found for language '{self.language}', spell checking disabled")
+                    logger.info("Install language dictionaries: apt install aspell aspell-en aspell-de ...")
+                except Exception as e:
+                    logger.error(f"Failed to initialize spell checker: {e}")
+        return self._dict
 
     def is_available(self) -> bool:
         """Check if spell checking is available."""
@@ -76,13 +100,20 @@ class EnchantHighlighter(QSyntaxHighlighter):
         Args:
             language: Language code (e.g., 'en_US', 'de_DE', 'fr_FR')
         """
-        if not ENCHANT_AVAILABLE:
+        enchant = _get_enchant()
+        if not enchant:
             logger.warning("Cannot set language: PyEnchant not available")
             return
 
+        if self._dict_loaded and self._dict and language == self.language:
+            return
+
         try:
-            self.dict = enchant.Dict(language)
+            self._dict = enchant.Dict(language)
+            self._dict_loaded = True
             self.language = language
+            # Verdicts and queued words belong to the old dictionary
+            self._checker = SpellChecker(self._dict, get_spell_cache(language))
             logger.debug(f"Spell checker language changed to: {language}")
             # Re-highlight document
             self.rehighlight()
@@ -93,7 +124,8 @@ class EnchantHighlighter(QSyntaxHighlighter):
 
     def get_available_languages(self):
         """Get list of available dictionary languages."""
-        if not ENCHANT_AVAILABLE:
+        enchant = _get_enchant()
+        if not enchant:
             return []
         try:
             return enchant.list_languages()
@@ -114,35 +146,36 @@ class EnchantHighlighter(QSyntaxHighlighter):
         # Create block data to store misspellings
         block_data = SpellingBlockData()
 
-        # Simple word tokenization (split on whitespace and common punctuation)
-        # This is basic but works well for chat messages
-        import re
-        # Match words (alphanumeric + apostrophes for contractions)
-        word_pattern = re.compile(r"\b[a-zA-Z']+\b")
-
-        for match in word_pattern.finditer(text):
-            word = match.group()
-            start_pos = match.start()
-            length = len(word)
-
-            # Skip single-letter words and words with numbers
-            if length <= 1:
-                continue
-
-            # Check spelling
-            try:
-                if not self.dict.check(word):
-                    # Misspelled - apply red wavy underline
-                    self.setFormat(start_pos, length, self._spell_format)
-                    # Store for context menu
-                    block_data.misspellings.append((start_pos, length, word))
-            except Exception as e:
-                # Ignore errors for individual words
-                logger.debug(f"Error checking word '{word}': {e}")
+        # Cached verdicts; unknown words beyond the tick budget are queued
+        for start_pos, length, word in self._checker.misspellings(text):
+            # Misspelled - apply red wavy underline
+            self.setFormat(start_pos, length, self._spell_format)
+            # Store for context menu
+            block_data.misspellings.append((start_pos, length, word))
 
         # Store block data
         self.setCurrentBlockUserData(block_data)
 
+        if self._checker.needs_tick:
+            self._schedule_tick()
+
+    def _schedule_tick(self):
+        """Resolve queued words on the next event-loop iteration."""
+        if not self._tick_scheduled:
+            self._tick_scheduled = True
+            QTimer.singleShot(0, self._on_tick)
+
+    def _on_tick(self):
+        """Check the next batch of queued words; re-highlight if any were misspelled."""
+        self._tick_scheduled = False
+        if not self._checker:
+            return
+        found = self._checker.next_tick()
+        if found and self.document():
+            self.rehighlight()
+        if self._checker.pending:
+            self._schedule_tick()
+
     def suggest(self, word: str, max_suggestions: int = 10):
         """
         Get spelling suggestions for a misspelled word.
@@ -176,6 +209,7 @@ class EnchantHighlighter(QSyntaxHighlighter):
 
         try:
             self.dict.add(word)
+            self._checker.add_word(word)
             logger.debug(f"Added '{word}' to dictionary")
             # Re-highlight to remove underlines
             self.rehighlight()
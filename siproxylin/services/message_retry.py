@@ -5,10 +5,11 @@ Handles retrying failed/pending messages on account reconnect.
 Implements Phase 4: Message Retry Logic (TODO-retry-logic.md).
 """
 
+import asyncio
 import logging
 import time
 from datetime import datetime
-from typing import Dict, Optional, TYPE_CHECKING
+from typing import Callable, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
 from PySide6.QtCore import QObject, Signal
 
 if TYPE_CHECKING:
@@ -35,7 +36,8 @@ class MessageRetryHandler(QObject):
 
     # Configuration
     RETRY_DIALOG_THRESHOLD_HOURS = 24  # Show user prompt after 24h of failures
-    MAM_QUERY_WINDOW_SECONDS = 600  # Query ±10 min around message timestamp
+    MAM_QUERY_WINDOW_SECONDS = 600  # Query ±10 min around pending messages' time span
+    RETRY_CONCURRENCY = 4  # Conversations reconciled/resent at the same time
 
     def __init__(self):
         """Initialize message retry handler."""
@@ -46,18 +48,27 @@ class MessageRetryHandler(QObject):
         self,
         account_id: int,
         xmpp_client,  # DrunkXMPP client
-        db: 'Database'
+        db: 'Database',
+        progress: Optional[Callable[[Dict[str, int]], None]] = None
     ) -> Dict[str, int]:
         """
         Retry all pending messages for a specific account.
 
+        Messages are reconciled per conversation: one MAM query spanning all of
+        that conversation's pending messages, then the ones not found in the
+        archive are resent in their original order. Conversations are processed
+        concurrently (at most RETRY_CONCURRENCY at a time).
+
         Args:
             account_id: Account ID
             xmpp_client: DrunkXMPP client instance
             db: Database instance
+            progress: Optional callback, called with a copy of the stats after
+                      each conversation while messages remain ('remaining' > 0)
 
         Returns:
-            Dict with stats: {"resent": 3, "found_in_mam": 1, "failed": 0, "skipped_user_prompt": 2, "discarded": 1}
+            Dict with stats: {"total": 6, "remaining": 0, "resent": 3, "found_in_mam": 1,
+                              "failed": 0, "skipped_user_prompt": 2, "discarded": 1}
         """
         from ..utils.logger import get_account_logger
 
@@ -65,6 +76,8 @@ class MessageRetryHandler(QObject):
         acc_logger.info(f"Starting message retry for account {account_id}")
 
         stats = {
+            "total": 0,
+            "remaining": 0,
             "resent": 0,
             "found_in_mam": 0,
             "failed": 0,
@@ -73,7 +86,7 @@ class MessageRetryHandler(QObject):
         }
 
         try:
-            # Query pending messages (marked=0, direction=1)
+            # Query pending messages (marked=0, direction=1), oldest first
             pending = db.get_pending_messages(account_id)
 
             if not pending:
@@ -81,7 +94,10 @@ class MessageRetryHandler(QObject):
                 return stats
 
             acc_logger.info(f"Found {len(pending)} pending messages to retry")
+            stats["total"] = len(pending)
 
+            # Group by conversation, keeping send order within each group
+            conversations: Dict[Tuple[str, int], List] = {}
             for msg in pending:
                 try:
                     # Initialize retry tracking if first attempt
@@ -97,35 +113,24 @@ class MessageRetryHandler(QObject):
                         stats["skipped_user_prompt"] += 1
                         continue
 
-                    # Step 1: Check MAM for deduplication
-                    acc_logger.debug(f"Checking MAM for message {msg['id']} (origin_id: {msg['origin_id']})")
-                    exists_in_mam = await self._check_message_in_mam(
-                        msg, xmpp_client, acc_logger
-                    )
-
-                    if exists_in_mam:
-                        # Message already on server, just update DB
-                        db.mark_message_delivered(msg['id'])
-                        acc_logger.info(f"Message {msg['id']} found in MAM, marked as delivered")
-                        stats["found_in_mam"] += 1
-                        continue
-
-                    # Step 2: Resend message
-                    acc_logger.info(f"Resending message {msg['id']} (attempt {msg['retry_count'] + 1})")
-                    result = await self._resend_message(msg, xmpp_client, db, acc_logger)
-
-                    if result == "discarded":
-                        stats["discarded"] += 1
-                    else:
-                        # Update retry count and timestamp
-                        db.increment_retry_count(msg['id'])
-                        stats["resent"] += 1
+                    conversations.setdefault((msg['counterpart_jid'], msg['type']), []).append(msg)
 
                 except Exception as e:
                     acc_logger.error(f"Failed to retry message {msg['id']}: {e}", exc_info=True)
                     stats["failed"] += 1
                     # Continue with next message
 
+            stats["remaining"] = sum(len(messages) for messages in conversations.values())
+            semaphore = asyncio.Semaphore(self.RETRY_CONCURRENCY)
+
+            async def retry_conversation(messages: List):
+                async with semaphore:
+                    await self._retry_conversation(messages, xmpp_client, db, stats, acc_logger)
+                if progress and stats["remaining"]:
+                    progress(dict(stats))
+
+            await asyncio.gather(*(retry_conversation(messages) for messages in conversations.values()))
+
             acc_logger.info(f"Retry completed: {stats}")
             return stats
 
@@ -133,6 +138,55 @@ class MessageRetryHandler(QObject):
             acc_logger.error(f"Message retry failed for account {account_id}: {e}", exc_info=True)
             raise
 
+    async def _retry_conversation(
+        self,
+        messages: List,
+        xmpp_client,
+        db: 'Database',
+        stats: Dict[str, int],
+        acc_logger: logging.Logger
+    ):
+        """
+        Reconcile one conversation's pending messages against MAM, resend the rest in order.
+
+        Args:
+            messages: Pending message rows of one conversation (oldest first)
+            xmpp_client: DrunkXMPP client instance
+            db: Database instance
+            stats: Shared stats dict (updated in place)
+            acc_logger: Account logger
+        """
+        # Step 1: One MAM query for the whole conversation
+        archived_ids = await self._fetch_archived_ids(messages, xmpp_client, acc_logger)
+
+        # Step 2: Mark archived ones delivered, resend the others (in order)
+        for msg in messages:
+            try:
+                if msg['origin_id'] and msg['origin_id'] in archived_ids:
+                    # Message already on server, just update DB
+                    db.mark_message_delivered(msg['id'])
+                    acc_logger.info(f"Message {msg['id']} found in MAM, marked as delivered")
+                    stats["found_in_mam"] += 1
+                    continue
+
+                acc_logger.info(f"Resending message {msg['id']} (attempt {msg['retry_count'] + 1})")
+                result = await self._resend_message(msg, xmpp_client, db, acc_logger)
+
+                if result == "discarded":
+                    stats["discarded"] += 1
+                else:
+                    # Update retry count and timestamp
+                    db.increment_retry_count(msg['id'])
+                    stats["resent"] += 1
+
+            except Exception as e:
+                acc_logger.error(f"Failed to retry message {msg['id']}: {e}", exc_info=True)
+                stats["failed"] += 1
+                # Continue with next message
+
+            finally:
+                stats["remaining"] -= 1
+
     def _should_prompt_user(self, msg: dict) -> bool:
         """
         Check if message has been failing for >24h and needs user prompt.
@@ -151,60 +205,53 @@ class MessageRetryHandler(QObject):
 
         return hours_since_first_retry >= self.RETRY_DIALOG_THRESHOLD_HOURS
 
-    async def _check_message_in_mam(
+    async def _fetch_archived_ids(
         self,
-        msg: dict,
+        messages: List,
         xmpp_client,
         acc_logger: logging.Logger
-    ) -> bool:
+    ) -> Set[str]:
         """
-        Query MAM around message timestamp to check if it exists.
-        Uses origin_id for matching.
+        Query MAM once for the time span of a conversation's pending messages.
 
         Args:
-            msg: Message row from database
+            messages: Pending message rows of one conversation
             xmpp_client: DrunkXMPP client instance
             acc_logger: Account logger
 
         Returns:
-            True if message found in MAM, False otherwise
+            Set of message IDs (id / origin-id) found in the archive; empty if
+            MAM is unavailable (messages will be resent, origin_id prevents dupes)
         """
-        try:
-            counterpart_jid = msg['counterpart_jid']
+        counterpart_jid = messages[0]['counterpart_jid']
+        is_groupchat = messages[0]['type'] == 1
 
-            # Query MAM: ±10 minutes around message timestamp
-            start_time = datetime.fromtimestamp(msg['time'] - self.MAM_QUERY_WINDOW_SECONDS)
-            end_time = datetime.fromtimestamp(msg['time'] + self.MAM_QUERY_WINDOW_SECONDS)
+        # Span of all pending messages, ±10 minutes for clock skew
+        times = [msg['time'] for msg in messages]
+        start_time = datetime.fromtimestamp(min(times) - self.MAM_QUERY_WINDOW_SECONDS)
+        end_time = datetime.fromtimestamp(max(times) + self.MAM_QUERY_WINDOW_SECONDS)
 
-            acc_logger.debug(f"Querying MAM from {start_time} to {end_time}")
+        acc_logger.debug(
+            f"Querying MAM for {len(messages)} pending messages to {counterpart_jid} "
+            f"from {start_time} to {end_time}"
+        )
 
-            history = await xmpp_client.retrieve_history(
+        try:
+            return await xmpp_client.retrieve_archived_ids(
                 jid=counterpart_jid,
                 start=start_time,
                 end=end_time,
-                max_messages=50
+                with_jid=None if is_groupchat else counterpart_jid
             )
 
-            # Look for our origin_id in the results
-            origin_id = msg['origin_id']
-            for archived_msg in history:
-                # Check if message IDs match
-                archived_stanza = archived_msg['message']
-                if archived_stanza.get('id') == origin_id:
-                    acc_logger.debug(f"Found message in MAM with origin_id {origin_id}")
-                    return True
-
-            acc_logger.debug(f"Message with origin_id {origin_id} not found in MAM")
-            return False
-
         except RuntimeError as e:
             # MAM not supported - can't deduplicate, assume not there
             acc_logger.warning(f"MAM check failed (not supported?): {e}")
-            return False
+            return set()
         except Exception as e:
             # Query failed - assume not there, will resend (origin_id prevents dupes)
             acc_logger.error(f"MAM query error: {e}", exc_info=True)
-            return False
+            return set()
 
     async def _resend_message(
         self,
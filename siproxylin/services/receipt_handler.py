@@ -8,27 +8,59 @@ Updates message `marked` status following this schema:
     2 = RECEIVED (delivery receipt - double ✓✓)
     7 = READ (displayed marker - double ✓✓ bold)
     8 = ERROR (won't send)
+
+Updates are coalesced: events arriving within COALESCE_DELAY are applied in
+one transaction and reported once per conversation as
+{content_item_id: marked} for the rows that actually changed.
 """
 
+import asyncio
 import logging
-from typing import Optional
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Tuple
 from ..db.database import Database
 
 
 logger = logging.getLogger('siproxylin.receipt_handler')
 
+# Batching window for receipts/markers/ACKs (seconds)
+COALESCE_DELAY = 0.05
+
+MARKED_SENT = 1
+MARKED_RECEIVED = 2
+MARKED_READ = 7
+
+# Message row + its content item (for patching the chat view)
+_ROW_QUERY = """
+    SELECT m.id, m.marked, j.bare_jid, ci.id AS ci_id
+    FROM message m
+    JOIN jid j ON j.id = m.counterpart_id
+    LEFT JOIN content_item ci ON ci.content_type = 0 AND ci.foreign_id = m.id
+    WHERE m.account_id = ?
+"""
+
 
 class ReceiptHandler:
     """Handles receipt and marker database updates."""
 
-    def __init__(self, db: Database):
+    def __init__(self, db: Database,
+                 on_update: Optional[Callable[[int, str, Dict[int, int]], None]] = None,
+                 delay: float = COALESCE_DELAY):
         """
         Initialize receipt handler.
 
         Args:
             db: Database instance
+            on_update: Called once per conversation after each flush with
+                       (account_id, bare_jid, {content_item_id: marked})
+            delay: Batching window in seconds
         """
         self.db = db
+        self.on_update = on_update
+        self.delay = delay
+        # (account_id, counterpart_jid or None for ACKs, origin_id, marked)
+        self._pending: List[Tuple[int, Optional[str], str, int]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
 
     def on_server_ack(self, account_id: int, message_id: str):
         """
@@ -39,28 +71,7 @@ class ReceiptHandler:
             account_id: Account ID
             message_id: Message origin_id (our sent message ID)
         """
-        try:
-            # Only update if currently marked=0 (pending)
-            # Don't downgrade if already received/read
-            updated = self.db.execute(
-                """
-                UPDATE message
-                SET marked = 1
-                WHERE account_id = ?
-                  AND origin_id = ?
-                  AND marked = 0
-                """,
-                (account_id, message_id)
-            )
-
-            if updated.rowcount > 0:
-                self.db.commit()
-                logger.debug(f"Server ACK: marked message {message_id} as SENT (marked=1)")
-            else:
-                logger.debug(f"Server ACK: message {message_id} already marked or not found")
-
-        except Exception as e:
-            logger.error(f"Failed to update server ACK for {message_id}: {e}")
+        self._queue(account_id, None, message_id, MARKED_SENT)
 
     def on_delivery_receipt(self, account_id: int, counterpart_jid: str, message_id: str):
         """
@@ -72,40 +83,7 @@ class ReceiptHandler:
             counterpart_jid: Sender's bare JID
             message_id: Message origin_id (our sent message ID)
         """
-        try:
-            # Get counterpart JID ID
-            jid_row = self.db.fetchone(
-                "SELECT id FROM jid WHERE bare_jid = ?",
-                (counterpart_jid,)
-            )
-
-            if not jid_row:
-                logger.warning(f"Delivery receipt: JID {counterpart_jid} not found")
-                return
-
-            counterpart_id = jid_row['id']
-
-            # Update if currently marked<=1 (pending or sent)
-            updated = self.db.execute(
-                """
-                UPDATE message
-                SET marked = 2
-                WHERE account_id = ?
-                  AND counterpart_id = ?
-                  AND origin_id = ?
-                  AND marked <= 1
-                """,
-                (account_id, counterpart_id, message_id)
-            )
-
-            if updated.rowcount > 0:
-                self.db.commit()
-                logger.info(f"Delivery receipt: marked message {message_id} as RECEIVED (marked=2)")
-            else:
-                logger.debug(f"Delivery receipt: message {message_id} already marked or not found")
-
-        except Exception as e:
-            logger.error(f"Failed to update delivery receipt for {message_id}: {e}")
+        self._queue(account_id, counterpart_jid, message_id, MARKED_RECEIVED)
 
     def on_displayed_marker(self, account_id: int, counterpart_jid: str, message_id: str):
         """
@@ -117,63 +95,7 @@ class ReceiptHandler:
             counterpart_jid: Sender's bare JID
             message_id: Message origin_id (our sent message ID that was displayed)
         """
-        try:
-            # Get counterpart JID ID
-            jid_row = self.db.fetchone(
-                "SELECT id FROM jid WHERE bare_jid = ?",
-                (counterpart_jid,)
-            )
-
-            if not jid_row:
-                logger.warning(f"Displayed marker: JID {counterpart_jid} not found")
-                return
-
-            counterpart_id = jid_row['id']
-
-            # First, get the timestamp of the marked message
-            marked_msg = self.db.fetchone(
-                """
-                SELECT time
-                FROM message
-                WHERE account_id = ?
-                  AND counterpart_id = ?
-                  AND origin_id = ?
-                """,
-                (account_id, counterpart_id, message_id)
-            )
-
-            if not marked_msg:
-                logger.warning(f"Displayed marker: message {message_id} not found")
-                return
-
-            marked_time = marked_msg['time']
-
-            # CUMULATIVE UPDATE: Mark all messages up to this timestamp as READ
-            # Only update messages that are currently marked<7
-            updated = self.db.execute(
-                """
-                UPDATE message
-                SET marked = 7
-                WHERE account_id = ?
-                  AND counterpart_id = ?
-                  AND direction = 1
-                  AND time <= ?
-                  AND marked < 7
-                """,
-                (account_id, counterpart_id, marked_time)
-            )
-
-            count = updated.rowcount
-            if count > 0:
-                self.db.commit()
-                logger.info(
-                    f"Displayed marker: marked {count} message(s) up to {message_id} as READ (marked=7)"
-                )
-            else:
-                logger.debug(f"Displayed marker: no messages to update for {message_id}")
-
-        except Exception as e:
-            logger.error(f"Failed to update displayed marker for {message_id}: {e}")
+        self._queue(account_id, counterpart_jid, message_id, MARKED_READ)
 
     def on_received_marker(self, account_id: int, counterpart_jid: str, message_id: str):
         """
@@ -187,3 +109,147 @@ class ReceiptHandler:
         """
         logger.debug(f"Received marker for {message_id}: ignoring (redundant with delivery receipt)")
         # Intentionally do nothing - delivery receipts are preferred
+
+    @property
+    def pending_count(self) -> int:
+        """Number of queued events not yet written."""
+        return len(self._pending)
+
+    def _queue(self, account_id: int, counterpart_jid: Optional[str], message_id: str, marked: int):
+        """Queue an event and schedule a flush (or apply now without a running loop)."""
+        self._pending.append((account_id, counterpart_jid, message_id, marked))
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.delay, self.flush)
+
+    def flush(self) -> Dict[Tuple[int, str], Dict[int, int]]:
+        """
+        Apply all queued events in one transaction and notify per conversation.
+
+        Returns:
+            Dict {(account_id, bare_jid): {content_item_id: marked}} of changed rows
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending, self._pending = self._pending, []
+        if not pending:
+            return {}
+
+        try:
+            with self.db.transaction():
+                targets = self._resolve(pending)
+                self.db.executemany(
+                    "UPDATE message SET marked = ? WHERE id = ? AND marked < ?",
+                    [(marked, msg_id, marked) for msg_id, (marked, _, _, _) in targets.items()]
+                )
+        except Exception as e:
+            logger.error(f"Failed to apply {len(pending)} receipt/marker update(s): {e}")
+            return {}
+
+        updates: Dict[Tuple[int, str], Dict[int, int]] = defaultdict(dict)
+        for marked, account_id, bare_jid, ci_id in targets.values():
+            changes = updates[(account_id, bare_jid)]
+            if ci_id is not None:
+                changes[ci_id] = marked
+
+        logger.debug(
+            f"Applied {len(pending)} receipt/marker event(s): "
+            f"{len(targets)} message(s) in {len(updates)} conversation(s)"
+        )
+
+        if self.on_update:
+            for (account_id, bare_jid), changes in updates.items():
+                try:
+                    self.on_update(account_id, bare_jid, changes)
+                except Exception as e:
+                    logger.error(f"Receipt update callback failed for {bare_jid}: {e}")
+
+        return dict(updates)
+
+    def _resolve(self, pending) -> Dict[int, Tuple[int, int, str, Optional[int]]]:
+        """
+        Find the rows each queued event upgrades.
+
+        Statuses only move up (0 → 1 → 2 → 7), so the final value per row is
+        the highest one any event asks for, and errors (8) are never touched.
+        All displayed markers of a conversation collapse into one cumulative
+        "everything up to the newest marked message" update.
+
+        Returns:
+            Dict {message.id: (marked, account_id, bare_jid, content_item_id)}
+        """
+        acks = defaultdict(set)        # account_id -> origin ids
+        receipts = defaultdict(set)    # (account_id, jid) -> origin ids
+        displayed = defaultdict(set)   # (account_id, jid) -> origin ids
+        for account_id, jid, message_id, marked in pending:
+            if marked == MARKED_SENT:
+                acks[account_id].add(message_id)
+            elif marked == MARKED_RECEIVED:
+                receipts[(account_id, jid)].add(message_id)
+            else:
+                displayed[(account_id, jid)].add(message_id)
+
+        targets: Dict[int, Tuple[int, int, str, Optional[int]]] = {}
+
+        def upgrade(rows, account_id, marked):
+            for row in rows:
+                current = targets.get(row['id'], (row['marked'],))[0]
+                if marked > current:
+                    targets[row['id']] = (marked, account_id, row['bare_jid'], row['ci_id'])
+
+        for account_id, ids in acks.items():
+            rows = self.db.fetchall(
+                _ROW_QUERY + f" AND m.origin_id IN ({_placeholders(ids)})",
+                (account_id, *ids)
+            )
+            upgrade(rows, account_id, MARKED_SENT)
+
+        for (account_id, jid), ids in receipts.items():
+            rows = self.db.fetchall(
+                _ROW_QUERY + f" AND j.bare_jid = ? AND m.origin_id IN ({_placeholders(ids)})",
+                (account_id, jid, *ids)
+            )
+            if not rows:
+                logger.debug(f"Delivery receipt: {len(ids)} message(s) from {jid} not found")
+            upgrade(rows, account_id, MARKED_RECEIVED)
+
+        for (account_id, jid), ids in displayed.items():
+            newest = self.db.fetchone(
+                f"""
+                SELECT MAX(m.time) AS time
+                FROM message m
+                JOIN jid j ON j.id = m.counterpart_id
+                WHERE m.account_id = ? AND j.bare_jid = ? AND m.origin_id IN ({_placeholders(ids)})
+                """,
+                (account_id, jid, *ids)
+            )
+            if not newest or newest['time'] is None:
+                logger.warning(f"Displayed marker: message(s) {sorted(ids)} from {jid} not found")
+                continue
+
+            # CUMULATIVE: all our messages up to the newest displayed one are READ
+            rows = self.db.fetchall(
+                _ROW_QUERY + """
+                  AND j.bare_jid = ?
+                  AND m.direction = 1
+                  AND m.time <= ?
+                  AND m.marked < 7
+                """,
+                (account_id, jid, newest['time'])
+            )
+            upgrade(rows, account_id, MARKED_READ)
+
+        return targets
+
+
+def _placeholders(values) -> str:
+    """SQL placeholder list for an IN clause."""
+    return ', '.join('?' * len(values))
@@ -11,9 +11,18 @@ from .logger import (
     cleanup_old_logs
 )
 from .jid_utils import generate_resource
-from .audio_devices import get_audio_device_manager, AudioDevice, AudioDeviceManager
+from .audio_devices import (
+    get_audio_device_manager,
+    get_audio_device_registry,
+    AudioDevice,
+    AudioDeviceManager,
+    AudioDeviceRegistry
+)
 from .file_utils import open_file_with_external_app, save_file_as
 from .video_utils import generate_video_thumbnail, get_or_generate_thumbnail, get_cached_thumbnail_path
+from .startup_profiler import get_startup_profiler, StartupProfiler
+from .spell_cache import get_spell_cache, SpellCache, SpellChecker
+from .account_connect import connect_concurrently
 
 __all__ = [
     'get_paths',
@@ -26,11 +35,19 @@ __all__ = [
     'cleanup_old_logs',
     'generate_resource',
     'get_audio_device_manager',
+    'get_audio_device_registry',
     'AudioDevice',
     'AudioDeviceManager',
+    'AudioDeviceRegistry',
     'open_file_with_external_app',
     'save_file_as',
     'generate_video_thumbnail',
     'get_or_generate_thumbnail',
     'get_cached_thumbnail_path',
+    'get_startup_profiler',
+    'StartupProfiler',
+    'get_spell_cache',
+    'SpellCache',
+    'SpellChecker',
+    'connect_concurrently',
 ]
@@ -0,0 +1,77 @@
+"""
+Concurrent account bring-up for Siproxylin.
+
+AccountBrewery used to connect enabled accounts one after another. Here each
+account is a job (start connecting, return the outcome) and up to a limit of
+jobs run at the same time, so the TCP/TLS/SASL/proxy handshakes of different
+servers overlap and total startup time follows the slowest account instead
+of the sum. A job that raises or exceeds the timeout only marks its own
+account ('failed'/'timeout') and frees its slot for the next one; the
+connection itself keeps retrying in the background.
+
+Qt-free, so the scheduling can be tested against local stand-in servers.
+
+Usage:
+    results = await connect_concurrently(
+        {account_id: account.connect_and_wait for ...},
+        concurrency=4,
+        on_done=lambda account_id, outcome, done, total: ...,
+    )
+"""
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+
+logger = logging.getLogger('siproxylin.account_connect')
+
+# Accounts connecting at the same time (setting 'account_connect_concurrency')
+ACCOUNT_CONNECT_CONCURRENCY = 4
+
+# Seconds an account may hold a slot before the next account starts
+ACCOUNT_CONNECT_TIMEOUT = 30.0
+
+
+async def connect_concurrently(jobs: Dict[int, Callable[[], Awaitable[str]]],
+                               concurrency: int = ACCOUNT_CONNECT_CONCURRENCY,
+                               timeout: float = ACCOUNT_CONNECT_TIMEOUT,
+                               on_done: Optional[Callable[[int, str, int, int], None]] = None) -> Dict[int, str]:
+    """
+    Run account connect jobs with bounded concurrency.
+
+    Args:
+        jobs: {account_id: coroutine function returning the outcome}, started in order
+        concurrency: Jobs running at the same time (at least 1)
+        timeout: Seconds per job before it counts as 'timeout'
+        on_done: Called as (account_id, outcome, done, total) when a job finishes
+
+    Returns:
+        {account_id: outcome}
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    results: Dict[int, str] = {}
+    total = len(jobs)
+
+    async def run(account_id: int, job: Callable[[], Awaitable[str]]):
+        async with semaphore:
+            start = time.monotonic()
+            try:
+                outcome = await asyncio.wait_for(job(), timeout)
+            except asyncio.TimeoutError:
+                outcome = 'timeout'
+            except Exception as e:
+                logger.error(f"Account {account_id} failed to connect: {e}")
+                outcome = 'failed'
+            results[account_id] = outcome
+            logger.info(f"Account {account_id}: {outcome} after {time.monotonic() - start:.2f}s "
+                        f"({len(results)}/{total})")
+        if on_done:
+            try:
+                on_done(account_id, outcome, len(results), total)
+            except Exception as e:
+                logger.error(f"Error in account connect progress callback: {e}")
+
+    await asyncio.gather(*(run(account_id, job) for account_id, job in jobs.items()))
+    return results
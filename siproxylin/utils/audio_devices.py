@@ -3,12 +3,19 @@ Audio Device Detection and Management
 
 Detects available audio input/output devices across platforms.
 Provides hooks for GUI audio settings dialogs.
+
+On Linux, AudioDeviceRegistry enumerates PulseAudio/PipeWire sinks and
+sources once and keeps the list current from `pactl subscribe` hot-plug
+events, so callers read devices from memory instead of spawning pactl.
 """
 
+import asyncio
+import json
 import logging
 import platform
+import re
 import subprocess
-from typing import List, Dict, Optional, Tuple
+from typing import Any, Callable, List, Dict, Optional, Set, Tuple
 
 
 logger = logging.getLogger(__name__)
@@ -17,16 +24,18 @@ logger = logging.getLogger(__name__)
 class AudioDevice:
     """Represents an audio device (microphone or speaker)."""
 
-    def __init__(self, id: str, name: str, is_default: bool = False):
+    def __init__(self, id: str, name: str, is_default: bool = False, device_class: str = ''):
         """
         Args:
             id: Device identifier (used by av/MediaPlayer)
             name: Human-readable name
             is_default: Whether this is the system default device
+            device_class: 'Audio/Source' or 'Audio/Sink' (registry devices only)
         """
         self.id = id
         self.name = name
         self.is_default = is_default
+        self.device_class = device_class
 
     def __repr__(self):
         default_marker = " [DEFAULT]" if self.is_default else ""
@@ -58,6 +67,9 @@ class AudioDeviceManager:
             List of AudioDevice objects
         """
         if self.system == 'Linux':
+            registry = get_audio_device_registry()
+            if registry.loaded:
+                return registry.get_devices('source')
             return self._get_linux_input_devices()
         elif self.system == 'Windows':
             return self._get_windows_input_devices()
@@ -75,6 +87,9 @@ class AudioDeviceManager:
             List of AudioDevice objects
         """
         if self.system == 'Linux':
+            registry = get_audio_device_registry()
+            if registry.loaded:
+                return registry.get_devices('sink')
             return self._get_linux_output_devices()
         elif self.system == 'Windows':
             return self._get_windows_output_devices()
@@ -394,8 +409,271 @@ class AudioDeviceManager:
         return [AudioDevice(':0', 'Default Speakers', is_default=True)]
 
 
+# Event lines of `pactl subscribe`, e.g. "Event 'new' on source #57"
+PACTL_EVENT_RE = re.compile(r"Event '(new|change|remove)' on ([a-z-]+) #(-?\d+)")
+
+# GStreamer-style device classes (same as the call service's ListAudioDevices)
+DEVICE_CLASSES = {'sink': 'Audio/Sink', 'source': 'Audio/Source'}
+
+
+class AudioDeviceRegistry:
+    """
+    In-memory registry of PulseAudio/PipeWire sinks and sources (Linux).
+
+    - start(): subscribe to `pactl subscribe` first, then enumerate once;
+      events arriving during the initial listing are replayed after it, so
+      nothing plugged in meanwhile is missed
+    - 'remove' events drop the device right away; 'new'/'change' events
+      (and card profile changes) re-list only the affected kind, coalesced
+      over REFRESH_DELAY so hot-plug bursts cost one pactl call
+    - Server changes (default sink/source switched) refresh the defaults
+    - Listeners are called after every change
+    """
+
+    REFRESH_DELAY = 0.3  # seconds to coalesce bursts of events
+
+    def __init__(self, pactl: str = 'pactl'):
+        """
+        Args:
+            pactl: pactl executable (overridable for tests)
+        """
+        self.pactl = pactl
+        self.logger = logging.getLogger(__name__)
+        self.loaded = False
+
+        self._devices: Dict[str, Dict[int, AudioDevice]] = {'sink': {}, 'source': {}}
+        self._defaults: Dict[str, Optional[str]] = {'sink': None, 'source': None}
+        self._listeners: List[Callable[[], None]] = []
+        self._pending: Set[str] = set()
+        self._refresh_handle: Optional[asyncio.TimerHandle] = None
+        self._watch_task: Optional[asyncio.Task] = None
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._backlog: Optional[List[str]] = None  # Event lines held back during the initial listing
+
+    # -------------------------------------------------------------------------
+    # Reading (memory only)
+    # -------------------------------------------------------------------------
+
+    def get_devices(self, kind: str) -> List[AudioDevice]:
+        """
+        Get cached devices.
+
+        Args:
+            kind: 'sink' (speakers) or 'source' (microphones)
+
+        Returns:
+            List of AudioDevice objects (in server order)
+        """
+        default = self._defaults[kind]
+        return [
+            AudioDevice(device.id, device.name, device.id == default, device.device_class)
+            for _, device in sorted(self._devices[kind].items())
+        ]
+
+    def list_devices(self) -> List[Dict[str, str]]:
+        """
+        Get cached devices in the call service's ListAudioDevices format.
+
+        Returns:
+            List of dicts with keys: name (device ID), description, device_class
+        """
+        return [
+            {'name': device.id, 'description': device.name, 'device_class': device.device_class}
+            for kind in ('source', 'sink')
+            for device in self.get_devices(kind)
+        ]
+
+    def add_listener(self, callback: Callable[[], None]):
+        """Call callback (no arguments) whenever the device list changes."""
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[], None]):
+        """Remove a listener added with add_listener()."""
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    async def start(self) -> bool:
+        """
+        Enumerate devices and start following hot-plug events.
+
+        Returns:
+            True if devices were enumerated (registry is usable)
+        """
+        if self._watch_task:
+            return self.loaded
+
+        # Subscribe before listing: a device plugged in while we enumerate
+        # must still produce an event
+        try:
+            self._process = await asyncio.create_subprocess_exec(
+                self.pactl, 'subscribe',
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+            )
+        except OSError as e:
+            self.logger.warning(f"Audio device registry unavailable (pactl): {e}")
+            return False
+
+        self._backlog = []
+        self._watch_task = asyncio.ensure_future(self._watch(self._process))
+
+        try:
+            await self.refresh({'sink', 'source', 'server'})
+        except (OSError, RuntimeError, ValueError) as e:
+            self.logger.warning(f"Audio device registry unavailable (pactl): {e}")
+            await self.stop()
+            return False
+
+        # Apply what happened during the listing
+        backlog, self._backlog = self._backlog, None
+        for line in backlog:
+            self._on_event(line)
+        return True
+
+    def shutdown(self):
+        """
+        Stop following events without waiting (application exit).
+
+        Terminates the `pactl subscribe` child right away so it can't
+        outlive the application.
+        """
+        if self._refresh_handle:
+            self._refresh_handle.cancel()
+            self._refresh_handle = None
+        if self._watch_task:
+            self._watch_task.cancel()
+            self._watch_task = None
+        self._backlog = None
+        process, self._process = self._process, None
+        if process and process.returncode is None:
+            try:
+                process.terminate()
+            except ProcessLookupError:
+                pass
+        return process
+
+    async def stop(self):
+        """Stop following events (cached devices stay readable)."""
+        process = self.shutdown()
+        if process:
+            await process.wait()
+
+    async def refresh(self, kinds: Set[str]):
+        """
+        Re-enumerate the given kinds from pactl.
+
+        Args:
+            kinds: Subset of {'sink', 'source', 'server'} ('server' = defaults)
+        """
+        if 'server' in kinds:
+            info = await self._pactl_json('info')
+            self._defaults['sink'] = info.get('default_sink_name')
+            self._defaults['source'] = info.get('default_source_name')
+
+        for kind in ('sink', 'source'):
+            if kind not in kinds:
+                continue
+            devices = {}
+            for item in await self._pactl_json('list', f'{kind}s'):
+                name = item.get('name', '')
+                # Skip monitor sources (loopback from speakers)
+                if kind == 'source' and (item.get('monitor_of_sink') not in (None, 'n/a')
+                                         or name.endswith('.monitor')):
+                    continue
+                devices[item['index']] = AudioDevice(
+                    name, item.get('description') or name, device_class=DEVICE_CLASSES[kind]
+                )
+            self._devices[kind] = devices
+
+        self.loaded = True
+        self.logger.debug(
+            f"Audio devices: {len(self._devices['source'])} sources, "
+            f"{len(self._devices['sink'])} sinks (refreshed: {', '.join(sorted(kinds))})"
+        )
+        self._notify()
+
+    # -------------------------------------------------------------------------
+    # Internals
+    # -------------------------------------------------------------------------
+
+    async def _pactl_json(self, *args: str) -> Any:
+        """Run `pactl -f json ARGS` and return the parsed output."""
+        process = await asyncio.create_subprocess_exec(
+            self.pactl, '-f', 'json', *args,
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL
+        )
+        stdout, _ = await process.communicate()
+        if process.returncode != 0:
+            raise RuntimeError(f"pactl {' '.join(args)} exited with {process.returncode}")
+        return json.loads(stdout.decode() or 'null')
+
+    async def _watch(self, process: asyncio.subprocess.Process):
+        """Follow `pactl subscribe` output until stopped or pactl exits."""
+        try:
+            async for line in process.stdout:
+                line = line.decode(errors='replace')
+                if self._backlog is not None:
+                    self._backlog.append(line)
+                else:
+                    self._on_event(line)
+            self.logger.warning("pactl subscribe exited - audio device list no longer updated")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.logger.error(f"Audio device event stream failed: {e}")
+
+    def _on_event(self, line: str):
+        """Apply one `pactl subscribe` event line."""
+        match = PACTL_EVENT_RE.search(line)
+        if not match:
+            return
+        event, facility, index = match.group(1), match.group(2), int(match.group(3))
+
+        if facility in ('sink', 'source'):
+            if event == 'remove':
+                if self._devices[facility].pop(index, None):
+                    self._notify()
+                return
+            self._schedule_refresh(facility)
+        elif facility == 'server':
+            self._schedule_refresh('server')
+        elif facility == 'card':
+            # Profile switch / hot-plug: the card's sinks and sources change
+            self._schedule_refresh('sink', 'source')
+
+    def _schedule_refresh(self, *kinds: str):
+        """Coalesce refreshes of the given kinds into one after REFRESH_DELAY."""
+        self._pending.update(kinds)
+        if self._refresh_handle is None:
+            loop = asyncio.get_running_loop()
+            self._refresh_handle = loop.call_later(
+                self.REFRESH_DELAY, lambda: asyncio.ensure_future(self._refresh_pending())
+            )
+
+    async def _refresh_pending(self):
+        """Run the coalesced refresh."""
+        self._refresh_handle = None
+        kinds, self._pending = self._pending, set()
+        try:
+            await self.refresh(kinds)
+        except (OSError, RuntimeError, ValueError) as e:
+            self.logger.warning(f"Failed to refresh audio devices: {e}")
+
+    def _notify(self):
+        """Call change listeners."""
+        for callback in list(self._listeners):
+            try:
+                callback()
+            except Exception as e:
+                self.logger.error(f"Audio device listener failed: {e}")
+
+
 # Global singleton
 _audio_device_manager: Optional[AudioDeviceManager] = None
+_audio_device_registry: Optional[AudioDeviceRegistry] = None
 
 
 def get_audio_device_manager() -> AudioDeviceManager:
@@ -404,3 +682,11 @@ def get_audio_device_manager() -> AudioDeviceManager:
     if _audio_device_manager is None:
         _audio_device_manager = AudioDeviceManager()
     return _audio_device_manager
+
+
+def get_audio_device_registry() -> AudioDeviceRegistry:
+    """Get global AudioDeviceRegistry singleton."""
+    global _audio_device_registry
+    if _audio_device_registry is None:
+        _audio_device_registry = AudioDeviceRegistry()
+    return _audio_device_registry
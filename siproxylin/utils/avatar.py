@@ -2,63 +2,105 @@
 Avatar utilities for DRUNK-XMPP-GUI.
 
 Handles loading, rendering, and caching of contact avatars.
+
+Avatar bytes live in the content-addressed AvatarStore; contact_avatar only
+holds the hash. Rendered (scaled, circular) pixmaps are kept in an LRU keyed
+by (account_id, jid, size, hash) under a memory budget. Widgets get avatars
+through AvatarLoader: the initials placeholder right away, the photo via
+avatar_ready once decoded on a worker thread, so they never block on decode.
 """
 
 import logging
-from typing import Optional
-from PySide6.QtGui import QPixmap, QPainter, QBrush, QColor, QPainterPath, QFont
-from PySide6.QtCore import Qt, QRect
+from collections import OrderedDict
+from typing import Optional, Dict, Tuple, Set
+from PySide6.QtGui import QPixmap, QImage, QPainter, QBrush, QColor, QPainterPath, QFont
+from PySide6.QtCore import Qt, QRect, QObject, QRunnable, QThreadPool, Signal
 
 from ..db.database import get_db
+from .avatar_store import get_avatar_store
 
 
 logger = logging.getLogger('siproxylin.avatar')
 
 
-class AvatarCache:
-    """LRU cache for avatar pixmaps to avoid repeated DB queries and rendering."""
-
-    def __init__(self, max_size: int = 100):
-        self._cache = {}  # {(jid, size): QPixmap}
-        self._max_size = max_size
-        self._access_order = []  # Track access order for LRU eviction
-
-    def get(self, jid: str, size: int) -> Optional[QPixmap]:
-        """Get cached avatar pixmap."""
-        key = (jid, size)
-        if key in self._cache:
-            # Move to end (most recently used)
-            self._access_order.remove(key)
-            self._access_order.append(key)
-            return self._cache[key]
-        return None
+# Sentinel: contact hash not looked up yet (None means "no avatar, use initials")
+_UNKNOWN = object()
 
-    def put(self, jid: str, size: int, pixmap: QPixmap):
-        """Store avatar pixmap in cache."""
-        key = (jid, size)
 
-        # Evict oldest if at capacity
-        if len(self._cache) >= self._max_size and key not in self._cache:
-            oldest = self._access_order.pop(0)
-            del self._cache[oldest]
+class AvatarCache:
+    """LRU cache for rendered avatar pixmaps, bounded by memory use."""
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024):
+        """
+        Initialize cache.
+
+        Args:
+            max_bytes: Memory budget for cached pixmaps (estimated at 4 bytes/pixel)
+        """
+        self._cache: OrderedDict = OrderedDict()  # {(account_id, jid, size, hash): QPixmap}
+        self._hashes: Dict[Tuple[int, str], Optional[str]] = {}  # {(account_id, jid): hash or None}
+        self._max_bytes = max_bytes
+        self._bytes = 0
+
+    @staticmethod
+    def _cost(pixmap: QPixmap) -> int:
+        return pixmap.width() * pixmap.height() * 4
+
+    def get(self, account_id: int, jid: str, size: int, avatar_hash: Optional[str]) -> Optional[QPixmap]:
+        """Get cached avatar pixmap (marks it most recently used)."""
+        key = (account_id, jid, size, avatar_hash)
+        pixmap = self._cache.get(key)
+        if pixmap is not None:
+            self._cache.move_to_end(key)
+        return pixmap
+
+    def put(self, account_id: int, jid: str, size: int, avatar_hash: Optional[str], pixmap: QPixmap):
+        """Store avatar pixmap, evicting least recently used entries over budget."""
+        key = (account_id, jid, size, avatar_hash)
+        old = self._cache.pop(key, None)
+        if old is not None:
+            self._bytes -= self._cost(old)
 
         self._cache[key] = pixmap
-        if key in self._access_order:
-            self._access_order.remove(key)
-        self._access_order.append(key)
-
-    def invalidate(self, jid: str):
-        """Invalidate all cached sizes for a JID (when avatar updates)."""
-        keys_to_remove = [k for k in self._cache.keys() if k[0] == jid]
+        self._bytes += self._cost(pixmap)
+
+        while self._bytes > self._max_bytes and len(self._cache) > 1:
+            _, evicted = self._cache.popitem(last=False)
+            self._bytes -= self._cost(evicted)
+
+    def get_hash(self, account_id: int, jid: str):
+        """Get remembered avatar hash for a contact (_UNKNOWN if not looked up)."""
+        return self._hashes.get((account_id, jid), _UNKNOWN)
+
+    def set_hash(self, account_id: int, jid: str, avatar_hash: Optional[str]):
+        """Remember avatar hash for a contact (None = no avatar)."""
+        self._hashes[(account_id, jid)] = avatar_hash
+
+    def invalidate(self, jid: str, account_id: Optional[int] = None):
+        """
+        Invalidate a contact's avatar (when avatar updates).
+
+        Args:
+            jid: Bare JID
+            account_id: Only this account (None = all accounts)
+        """
+        keys_to_remove = [
+            k for k in self._cache
+            if k[1] == jid and (account_id is None or k[0] == account_id)
+        ]
         for key in keys_to_remove:
-            del self._cache[key]
-            self._access_order.remove(key)
+            self._bytes -= self._cost(self._cache.pop(key))
+
+        for key in [k for k in self._hashes if k[1] == jid and (account_id is None or k[0] == account_id)]:
+            del self._hashes[key]
+
         logger.debug(f"Invalidated {len(keys_to_remove)} cached avatars for {jid}")
 
     def clear(self):
         """Clear entire cache."""
         self._cache.clear()
-        self._access_order.clear()
+        self._hashes.clear()
+        self._bytes = 0
 
 
 # Global avatar cache
@@ -70,60 +112,62 @@ def get_avatar_cache() -> AvatarCache:
     return _avatar_cache
 
 
-def load_avatar_from_db(account_id: int, jid: str) -> Optional[bytes]:
+def load_avatar_hash(account_id: int, jid: str) -> Optional[str]:
     """
-    Load avatar data from database for a JID.
+    Load current avatar hash for a JID (prefer PEP type=1, fallback to vCard type=0).
 
     Args:
         account_id: Account ID
         jid: Bare JID of contact
 
     Returns:
-        Avatar data as bytes, or None if not found
+        SHA-1 hex digest, or None if no avatar stored
     """
-    db = get_db()
-
-    # Get jid_id
-    jid_row = db.fetchone("SELECT id FROM jid WHERE bare_jid = ?", (jid,))
-    if not jid_row:
-        return None
+    row = get_db().fetchone("""
+        SELECT a.hash FROM contact_avatar a
+        JOIN jid j ON a.jid_id = j.id
+        WHERE j.bare_jid = ? AND a.account_id = ? AND a.type >= 0
+        ORDER BY a.type DESC
+        LIMIT 1
+    """, (jid, account_id))
+    return row['hash'] if row else None
 
-    jid_id = jid_row['id']
 
-    # Try to get avatar (prefer PEP type=1, fallback to vCard type=0)
-    avatar_row = db.fetchone("""
-        SELECT data FROM contact_avatar
-        WHERE jid_id = ? AND account_id = ?
-        ORDER BY type DESC
-        LIMIT 1
-    """, (jid_id, account_id))
+def load_avatar_from_db(account_id: int, jid: str) -> Optional[bytes]:
+    """
+    Load avatar data for a JID from the avatar store.
 
-    if avatar_row and avatar_row['data']:
-        return avatar_row['data']
+    Args:
+        account_id: Account ID
+        jid: Bare JID of contact
 
-    return None
+    Returns:
+        Avatar data as bytes, or None if not found
+    """
+    avatar_hash = load_avatar_hash(account_id, jid)
+    return get_avatar_store().get(avatar_hash) if avatar_hash else None
 
 
-def create_circular_avatar(pixmap: QPixmap, size: int) -> QPixmap:
+def _circular_image(image: QImage, size: int) -> QImage:
     """
-    Create a circular avatar from a square pixmap.
+    Scale and clip an image to a circle (QImage, safe off the GUI thread).
 
     Args:
-        pixmap: Source pixmap
+        image: Source image
         size: Output size (diameter)
 
     Returns:
-        Circular avatar pixmap
+        Circular ARGB image
     """
-    # Scale pixmap to size while maintaining aspect ratio
-    scaled = pixmap.scaled(
+    # Scale image to size while maintaining aspect ratio
+    scaled = image.scaled(
         size, size,
         Qt.KeepAspectRatioByExpanding,
         Qt.SmoothTransformation
     )
 
     # Create circular mask
-    output = QPixmap(size, size)
+    output = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
     output.fill(Qt.transparent)
 
     painter = QPainter(output)
@@ -140,13 +184,57 @@ def create_circular_avatar(pixmap: QPixmap, size: int) -> QPixmap:
     # Center the image if it's larger than the circle
     x_offset = (scaled.width() - size) // 2
     y_offset = (scaled.height() - size) // 2
-    painter.drawPixmap(-x_offset, -y_offset, scaled)
+    painter.drawImage(-x_offset, -y_offset, scaled)
 
     painter.end()
 
     return output
 
 
+def _decode_avatar(avatar_hash: str, size: int, jid: str) -> Optional[QImage]:
+    """
+    Read avatar bytes from the store and render a circular image.
+
+    Args:
+        avatar_hash: Avatar SHA-1
+        size: Output size (diameter)
+        jid: Contact JID (for logging)
+
+    Returns:
+        Circular image, or None if missing/undecodable
+    """
+    avatar_bytes = get_avatar_store().get(avatar_hash)
+    if not avatar_bytes:
+        logger.warning(f"Avatar file {avatar_hash[:16]}... missing for {jid}")
+        return None
+
+    image = QImage()
+    if not image.loadFromData(avatar_bytes):
+        # loadFromData returns False on failure but doesn't raise exception
+        first_bytes_hex = avatar_bytes[:20].hex()
+        logger.warning(f"Failed to load avatar image for {jid}: "
+                       f"loadFromData returned False (invalid image format?), "
+                       f"data length: {len(avatar_bytes)} bytes, "
+                       f"first 20 bytes (hex): {first_bytes_hex}")
+        return None
+
+    return _circular_image(image, size)
+
+
+def create_circular_avatar(pixmap: QPixmap, size: int) -> QPixmap:
+    """
+    Create a circular avatar from a square pixmap.
+
+    Args:
+        pixmap: Source pixmap
+        size: Output size (diameter)
+
+    Returns:
+        Circular avatar pixmap
+    """
+    return QPixmap.fromImage(_circular_image(pixmap.toImage(), size))
+
+
 def create_initials_avatar(jid: str, size: int, bg_color: Optional[QColor] = None) -> QPixmap:
     """
     Create an avatar with initials from JID.
@@ -197,10 +285,34 @@ def create_initials_avatar(jid: str, size: int, bg_color: Optional[QColor] = Non
     return pixmap
 
 
+def _lookup_hash(account_id: int, jid: str) -> Optional[str]:
+    """Avatar hash for a contact, from cache or DB (remembered until invalidated)."""
+    cache = get_avatar_cache()
+    avatar_hash = cache.get_hash(account_id, jid)
+    if avatar_hash is _UNKNOWN:
+        avatar_hash = load_avatar_hash(account_id, jid)
+        cache.set_hash(account_id, jid, avatar_hash)
+    return avatar_hash
+
+
+def _initials_pixmap(account_id: int, jid: str, size: int) -> QPixmap:
+    """Cached initials avatar."""
+    cache = get_avatar_cache()
+    cached = cache.get(account_id, jid, size, None)
+    if cached is None:
+        cached = create_initials_avatar(jid, size)
+        cache.put(account_id, jid, size, None, cached)
+        logger.debug(f"Created initials avatar for {jid}")
+    return cached
+
+
 def get_avatar_pixmap(account_id: int, jid: str, size: int = 40) -> QPixmap:
     """
     Get avatar pixmap for a JID, with fallback to initials.
-    Uses cache to avoid repeated DB queries and rendering.
+    Uses cache to avoid repeated loading and rendering.
+
+    Decodes synchronously on a cache miss; widgets should use
+    get_avatar_loader().request() instead.
 
     Args:
         account_id: Account ID
@@ -210,40 +322,107 @@ def get_avatar_pixmap(account_id: int, jid: str, size: int = 40) -> QPixmap:
     Returns:
         Avatar pixmap (either from photo or initials)
     """
-    # Check cache first
     cache = get_avatar_cache()
-    cached = cache.get(jid, size)
-    if cached:
-        return cached
+    avatar_hash = _lookup_hash(account_id, jid)
 
-    # Try to load from database
-    avatar_data = load_avatar_from_db(account_id, jid)
+    if avatar_hash:
+        cached = cache.get(account_id, jid, size, avatar_hash)
+        if cached is not None:
+            return cached
 
-    if avatar_data:
         try:
-            # Ensure we have bytes, not memoryview (SQLite BLOB handling)
-            avatar_bytes = bytes(avatar_data) if not isinstance(avatar_data, bytes) else avatar_data
-
-            pixmap = QPixmap()
-            if not pixmap.loadFromData(avatar_bytes):
-                # loadFromData returns False on failure but doesn't raise exception
-                first_bytes_hex = avatar_bytes[:20].hex() if len(avatar_bytes) >= 20 else avatar_bytes.hex()
-                logger.warning(f"Failed to load avatar image for {jid}: "
-                              f"loadFromData returned False (invalid image format?), "
-                              f"data length: {len(avatar_bytes)} bytes, "
-                              f"first 20 bytes (hex): {first_bytes_hex}")
-            else:
-                # Create circular version
-                circular = create_circular_avatar(pixmap, size)
-                cache.put(jid, size, circular)
-                logger.debug(f"Loaded avatar for {jid} from DB ({len(avatar_data)} bytes)")
+            image = _decode_avatar(avatar_hash, size, jid)
+            if image is not None:
+                circular = QPixmap.fromImage(image)
+                cache.put(account_id, jid, size, avatar_hash, circular)
+                logger.debug(f"Loaded avatar for {jid} ({avatar_hash[:16]}...)")
                 return circular
         except Exception as e:
             logger.error(f"Exception loading avatar for {jid}: {e}", exc_info=True)
 
     # Fallback to initials
-    initials_avatar = create_initials_avatar(jid, size)
-    cache.put(jid, size, initials_avatar)
-    logger.debug(f"Created initials avatar for {jid}")
+    return _initials_pixmap(account_id, jid, size)
+
+
+class _DecodeTask(QRunnable):
+    """Decode + clip one avatar on the thread pool."""
+
+    def __init__(self, loader: 'AvatarLoader', key: tuple):
+        super().__init__()
+        self.loader = loader
+        self.key = key
+
+    def run(self):
+        account_id, jid, size, avatar_hash = self.key
+        image = None
+        try:
+            image = _decode_avatar(avatar_hash, size, jid)
+        except Exception as e:
+            logger.error(f"Exception decoding avatar for {jid}: {e}", exc_info=True)
+        # Queued to the GUI thread (QPixmap must be created there)
+        self.loader._decoded.emit(self.key, image)
+
+
+class AvatarLoader(QObject):
+    """
+    Non-blocking avatar access for lists.
+
+    request() returns immediately: the cached avatar if rendered, otherwise the
+    initials placeholder while the photo is decoded in the background.
+    avatar_ready fires once the real avatar is in the cache.
+    """
 
-    return initials_avatar
+    avatar_ready = Signal(int, str, int)  # account_id, jid, size
+    _decoded = Signal(object, object)     # key, QImage or None (worker → GUI thread)
+
+    def __init__(self):
+        super().__init__()
+        self._pending: Set[tuple] = set()
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(2)
+        self._decoded.connect(self._on_decoded)
+
+    def request(self, account_id: int, jid: str, size: int = 40) -> QPixmap:
+        """
+        Get avatar without blocking on decode.
+
+        Args:
+            account_id: Account ID
+            jid: Bare JID
+            size: Avatar size in pixels (diameter)
+
+        Returns:
+            Avatar pixmap, or initials placeholder until avatar_ready fires
+        """
+        avatar_hash = _lookup_hash(account_id, jid)
+        if avatar_hash:
+            cached = get_avatar_cache().get(account_id, jid, size, avatar_hash)
+            if cached is not None:
+                return cached
+
+            key = (account_id, jid, size, avatar_hash)
+            if key not in self._pending:
+                self._pending.add(key)
+                self._pool.start(_DecodeTask(self, key))
+
+        return _initials_pixmap(account_id, jid, size)
+
+    def _on_decoded(self, key: tuple, image: Optional[QImage]):
+        self._pending.discard(key)
+        if image is None:
+            return
+        account_id, jid, size, avatar_hash = key
+        get_avatar_cache().put(account_id, jid, size, avatar_hash, QPixmap.fromImage(image))
+        self.avatar_ready.emit(account_id, jid, size)
+
+
+# Global avatar loader (created on first use, needs QApplication)
+_avatar_loader: Optional[AvatarLoader] = None
+
+
+def get_avatar_loader() -> AvatarLoader:
+    """Get the global non-blocking avatar loader."""
+    global _avatar_loader
+    if _avatar_loader is None:
+        _avatar_loader = AvatarLoader()
+    return _avatar_loader
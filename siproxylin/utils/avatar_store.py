@@ -0,0 +1,145 @@
+"""
+Content-addressed on-disk avatar store for Siproxylin.
+
+Avatar images are stored once per SHA-1 of their bytes, shared by all
+accounts and contacts. The database (contact_avatar.hash) only references
+them by hash.
+
+Layout:
+    <data_dir>/avatars/<first 2 hex chars>/<sha1 hex>
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Iterable
+
+
+logger = logging.getLogger('siproxylin.avatar_store')
+
+
+class AvatarStore:
+    """Deduplicated avatar files keyed by SHA-1."""
+
+    def __init__(self, root: Path):
+        """
+        Initialize avatar store.
+
+        Args:
+            root: Store directory (created on first write)
+        """
+        self.root = root
+
+    @staticmethod
+    def hash_data(data: bytes) -> str:
+        """SHA-1 hex digest used as the storage key (same as XEP-0084/0153 ids)."""
+        return hashlib.sha1(data).hexdigest()
+
+    def path_for(self, avatar_hash: str) -> Path:
+        """
+        File path for a hash (may not exist).
+
+        Args:
+            avatar_hash: SHA-1 hex digest
+
+        Returns:
+            Path inside the store
+        """
+        avatar_hash = avatar_hash.lower()
+        return self.root / avatar_hash[:2] / avatar_hash
+
+    def has(self, avatar_hash: str) -> bool:
+        """Check if an avatar with this hash is stored."""
+        return bool(avatar_hash) and self.path_for(avatar_hash).exists()
+
+    def put(self, data: bytes) -> str:
+        """
+        Store avatar bytes (no-op if already stored).
+
+        Written to a temp file and renamed, so readers never see partial files.
+
+        Args:
+            data: Image bytes
+
+        Returns:
+            SHA-1 hex digest of the data
+        """
+        avatar_hash = self.hash_data(data)
+        path = self.path_for(avatar_hash)
+        if path.exists():
+            return avatar_hash
+
+        path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.chmod(tmp_path, 0o600)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        logger.debug(f"Stored avatar {avatar_hash[:16]}... ({len(data)} bytes)")
+        return avatar_hash
+
+    def get(self, avatar_hash: str) -> Optional[bytes]:
+        """
+        Read avatar bytes.
+
+        Args:
+            avatar_hash: SHA-1 hex digest
+
+        Returns:
+            Image bytes, or None if not stored
+        """
+        if not avatar_hash:
+            return None
+        try:
+            return self.path_for(avatar_hash).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def prune(self, referenced: Iterable[str]) -> int:
+        """
+        Delete avatars no longer referenced by any contact.
+
+        Args:
+            referenced: Hashes still in use
+
+        Returns:
+            Number of files removed
+        """
+        keep = {h.lower() for h in referenced if h}
+        removed = 0
+        if not self.root.exists():
+            return 0
+
+        for path in self.root.glob('*/*'):
+            if path.name.startswith('.tmp-') or path.name in keep:
+                continue
+            try:
+                path.unlink()
+                removed += 1
+            except OSError as e:
+                logger.warning(f"Failed to remove unreferenced avatar {path}: {e}")
+
+        if removed:
+            logger.info(f"Pruned {removed} unreferenced avatar file(s)")
+        return removed
+
+
+# Global avatar store instance
+_avatar_store: Optional[AvatarStore] = None
+
+
+def get_avatar_store() -> AvatarStore:
+    """Get the global avatar store (in the profile data directory)."""
+    global _avatar_store
+    if _avatar_store is None:
+        from .paths import get_paths
+        _avatar_store = AvatarStore(get_paths().data_dir / 'avatars')
+    return _avatar_store
@@ -0,0 +1,252 @@
+"""
+Streaming attachment download for Siproxylin.
+
+Downloads HTTP Upload (XEP-0363) and OMEMO media sharing (XEP-0454,
+aesgcm://) attachments straight to disk:
+- Body is read in chunks (never held in memory as a whole)
+- AES-256-GCM is decrypted incrementally, the auth tag (last 16 bytes of the
+  body) is verified at the end
+- Decryption and file writes run in a thread executor, not on the event loop
+- Data goes to '<dest>.part' and is renamed to <dest> only once complete
+- An existing '.part' file is resumed with an HTTP Range request
+
+Usage:
+    download_url, key, iv = parse_attachment_url(file_url)
+    async with aiohttp.ClientSession() as session:
+        size = await download_to_file(session, download_url, dest, key, iv,
+                                      progress=lambda done, total: ...)
+"""
+
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import Optional, Tuple, Callable
+
+import aiohttp
+
+
+logger = logging.getLogger('siproxylin.file_download')
+
+CHUNK_SIZE = 256 * 1024
+GCM_TAG_SIZE = 16
+MAX_ATTEMPTS = 3
+RETRY_DELAY = 1.0  # seconds, multiplied by the attempt number
+
+
+class DownloadError(Exception):
+    """Download failed (HTTP error, truncated body or failed authentication)."""
+
+
+def parse_attachment_url(file_url: str) -> Tuple[str, Optional[bytes], Optional[bytes]]:
+    """
+    Split an attachment URL into download URL and OMEMO key material.
+
+    aesgcm://host/path#<iv hex><key hex> is fetched over https://, the
+    fragment (24 hex IV + 64 hex key = 88 chars, XEP-0454) is never sent.
+
+    Args:
+        file_url: http(s):// or aesgcm:// URL
+
+    Returns:
+        Tuple (download_url, key, iv) - key/iv are None for plain URLs
+
+    Raises:
+        ValueError: Malformed aesgcm:// fragment
+    """
+    if not file_url.startswith('aesgcm://'):
+        return file_url, None, None
+
+    url_parts = file_url[len('aesgcm://'):]
+    http_part, _, fragment = url_parts.partition('#')
+    download_url = f'https://{http_part}'
+    if not fragment:
+        return download_url, None, None
+
+    if len(fragment) != 88:
+        raise ValueError(f"Invalid fragment length: {len(fragment)} (expected 88)")
+
+    iv = bytes.fromhex(fragment[:24])    # 12 bytes
+    key = bytes.fromhex(fragment[24:])   # 32 bytes
+    return download_url, key, iv
+
+
+def part_path(dest: Path) -> Path:
+    """Temporary path a download is written to before the final rename."""
+    return dest.with_name(dest.name + '.part')
+
+
+class _PartWriter:
+    """
+    Blocking half of a download (runs in the executor).
+
+    Appends (decrypted) chunks to the .part file. For encrypted downloads the
+    last GCM_TAG_SIZE bytes seen are held back, since they may be the tag.
+    Held back bytes are never written, so the .part size is always the exact
+    offset to resume from.
+    """
+
+    def __init__(self, path: Path, offset: int, key: Optional[bytes], iv: Optional[bytes]):
+        self.path = path
+        self.written = offset
+        self.tail = b''
+        self.decryptor = None
+
+        if key is not None:
+            from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+            cipher = Cipher(algorithms.AES(key), modes.GCM(iv))
+            self.decryptor = cipher.decryptor()
+            if offset:
+                # GCM is CTR mode: re-encrypting the plaintext we already have
+                # yields the original ciphertext, which brings the GHASH state
+                # up to date without downloading it again
+                encryptor = cipher.encryptor()
+                with open(path, 'rb') as f:
+                    remaining = offset
+                    while remaining:
+                        plain = f.read(min(CHUNK_SIZE, remaining))
+                        if not plain:
+                            raise DownloadError("Partial file shorter than expected")
+                        remaining -= len(plain)
+                        self.decryptor.update(encryptor.update(plain))
+
+        flags = os.O_WRONLY | os.O_CREAT | (os.O_APPEND if offset else os.O_TRUNC)
+        self.file = os.fdopen(os.open(path, flags, 0o600), 'wb')
+
+    def write(self, chunk: bytes):
+        """Decrypt (if needed) and append a chunk."""
+        if self.decryptor is not None:
+            data = self.tail + chunk
+            self.tail = data[-GCM_TAG_SIZE:]
+            chunk = self.decryptor.update(data[:-GCM_TAG_SIZE])
+        self.file.write(chunk)
+        self.written += len(chunk)
+
+    def finish(self) -> int:
+        """
+        Verify the GCM tag and close the file.
+
+        Returns:
+            Plaintext size in bytes
+
+        Raises:
+            DownloadError: Body too short to contain a tag
+            cryptography.exceptions.InvalidTag: Authentication failed
+        """
+        try:
+            if self.decryptor is not None:
+                if len(self.tail) != GCM_TAG_SIZE:
+                    raise DownloadError("Encrypted file is missing its authentication tag")
+                last = self.decryptor.finalize_with_tag(self.tail)
+                self.file.write(last)
+                self.written += len(last)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+        finally:
+            self.file.close()
+        return self.written
+
+    def close(self):
+        """Close without finishing (keeps the .part file for resume)."""
+        self.file.close()
+
+
+async def download_to_file(session: aiohttp.ClientSession, url: str, dest: Path,
+                           key: Optional[bytes] = None, iv: Optional[bytes] = None,
+                           progress: Optional[Callable[[int, Optional[int]], None]] = None,
+                           chunk_size: int = CHUNK_SIZE,
+                           max_attempts: int = MAX_ATTEMPTS) -> int:
+    """
+    Download (and decrypt) a file to disk.
+
+    Network errors are retried up to max_attempts times, resuming from the
+    .part file via HTTP Range. A .part file left over from an earlier run is
+    resumed the same way. Servers that ignore Range (200 instead of 206) get
+    a fresh download.
+
+    Args:
+        session: aiohttp session
+        url: http(s) URL to fetch
+        dest: Final file path (written atomically)
+        key: AES-256-GCM key (None = plain download)
+        iv: GCM IV
+        progress: Called with (bytes_written, total_bytes or None) after each chunk
+        chunk_size: Read size in bytes
+        max_attempts: Network attempts before giving up
+
+    Returns:
+        Size of the downloaded (decrypted) file in bytes
+
+    Raises:
+        DownloadError: HTTP error, network errors exhausted, or bad auth tag
+    """
+    loop = asyncio.get_running_loop()
+    part = part_path(dest)
+    attempt = 0
+
+    while True:
+        attempt += 1
+        offset = part.stat().st_size if part.exists() else 0
+        headers = {'Range': f'bytes={offset}-'} if offset else None
+        writer = None
+
+        try:
+            async with session.get(url, headers=headers) as response:
+                if response.status == 416 and offset:
+                    # Our .part doesn't match the server's file any more
+                    logger.warning(f"Range not satisfiable for {dest.name}, restarting download")
+                    await loop.run_in_executor(None, part.unlink)
+                    attempt -= 1
+                    continue
+                if response.status == 200:
+                    offset = 0
+                elif response.status != 206 or not offset:
+                    raise DownloadError(f"HTTP {response.status}")
+
+                total = None
+                if response.content_length is not None:
+                    total = offset + response.content_length
+                    if key is not None:
+                        total -= GCM_TAG_SIZE
+
+                if offset:
+                    logger.info(f"Resuming {dest.name} at {offset} bytes")
+
+                writer = await loop.run_in_executor(None, _PartWriter, part, offset, key, iv)
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    await loop.run_in_executor(None, writer.write, chunk)
+                    if progress:
+                        progress(writer.written, total)
+
+                size = await loop.run_in_executor(None, writer.finish)
+                writer = None
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if writer is not None:
+                await loop.run_in_executor(None, writer.close)
+            if attempt >= max_attempts:
+                raise DownloadError(f"Download failed after {attempt} attempts: {e}") from e
+            logger.warning(f"Download of {dest.name} interrupted ({e}), retrying")
+            await asyncio.sleep(RETRY_DELAY * attempt)
+            continue
+
+        except DownloadError:
+            if writer is not None:
+                await loop.run_in_executor(None, writer.close)
+            raise
+
+        except asyncio.CancelledError:
+            if writer is not None:
+                writer.close()
+            raise
+
+        except Exception as e:
+            # Authentication failure (InvalidTag): partial plaintext is garbage
+            if writer is not None:
+                writer.close()
+            if part.exists():
+                part.unlink()
+            raise DownloadError(f"Decryption failed: {type(e).__name__}") from e
+
+        os.replace(part, dest)
+        return size
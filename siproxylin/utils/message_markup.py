@@ -0,0 +1,193 @@
+"""
+Message body → HTML rendering (XEP-0393 Message Styling + links).
+
+Used by MessageBubbleDelegate. The rendered HTML does not depend on theme or
+bubble direction: links carry a URL_COLOR placeholder that apply_url_color()
+replaces at paint time, so the output can be stored once per message
+(message_html table) and reused across themes, refreshes and restarts.
+
+Bump RENDERER_VERSION whenever the output changes; stored HTML of older
+versions is then ignored and re-rendered.
+
+Usage:
+    html = render_body_html(body)                 # store this
+    doc.setHtml(apply_url_color(html, '#4ea1f3'))
+"""
+
+import re
+from html import escape
+
+
+# Version of render_body_html() output (stored alongside the HTML)
+RENDERER_VERSION = 1
+
+# Stands in for the link color until paint time (Unicode private use area)
+URL_COLOR = '\uE002'
+
+# URL detection regex pattern
+# Matches http://, https://, and www. URLs
+URL_PATTERN = re.compile(
+    r'(?i)\b(?:'
+    r'(?:https?://)'  # http:// or https://
+    r'|(?:www\.)'     # or www.
+    r')'
+    r'(?:[a-z0-9][-a-z0-9]*[a-z0-9]\.)*'  # subdomains
+    r'[a-z][-a-z0-9]*[a-z0-9]'            # domain
+    r'(?:\.[a-z]{2,})?'                    # TLD
+    r'(?::[0-9]{1,5})?'                    # optional port
+    r'(?:[/?#][^\s]*)?',                   # path/query/fragment
+    re.IGNORECASE
+)
+
+# Match ```optional_language\ncode\n``` or ```code...```
+# - ```language (optional, only letters/numbers, no spaces)
+# - Followed by either newline OR any content
+# - Captures everything until closing ```
+# - Content can start on same line or next line
+_CODE_BLOCK = re.compile(r'```(?:([a-zA-Z0-9]+)\n|\n?)(.+?)```', re.DOTALL)
+
+# XEP-0393 spans: (^|\s)MARKER(\S|\S.*?\S)MARKER
+_MONOSPACE = re.compile(r'(^|\s)(`)((?:\S|\S.*?\S))\2')
+_BOLD = re.compile(r'(^|\s)(\*)((?:\S|\S.*?\S))\2')
+_ITALIC = re.compile(r'(^|\s)(_)((?:\S|\S.*?\S))\2')
+_STRIKE = re.compile(r'(^|\s)(~)((?:\S|\S.*?\S))\2')
+
+# Code spans/blocks are kept out of URL detection
+_CODE_SPLIT = re.compile(r'(<code[^>]*>.*?</code>|<table[^>]*>.*?</table>)', re.DOTALL)
+
+
+def _save_code_block(match, code_blocks):
+    """Replace a code block with a placeholder and save its HTML."""
+    lang = match.group(1) if match.group(1) else ''
+    code = match.group(2)
+
+    # Escape HTML in code content
+    escaped_code = escape(code)
+
+    # Create styled code block with language hint if present
+    # Using <small> for font size since QTextDocument doesn't respect font-size CSS well
+    # Using table to limit width (QTextDocument doesn't respect inline-block well)
+    lang_label = f'<small><small><span style="color: rgba(127,127,127,0.6);">{escape(lang)}</span></small></small><br />' if lang else ''
+
+    # Preserve whitespace (spaces, tabs) and newlines:
+    # - Replace tabs with 4 non-breaking spaces (standard tab width)
+    # - Replace spaces with non-breaking spaces to preserve indentation
+    # - Replace newlines with <br />
+    code_with_br = (escaped_code
+        .replace('\t', '&nbsp;&nbsp;&nbsp;&nbsp;')  # Tab = 4 spaces
+        .replace(' ', '&nbsp;')                      # Preserve spaces
+        .replace('\n', '<br />')                     # Newlines
+    )
+
+    block_html = (
+        f'<small><table cellpadding="0" cellspacing="0" style="margin: 4px 0;"><tr><td style="'
+        f'font-family: monospace; '
+        f'background-color: rgba(127,127,127,0.2); '
+        f'padding: 8px; border-radius: 4px; '
+        f'border-left: 3px solid rgba(127,127,127,0.4);">'
+        f'{lang_label}'
+        f'{code_with_br}'
+        f'</td></tr></table></small>'
+    )
+
+    # Use a placeholder that won't be affected by HTML escaping
+    # Using Unicode private use area characters to ensure uniqueness
+    placeholder = f'\uE000CODEBLOCK{len(code_blocks)}\uE001'
+    code_blocks.append(block_html)
+    return placeholder
+
+
+def _link_urls(part):
+    """Convert URLs in an HTML-escaped, non-code text section to anchors."""
+    urls = list(URL_PATTERN.finditer(part))
+    if not urls:
+        return part
+
+    url_result = []
+    last_end = 0
+    for match in urls:
+        start, end = match.span()
+        url = match.group(0)
+
+        # Add text before URL
+        if start > last_end:
+            url_result.append(part[last_end:start])
+
+        # Add URL as anchor
+        href = url if url.startswith(('http://', 'https://')) else f'http://{url}'
+        url_result.append(f'<a href="{href}" style="color: {URL_COLOR};">{url}</a>')
+
+        last_end = end
+
+    # Add remaining text
+    if last_end < len(part):
+        url_result.append(part[last_end:])
+
+    return ''.join(url_result)
+
+
+def render_body_html(text: str) -> str:
+    """
+    Convert plain text to HTML with URL links and XEP-0393 formatting.
+
+    This function:
+    1. Escapes HTML in plain text
+    2. Applies XEP-0393 formatting (*bold*, _italic_, ~strike~, `code`, ```blocks```)
+    3. Converts URLs to clickable links (color left as URL_COLOR)
+    4. Converts newlines to <br />
+
+    Args:
+        text: Plain text with XEP-0393 formatting and possible URLs
+
+    Returns:
+        HTML string ready for apply_url_color()
+    """
+    # Step 1: Process multi-line code blocks FIRST (before escaping)
+    # This must be done before escaping to preserve newlines and avoid conflicts with inline `code`
+    code_blocks = []
+    text = _CODE_BLOCK.sub(lambda match: _save_code_block(match, code_blocks), text)
+
+    # Step 2: Escape HTML entities (after extracting code blocks)
+    escaped = escape(text)
+
+    # Step 3: Apply XEP-0393 inline formatting
+    # Process in order - monospace first to protect code from URL detection
+
+    # Monospace `code` - with background and smaller font
+    # Using <small> tag which QTextDocument respects better than font-size CSS
+    escaped = _MONOSPACE.sub(
+        r'\1<small><code style="font-family: monospace; background-color: rgba(127,127,127,0.2); padding: 2px 4px; border-radius: 3px;">\3</code></small>',
+        escaped
+    )
+    escaped = _BOLD.sub(r'\1<b>\3</b>', escaped)
+    escaped = _ITALIC.sub(r'\1<i>\3</i>', escaped)
+    escaped = _STRIKE.sub(r'\1<s>\3</s>', escaped)
+
+    # Step 4: Restore code blocks (they're already HTML, don't process further)
+    for i, block_html in enumerate(code_blocks):
+        escaped = escaped.replace(f'\uE000CODEBLOCK{i}\uE001', block_html)
+
+    # Step 5: Convert URLs to anchors (but NOT inside <code> or <table> tags)
+    parts = _CODE_SPLIT.split(escaped)
+    result = [
+        part if part.startswith('<code') or part.startswith('<table') else _link_urls(part)
+        for part in parts
+    ]
+
+    # Step 6: Convert newlines to <br /> (only in non-code-block text)
+    # Code blocks preserve their newlines as actual newlines, not <br />
+    return ''.join(result).replace('\n', '<br />')
+
+
+def apply_url_color(html: str, color: str) -> str:
+    """
+    Fill in the link color of rendered HTML.
+
+    Args:
+        html: Output of render_body_html()
+        color: CSS color (e.g. QColor.name())
+
+    Returns:
+        HTML string ready for QTextDocument
+    """
+    return html.replace(URL_COLOR, color)
@@ -0,0 +1,208 @@
+"""
+Spell check verdict cache for Siproxylin.
+
+EnchantHighlighter re-highlights a block on every keystroke, and a pasted
+draft can hold thousands of words. Verdicts are cached per dictionary
+(language), so a word is passed to enchant once; SpellChecker checks at most
+a budget of unknown words per event-loop tick and queues the rest, which the
+highlighter resolves on the following ticks before re-highlighting.
+
+Qt-free, so the tokenizer/cache/budget logic can be tested and benchmarked
+without a GUI.
+
+Usage:
+    checker = SpellChecker(enchant.Dict('en_US'), get_spell_cache('en_US'))
+    misspelled = checker.misspellings(text)   # [(start, length, word), ...]
+    if checker.pending:
+        found = checker.next_tick()           # on the next loop iteration
+"""
+
+import logging
+import re
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+logger = logging.getLogger('siproxylin.spell_cache')
+
+# Words: letters + apostrophes for contractions (matches chat input well enough)
+WORD_PATTERN = re.compile(r"\b[a-zA-Z']+\b")
+
+# Cached verdicts per dictionary (LRU beyond this)
+SPELL_CACHE_SIZE = 20000
+
+# Unknown words passed to enchant per event-loop tick (None = no limit)
+SPELL_CHECK_BUDGET = 200
+
+
+def iter_words(text: str) -> Iterator[Tuple[int, int, str]]:
+    """
+    Split text into checkable words.
+
+    Args:
+        text: Block text
+
+    Yields:
+        (start_pos, length, word) tuples; single letters are skipped
+    """
+    for match in WORD_PATTERN.finditer(text):
+        word = match.group()
+        if len(word) > 1:
+            yield match.start(), len(word), word
+
+
+class SpellCache:
+    """Bounded word → verdict (True = correct) cache for one dictionary."""
+
+    def __init__(self, max_size: int = SPELL_CACHE_SIZE):
+        """
+        Initialize cache.
+
+        Args:
+            max_size: Verdicts kept before the least recently used are dropped
+        """
+        self.max_size = max_size
+        self._verdicts: 'OrderedDict[str, bool]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, word: str) -> Optional[bool]:
+        """
+        Get cached verdict.
+
+        Args:
+            word: Word as typed (case-sensitive, like enchant)
+
+        Returns:
+            True/False, or None if the word was not checked yet
+        """
+        verdict = self._verdicts.get(word)
+        if verdict is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._verdicts.move_to_end(word)
+        return verdict
+
+    def put(self, word: str, correct: bool):
+        """Store a verdict (evicting the least recently used beyond max_size)."""
+        self._verdicts[word] = correct
+        self._verdicts.move_to_end(word)
+        if len(self._verdicts) > self.max_size:
+            self._verdicts.popitem(last=False)
+
+    def clear(self):
+        """Drop all verdicts (dictionary contents changed)."""
+        self._verdicts.clear()
+
+    def __len__(self) -> int:
+        return len(self._verdicts)
+
+
+class SpellChecker:
+    """
+    Cached, budgeted misspelling finder for one dictionary.
+
+    Words without a cached verdict cost one dictionary.check() each, up to
+    the budget per tick; the rest are queued in `pending` and reported as
+    correct until next_tick() resolves them.
+    """
+
+    def __init__(self, dictionary, cache: Optional[SpellCache] = None,
+                 budget: Optional[int] = SPELL_CHECK_BUDGET):
+        """
+        Initialize checker.
+
+        Args:
+            dictionary: Object with check(word) -> bool (enchant.Dict)
+            cache: Verdict cache for this dictionary (default: private cache)
+            budget: Unknown words checked per tick (None = check everything)
+        """
+        self.dictionary = dictionary
+        self.cache = cache if cache is not None else SpellCache()
+        self.budget = budget
+        self.pending: Dict[str, None] = {}  # Insertion-ordered set
+        self.checked = 0  # dictionary.check() calls (for benchmarks)
+        self._remaining = budget
+
+    @property
+    def needs_tick(self) -> bool:
+        """True if words are queued or the tick budget was used."""
+        return bool(self.pending) or self._remaining != self.budget
+
+    def misspellings(self, text: str) -> List[Tuple[int, int, str]]:
+        """
+        Find misspelled words in a text block.
+
+        Args:
+            text: Block text
+
+        Returns:
+            List of (start_pos, length, word) for misspelled words
+        """
+        misspelled = []
+        for start_pos, length, word in iter_words(text):
+            correct = self.cache.get(word)
+            if correct is None:
+                if self._remaining is not None and self._remaining <= 0:
+                    self.pending[word] = None
+                    continue
+                correct = self._check(word)
+            if not correct:
+                misspelled.append((start_pos, length, word))
+        return misspelled
+
+    def next_tick(self) -> List[str]:
+        """
+        Start a new tick: reset the budget and resolve queued words.
+
+        Returns:
+            Queued words that turned out to be misspelled (caller re-highlights)
+        """
+        self._remaining = self.budget
+        found = []
+        while self.pending and (self._remaining is None or self._remaining > 0):
+            word = next(iter(self.pending))
+            del self.pending[word]
+            if self.cache.get(word) is None and not self._check(word):
+                found.append(word)
+        return found
+
+    def add_word(self, word: str):
+        """Mark a word correct after it was added to the personal dictionary."""
+        self.pending.pop(word, None)
+        self.cache.put(word, True)
+
+    def _check(self, word: str) -> bool:
+        """Ask the dictionary (one budget unit) and cache the verdict."""
+        if self._remaining is not None:
+            self._remaining -= 1
+        self.checked += 1
+        try:
+            correct = bool(self.dictionary.check(word))
+        except Exception as e:
+            # Ignore errors for individual words
+            logger.debug(f"Error checking word '{word}': {e}")
+            correct = True
+        self.cache.put(word, correct)
+        return correct
+
+
+# Verdict caches shared by all highlighters, per dictionary language
+_caches: Dict[str, SpellCache] = {}
+
+
+def get_spell_cache(language: str) -> SpellCache:
+    """
+    Get the shared verdict cache for a dictionary language.
+
+    Args:
+        language: Language code (e.g., 'en_US')
+
+    Returns:
+        SpellCache instance
+    """
+    cache = _caches.get(language)
+    if cache is None:
+        cache = _caches[language] = SpellCache()
+    return cache
@@ -0,0 +1,117 @@
+"""
+Startup profiler for Siproxylin.
+
+Records named startup phases (imports, database, main window, first paint,
+accounts, background services) as offsets from process start. The timeline
+is always logged at DEBUG; with --profile-startup it is logged at INFO and
+printed to stderr.
+
+Usage:
+    profiler = get_startup_profiler()
+    profiler.mark('database')
+    ...
+    profiler.report()
+"""
+
+import logging
+import sys
+import time
+from typing import List, Optional, Tuple
+
+
+logger = logging.getLogger('siproxylin.startup')
+
+
+class StartupProfiler:
+    """Collects startup phase timestamps and formats them as a timeline."""
+
+    def __init__(self, start: Optional[float] = None):
+        """
+        Initialize profiler.
+
+        Args:
+            start: time.perf_counter() value of process start (default: now)
+        """
+        self.start = start if start is not None else time.perf_counter()
+        self.enabled = False
+        self.phases: List[Tuple[str, float]] = []
+        self._reported = False
+
+    def enable(self, start: Optional[float] = None):
+        """
+        Turn on timeline output (--profile-startup).
+
+        Args:
+            start: Optional earlier process start to measure from
+        """
+        self.enabled = True
+        if start is not None:
+            self.start = start
+
+    def mark(self, phase: str) -> float:
+        """
+        Record the end of a startup phase.
+
+        Args:
+            phase: Phase name
+
+        Returns:
+            Seconds since process start
+        """
+        elapsed = time.perf_counter() - self.start
+        self.phases.append((phase, elapsed))
+        return elapsed
+
+    def elapsed(self, phase: str) -> Optional[float]:
+        """
+        Get the offset of a recorded phase.
+
+        Args:
+            phase: Phase name
+
+        Returns:
+            Seconds since process start, or None if not recorded
+        """
+        for name, elapsed in self.phases:
+            if name == phase:
+                return elapsed
+        return None
+
+    def timeline(self) -> str:
+        """Format recorded phases: offset from start, duration, name."""
+        lines = []
+        previous = 0.0
+        for name, elapsed in self.phases:
+            lines.append(f"  {elapsed * 1000:8.1f} ms  (+{(elapsed - previous) * 1000:7.1f} ms)  {name}")
+            previous = elapsed
+        return '\n'.join(lines)
+
+    def report(self):
+        """Log the timeline (once; INFO + stderr if enabled, DEBUG otherwise)."""
+        if self._reported or not self.phases:
+            return
+        self._reported = True
+
+        text = f"Startup timeline:\n{self.timeline()}"
+        if self.enabled:
+            logger.info(text)
+            print(text, file=sys.stderr)
+        else:
+            logger.debug(text)
+
+
+# Global singleton instance
+_startup_profiler: Optional[StartupProfiler] = None
+
+
+def get_startup_profiler() -> StartupProfiler:
+    """
+    Get the global startup profiler instance.
+
+    Returns:
+        StartupProfiler singleton
+    """
+    global _startup_profiler
+    if _startup_profiler is None:
+        _startup_profiler = StartupProfiler()
+    return _startup_profiler
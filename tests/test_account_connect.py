@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Unit tests for concurrent account bring-up (siproxylin/utils/account_connect.py
+and DrunkXMPP.wait_for_session), against local stand-in XMPP servers with
+injected handshake latency.
+
+Run with: pytest tests/test_account_connect.py -v -s
+"""
+
+import re
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from drunk_xmpp import DrunkXMPP
+from siproxylin.utils.account_connect import connect_concurrently
+
+
+STREAM = ("<?xml version='1.0'?><stream:stream xmlns='jabber:client' "
+          "xmlns:stream='http://etherx.jabber.org/streams' from='example.org' id='s1' version='1.0'>")
+SASL = "urn:ietf:params:xml:ns:xmpp-sasl"
+BIND = "urn:ietf:params:xml:ns:xmpp-bind"
+
+
+async def fake_server(latency, dead=False):
+    """
+    Minimal plaintext XMPP server: PLAIN auth succeeds, bind returns me@example.org/r.
+
+    Args:
+        latency: Seconds before the server answers the first stream header
+        dead: Accept the connection but never answer
+
+    Returns:
+        (server, port)
+    """
+    async def handle(reader, writer):
+        buf, stage = '', 0
+        try:
+            await asyncio.sleep(latency)
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                if dead:
+                    continue
+                buf += data.decode(errors='replace')
+                if stage in (0, 2) and '<stream:stream' in buf:
+                    if stage == 0:
+                        features = f"<mechanisms xmlns='{SASL}'><mechanism>PLAIN</mechanism></mechanisms>"
+                    else:
+                        features = f"<bind xmlns='{BIND}'/>"
+                    writer.write(f"{STREAM}<stream:features>{features}</stream:features>".encode())
+                    buf, stage = '', stage + 1
+                elif stage == 1 and '<auth' in buf and ('</auth>' in buf or '/>' in buf):
+                    writer.write(f"<success xmlns='{SASL}'/>".encode())
+                    buf, stage = '', 2
+                elif stage == 3 and '<bind' in buf and '</iq>' in buf:
+                    iq_id = re.search(r"id=['\"]([^'\"]+)", buf).group(1)
+                    writer.write(f"<iq type='result' id='{iq_id}'><bind xmlns='{BIND}'>"
+                                 f"<jid>me@example.org/r</jid></bind></iq>".encode())
+                    buf, stage = '', 4
+                await writer.drain()
+        except (asyncio.CancelledError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, '127.0.0.1', 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+def account_job(port, clients, timeout=10.0):
+    """Connect job for one account, as XMPPAccount.connect_and_wait() runs it."""
+    async def connect_and_wait():
+        client = DrunkXMPP('me@example.org/r', 'secret', rooms={}, enable_omemo=False, sasl_mech='PLAIN')
+        client.enable_direct_tls = False
+        client.enable_starttls = False
+        client.enable_plaintext = True
+        clients.append(client)
+        client.connect(('127.0.0.1', port))
+        client.plugin['feature_mechanisms'].config['unencrypted_plain'] = True
+        return await client.wait_for_session(timeout)
+    return connect_and_wait
+
+
+async def bring_up(servers, concurrency, timeout=10.0):
+    """Connect one account per (latency, dead) server; returns (results, seconds, progress)."""
+    started = [await fake_server(latency, dead) for latency, dead in servers]
+    clients, progress = [], []
+    jobs = {account_id: account_job(port, clients) for account_id, (_, port) in enumerate(started, 1)}
+
+    start = time.perf_counter()
+    results = await connect_concurrently(
+        jobs, concurrency=concurrency, timeout=timeout,
+        on_done=lambda account_id, outcome, done, total: progress.append(
+            (account_id, outcome, done, total, time.perf_counter() - start)))
+    elapsed = time.perf_counter() - start
+
+    for client in clients:
+        client.abort()
+    for server, _ in started:
+        server.close()
+    await asyncio.sleep(0.05)
+    return results, elapsed, progress
+
+
+def test_startup_time_follows_slowest_account():
+    """Benchmark: 4 accounts with 0.2-0.8 s handshake latency, in parallel vs one at a time."""
+    latencies = [0.2, 0.4, 0.6, 0.8]
+    servers = [(latency, False) for latency in latencies]
+
+    results, parallel_s, _ = asyncio.run(bring_up(servers, concurrency=4))
+    serial_results, serial_s, _ = asyncio.run(bring_up(servers, concurrency=1))
+
+    print(f"\n4 accounts ({'/'.join(map(str, latencies))} s latency): concurrent {parallel_s:.2f} s, "
+          f"sequential {serial_s:.2f} s (sum of latencies {sum(latencies):.1f} s)")
+
+    assert results == serial_results == {1: 'connected', 2: 'connected', 3: 'connected', 4: 'connected'}
+    assert max(latencies) <= parallel_s < max(latencies) + 0.8
+    assert parallel_s < serial_s * 0.6
+    assert serial_s >= sum(latencies)
+
+
+def test_dead_server_does_not_hold_back_other_accounts():
+    """Test an unresponsive server times out on its own while the other accounts come up."""
+    servers = [(0.0, True), (0.1, False), (0.2, False)]
+
+    results, elapsed, progress = asyncio.run(bring_up(servers, concurrency=2, timeout=1.0))
+
+    assert results == {1: 'timeout', 2: 'connected', 3: 'connected'}
+    assert [(account_id, done) for account_id, _, done, _, _ in progress] == [(2, 1), (3, 2), (1, 3)]
+    assert all(total == 3 for _, _, _, total, _ in progress)
+    assert progress[1][4] < 1.0 <= elapsed < 1.5
+
+
+def test_failing_job_is_isolated_and_concurrency_is_bounded():
+    """Test a job that raises only fails its own account and at most `concurrency` jobs run at once."""
+    running = {'now': 0, 'peak': 0}
+
+    def job(outcome):
+        async def run():
+            running['now'] += 1
+            running['peak'] = max(running['peak'], running['now'])
+            await asyncio.sleep(0.01)
+            running['now'] -= 1
+            if outcome == 'raise':
+                raise RuntimeError("proxy refused")
+            return outcome
+        return run
+
+    jobs = {i: job('raise' if i == 3 else 'connected') for i in range(1, 11)}
+    results = asyncio.run(connect_concurrently(jobs, concurrency=3))
+
+    assert results[3] == 'failed'
+    assert all(results[i] == 'connected' for i in jobs if i != 3)
+    assert running['peak'] == 3
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Unit tests for AudioDeviceRegistry - cached PulseAudio/PipeWire devices
+updated from `pactl subscribe` events.
+
+Uses a fake pactl script that serves device lists from a JSON state file
+and replays a scripted event stream. Like the real pactl, `subscribe` only
+reports a plug-in that happens after it started (see plug_during_listing()).
+
+Run with: pytest tests/test_audio_device_registry.py -v
+"""
+
+import sys
+import json
+import signal
+import asyncio
+import textwrap
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from siproxylin.utils.audio_devices import AudioDeviceRegistry
+
+
+FAKE_PACTL = textwrap.dedent('''\
+    #!{python}
+    import json, sys, time
+    from pathlib import Path
+
+    base = Path(__file__).parent
+    args = sys.argv[1:]
+    with open(base / 'calls.log', 'a') as log:
+        log.write(' '.join(args) + '\\n')
+
+    if args == ['subscribe']:
+        started = time.time()
+        for line in (base / 'events.txt').read_text().splitlines():
+            if line.startswith('sleep '):
+                time.sleep(float(line.split()[1]))
+            elif line.startswith('state '):
+                (base / 'state.json').write_text(line[len('state '):])
+            else:
+                print(line, flush=True)
+        for _ in range(600):
+            plugged = base / 'plugged'
+            if plugged.exists():
+                plugged_at, event = plugged.read_text().split('\\n', 1)
+                if float(plugged_at) >= started:
+                    print(event, flush=True)
+                break
+            time.sleep(0.01)
+        time.sleep(60)
+        sys.exit(0)
+
+    state = json.loads((base / 'state.json').read_text())
+    if args == ['-f', 'json', 'info']:
+        print(json.dumps(state['info']))
+    elif args[:3] == ['-f', 'json', 'list']:
+        print(json.dumps(state[args[3]]), flush=True)
+        plug = base / ('plug-' + args[3] + '.json')
+        if plug.exists():
+            new_state, event = json.loads(plug.read_text())
+            plug.unlink()
+            time.sleep(0.2)
+            (base / 'state.json').write_text(new_state)
+            (base / 'plugged').write_text(str(time.time()) + '\\n' + event)
+    else:
+        sys.exit(1)
+''')
+
+
+def device(index, name, description):
+    return {'index': index, 'name': name, 'description': description}
+
+
+def state(sinks, sources, default_sink='speakers', default_source='mic'):
+    return json.dumps({
+        'info': {'default_sink_name': default_sink, 'default_source_name': default_source},
+        'sinks': sinks,
+        'sources': sources,
+    })
+
+
+@pytest.fixture
+def fake_pactl(tmp_path):
+    script = tmp_path / 'pactl'
+    script.write_text(FAKE_PACTL.format(python=sys.executable))
+    script.chmod(0o755)
+    (tmp_path / 'state.json').write_text(state(
+        sinks=[device(1, 'speakers', 'Built-in Speakers')],
+        sources=[device(2, 'mic', 'Built-in Mic'),
+                 {**device(3, 'speakers.monitor', 'Monitor'), 'monitor_of_sink': 'speakers'}],
+    ))
+    (tmp_path / 'events.txt').write_text('')
+    return tmp_path
+
+
+def plug_during_listing(base, kind, new_state, event):
+    """Switch to new_state (and fire event) right after `list <kind>` has printed."""
+    (base / f'plug-{kind}.json').write_text(json.dumps([new_state, event]))
+
+
+def pactl_calls(base):
+    log = base / 'calls.log'
+    return log.read_text().splitlines() if log.exists() else []
+
+
+async def wait_for(condition, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+        await asyncio.sleep(0.02)
+
+
+def test_enumerates_once_and_reads_from_memory(fake_pactl):
+    """Test devices are listed once; repeated reads don't spawn pactl."""
+    registry = AudioDeviceRegistry(pactl=str(fake_pactl / 'pactl'))
+
+    async def run():
+        assert await registry.start()
+        for _ in range(50):
+            registry.get_devices('source')
+            registry.list_devices()
+        await registry.stop()
+
+    asyncio.run(run())
+
+    mics = registry.get_devices('source')
+    assert [(d.id, d.name, d.is_default) for d in mics] == [('mic', 'Built-in Mic', True)]
+    assert registry.list_devices() == [
+        {'name': 'mic', 'description': 'Built-in Mic', 'device_class': 'Audio/Source'},
+        {'name': 'speakers', 'description': 'Built-in Speakers', 'device_class': 'Audio/Sink'},
+    ]
+    listing_calls = [call for call in pactl_calls(fake_pactl) if call != 'subscribe']
+    assert sorted(listing_calls) == ['-f json info', '-f json list sinks', '-f json list sources']
+
+
+def test_hotplug_events_update_registry(fake_pactl):
+    """Test a scripted hot-plug stream: USB headset added, made default, then removed."""
+    headset = device(7, 'usb-headset', 'USB Headset')
+    (fake_pactl / 'events.txt').write_text('\n'.join([
+        'sleep 0.2',
+        'state ' + state(sinks=[device(1, 'speakers', 'Built-in Speakers'), headset],
+                         sources=[device(2, 'mic', 'Built-in Mic')]),
+        "Event 'new' on card #3",
+        "Event 'new' on sink #7",
+        "Event 'change' on sink #7",
+        "Event 'change' on sink #7",
+        'sleep 1.0',
+        'state ' + state(sinks=[device(1, 'speakers', 'Built-in Speakers'), headset],
+                         sources=[device(2, 'mic', 'Built-in Mic')], default_sink='usb-headset'),
+        "Event 'change' on server #-1",
+        'sleep 1.0',
+        "Event 'remove' on sink #7",
+    ]))
+    registry = AudioDeviceRegistry(pactl=str(fake_pactl / 'pactl'))
+    changes = []
+    registry.add_listener(lambda: changes.append([d.id for d in registry.get_devices('sink')]))
+
+    def default_sink():
+        return next((d.id for d in registry.get_devices('sink') if d.is_default), None)
+
+    async def run():
+        await registry.start()
+        await wait_for(lambda: default_sink() == 'usb-headset')
+        sinks_listed = pactl_calls(fake_pactl).count('-f json list sinks')
+        await wait_for(lambda: [d.id for d in registry.get_devices('sink')] == ['speakers'])
+        await registry.stop()
+        return sinks_listed
+
+    sinks_listed = asyncio.run(run())
+
+    # Initial listing + one coalesced refresh for the whole plug-in burst
+    assert sinks_listed == 2
+    assert ['speakers', 'usb-headset'] in changes
+    assert changes[-1] == ['speakers']
+
+
+def test_start_fails_cleanly_without_pactl(tmp_path):
+    """Test a missing pactl leaves the registry unloaded (callers fall back)."""
+    registry = AudioDeviceRegistry(pactl=str(tmp_path / 'missing-pactl'))
+    assert asyncio.run(registry.start()) is False
+    assert registry.loaded is False
+
+
+def test_device_plugged_during_initial_listing_is_not_lost(fake_pactl):
+    """Test a headset plugged after `list sinks` printed (but before start() returned) shows up."""
+    plug_during_listing(fake_pactl, 'sinks', state(
+        sinks=[device(1, 'speakers', 'Built-in Speakers'), device(7, 'usb-headset', 'USB Headset')],
+        sources=[device(2, 'mic', 'Built-in Mic')],
+    ), "Event 'new' on sink #7")
+    registry = AudioDeviceRegistry(pactl=str(fake_pactl / 'pactl'))
+
+    async def run():
+        assert await registry.start()
+        await wait_for(lambda: len(registry.get_devices('sink')) == 2)
+        await registry.stop()
+
+    asyncio.run(run())
+
+    assert [d.id for d in registry.get_devices('sink')] == ['speakers', 'usb-headset']
+
+
+def test_shutdown_terminates_pactl_without_awaiting(fake_pactl):
+    """Test shutdown() (application exit) kills the `pactl subscribe` child synchronously."""
+    registry = AudioDeviceRegistry(pactl=str(fake_pactl / 'pactl'))
+
+    async def run():
+        assert await registry.start()
+        process = registry._process
+        registry.shutdown()
+        assert registry._process is None and registry._watch_task is None
+        return await asyncio.wait_for(process.wait(), 5)
+
+    assert asyncio.run(run()) == -signal.SIGTERM
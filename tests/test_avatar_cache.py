@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the rendered-avatar LRU (AvatarCache) and the non-blocking
+AvatarLoader (placeholder first, decode on the thread pool, avatar_ready).
+
+Run with: pytest tests/test_avatar_cache.py -v
+"""
+
+import os
+import sys
+import time
+import threading
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+pytest.importorskip('PySide6')
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtCore import QBuffer, QIODevice
+from PySide6.QtGui import QImage, QColor, QPixmap
+from PySide6.QtWidgets import QApplication
+
+from siproxylin.utils import avatar, avatar_store
+from siproxylin.utils.avatar import AvatarCache, AvatarLoader
+from siproxylin.utils.avatar_store import AvatarStore
+
+
+PIXMAP_BYTES = 40 * 40 * 4
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def png_bytes(color):
+    image = QImage(64, 64, QImage.Format_ARGB32)
+    image.fill(QColor(color))
+    buffer = QBuffer()
+    buffer.open(QIODevice.WriteOnly)
+    image.save(buffer, 'PNG')
+    return bytes(buffer.data())
+
+
+def test_cache_evicts_least_recently_used_over_budget(app):
+    """Test the cache stays within its byte budget and evicts the least recently used pixmap."""
+    cache = AvatarCache(max_bytes=3 * PIXMAP_BYTES)
+    for i in range(3):
+        cache.put(1, f'contact{i}@example.org', 40, 'hash', QPixmap(40, 40))
+
+    assert cache.get(1, 'contact0@example.org', 40, 'hash') is not None  # Now most recently used
+    cache.put(1, 'contact3@example.org', 40, 'hash', QPixmap(40, 40))
+
+    assert cache.get(1, 'contact1@example.org', 40, 'hash') is None
+    assert all(cache.get(1, f'contact{i}@example.org', 40, 'hash') is not None for i in (0, 2, 3))
+    assert cache._bytes == 3 * PIXMAP_BYTES
+
+
+def test_invalidate_drops_all_sizes_and_hash(app):
+    """Test invalidate() forgets every rendered size and the remembered hash of a contact."""
+    cache = AvatarCache()
+    cache.put(1, 'alice@example.org', 40, 'old', QPixmap(40, 40))
+    cache.put(1, 'alice@example.org', 80, 'old', QPixmap(80, 80))
+    cache.put(2, 'alice@example.org', 40, 'old', QPixmap(40, 40))
+    cache.set_hash(1, 'alice@example.org', 'old')
+
+    cache.invalidate('alice@example.org', account_id=1)
+
+    assert cache.get(1, 'alice@example.org', 40, 'old') is None
+    assert cache.get(1, 'alice@example.org', 80, 'old') is None
+    assert cache.get(2, 'alice@example.org', 40, 'old') is not None
+    assert cache.get_hash(1, 'alice@example.org') is avatar._UNKNOWN
+    assert cache._bytes == PIXMAP_BYTES
+
+
+def test_loader_returns_placeholder_and_decodes_off_gui_thread(app, tmp_path, monkeypatch):
+    """Test request() never decodes inline: initials first, photo after avatar_ready."""
+    store = AvatarStore(tmp_path / 'avatars')
+    avatar_hash = store.put(png_bytes('red'))
+    monkeypatch.setattr(avatar_store, '_avatar_store', store)
+    monkeypatch.setattr(avatar, '_avatar_cache', AvatarCache())
+    monkeypatch.setattr(avatar, 'load_avatar_hash', lambda account_id, jid: avatar_hash)
+
+    decode_threads = []
+    real_decode = avatar._decode_avatar
+
+    def decode(*args):
+        decode_threads.append(threading.current_thread())
+        return real_decode(*args)
+
+    monkeypatch.setattr(avatar, '_decode_avatar', decode)
+
+    loader = AvatarLoader()
+    ready = []
+    loader.avatar_ready.connect(lambda *args: ready.append(args))
+
+    placeholder = loader.request(1, 'alice@example.org', 40)
+    loader.request(1, 'alice@example.org', 40)  # Same avatar while pending: no second decode
+    assert placeholder.width() == 40 and not ready
+
+    deadline = time.monotonic() + 5
+    while not ready and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+
+    assert ready == [(1, 'alice@example.org', 40)]
+    assert len(decode_threads) == 1 and decode_threads[0] is not threading.main_thread()
+
+    photo = loader.request(1, 'alice@example.org', 40)
+    assert photo.cacheKey() != placeholder.cacheKey()
+    assert photo.toImage().pixelColor(20, 20).name() == '#ff0000'
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Unit tests for AvatarStore - content-addressed avatar files.
+
+Run with: pytest tests/test_avatar_store.py -v
+"""
+
+import sys
+import hashlib
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from siproxylin.utils.avatar_store import AvatarStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return AvatarStore(tmp_path / 'avatars')
+
+
+def test_put_returns_sha1_and_roundtrips(store):
+    """Test bytes are keyed by SHA-1 and read back unchanged."""
+    data = b'\x89PNG fake image'
+    avatar_hash = store.put(data)
+
+    assert avatar_hash == hashlib.sha1(data).hexdigest()
+    assert store.get(avatar_hash) == data
+    assert store.path_for(avatar_hash).parent.name == avatar_hash[:2]
+
+
+def test_identical_avatars_are_deduplicated(store):
+    """Test the same image from two contacts is stored once."""
+    first = store.put(b'same')
+    second = store.put(b'same')
+
+    assert first == second
+    assert len(list(store.root.glob('*/*'))) == 1
+
+
+def test_missing_avatar_returns_none(store):
+    """Test unknown or empty hashes read as None."""
+    assert store.get('0' * 40) is None
+    assert store.get('') is None
+    assert not store.has('')
+
+
+def test_prune_keeps_referenced(store):
+    """Test prune removes only hashes no contact references."""
+    keep = store.put(b'keep')
+    drop = store.put(b'drop')
+
+    assert store.prune([keep]) == 1
+    assert store.has(keep)
+    assert not store.has(drop)
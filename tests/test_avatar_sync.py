@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Unit tests for hash-driven avatar sync in AvatarBarrel: a reconnect (or
+restart) with an unchanged 500-contact roster fetches nothing.
+
+Uses a fake DrunkXMPP whose get_avatar() counts requests, so no server is needed.
+
+Run with: pytest tests/test_avatar_sync.py -v
+"""
+
+import sys
+import asyncio
+import hashlib
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+pytest.importorskip('PySide6')
+
+from siproxylin.db.database import Database
+from siproxylin.utils import avatar_store
+from siproxylin.utils.avatar_store import AvatarStore
+from siproxylin.core.barrels.avatars import AvatarBarrel
+
+
+CONTACTS = 500
+WITH_AVATAR = 400  # The other 100 publish no avatar
+
+
+class FakeSignal:
+    def emit(self, *args):
+        pass
+
+
+class FakeClient:
+    """DrunkXMPP stand-in serving avatars for the first WITH_AVATAR contacts."""
+
+    def __init__(self, barrel, served=None):
+        self.barrel = barrel
+        self.served = served or {}  # jid -> avatar bytes overriding the defaults
+        self.requests = []
+
+    async def get_avatar(self, jid, prefer_pep=True):
+        self.requests.append(jid)
+        index = int(jid[len('contact'):].split('@')[0])
+        data = self.served.get(jid, avatar_bytes(index) if index < WITH_AVATAR else None)
+        if data is None:
+            return None
+        avatar_data = {'data': data, 'hash': hashlib.sha1(data).hexdigest(),
+                       'mime_type': 'image/png', 'source': 'xep_0084'}
+        await self.barrel.on_avatar_update(jid, avatar_data)
+        return avatar_data
+
+
+def avatar_bytes(index):
+    return f'png {index}'.encode()
+
+
+def avatar_hash(index):
+    return hashlib.sha1(avatar_bytes(index)).hexdigest()
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(avatar_store, '_avatar_store', AvatarStore(tmp_path / 'avatars'))
+    database = Database(tmp_path / 'test.db')
+    database.initialize()
+    database.execute("INSERT INTO account (id, bare_jid) VALUES (1, 'me@example.org')")
+    database.executemany("INSERT INTO jid (id, bare_jid) VALUES (?, ?)",
+                         [(i + 1, f'contact{i}@example.org') for i in range(CONTACTS)])
+    database.executemany("INSERT INTO roster (account_id, jid_id) VALUES (1, ?)",
+                         [(i + 1,) for i in range(CONTACTS)])
+    database.commit()
+    yield database
+    database.close()
+
+
+def connect(db):
+    """Fresh barrel and client (as after a restart), then roster pass and presence flood."""
+    barrel = AvatarBarrel(1, None, db, None, {'avatar_updated': FakeSignal()})
+    client = barrel.client = FakeClient(barrel)
+
+    async def session():
+        await barrel.fetch_roster_avatars()
+        for i in range(CONTACTS):
+            await barrel.on_avatar_hash(f'contact{i}@example.org',
+                                        avatar_hash(i) if i < WITH_AVATAR else '', 'xep_0153')
+        while barrel._workers and not all(w.done() for w in barrel._workers):
+            await asyncio.sleep(0.01)
+
+    asyncio.run(session())
+    return barrel, client
+
+
+def test_unchanged_reconnect_fetches_zero_avatars(db):
+    """Test first sync fetches every contact once, an unchanged reconnect fetches none."""
+    _, first = connect(db)
+    assert sorted(first.requests) == sorted(f'contact{i}@example.org' for i in range(CONTACTS))
+
+    _, second = connect(db)
+    assert second.requests == []
+
+
+def test_changed_hash_fetches_only_that_contact(db):
+    """Test one advertised hash change after reconnect fetches one avatar."""
+    connect(db)
+    barrel = AvatarBarrel(1, None, db, None, {'avatar_updated': FakeSignal()})
+    client = barrel.client = FakeClient(barrel, served={'contact450@example.org': b'new avatar'})
+
+    async def presence():
+        await barrel.fetch_roster_avatars()
+        await barrel.on_avatar_hash('contact7@example.org', avatar_hash(7), 'xep_0153')
+        await barrel.on_avatar_hash('contact450@example.org', hashlib.sha1(b'new avatar').hexdigest(),
+                                    'xep_0153')
+        await asyncio.gather(*barrel._workers, return_exceptions=True)
+
+    asyncio.run(presence())
+    assert client.requests == ['contact450@example.org']
+    assert barrel._get_stored_hashes()['contact450@example.org'] == {1: hashlib.sha1(b'new avatar').hexdigest()}
+
+
+def test_probe_marker_is_replaced_by_real_avatar(db):
+    """Test a contact probed without avatar gets its avatar once it publishes one."""
+    connect(db)
+    barrel = AvatarBarrel(1, None, db, None, {'avatar_updated': FakeSignal()})
+    jid = 'contact499@example.org'
+    assert barrel._get_stored_hashes()[jid] == {-1: ''}
+
+    barrel.store_avatar(jid, {'data': b'new', 'hash': '', 'source': 'xep_0084'})
+
+    rows = db.fetchall("SELECT type, hash FROM contact_avatar WHERE jid_id = 500")
+    assert [(row['type'], row['hash']) for row in rows] == [(1, hashlib.sha1(b'new').hexdigest())]
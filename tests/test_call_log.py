@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the keyset-paged call log (db/call_log.py and
+gui/models/call_log_model.py), seeded with 100k calls.
+
+Run with: pytest tests/test_call_log.py -v -s
+"""
+
+import sys
+import time
+import random
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from siproxylin.db.database import Database
+from siproxylin.db.call_log import CallLogFilter, CallLogOrder, CALL_LOG_PAGE_SIZE, fetch_call_page, page_cursor
+
+
+MISSED = 6
+
+
+def make_db(path, calls, seed=3):
+    """Database with 2 accounts, 50 peers and `calls` calls (many sharing a timestamp)."""
+    db = Database(path)
+    db.initialize()
+    db.executemany("INSERT INTO account (id, bare_jid) VALUES (?, ?)",
+                   [(1, 'me@example.org'), (2, 'work@example.com')])
+    db.executemany("INSERT INTO jid (id, bare_jid) VALUES (?, ?)",
+                   [(i, f'peer{i}@example.org') for i in range(1, 51)])
+    rng = random.Random(seed)
+    db.executemany("""
+        INSERT INTO call (account_id, counterpart_id, direction, time, local_time, end_time, state, type)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """, [(rng.randint(1, 2), rng.randint(1, 50), rng.randint(0, 1), 1_600_000_000 + i // 3,
+           1_600_000_000 + i // 3, 1_600_000_060 + i // 3, rng.choice([4, 4, 4, 5, 6, 7]), 0)
+          for i in range(calls)])
+    db.commit()
+    return db
+
+
+@pytest.fixture(scope='module')
+def db(tmp_path_factory):
+    database = make_db(tmp_path_factory.mktemp('calls') / 'test.db', 100_000)
+    yield database
+    database.close()
+
+
+def all_pages(db, filters, order=CallLogOrder()):
+    rows, after = [], None
+    while True:
+        page = fetch_call_page(db, filters, order, after=after, limit=1000)
+        rows.extend(page)
+        if len(page) < 1000:
+            return rows
+        after = page_cursor(page)
+
+
+def test_pages_cover_every_call_once_newest_first(db):
+    """Test keyset paging returns each call exactly once, ties on time included."""
+    filters = CallLogFilter(account_id=1)
+    rows = all_pages(db, filters)
+    expected = db.fetchone("SELECT COUNT(*) AS n FROM call WHERE account_id = 1")['n']
+
+    assert len(rows) == expected == len({row['id'] for row in rows})
+    keys = [(row['time'], row['id']) for row in rows]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_filters_are_applied_in_sql(db):
+    """Test direction, state and JID filters match a full scan."""
+    filters = CallLogFilter(account_id=2, direction=0, state=MISSED, jid_search='PEER1')
+    rows = all_pages(db, filters)
+    expected = db.fetchall("""
+        SELECT c.id FROM call c JOIN jid j ON j.id = c.counterpart_id
+        WHERE c.account_id = 2 AND c.direction = 0 AND c.state = ? AND j.bare_jid LIKE '%peer1%'
+    """, (MISSED,))
+
+    assert rows and {row['id'] for row in rows} == {row['id'] for row in expected}
+    assert fetch_call_page(db, CallLogFilter(jid_search='_')) == []  # LIKE wildcards are literal
+
+
+@pytest.mark.parametrize('order', [CallLogOrder('state', descending=False), CallLogOrder('jid')])
+def test_sorted_pages_cover_every_call_once(db, order):
+    """Test keyset paging in a header-click order returns each call once, in that order."""
+    filters = CallLogFilter(account_id=1, direction=0)
+    rows = all_pages(db, filters, order)
+    expected = db.fetchone("SELECT COUNT(*) AS n FROM call WHERE account_id = 1 AND direction = 0")['n']
+
+    assert len(rows) == expected == len({row['id'] for row in rows})
+    keys = [(row['sort_key'], row['id']) for row in rows]
+    assert keys == sorted(keys, reverse=order.descending)
+
+
+def test_page_query_uses_account_time_index(db):
+    """Test a filtered page is read from call_account_time_idx without sorting."""
+    plan = ' | '.join(row['detail'] for row in db.fetchall("""
+        EXPLAIN QUERY PLAN
+        SELECT c.id FROM call c
+        WHERE c.account_id = 1 AND c.state = 6 AND (c.time, c.id) < (?, ?)
+        ORDER BY c.time DESC, c.id DESC LIMIT 200
+    """, (1_600_020_000, 0)))
+
+    assert 'call_account_time_idx' in plan and 'TEMP B-TREE' not in plan
+
+
+def test_first_page_time_is_independent_of_history_size(db, tmp_path):
+    """Benchmark: opening the call log (first page) with 1k vs 100k stored calls."""
+    small = make_db(tmp_path / 'small.db', 1_000)
+
+    def first_page_ms(database):
+        best = float('inf')
+        for _ in range(5):
+            start = time.perf_counter()
+            fetch_call_page(database, CallLogFilter(account_id=1))
+            best = min(best, time.perf_counter() - start)
+        return best * 1000
+
+    start = time.perf_counter()
+    db.fetchall("""
+        SELECT c.id, c.time, j.bare_jid FROM call c JOIN jid j ON c.counterpart_id = j.id
+        LEFT JOIN account a ON c.account_id = a.id ORDER BY c.time DESC
+    """)
+    full_ms = (time.perf_counter() - start) * 1000
+    small_ms, large_ms = first_page_ms(small), first_page_ms(db)
+    small.close()
+
+    print(f"\nFirst page ({CALL_LOG_PAGE_SIZE} rows): 1k calls {small_ms:.2f} ms, 100k calls {large_ms:.2f} ms; "
+          f"old full select of 100k: {full_ms:.1f} ms")
+
+    assert large_ms < small_ms * 3 + 1
+    assert large_ms * 10 < full_ms
+
+
+def test_model_fetches_more_on_demand(db):
+    """Test CallLogModel loads one page up front and the next one via fetchMore()."""
+    pytest.importorskip('PySide6')
+    from siproxylin.gui.models.call_log_model import CallLogModel
+
+    model = CallLogModel(db=db, page_size=100)
+    model.set_filter(CallLogFilter(account_id=1, state=MISSED))
+    assert model.rowCount() == 100 and model.canFetchMore()
+
+    model.fetchMore()
+    assert model.rowCount() == 200
+
+
+def test_model_sort_requeries_in_header_order(db):
+    """Test a header click (sort()) reloads the first page in SQL order; the default order is a no-op."""
+    pytest.importorskip('PySide6')
+    from PySide6.QtCore import Qt
+    from siproxylin.gui.models.call_log_model import CallLogModel
+
+    model = CallLogModel(db=db, page_size=50)
+    model.set_filter(CallLogFilter(account_id=2))
+    resets = []
+    model.modelReset.connect(lambda: resets.append(1))
+
+    model.sort(0, Qt.DescendingOrder)  # Initial header indicator: already newest first
+    assert resets == []
+
+    model.sort(1, Qt.AscendingOrder)  # JID
+    jids = [model.index(row, 1).data() for row in range(model.rowCount())]
+    assert resets == [1] and model.rowCount() == 50
+    assert jids == sorted(jids)
+
+    model.fetchMore()
+    more = [model.index(row, 1).data() for row in range(50, model.rowCount())]
+    assert model.rowCount() == 100 and min(more) >= max(jids)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Unit tests for CallBarrel speculative session pre-warm (XEP-0353 propose).
+
+Uses a fake CallBridge whose CreateSession takes a fixed time, so no call
+service is needed.
+
+Run with: pytest tests/test_call_prewarm.py -v
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+pytest.importorskip('PySide6')
+
+from drunk_call_hook.tracing import CallSetupTracer
+from siproxylin.core.barrels import calls
+from siproxylin.core.barrels.calls import CallBarrel
+
+
+AUDIO_SETTINGS = ('', '', '', '', {
+    'echo_cancel': True, 'echo_suppression_level': 1, 'noise_suppression': True,
+    'noise_suppression_level': 1, 'gain_control': True,
+})
+
+
+class FakeBridge:
+    """CallBridge stand-in recording sessions (CreateSession takes 50ms)."""
+
+    def __init__(self, results=()):
+        self.results = list(results)  # CreateSession outcomes (then success)
+        self.created = []
+        self.ended = []
+
+    async def create_session(self, peer_jid, session_id, *args, **kwargs):
+        await asyncio.sleep(0.05)
+        self.created.append(session_id)
+        return self.results.pop(0) if self.results else True
+
+    async def end_session(self, session_id):
+        self.ended.append(session_id)
+
+
+class FakeClient:
+    """DrunkXMPP stand-in without XEP-0215 services."""
+
+    external_services_metrics = {'hits': 0, 'misses': 0, 'saved_ms': 0.0, 'last_saved_ms': 0.0}
+
+    def get_cached_external_services(self):
+        return []
+
+    async def get_call_external_services(self):
+        return []
+
+
+class FakeTrickleICE:
+    def __init__(self):
+        self.states = []
+
+    def set_incoming_state(self, session_id, state):
+        self.states.append(state)
+
+
+class FakeJingleAdapter:
+    def __init__(self):
+        self.sessions = {}
+        self.trickle_ice = FakeTrickleICE()
+
+
+def make_barrel(bridge):
+    barrel = CallBarrel(1, FakeClient(), None, signals={})
+    barrel.call_bridge = bridge
+    barrel.tracer = CallSetupTracer()
+    barrel.jingle_adapter = FakeJingleAdapter()
+    barrel._load_audio_settings = lambda: AUDIO_SETTINGS
+    return barrel
+
+
+def ring(barrel, session_id, peer_jid='caller@example.org'):
+    barrel.tracer.begin(session_id, 'incoming')
+    barrel._start_prewarm(session_id, peer_jid)
+
+
+def session_initiate(barrel, session_id, peer_jid='caller@example.org'):
+    barrel.pending_call_offers[session_id] = 'v=0'
+    barrel.jingle_adapter.sessions[session_id] = {'peer_jid': peer_jid}
+
+
+def prewarm_marks(barrel, session_id):
+    record = barrel.tracer.finish(session_id, 'test')
+    return [mark['name'] for mark in record['marks'] if mark['name'].startswith('prewarm:')]
+
+
+def test_prewarmed_session_is_committed_on_accept():
+    """Test the session built while ringing is reused, not created again."""
+    bridge = FakeBridge()
+    barrel = make_barrel(bridge)
+
+    async def run():
+        ring(barrel, 's1')
+        await asyncio.sleep(0.1)  # ringing
+        session_initiate(barrel, 's1')
+        start = asyncio.get_running_loop().time()
+        created = await barrel._create_incoming_session('s1')
+        return created, asyncio.get_running_loop().time() - start
+
+    created, elapsed = asyncio.run(run())
+
+    assert created is True
+    assert bridge.created == ['s1'] and bridge.ended == []
+    assert elapsed < 0.05  # no CreateSession on the critical path
+    assert barrel.prewarm_tasks == {}
+    assert prewarm_marks(barrel, 's1') == ['prewarm:ready', 'prewarm:used']
+
+
+def test_failed_prewarm_falls_back_to_cold_session():
+    """Test a failed pre-warm is cleaned up and the session is built normally."""
+    bridge = FakeBridge(results=[False])
+    barrel = make_barrel(bridge)
+
+    async def run():
+        ring(barrel, 's1')
+        session_initiate(barrel, 's1')  # before the pre-warm finished
+        return await barrel._create_incoming_session('s1')
+
+    assert asyncio.run(run()) is True
+    assert bridge.created == ['s1', 's1'] and bridge.ended == ['s1']
+    assert prewarm_marks(barrel, 's1') == ['prewarm:failed', 'prewarm:none']
+
+
+def test_prewarm_cap_and_teardown():
+    """Test concurrent pre-warms are capped and discarded sessions free their slot."""
+    bridge = FakeBridge()
+    first, second = make_barrel(bridge), make_barrel(bridge)
+
+    async def run():
+        ring(first, 's1')
+        ring(second, 's2')
+        ring(second, 's3')  # over the cap
+        await first._discard_prewarm('s1')  # rejected while still building
+        await second._discard_prewarm('s2')
+        ring(second, 's4')
+        await asyncio.sleep(0.1)
+        pending = list(second.prewarm_tasks)
+        await second._discard_prewarm('s4')
+        return pending
+
+    assert asyncio.run(run()) == ['s4']
+
+    assert calls.MAX_PREWARMED_SESSIONS == 2
+    assert sorted(bridge.created) == ['s1', 's2', 's4']
+    assert 'prewarm:skipped' in prewarm_marks(second, 's3')
+    assert first.prewarm_tasks == {} and second.prewarm_tasks == {}
+    assert calls._prewarming_sessions == set()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Unit tests for CallSetupTracer - call setup spans, JSONL traces, percentiles.
+
+Uses a fake clock and a mocked CallBridge stub, so no call service is needed.
+
+Run with: pytest tests/test_call_setup_tracing.py -v
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from drunk_call_hook import CallBridge
+from drunk_call_hook.proto import call_pb2
+from drunk_call_hook.tracing import (
+    CallSetupTracer, load_traces, summarize, percentile, format_waterfall,
+    accept_to_media, format_accept_to_media
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock (seconds)."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, ms):
+        self.now += ms / 1000.0
+
+
+class FakeStub:
+    """CallService stub whose unary RPCs take a fixed (fake) time."""
+
+    def __init__(self, clock, rpc_ms):
+        self.clock = clock
+        self.rpc_ms = rpc_ms
+
+    async def _rpc(self, name, response):
+        self.clock.advance(self.rpc_ms[name])
+        return response
+
+    def CreateSession(self, request):
+        return self._rpc('CreateSession', call_pb2.CreateSessionResponse(success=True))
+
+    def CreateOffer(self, request):
+        return self._rpc('CreateOffer', call_pb2.SDPResponse(sdp='v=0'))
+
+    async def StreamEvents(self, request):
+        return
+        yield
+
+    async def StreamStats(self, request):
+        return
+        yield
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_spans_and_marks_are_relative_to_begin(clock, tmp_path):
+    """Test span durations and mark offsets use the session start as zero."""
+    tracer = CallSetupTracer(trace_path=tmp_path / 'trace.jsonl', clock=clock)
+    tracer.begin('s1', 'outgoing')
+    clock.advance(100)
+    tracer.mark('s1', 'xep0353:proceed-received')
+    with tracer.span('s1', 'rpc:CreateSession'):
+        clock.advance(40)
+    clock.advance(10)
+    record = tracer.finish('s1', 'connected')
+
+    assert record['marks'] == [{'name': 'xep0353:proceed-received', 'at_ms': 100.0}]
+    assert record['spans'] == [{'name': 'rpc:CreateSession', 'start_ms': 100.0, 'end_ms': 140.0}]
+    assert record['total_ms'] == 150.0
+    assert load_traces(tmp_path / 'trace.jsonl')[0]['session_id'] == 's1'
+
+
+def test_events_after_finish_are_ignored(clock):
+    """Test late ICE states don't resurrect a finished trace."""
+    tracer = CallSetupTracer(clock=clock)
+    tracer.begin('s1', 'incoming')
+    tracer.finish('s1', 'connected')
+    tracer.mark('s1', 'ice:completed')
+
+    assert not tracer.is_tracing('s1')
+    assert tracer.finish('s1', 'success') is None
+
+
+def test_mark_once_and_unfinished_spans(clock):
+    """Test mark_once dedupes and open spans are closed at finish."""
+    tracer = CallSetupTracer(clock=clock)
+    tracer.begin('s1', 'incoming')
+    tracer.mark_once('s1', 'ice:first-local-candidate')
+    clock.advance(5)
+    tracer.mark_once('s1', 'ice:first-local-candidate')
+    tracer.start_span('s1', 'trickle:await-candidates')
+    clock.advance(20)
+    record = tracer.finish('s1', 'timeout')
+
+    assert len(record['marks']) == 1
+    assert record['spans'][0]['error'] == 'unfinished'
+    assert record['spans'][0]['end_ms'] == 25.0
+
+
+def test_summary_percentiles():
+    """Test per-phase percentiles across calls."""
+    traces = [
+        {'session_id': str(i), 'outcome': 'connected', 'total_ms': float(i * 100),
+         'spans': [{'name': 'rpc:CreateOffer', 'start_ms': 0.0, 'end_ms': float(i)}],
+         'marks': []}
+        for i in range(1, 11)
+    ]
+    summary = summarize(traces)
+
+    assert summary['rpc:CreateOffer']['count'] == 10
+    assert summary['rpc:CreateOffer']['p50'] == 5.0
+    assert summary['rpc:CreateOffer']['p90'] == 9.0
+    assert summary['total']['max'] == 1000.0
+    assert percentile([], 50) == 0.0
+
+
+def test_accept_to_media_split_by_prewarm():
+    """Test accept → ICE connected latency is grouped by pre-warm use."""
+    def trace(accepted, connected, prewarm):
+        marks = [{'name': 'user:accepted', 'at_ms': accepted}]
+        if prewarm:
+            marks.append({'name': 'prewarm:used', 'at_ms': accepted + 50})
+        if connected is not None:
+            marks.append({'name': 'ice:connected', 'at_ms': connected})
+        return {'session_id': 's', 'spans': [], 'marks': marks}
+
+    groups = accept_to_media([
+        trace(3000.0, 3400.0, prewarm=True),
+        trace(5000.0, 7500.0, prewarm=False),
+        trace(4000.0, None, prewarm=True),  # never connected
+        {'session_id': 'out', 'spans': [], 'marks': [{'name': 'ice:connected', 'at_ms': 900.0}]},
+    ])
+
+    assert groups == {'prewarmed': [400.0], 'cold': [2500.0]}
+    table = format_accept_to_media(groups).splitlines()
+    assert table[1].split() == ['prewarmed', '1', '400', '400', '400']
+
+
+def test_mocked_bridge_records_rpc_latency(clock):
+    """Test CallBridge RPCs are traced end to end with a mocked stub."""
+    tracer = CallSetupTracer(clock=clock)
+    bridge = CallBridge(tracer=tracer)
+    bridge._stub = FakeStub(clock, {'CreateSession': 30, 'CreateOffer': 120})
+
+    async def setup_call():
+        tracer.begin('s1', 'outgoing')
+        await bridge.create_session('peer@example.org', 's1')
+        await bridge.create_offer('s1')
+        await bridge._stop_event_stream('s1')
+        await bridge._stop_stats_stream('s1')
+        return tracer.finish('s1', 'connected')
+
+    record = asyncio.run(setup_call())
+    durations = {s['name']: s['end_ms'] - s['start_ms'] for s in record['spans']}
+
+    assert durations == {'rpc:CreateSession': 30.0, 'rpc:CreateOffer': 120.0}
+    assert 'rpc:CreateOffer' in format_waterfall(record)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for the in-process FakeCallService and the call signalling benchmark
+(JingleAdapter + CallBridge over an in-memory XMPP loopback).
+
+Run with: pytest tests/test_call_signalling_benchmark.py -v
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from drunk_call_hook import CallBridge
+from drunk_call_hook.benchmark import run_benchmark, format_report
+from drunk_call_hook.fake_service import start_fake_call_service
+from drunk_call_hook.tracing import CallSetupTracer, load_traces
+
+
+def test_fake_service_implements_call_bridge_rpcs():
+    """Test CallBridge against the fake service: session RPCs, scripted events, stats, devices."""
+    events = []
+
+    async def run():
+        server, address, service = await start_fake_call_service(
+            latency_ms={'CreateOffer': 30}, sdp_candidates=0
+        )
+        bridge = CallBridge(
+            address=address, tracer=CallSetupTracer(), stats_interval_ms=20,
+            on_ice_candidate=lambda sid, cand: events.append(('candidate', cand['candidate'])),
+            on_connection_state=lambda sid, state: events.append(('state', state)),
+        )
+        try:
+            assert await bridge.connect()
+            assert await bridge.create_session('peer@example.org/res', 's1')
+            offer = await bridge.create_offer('s1')
+            await bridge.set_remote_description('s1', offer.replace('actpass', 'active'), 'answer')
+            await bridge.add_ice_candidate('s1', {'candidate': 'candidate:9 1 udp 1 198.51.100.1 9 typ relay'})
+            await asyncio.sleep(0.2)
+            await bridge.set_mute('s1', True)
+            devices = await bridge.list_audio_devices()
+            stats = await bridge.get_stats('s1')
+            await bridge.end_session('s1')
+
+            service.errors['CreateSession'] = 'no audio device'
+            assert await bridge.create_session('peer@example.org/res', 's2') is False
+            return offer, devices, stats, service
+        finally:
+            await bridge.disconnect()
+            await server.stop(None)
+
+    offer, devices, stats, service = asyncio.run(run())
+
+    assert 'a=ice-ufrag:' in offer and 'a=candidate:' not in offer
+    assert [d['device_class'] for d in devices] == ['Audio/Source', 'Audio/Sink']
+    assert stats['connection_state'] == 'connected' and stats['bytes_sent'] > 0
+    assert [e for e in events if e[0] == 'state'] == [('state', 'new'), ('state', 'checking'),
+                                                      ('state', 'connected')]
+    assert len([e for e in events if e[0] == 'candidate']) == 2
+    assert service.rpc_counts['SetMute'] == 1 and service.sessions == {}
+
+
+def test_benchmark_connects_concurrent_calls(tmp_path):
+    """Test N concurrent calls connect end-to-end and every figure is reported."""
+    trace_path = tmp_path / 'bench.jsonl'
+    result = asyncio.run(run_benchmark(sessions=8, heartbeat_interval=0.05, trace_path=trace_path))
+
+    assert result['connected'] == 8
+    assert 0 < result['setup_ms']['p50'] <= result['setup_ms']['p99'] <= result['setup_ms']['max']
+    phases = result['phases']
+    assert phases['jingle:session-accept-received']['count'] == 8
+    assert phases['ice:connected']['count'] == 8
+    assert result['callee_phases']['rpc:CreateAnswer']['count'] == 8
+    # Both sides stream NEW + 2 candidates + CHECKING + CONNECTED per call
+    assert result['events']['count'] == 8 * 2 * 5
+    assert result['events']['per_second'] > 0
+    assert result['rpcs']['CreateSession'] == 16 and result['rpcs']['EndSession'] == 16
+    assert result['heartbeat']['sent'] >= 2 and result['heartbeat']['failed'] == 0
+
+    traces = load_traces(trace_path)
+    assert len(traces) == 8 and {t['direction'] for t in traces} == {'outgoing'}
+    assert 'calls connected' in format_report(result)
+
+
+def test_benchmark_reflects_signalling_latency():
+    """Test one-way XMPP latency shows up in the setup time (several round trips)."""
+    fast = asyncio.run(run_benchmark(sessions=3, xmpp_latency_ms=1, heartbeat_interval=0))
+    slow = asyncio.run(run_benchmark(sessions=3, xmpp_latency_ms=40, heartbeat_interval=0))
+
+    assert fast['connected'] == slow['connected'] == 3
+    # Critical path: propose/proceed round trip, session-initiate, session-accept = 4 hops
+    assert slow['setup_ms']['p50'] - fast['setup_ms']['p50'] >= 4 * 39 * 0.9
+    assert slow['heartbeat']['sent'] == 0
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Unit tests for CallStatsHistory - StreamStats delta merging and ring buffer.
+
+Run with: pytest tests/test_call_stats.py -v
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from drunk_call_hook.proto import call_pb2
+from drunk_call_hook.stats import CallStatsHistory
+
+
+def _update(ts, **kwargs):
+    return call_pb2.StatsUpdate(timestamp_ms=ts, **kwargs)
+
+
+def test_first_update_fills_snapshot():
+    """Test first update populates strings and candidates."""
+    history = CallStatsHistory()
+    snap = history.apply_update(_update(
+        0, bytes_sent=100, bandwidth_kbps=32, rtt_ms=40,
+        connection_state='connected', connection_type='TURN relay',
+        candidates_changed=True, local_candidates=['1.2.3.4 (relay)'],
+        remote_candidates=['5.6.7.8 (relay)']
+    ))
+
+    assert snap['bytes_sent'] == 100
+    assert snap['connection_state'] == 'connected'
+    assert snap['connection_type'] == 'TURN relay'
+    assert snap['local_candidates'] == ['1.2.3.4 (relay)']
+    assert snap['remote_candidates'] == ['5.6.7.8 (relay)']
+
+
+def test_empty_strings_keep_previous_values():
+    """Test unchanged fields (empty in delta) are kept from previous update."""
+    history = CallStatsHistory()
+    history.apply_update(_update(
+        0, connection_state='connected', connection_type='TURN relay',
+        candidates_changed=True, local_candidates=['a'], remote_candidates=['b']
+    ))
+    snap = history.apply_update(_update(2000, bytes_sent=500))
+
+    assert snap['bytes_sent'] == 500
+    assert snap['connection_state'] == 'connected'
+    assert snap['connection_type'] == 'TURN relay'
+    assert snap['local_candidates'] == ['a']
+    assert snap['remote_candidates'] == ['b']
+
+
+def test_ring_buffer_is_bounded():
+    """Test oldest samples are dropped when buffer is full."""
+    history = CallStatsHistory(max_samples=3)
+    for i in range(5):
+        history.apply_update(_update(i * 2000, bandwidth_kbps=i))
+
+    assert history.series('bandwidth_kbps') == [2, 3, 4]
+
+
+def test_summary_covers_whole_call():
+    """Test summary aggregates all samples, not just buffered ones."""
+    history = CallStatsHistory(max_samples=2)
+    history.apply_update(_update(0, bandwidth_kbps=100, rtt_ms=20, packet_loss_pct=1.5,
+                                 candidates_changed=True, local_candidates=['a']))
+    history.apply_update(_update(2000, bandwidth_kbps=50, rtt_ms=0))
+    history.apply_update(_update(4000, bandwidth_kbps=30, rtt_ms=60,
+                                 candidates_changed=True, local_candidates=['b']))
+
+    summary = history.summary()
+    assert summary['samples'] == 3
+    assert summary['avg_bandwidth_kbps'] == 60
+    assert summary['peak_bandwidth_kbps'] == 100
+    assert summary['avg_rtt_ms'] == 40  # Zero RTT samples are ignored
+    assert summary['max_rtt_ms'] == 60
+    assert summary['max_packet_loss_pct'] == 1.5
+    assert summary['pair_changes'] == 1
+
+
+def test_summary_none_without_samples():
+    """Test no summary is produced for calls that never streamed stats."""
+    assert CallStatsHistory().summary() is None
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Unit tests for ContactTreeModel incremental updates: a roster push or
+bookmark change touches only its own row, never the whole account.
+
+Run with: pytest tests/test_contact_tree_model.py -v
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+pytest.importorskip('PySide6')
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtWidgets import QApplication
+
+from siproxylin.gui.models import ContactDisplayData, AccountDisplayData, ContactTreeModel
+
+
+ACCOUNT = AccountDisplayData(account_id=1, bare_jid='me@example.org', name='me')
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def contact(i, **fields):
+    fields.setdefault('name', f'Contact {i}')
+    return ContactDisplayData(jid=f'contact{i}@example.org', account_id=1, item_type='contact', **fields)
+
+
+@pytest.fixture
+def model(app):
+    """Model with 500 contacts and a recorder of every change notification."""
+    model = ContactTreeModel()
+    model.reset([(ACCOUNT, [contact(i) for i in range(500)])])
+    model.changes = []
+    model.dataChanged.connect(lambda first, last, roles=(): model.changes.append(
+        ('changed', first.row(), last.row())))
+    model.rowsInserted.connect(lambda parent, first, last: model.changes.append(('inserted', first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: model.changes.append(('removed', first, last)))
+    model.modelReset.connect(lambda: model.changes.append(('reset',)))
+    return model
+
+
+def test_push_for_one_contact_touches_only_its_row(model):
+    """Test a renamed contact emits one dataChanged for its own row."""
+    model.upsert_entry(contact(123, subscription='to'))
+
+    assert model.changes == [('changed', 123, 123)]
+    assert model.get_entry(1, 'contact123@example.org').subscription == 'to'
+
+
+def test_unchanged_push_emits_nothing(model):
+    """Test re-applying identical data (e.g. repeated bookmark sync) repaints nothing."""
+    model.upsert_entry(contact(7))
+    model.upsert_entry(contact(8))
+
+    assert model.changes == []
+
+
+def test_added_and_removed_contact_insert_and_remove_one_row(model):
+    """Test a roster add appends one row and a roster remove deletes one row."""
+    model.upsert_entry(contact(500))
+    model.remove_entry(1, 'contact42@example.org')
+
+    assert model.changes == [('inserted', 500, 500), ('removed', 42, 42)]
+    assert model.rowCount(model.index_for(1)) == 500
+    assert model.index_for(1, 'contact43@example.org').row() == 42
+
+
+def test_push_keeps_live_call_state(model):
+    """Test a roster push for a contact in a call keeps the call indicator."""
+    model.update_entry(1, 'contact5@example.org', call_state='active')
+    model.changes.clear()
+
+    model.upsert_entry(contact(5, name='Renamed'))
+
+    entry = model.get_entry(1, 'contact5@example.org')
+    assert entry.name == 'Renamed' and entry.call_state == 'active'
+    assert model.changes == [('changed', 5, 5)]
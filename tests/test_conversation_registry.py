@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Unit tests for ConversationRegistry - in-memory conversation settings.
+
+Run with: pytest tests/test_conversation_registry.py -v
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from siproxylin.db.database import Database
+from siproxylin.db.conversation_registry import ConversationRegistry
+
+
+PEER = 'peer@example.org'
+ROOM = 'room@conference.example.org'
+NEW = 'new@example.org'
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(tmp_path / 'test.db')
+    database.initialize()
+    database.execute("INSERT INTO account (id, bare_jid) VALUES (1, 'me@example.org')")
+    database.execute("INSERT INTO jid (id, bare_jid) VALUES (1, ?), (2, ?), (3, ?)", (PEER, ROOM, NEW))
+    database.execute("""
+        INSERT INTO conversation (id, account_id, jid_id, type, send_typing, encryption)
+        VALUES (1, 1, 1, 0, 0, 1), (2, 1, 2, 1, 1, 0)
+    """)
+    database.commit()
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def queries(db):
+    """Collect SELECT statements run on the connection."""
+    statements = []
+    db.connection.set_trace_callback(
+        lambda sql: statements.append(sql) if sql.lstrip().upper().startswith('SELECT') else None
+    )
+    yield statements
+    db.connection.set_trace_callback(None)
+
+
+def test_lookups_after_load_do_not_query(db, queries):
+    """Test one query per account, then typing/marker lookups are dict hits."""
+    registry = ConversationRegistry(db)
+
+    conv = registry.find(1, PEER)
+    assert len(queries) == 1
+    for _ in range(50):  # e.g. one lookup per keystroke
+        assert registry.find(1, PEER).send_typing is False
+        assert registry.get(conv.id).encryption == 1
+    assert registry.find(1, ROOM).is_muc
+
+    assert len(queries) == 1
+    assert conv.send_marker is True and conv.read_up_to_item == -1
+
+
+def test_update_writes_through(db, queries):
+    """Test update() persists the change and the cached row follows it."""
+    registry = ConversationRegistry(db)
+    conv = registry.find(1, PEER)
+
+    registry.update(conv.id, send_typing=True, read_up_to_item=42)
+
+    assert registry.find(1, PEER).send_typing is True
+    assert len(queries) == 1
+    row = db.fetchone("SELECT send_typing, read_up_to_item FROM conversation WHERE id = ?", (conv.id,))
+    assert (row['send_typing'], row['read_up_to_item']) == (1, 42)
+
+    with pytest.raises(ValueError):
+        registry.update(conv.id, bare_jid='evil@example.org')
+
+
+def test_miss_is_loaded_and_forget_drops(db):
+    """Test rows created elsewhere are picked up, and forgotten rows are re-read."""
+    registry = ConversationRegistry(db)
+    assert registry.find(1, NEW) is None
+
+    created = registry.get_or_create(1, 3, NEW, 0)
+    assert registry.find(1, NEW) is created
+
+    db.execute("DELETE FROM conversation WHERE id = ?", (created.id,))
+    db.commit()
+    registry.forget_jid(1, NEW)
+    assert registry.find(1, NEW) is None
+    assert registry.get(created.id) is None
+
+    registry.forget_account(1)
+    assert registry.find(1, PEER).id == 1
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Unit tests for ExternalServicesMixin - expiry-aware XEP-0215 credential cache.
+
+Run with: pytest tests/test_external_services.py -v
+"""
+
+import sys
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from drunk_xmpp import external_services
+from drunk_xmpp.external_services import ExternalServicesMixin, parse_expires
+
+
+def turn(expires_in=None):
+    service = {'type': 'turn', 'host': 'turn.example.org', 'port': 3478,
+               'transport': 'udp', 'username': 'u', 'password': 'p'}
+    if expires_in is not None:
+        expires = datetime.fromtimestamp(time.time() + expires_in, timezone.utc)
+        service['expires'] = expires.isoformat().replace('+00:00', 'Z')
+    return service
+
+
+class FakeClient(ExternalServicesMixin):
+    """Mixin host with a scripted XEP-0215 responder."""
+
+    def __init__(self, responses):
+        self.logger = logging.getLogger('test.external_services')
+        self.responses = list(responses)
+        self.queries = 0
+
+    async def _query_external_services(self, service_type=None):
+        self.queries += 1
+        await asyncio.sleep(0.05)  # server round trip
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def short_timings(monkeypatch):
+    monkeypatch.setattr(external_services, 'EXTERNAL_SERVICES_REFRESH_AHEAD', 1.0)
+    monkeypatch.setattr(external_services, 'EXTERNAL_SERVICES_MIN_REFRESH', 0.1)
+    monkeypatch.setattr(external_services, 'EXTERNAL_SERVICES_MIN_VALIDITY', 0)
+
+
+def test_parse_expires():
+    """Test XEP-0082 timestamps with and without zone/fraction."""
+    assert parse_expires('2025-01-01T12:00:00Z') == 1735732800
+    assert parse_expires('2025-01-01T14:00:00.500+02:00') == 1735732800.5
+    assert parse_expires('not a date') is None
+
+
+def test_warm_cache_serves_calls_from_memory():
+    """Test calls after session start don't query the server, and savings are reported."""
+    client = FakeClient([[turn(expires_in=3600)]])
+
+    async def run():
+        await client.warm_external_services()
+        await client.warm_external_services()  # still fresh: no second query
+        results = [await client.get_call_external_services() for _ in range(3)]
+        client.cancel_external_services_refresh()
+        return results
+
+    results = asyncio.run(run())
+
+    assert client.queries == 1
+    assert all(services[0]['username'] == 'u' for services in results)
+    metrics = client.external_services_metrics
+    assert metrics['hits'] == 3 and metrics['misses'] == 0
+    assert metrics['last_saved_ms'] >= 40
+    assert metrics['saved_ms'] == pytest.approx(3 * metrics['last_saved_ms'])
+
+
+def test_refreshes_ahead_of_expiry(short_timings):
+    """Test credentials are re-fetched in the background before they expire."""
+    client = FakeClient([[turn(expires_in=1.3)], [{**turn(expires_in=3600), 'username': 'u2'}]])
+
+    async def run():
+        await client.warm_external_services()
+        await asyncio.sleep(0.6)  # refresh is due 0.3s in (1.3s - 1.0s ahead)
+        services = await client.get_call_external_services()
+        client.cancel_external_services_refresh()
+        return services
+
+    services = asyncio.run(run())
+
+    assert client.queries == 2
+    assert services[0]['username'] == 'u2'
+    assert client.external_services_metrics['hits'] == 1
+
+
+def test_stale_cache_falls_back_to_live_query(short_timings):
+    """Test expired credentials are never served; concurrent calls share one query."""
+    client = FakeClient([[turn(expires_in=-5)], [turn(expires_in=3600)]])
+
+    async def run():
+        await client.refresh_external_services()
+        client.cancel_external_services_refresh()
+        assert client.get_cached_external_services() is None
+        results = await asyncio.gather(client.get_call_external_services(),
+                                       client.get_call_external_services())
+        client.cancel_external_services_refresh()
+        return results
+
+    first, second = asyncio.run(run())
+
+    assert client.queries == 2
+    assert first == second and first[0]['expires']
+    assert client.external_services_metrics['misses'] == 2
+
+
+def test_failed_refresh_keeps_valid_cache():
+    """Test a failed refresh keeps serving the still valid credentials."""
+    client = FakeClient([[turn(expires_in=3600)], TimeoutError('iq timeout')])
+
+    async def run():
+        await client.refresh_external_services()
+        services = await client.refresh_external_services()
+        client.cancel_external_services_refresh()
+        return services
+
+    assert asyncio.run(run())[0]['username'] == 'u'
+    assert client.get_cached_external_services()[0]['username'] == 'u'
+
+
+def test_credentials_are_never_served_after_expires(short_timings):
+    """Test short-lived credentials leave the cache at their 'expires', and calls query again."""
+    client = FakeClient([[turn(expires_in=0.3)], [{**turn(expires_in=3600), 'username': 'u2'}]])
+
+    async def run():
+        await client.refresh_external_services()
+        client.cancel_external_services_refresh()
+        assert client.get_cached_external_services()[0]['username'] == 'u'
+        await asyncio.sleep(0.4)
+        assert client.get_cached_external_services() is None
+        services = await client.get_call_external_services()
+        client.cancel_external_services_refresh()
+        return services
+
+    assert asyncio.run(run())[0]['username'] == 'u2'
+    assert client.queries == 2
+
+
+def test_already_expired_credentials_back_off_instead_of_looping():
+    """Test an 'expires' in the past (clock skew) is not served and refreshes back off, then recover."""
+    client = FakeClient([[turn(expires_in=-5)]] * 8 + [[turn(expires_in=3600)]])
+
+    async def run():
+        delays = []
+        for _ in range(9):
+            await client.refresh_external_services()
+            delays.append(round(client._external_services_timer.when() - asyncio.get_running_loop().time()))
+            assert (client.get_cached_external_services() is None) == (len(delays) < 9)
+        client.cancel_external_services_refresh()
+        return delays
+
+    delays = asyncio.run(run())
+
+    assert delays[:8] == [10, 20, 40, 80, 160, 320, 600, 600]
+    assert delays[8] == 3600 - external_services.EXTERNAL_SERVICES_REFRESH_AHEAD
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Unit tests for streaming attachment download (chunked AES-GCM, Range resume).
+
+Runs against a local aiohttp server.
+
+Run with: pytest tests/test_file_download.py -v
+"""
+
+import sys
+import os
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+pytest.importorskip('cryptography')
+import aiohttp
+from aiohttp import web
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from siproxylin.utils import file_download
+from siproxylin.utils.file_download import (
+    download_to_file, parse_attachment_url, part_path, DownloadError
+)
+
+
+KEY = bytes(range(32))
+IV = bytes(range(12))
+PLAINTEXT = os.urandom(300 * 1024 + 7)
+
+
+class FileServer:
+    """Serves one body with Range support, optionally dropping the first response midway."""
+
+    def __init__(self, body: bytes, drop_after: int = None):
+        self.body = body
+        self.drop_after = drop_after
+        self.range_starts = []
+
+    async def handle(self, request):
+        header = request.headers.get('Range')
+        start = int(header[len('bytes='):-1]) if header else 0
+        self.range_starts.append(start)
+
+        body = self.body[start:]
+        response = web.StreamResponse(status=206 if start else 200)
+        response.content_length = len(body)
+        await response.prepare(request)
+
+        if self.drop_after is not None and len(self.range_starts) == 1:
+            await response.write(body[:self.drop_after])
+            await asyncio.sleep(0.2)  # let the client consume what was sent
+            request.transport.close()
+            return response
+
+        await response.write(body)
+        await response.write_eof()
+        return response
+
+
+def run_download(server, dest, key=None, iv=None, progress=None):
+    """Start the server on a free port and download from it."""
+    async def run():
+        app = web.Application()
+        app.router.add_get('/file', server.handle)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            async with aiohttp.ClientSession() as session:
+                return await download_to_file(session, f'http://127.0.0.1:{port}/file', dest,
+                                              key, iv, progress=progress, chunk_size=16 * 1024)
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(run())
+
+
+@pytest.fixture(autouse=True)
+def no_retry_delay(monkeypatch):
+    monkeypatch.setattr(file_download, 'RETRY_DELAY', 0)
+
+
+def encrypt(plaintext):
+    return AESGCM(KEY).encrypt(IV, plaintext, None)  # ciphertext + 16 byte tag
+
+
+def test_parse_attachment_url():
+    """Test aesgcm:// URLs become https:// plus key material."""
+    fragment = IV.hex() + KEY.hex()
+    url, key, iv = parse_attachment_url(f'aesgcm://example.org/up/a.jpg#{fragment}')
+    assert (url, key, iv) == ('https://example.org/up/a.jpg', KEY, IV)
+    assert parse_attachment_url('https://example.org/b.png') == ('https://example.org/b.png', None, None)
+    with pytest.raises(ValueError):
+        parse_attachment_url('aesgcm://example.org/a.jpg#abcd')
+
+
+def test_plain_download_streams_to_file(tmp_path):
+    """Test plain download writes the body and reports progress."""
+    dest = tmp_path / 'plain.bin'
+    seen = []
+    size = run_download(FileServer(PLAINTEXT), dest, progress=lambda done, total: seen.append((done, total)))
+
+    assert size == len(PLAINTEXT)
+    assert dest.read_bytes() == PLAINTEXT
+    assert not part_path(dest).exists()
+    assert seen[-1] == (len(PLAINTEXT), len(PLAINTEXT))
+    assert len(seen) > 1
+
+
+def test_encrypted_download_decrypts_incrementally(tmp_path):
+    """Test aesgcm body is decrypted and the tag is not written."""
+    dest = tmp_path / 'video.mp4'
+    seen = []
+    size = run_download(FileServer(encrypt(PLAINTEXT)), dest, KEY, IV,
+                        progress=lambda done, total: seen.append(total))
+
+    assert size == len(PLAINTEXT)
+    assert dest.read_bytes() == PLAINTEXT
+    assert seen[-1] == len(PLAINTEXT)
+
+
+def test_tampered_ciphertext_is_rejected(tmp_path):
+    """Test a bad auth tag leaves neither the file nor a partial file."""
+    body = bytearray(encrypt(PLAINTEXT))
+    body[100] ^= 0xFF
+    dest = tmp_path / 'evil.jpg'
+
+    with pytest.raises(DownloadError):
+        run_download(FileServer(bytes(body)), dest, KEY, IV)
+    assert not dest.exists()
+    assert not part_path(dest).exists()
+
+
+def test_dropped_connection_resumes_with_range(tmp_path):
+    """Test an interrupted download continues where it stopped."""
+    server = FileServer(encrypt(PLAINTEXT), drop_after=100 * 1024)
+    dest = tmp_path / 'resume.bin'
+    run_download(server, dest, KEY, IV)
+
+    assert dest.read_bytes() == PLAINTEXT
+    assert server.range_starts[0] == 0
+    assert 0 < server.range_starts[1] <= 100 * 1024
+
+
+def test_leftover_part_file_is_resumed(tmp_path):
+    """Test a .part file from an earlier run is continued (GCM state rebuilt)."""
+    dest = tmp_path / 'restart.bin'
+    part_path(dest).write_bytes(PLAINTEXT[:123457])
+    server = FileServer(encrypt(PLAINTEXT))
+    run_download(server, dest, KEY, IV)
+
+    assert server.range_starts == [123457]
+    assert dest.read_bytes() == PLAINTEXT
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Unit tests for FileUploadMixin - streamed (XEP-0454 encrypted) uploads.
+
+Runs against a local aiohttp PUT endpoint.
+
+Run with: pytest tests/test_file_uploads.py -v
+"""
+
+import sys
+import os
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from drunk_xmpp.file_uploads import UPLOAD_CHUNK_SIZE, GCM_TAG_SIZE
+from upload_server import UploadServer, FakeClient, with_server
+
+
+def test_encrypted_upload_streams_valid_ciphertext(tmp_path):
+    """Test the streamed body decrypts with the key/IV from the aesgcm:// fragment."""
+    server = UploadServer()
+    plaintext = os.urandom(3 * UPLOAD_CHUNK_SIZE + 123)
+    source = tmp_path / 'photo.JPG'
+    source.write_bytes(plaintext)
+    progress = []
+
+    async def body(base_url):
+        client = FakeClient(base_url)
+        try:
+            return await client.upload_encrypted_file(
+                str(source), progress=lambda sent, total: progress.append((sent, total)))
+        finally:
+            await client.http_client.close()
+
+    url = asyncio.run(with_server(server, body))
+
+    assert url.startswith('aesgcm://')
+    path, fragment = url.split('#')
+    name = path.rsplit('/', 1)[1]
+    assert name.endswith('.jpg') and 'photo' not in name
+
+    iv, key = bytes.fromhex(fragment[:24]), bytes.fromhex(fragment[24:])
+    ciphertext = server.uploads[name]
+    assert AESGCM(key).decrypt(iv, ciphertext, None) == plaintext
+
+    # Content-Length known up front, no chunked transfer encoding
+    total = len(plaintext) + GCM_TAG_SIZE
+    assert int(server.headers[name]['Content-Length']) == total
+    assert 'Transfer-Encoding' not in server.headers[name]
+    assert progress[-1] == (total, total)
+    assert all(a[0] < b[0] for a, b in zip(progress, progress[1:]))
+
+
+def test_plain_upload_streams_file(tmp_path):
+    """Test unencrypted uploads are streamed with a Content-Length."""
+    server = UploadServer()
+    data = os.urandom(UPLOAD_CHUNK_SIZE + 1)
+    source = tmp_path / 'notes.bin'
+    source.write_bytes(data)
+
+    async def body(base_url):
+        client = FakeClient(base_url)
+        try:
+            return await client.upload_file(str(source))
+        finally:
+            await client.http_client.close()
+
+    url = asyncio.run(with_server(server, body))
+
+    assert url.endswith('/notes.bin')
+    assert server.uploads['notes.bin'] == data
+    assert int(server.headers['notes.bin']['Content-Length']) == len(data)
+
+
+def test_upload_can_be_cancelled(tmp_path):
+    """Test cancelling the uploading task aborts the PUT."""
+    server = UploadServer(delay=0.05)
+    source = tmp_path / 'big.bin'
+    source.write_bytes(os.urandom(16 * UPLOAD_CHUNK_SIZE))
+    started = []
+
+    async def body(base_url):
+        client = FakeClient(base_url)
+        task = asyncio.ensure_future(client.upload_encrypted_file(
+            str(source), progress=lambda sent, total: started.append(sent)))
+        while not started:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            with pytest.raises(asyncio.CancelledError):
+                await task
+        finally:
+            await client.http_client.close()
+
+    asyncio.run(with_server(server, body))
+
+    assert server.uploads == {}
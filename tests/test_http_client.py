@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Unit tests for HttpClient - pooled per-account HTTP session for uploads/downloads.
+
+Runs against a local aiohttp server.
+
+Run with: pytest tests/test_http_client.py -v
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from drunk_xmpp.http_client import HttpClient
+from upload_server import UploadServer, FakeClient, with_server
+
+
+def test_uploads_and_downloads_share_one_connection(tmp_path):
+    """Test repeated transfers to the same host reuse the pooled connection."""
+    server = UploadServer()
+    first = tmp_path / 'first.txt'
+    first.write_bytes(b'hello')
+
+    async def body(base_url):
+        client = FakeClient(base_url)
+        url1 = await client.upload_file(str(first))
+        url2 = await client._upload_data('second.bin', b'world', 5, 'application/octet-stream')
+        async with client.http_client.session.get(url2) as response:
+            downloaded = await response.read()
+        await client.http_client.close()
+        return url1, downloaded
+
+    url1, downloaded = asyncio.run(with_server(server, body))
+
+    assert url1.endswith('/first.txt')
+    assert server.uploads == {'first.txt': b'hello', 'second.bin': b'world'}
+    assert downloaded == b'world'
+    assert len(set(server.client_ports)) == 1
+
+
+def test_upload_over_server_limit_is_rejected(tmp_path):
+    """Test files above the announced max-file-size are not uploaded."""
+    async def body(base_url):
+        client = FakeClient(base_url)
+        client.plugins['xep_0363'].max_file_size = 3
+        with pytest.raises(RuntimeError):
+            await client._upload_data('big.bin', b'toolarge', 8, 'application/octet-stream')
+
+    asyncio.run(with_server(UploadServer(), body))
+
+
+def test_session_is_recreated_after_close():
+    """Test a closed session is replaced on next use."""
+    async def body():
+        client = HttpClient(limit_per_host=2)
+        first = client.session
+        assert first.connector.limit_per_host == 2
+        await client.close()
+        second = client.session
+        await client.close()
+        return first, second
+
+    first, second = asyncio.run(body())
+    assert first is not second
+
+
+def test_proxy_uses_proxy_connector():
+    """Test the account proxy is applied to the HTTP session."""
+    aiohttp_socks = pytest.importorskip('aiohttp_socks')
+
+    async def body():
+        client = HttpClient(proxy_url='socks5://127.0.0.1:9050')
+        connector = client.session.connector
+        await client.close()
+        return connector
+
+    assert isinstance(asyncio.run(body()), aiohttp_socks.ProxyConnector)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Unit tests for pre-rendered message bodies (utils/message_markup.py and the
+message_html table), including a 10k mixed-markup message benchmark.
+
+Run with: pytest tests/test_message_html.py -v -s
+"""
+
+import sys
+import time
+import random
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from siproxylin.db.database import Database
+from siproxylin.utils.message_markup import (
+    RENDERER_VERSION, URL_COLOR, render_body_html, apply_url_color
+)
+
+
+SNIPPETS = ['see *this*', '_really_ nice', '~not~ that', 'run `make test`', 'https://example.org/a?b=1',
+            'www.siproxylin.org', '<html> & stuff', 'plain words here', 'line\nbreak',
+            '```python\ndef f():\n\treturn 1\n```', 'ok']
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(tmp_path / 'test.db')
+    database.initialize()
+    database.execute("INSERT INTO account (id, bare_jid) VALUES (1, 'me@example.org')")
+    database.execute("INSERT INTO jid (id, bare_jid) VALUES (1, 'peer@example.org')")
+    database.commit()
+    yield database
+    database.close()
+
+
+def add_messages(db, bodies):
+    db.executemany("""
+        INSERT INTO message (id, account_id, counterpart_id, direction, type, time, local_time, body)
+        VALUES (?, 1, 1, 0, 0, ?, ?, ?)
+    """, [(i + 1, 1000 + i, 1000 + i, body) for i, body in enumerate(bodies)])
+    db.commit()
+
+
+def load_html(db):
+    """Same JOIN as the chat view: {message.id: html} for the current renderer version."""
+    rows = db.fetchall("""
+        SELECT m.id, mh.html AS body_html, mh.renderer_version AS body_html_version
+        FROM message m
+        LEFT JOIN message_html mh ON mh.message_id = m.id
+    """)
+    return {row['id']: row['body_html'] for row in rows if row['body_html_version'] == RENDERER_VERSION}
+
+
+def test_render_is_theme_independent():
+    """Test links carry a color placeholder and code is kept out of styling/linking."""
+    html = render_body_html('*hi* https://example.org `x_y_` ```\nwww.a.com *b*\n```')
+
+    assert '<b>hi</b>' in html and '<code' in html and 'x_y_' in html
+    assert html.count('<a href=') == 1 and f'color: {URL_COLOR};' in html
+    assert apply_url_color(html, '#112233').count('color: #112233;') == 1
+
+
+def test_correction_and_delete_invalidate_stored_html(db):
+    """Test a body update (XEP-0308 correction) or delete drops the stored rendering."""
+    add_messages(db, ['*one*', 'two', 'three'])
+    db.store_message_html([(m, render_body_html(b)) for m, b in [(1, '*one*'), (2, 'two'), (3, 'three')]],
+                          RENDERER_VERSION)
+
+    db.execute("UPDATE message SET marked = 2 WHERE id = 1")  # status change keeps it
+    db.execute("UPDATE message SET body = '_two_' WHERE id = 2")
+    db.execute("DELETE FROM message WHERE id = 3")
+    db.commit()
+
+    assert load_html(db) == {1: '<b>one</b>'}
+    assert db.fetchone("SELECT COUNT(*) AS n FROM message_html")['n'] == 1
+
+
+def test_outdated_renderer_version_is_ignored_and_pruned(db):
+    """Test rows of another renderer version are not served and are pruned by maintenance."""
+    add_messages(db, ['old'])
+    db.store_message_html([(1, 'stale')], RENDERER_VERSION - 1)
+
+    assert load_html(db) == {}
+    db.run_maintenance()
+    assert db.fetchone("SELECT COUNT(*) AS n FROM message_html")['n'] == 0
+
+
+def test_benchmark_10k_mixed_markup_messages(db):
+    """Benchmark: cold render of 10k messages vs. reading the stored renderings."""
+    rng = random.Random(7)
+    bodies = [' '.join(rng.choice(SNIPPETS) for _ in range(rng.randint(1, 6))) for _ in range(10000)]
+    add_messages(db, bodies)
+
+    start = time.perf_counter()
+    rendered = [apply_url_color(render_body_html(body), '#4ea1f3') for body in bodies]
+    render_s = time.perf_counter() - start
+
+    db.store_message_html([(i + 1, render_body_html(body)) for i, body in enumerate(bodies)], RENDERER_VERSION)
+
+    start = time.perf_counter()
+    stored = load_html(db)
+    from_db = [apply_url_color(stored[i + 1], '#4ea1f3') for i in range(len(bodies))]
+    stored_s = time.perf_counter() - start
+
+    print(f"\n10k messages: regex render {render_s * 1000:.1f} ms, "
+          f"stored (JOIN + link color) {stored_s * 1000:.1f} ms")
+
+    assert from_db == rendered
+    assert stored_s < render_s
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Unit tests for MessageRetryHandler - batched MAM reconciliation of pending messages.
+
+Run with: pytest tests/test_message_retry.py -v
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+pytest.importorskip('PySide6')
+
+from siproxylin.services.message_retry import MessageRetryHandler
+
+
+def pending(msg_id, jid, time, origin_id, msg_type=0):
+    return {
+        'id': msg_id, 'counterpart_jid': jid, 'type': msg_type, 'time': time,
+        'origin_id': origin_id, 'body': f'body {msg_id}', 'encryption': 0,
+        'retry_count': 0, 'first_retry_attempt': None,
+    }
+
+
+class FakeDB:
+    """Records the retry handler's database updates."""
+
+    def __init__(self, messages):
+        self.messages = messages
+        self.delivered = []
+        self.retried = []
+
+    def get_pending_messages(self, account_id):
+        return self.messages
+
+    def initialize_retry_tracking(self, message_id):
+        pass
+
+    def mark_message_delivered(self, message_id):
+        self.delivered.append(message_id)
+
+    def increment_retry_count(self, message_id):
+        self.retried.append(message_id)
+
+    def update_message_origin_id(self, message_id, origin_id):
+        pass
+
+
+class FakeClient:
+    """DrunkXMPP stand-in with a MAM archive and slow sends."""
+
+    def __init__(self, archive):
+        self.archive = archive
+        self.rooms = {}
+        self.mam_queries = []
+        self.sent = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def retrieve_archived_ids(self, jid, start=None, end=None, with_jid=None):
+        self.mam_queries.append((jid, start, end))
+        return self.archive.get(jid, set())
+
+    async def send_private_message(self, jid, body):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        self.sent.append((jid, body))
+        return f'new-{body}'
+
+
+def test_one_mam_query_per_conversation():
+    """Test pending messages are reconciled with one MAM query per counterpart."""
+    messages = [pending(i, f'peer{i % 3}@example.org', 1000 + i * 60, f'o{i}') for i in range(30)]
+    db = FakeDB(messages)
+    client = FakeClient({'peer0@example.org': {'o0', 'o3'}, 'peer1@example.org': {'o1'}})
+
+    stats = asyncio.run(MessageRetryHandler().retry_pending_messages_for_account(1, client, db))
+
+    assert len(client.mam_queries) == 3
+    jid, start, end = next(q for q in client.mam_queries if q[0] == 'peer0@example.org')
+    assert start.timestamp() == 1000 - MessageRetryHandler.MAM_QUERY_WINDOW_SECONDS
+    assert end.timestamp() == 1000 + 27 * 60 + MessageRetryHandler.MAM_QUERY_WINDOW_SECONDS
+
+    assert sorted(db.delivered) == [0, 1, 3]
+    assert stats['found_in_mam'] == 3
+    assert stats['resent'] == 27
+    assert stats['total'] == 30 and stats['remaining'] == 0
+
+
+def test_resends_preserve_order_with_bounded_concurrency():
+    """Test resends stay in order per conversation while conversations run concurrently."""
+    messages = [pending(i, f'peer{i % 6}@example.org', 1000 + i, f'o{i}') for i in range(24)]
+    client = FakeClient({})
+    progress = []
+
+    asyncio.run(MessageRetryHandler().retry_pending_messages_for_account(
+        1, client, FakeDB(messages), progress=progress.append))
+
+    for peer in range(6):
+        bodies = [body for jid, body in client.sent if jid == f'peer{peer}@example.org']
+        assert bodies == [f'body {i}' for i in range(peer, 24, 6)]
+    assert 1 < client.max_in_flight <= MessageRetryHandler.RETRY_CONCURRENCY
+    assert [p['remaining'] for p in progress] == sorted((p['remaining'] for p in progress), reverse=True)
+    assert all(p['remaining'] > 0 for p in progress)
+
+
+def test_bad_row_fails_alone():
+    """Test a row that can't be prepared is counted as failed and the others are still retried."""
+    messages = [pending(i, 'peer@example.org', 1000 + i, f'o{i}') for i in range(3)]
+    messages[1]['first_retry_attempt'] = 'not a timestamp'
+    client = FakeClient({})
+    db = FakeDB(messages)
+
+    stats = asyncio.run(MessageRetryHandler().retry_pending_messages_for_account(1, client, db))
+
+    assert stats['failed'] == 1
+    assert stats['resent'] == 2 and db.retried == [0, 2]
+    assert stats['remaining'] == 0
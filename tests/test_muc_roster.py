@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Unit tests for MUC occupant rosters with coalesced change notifications
+(drunk_xmpp/muc_roster.py), which replace the 2-second participant polling,
+including a 5,000-occupant join replay benchmark.
+
+Run with: pytest tests/test_muc_roster.py -v -s
+"""
+
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from slixmpp.xmlstream import ET
+from drunk_xmpp import DrunkXMPP
+from drunk_xmpp.muc_roster import MucRosterTracker, Occupant, STATUS_NICK_CHANGE
+
+
+ROOM = 'room@conference.example.org'
+
+
+def join(tracker, count, room=ROOM):
+    for i in range(count):
+        tracker.on_presence(room, f'user{i}', True, jid=f'user{i}@example.org/res')
+
+
+def occupant_presence(nick, jid, status_code=None, room=ROOM):
+    status = f"<status code='{status_code}'/>" if status_code else ''
+    return ET.fromstring(
+        f"<presence xmlns='jabber:client' from='{room}/{nick}' to='me@example.org/res'>"
+        f"<x xmlns='http://jabber.org/protocol/muc#user'>"
+        f"<item affiliation='none' role='participant' jid='{jid}/res'/>{status}</x></presence>"
+    )
+
+
+def test_count_deduplicates_by_real_jid():
+    """Test one person with two nicks counts once, anonymous occupants count individually."""
+    tracker = MucRosterTracker()
+    tracker.on_presence(ROOM, 'alice', True, jid='alice@example.org/phone')
+    tracker.on_presence(ROOM, 'alice_', True, jid='alice@example.org/laptop')
+    tracker.on_presence(ROOM, 'anon1', True)
+    tracker.on_presence(ROOM, 'anon2', True)
+    assert tracker.get(ROOM).count == 3
+
+    tracker.on_presence(ROOM, 'alice', False)
+    assert tracker.get(ROOM).count == 3
+    tracker.on_presence(ROOM, 'alice_', False)
+    tracker.on_presence(ROOM, 'anon1', False)
+    assert tracker.get(ROOM).count == 1
+
+
+def test_changes_are_coalesced_per_window():
+    """Test join, role change, nick change and leave arrive as one delta per room."""
+    batches = []
+
+    async def scenario():
+        tracker = MucRosterTracker(lambda room, changes: batches.append((room, changes)), coalesce=0.01)
+        tracker.on_presence(ROOM, 'alice', True, jid='alice@example.org')
+        tracker.on_presence(ROOM, 'bob', True, jid='bob@example.org')
+        tracker.on_presence(ROOM, 'carol', True)
+        tracker.joined(ROOM)
+
+        tracker.on_presence(ROOM, 'alice', True, jid='alice@example.org', role='moderator')
+        tracker.on_presence(ROOM, 'bob', False, jid='bob@example.org',
+                            status_codes=[STATUS_NICK_CHANGE], new_nick='robert')
+        tracker.on_presence(ROOM, 'robert', True, jid='bob@example.org')
+        tracker.on_presence(ROOM, 'carol', False)
+        await asyncio.sleep(0.05)
+        return tracker
+
+    tracker = asyncio.run(scenario())
+
+    assert [set(changes) for _, changes in batches] == [{'alice', 'bob', 'carol'},
+                                                       {'alice', 'bob', 'robert', 'carol'}]
+    changes = batches[1][1]
+    assert changes['alice'].role == 'moderator'
+    assert changes['bob'] is None and changes['carol'] is None
+    assert changes['robert'] == Occupant('robert', 'bob@example.org', 'participant', 'none')
+    assert sorted(tracker.get(ROOM).occupants) == ['alice', 'robert']
+
+
+def test_idle_room_costs_no_notifications():
+    """Test status/show presences in an idle 1,000-occupant room trigger no view updates."""
+    batches = []
+    tracker = MucRosterTracker(lambda room, changes: batches.append(changes))
+    join(tracker, 1000)
+    tracker.joined(ROOM)
+    assert tracker.stats['flushes'] == 1 and len(batches[0]) == 1000
+
+    # Every occupant re-sends presence (away/back, status text) ten times
+    for _ in range(10):
+        join(tracker, 1000)
+
+    assert tracker.stats['presences'] == 11000
+    assert tracker.stats['flushes'] == 1 and len(batches) == 1
+    assert tracker.get(ROOM).count == 1000
+
+
+def test_leaving_room_reports_everyone_gone():
+    """Test room_left() clears the roster and reports all nicks as left."""
+    batches = []
+    tracker = MucRosterTracker(lambda room, changes: batches.append(changes))
+    join(tracker, 3)
+    tracker.joined(ROOM)
+
+    tracker.room_left(ROOM)
+
+    assert tracker.get(ROOM) is None
+    assert batches[-1] == {'user0': None, 'user1': None, 'user2': None}
+
+
+def test_join_is_buffered_until_self_presence():
+    """Test a join's occupants are held back and delivered once at the 110 boundary."""
+    batches = []
+    tracker = MucRosterTracker(lambda room, changes: batches.append(changes))
+    join(tracker, 50)
+    assert tracker.is_joining(ROOM) and not batches
+    assert tracker.get(ROOM).count == 50  # Roster itself is already usable
+
+    tracker.joined(ROOM)
+    assert not tracker.is_joining(ROOM) and len(batches) == 1 and len(batches[0]) == 50
+
+    # A join that fails before self-presence reports nothing
+    join(tracker, 5, room='other@conference.example.org')
+    tracker.room_left('other@conference.example.org')
+    assert len(batches) == 1
+
+
+def test_benchmark_5000_occupant_join():
+    """Benchmark: replay a 5,000-occupant join through DrunkXMPP, 100 stanzas per loop iteration."""
+    occupants = [occupant_presence(f'user{i}', f'user{i}@example.org') for i in range(5000)]
+    stanzas = occupants + [occupant_presence('me', 'me@example.org', status_code=110)]
+
+    async def replay(buffer_joins):
+        notifications = {'participants': [], 'presence': 0}
+
+        async def on_participants(room, changes):
+            notifications['participants'].append(len(changes))
+
+        async def on_presence(jid, show):
+            notifications['presence'] += 1
+
+        client = DrunkXMPP('me@example.org', 'secret', rooms={ROOM: {'nick': 'me'}}, enable_omemo=False,
+                           on_muc_participants_changed_callback=on_participants,
+                           on_presence_changed_callback=on_presence)
+        client.muc_roster.buffer_joins = buffer_joins
+
+        longest = total = 0.0
+        for i in range(0, len(stanzas), 100):
+            start = time.perf_counter()
+            for stanza in stanzas[i:i + 100]:
+                client._spawn_event(stanza)
+            while len(asyncio.all_tasks()) > 1:  # Run the handlers this read triggered
+                await asyncio.sleep(0)
+            elapsed = time.perf_counter() - start
+            longest, total = max(longest, elapsed), total + elapsed
+            await asyncio.sleep(0.01)  # Network gap between reads
+
+        await asyncio.sleep(client.muc_roster.coalesce + 0.05)
+        return client, notifications, total, longest
+
+    client, buffered, total_s, longest_s = asyncio.run(replay(True))
+    _, windowed, windowed_total_s, _ = asyncio.run(replay(False))
+
+    print(f"\n5,000-occupant join: {total_s * 1000:.0f} ms main-thread time, longest block "
+          f"{longest_s * 1000:.1f} ms, {len(buffered['participants'])} participant signal(s); "
+          f"window-only: {windowed_total_s * 1000:.0f} ms, {len(windowed['participants'])} signals")
+
+    assert ROOM in client.joined_rooms and client.muc_roster.get(ROOM).count == 5001
+    assert buffered['participants'] == [5001]
+    assert buffered['presence'] == 0 and windowed['presence'] == 0  # Occupants are not contacts
+    assert len(windowed['participants']) > 1 and sum(windowed['participants']) == 5001
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Unit tests for OMEMOStorageDB - cached reads, committed writes.
+
+Run with: pytest tests/test_omemo_storage.py -v
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from siproxylin.db.database import Database
+from siproxylin.db.omemo_storage import OMEMOStorageDB
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    database = Database(tmp_path / 'test.db')
+    database.initialize()
+    database.execute("INSERT INTO account (id, bare_jid) VALUES (1, 'me@example.org')")
+    database.commit()
+    database.close()
+    return tmp_path / 'test.db'
+
+
+@pytest.fixture
+def db(db_path):
+    database = Database(db_path)
+    yield database
+    database.close()
+
+
+def stored(db_path):
+    """Read omemo_storage as a fresh process would after a crash."""
+    database = Database(db_path)
+    try:
+        rows = database.fetchall("SELECT key, value FROM omemo_storage WHERE account_id = 1")
+        return {row['key']: row['value'] for row in rows}
+    finally:
+        database.close()
+
+
+def test_loads_are_cached(db):
+    """Test values (and misses) are read from SQLite only once."""
+    db.execute("INSERT INTO omemo_storage (account_id, key, value) VALUES (1, 'bundle', '[1, 2]')")
+    db.commit()
+    storage = OMEMOStorageDB(db, 1)
+
+    async def run():
+        first = (await storage.load('bundle')).from_just()
+        first.append(3)  # returned values are copies
+        db.execute("DELETE FROM omemo_storage")
+        return (await storage.load('bundle')).from_just(), (await storage.load('missing')).is_nothing
+
+    assert asyncio.run(run()) == ([1, 2], True)
+
+
+def test_every_write_is_committed_before_returning(db, db_path):
+    """Test each store/delete is visible to a fresh connection as soon as its await returns."""
+    storage = OMEMOStorageDB(db, 1)
+
+    async def run():
+        await storage.store('ratchet', 1)
+        assert stored(db_path) == {'ratchet': '1'}
+        await storage.store('prekeys', [1, 2, 3])
+        assert stored(db_path) == {'ratchet': '1', 'prekeys': '[1, 2, 3]'}
+        # One decryption step: advance the ratchet, consume a pre-key
+        await storage.store('ratchet', 2)
+        assert stored(db_path)['ratchet'] == '2'
+        await storage.store('prekeys', [2, 3])
+        assert stored(db_path)['prekeys'] == '[2, 3]'
+        await storage.delete('prekeys')
+        assert stored(db_path) == {'ratchet': '2'}
+
+    asyncio.run(run())
+
+
+def test_failed_write_raises_and_keeps_cache_consistent(db):
+    """Test a write that can't be committed fails the call instead of being reported as stored."""
+    storage = OMEMOStorageDB(db, 1)
+
+    async def run():
+        await storage.store('session', {'counter': 1})
+        db.execute("DROP TABLE omemo_storage")
+        with pytest.raises(Exception):
+            await storage.store('session', {'counter': 2})
+        return (await storage.load('session')).from_just()
+
+    assert asyncio.run(run()) == {'counter': 1}
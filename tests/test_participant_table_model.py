@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the MUC participant table: occupant changes insert, remove or
+update only their own rows (ParticipantTableModel), filtering follows them
+(ParticipantFilterProxy), and changes before the first load aren't dropped.
+
+Run with: pytest tests/test_participant_table_model.py -v
+"""
+
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+pytest.importorskip('PySide6')
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication
+
+from siproxylin.core.barrels.muc import Participant
+from siproxylin.gui.models import ParticipantTableModel, ParticipantFilterProxy
+from siproxylin.gui.muc_details_dialog import MUCDetailsDialog
+
+
+ROOM = 'room@conference.example.org'
+
+
+@pytest.fixture(scope='module')
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def occupant(i, **fields):
+    fields.setdefault('role', 'participant')
+    fields.setdefault('affiliation', 'none')
+    return Participant(nick=f'nick{i}', jid=f'user{i}@example.org/res', **fields)
+
+
+def record_changes(model):
+    model.changes = []
+    model.dataChanged.connect(lambda first, last, roles=(): model.changes.append(
+        ('changed', first.row(), last.row())))
+    model.rowsInserted.connect(lambda parent, first, last: model.changes.append(('inserted', first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: model.changes.append(('removed', first, last)))
+    model.modelReset.connect(lambda: model.changes.append(('reset',)))
+
+
+@pytest.fixture
+def dialog(app):
+    """
+    Just the participant-list state of MUCDetailsDialog: 300 occupants and
+    one offline owner, loaded, with a recorder of every model notification.
+    """
+    model = ParticipantTableModel()
+    model.reset([MUCDetailsDialog._online_entry(occupant(i)) for i in range(300)]
+                + [MUCDetailsDialog._offline_entry('owner@example.org', 'owner')])
+    record_changes(model)
+    state = SimpleNamespace(
+        _destroyed=False, account_id=1, room_jid=ROOM,
+        _participants_loaded=True, _participants_loading=False, loads=0,
+        participants_model=model, affiliated_users={'owner@example.org': 'owner'},
+        _online_entry=MUCDetailsDialog._online_entry, _offline_entry=MUCDetailsDialog._offline_entry,
+        _update_participant_count=lambda: None, _show_no_participants=lambda message: None,
+    )
+    state._load_participants = lambda: setattr(state, 'loads', state.loads + 1)
+    return state
+
+
+def apply(dialog, changes):
+    MUCDetailsDialog._on_participants_changed(dialog, 1, ROOM, changes)
+
+
+def test_role_change_updates_only_its_row(dialog):
+    """Test a role change emits one dataChanged for the occupant's own row."""
+    apply(dialog, {'nick42': occupant(42, role='moderator')})
+
+    model = dialog.participants_model
+    assert model.changes == [('changed', 42, 42)]
+    assert model.index(42, 3).data() == 'moderator'
+
+
+def test_join_and_leave_insert_and_remove_one_row(dialog):
+    """Test a join appends one row and a leave removes one row - no reset."""
+    apply(dialog, {'nick300': occupant(300), 'nick7': None})
+
+    model = dialog.participants_model
+    assert model.changes == [('inserted', 301, 301), ('removed', 7, 7)]
+    assert model.rowCount() == 301
+    assert model.get(('nick', 'nick8')) is model.participant(7)
+
+
+def test_affiliated_user_moves_between_offline_and_online(dialog):
+    """Test the offline owner row is replaced when they join and comes back when they leave."""
+    owner = Participant(nick='boss', jid='owner@example.org/laptop', role='moderator', affiliation='owner')
+
+    apply(dialog, {'boss': owner})
+    model = dialog.participants_model
+    assert model.get(('jid', 'owner@example.org')) is None
+    assert model.get(('nick', 'boss'))['jid'] == 'owner@example.org'
+
+    apply(dialog, {'boss': None})
+    assert model.get(('nick', 'boss')) is None
+    assert model.get(('jid', 'owner@example.org'))['status'] == 'Offline'
+    assert ('reset',) not in model.changes
+
+
+def test_changes_before_first_load_trigger_a_load(dialog):
+    """Test occupant changes while nothing is loaded start a load instead of being dropped."""
+    dialog._participants_loaded = False
+
+    dialog._participants_loading = True
+    apply(dialog, {'nick1': None})  # The running load reads the occupants at its end
+    assert dialog.loads == 0
+
+    dialog._participants_loading = False
+    apply(dialog, {'nick1': None})
+    assert dialog.loads == 1
+    assert dialog.participants_model.changes == []
+
+
+def test_proxy_follows_row_changes(app):
+    """Test filtered views pick up inserted/updated rows without a refilter."""
+    model = ParticipantTableModel()
+    model.reset([MUCDetailsDialog._online_entry(occupant(i)) for i in range(10)])
+    proxy = ParticipantFilterProxy(lambda p: p['role'] == 'moderator')
+    proxy.setSourceModel(model)
+    assert proxy.rowCount() == 0
+
+    model.upsert(MUCDetailsDialog._online_entry(occupant(3, role='moderator')))
+    model.upsert(MUCDetailsDialog._online_entry(occupant(10, role='moderator')))
+
+    assert [p['nickname'] for p in proxy.participants()] == ['nick3', 'nick10']
+    assert proxy.index(0, 0).data(Qt.UserRole)['jid'] == 'user3@example.org'
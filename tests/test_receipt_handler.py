@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Unit tests for ReceiptHandler - coalesced receipt/marker/ACK updates.
+
+Run with: pytest tests/test_receipt_handler.py -v
+"""
+
+import sys
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from siproxylin.db.database import Database
+from siproxylin.services.receipt_handler import ReceiptHandler
+
+
+PEER = 'peer@example.org'
+OTHER = 'other@example.org'
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(tmp_path / 'test.db')
+    database.initialize()
+    database.execute("INSERT INTO account (id, bare_jid) VALUES (1, 'me@example.org')")
+    database.execute("INSERT INTO jid (id, bare_jid) VALUES (1, ?), (2, ?)", (PEER, OTHER))
+    database.execute("INSERT INTO conversation (id, account_id, jid_id, type) VALUES (1, 1, 1, 0), (2, 1, 2, 0)")
+    database.commit()
+    yield database
+    database.close()
+
+
+def add_message(db, msg_id, counterpart_id, time, marked=0, direction=1):
+    """Insert a message with origin_id 'o<id>' and content item id 100 + id."""
+    db.execute(
+        """
+        INSERT INTO message (id, origin_id, account_id, counterpart_id, direction, type,
+                             time, local_time, body, marked)
+        VALUES (?, ?, 1, ?, ?, 0, ?, ?, 'hi', ?)
+        """,
+        (msg_id, f'o{msg_id}', counterpart_id, direction, time, time, marked)
+    )
+    db.execute(
+        "INSERT INTO content_item (id, conversation_id, time, local_time, content_type, foreign_id) "
+        "VALUES (?, ?, ?, ?, 0, ?)",
+        (100 + msg_id, counterpart_id, time, time, msg_id)
+    )
+    db.commit()
+
+
+def marks(db):
+    return {row['id']: row['marked'] for row in db.fetchall("SELECT id, marked FROM message")}
+
+
+def test_burst_is_applied_once_per_conversation(db):
+    """Test a burst of ACKs/receipts/markers becomes one transaction and one update per chat."""
+    for i in range(1, 11):
+        add_message(db, i, 1, 1000 + i)
+    add_message(db, 11, 2, 1000)
+    add_message(db, 12, 1, 1005, direction=0)  # incoming - never marked
+
+    updates = []
+    handler = ReceiptHandler(db, on_update=lambda *args: updates.append(args))
+    commits = []
+    db.connection.set_trace_callback(lambda sql: commits.append(sql) if sql == 'COMMIT' else None)
+
+    async def run():
+        for i in range(1, 11):
+            handler.on_server_ack(1, f'o{i}')
+            handler.on_delivery_receipt(1, PEER, f'o{i}')
+        handler.on_server_ack(1, 'o11')
+        handler.on_displayed_marker(1, PEER, 'o3')
+        handler.on_displayed_marker(1, PEER, 'o6')
+        assert updates == [] and handler.pending_count == 23
+        await asyncio.sleep(handler.delay * 3)
+
+    asyncio.run(run())
+    db.connection.set_trace_callback(None)
+
+    assert len(commits) == 1
+    assert handler.pending_count == 0
+    expected = {i: 7 if i <= 6 else 2 for i in range(1, 11)}
+    assert marks(db) == {**expected, 11: 1, 12: 0}
+    assert sorted(updates) == [
+        (1, OTHER, {111: 1}),
+        (1, PEER, {100 + i: marked for i, marked in expected.items()}),
+    ]
+
+
+def test_statuses_only_move_up(db):
+    """Test late receipts don't downgrade READ messages and errors stay errors."""
+    add_message(db, 1, 1, 1000, marked=7)
+    add_message(db, 2, 1, 1001, marked=8)
+    add_message(db, 3, 1, 1002, marked=1)
+    handler = ReceiptHandler(db)
+
+    handler.on_delivery_receipt(1, PEER, 'o1')  # no running loop: applied right away
+    handler.on_server_ack(1, 'o2')
+    handler.on_displayed_marker(1, PEER, 'o3')
+
+    assert marks(db) == {1: 7, 2: 8, 3: 7}
+
+
+def test_unknown_ids_are_ignored(db):
+    """Test markers for unknown messages don't update or notify."""
+    add_message(db, 1, 1, 1000)
+    updates = []
+    handler = ReceiptHandler(db, on_update=lambda *args: updates.append(args))
+
+    handler.on_displayed_marker(1, PEER, 'missing')
+    handler.on_delivery_receipt(1, OTHER, 'o1')  # right id, wrong conversation
+
+    assert marks(db) == {1: 0}
+    assert updates == []
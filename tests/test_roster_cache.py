@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the persisted roster cache (XEP-0237 roster versioning).
+
+Run with: pytest tests/test_roster_cache.py -v
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from siproxylin.db.database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = Database(tmp_path / 'test.db')
+    database.initialize()
+    database.execute("INSERT INTO account (id, bare_jid) VALUES (1, 'me@example.org')")
+    database.commit()
+    yield database
+    database.close()
+
+
+def roster(*jids, subscription='both'):
+    return {jid: {'name': jid.split('@')[0], 'subscription': subscription, 'ask': None} for jid in jids}
+
+
+def count_changes(db, fn):
+    """Run fn and return the number of rows it changed in the database."""
+    before = db.connection.total_changes
+    fn()
+    return db.connection.total_changes - before
+
+
+def test_full_roster_is_cached_with_version(db):
+    """Test a full roster result is stored and read back with its version."""
+    changed, gone = db.apply_roster(1, roster('a@example.org', 'b@example.org'), version='v1', replace=True)
+
+    version, items = db.get_roster_cache(1)
+    assert version == 'v1'
+    assert sorted(changed) == ['a@example.org', 'b@example.org']
+    assert gone == []
+    assert items['a@example.org'] == {'name': 'a', 'subscription': 'both', 'ask': None}
+
+
+def test_unchanged_roster_writes_nothing(db):
+    """Test re-applying the same roster and version touches no rows."""
+    items = roster(*(f'user{i}@example.org' for i in range(200)))
+    db.apply_roster(1, items, version='v1', replace=True)
+
+    result = []
+    writes = count_changes(db, lambda: result.append(
+        db.apply_roster(1, items, version='v1', replace=True)))
+
+    assert writes == 0
+    assert result == [([], [])]
+
+
+def test_push_applies_delta_only(db):
+    """Test roster pushes upsert/remove single items and bump the version."""
+    db.apply_roster(1, roster('a@example.org', 'b@example.org'), version='v1', replace=True)
+
+    changed, gone = db.apply_roster(1, roster('c@example.org', subscription='to'), version='v2')
+    assert changed == ['c@example.org'] and gone == []
+
+    changed, gone = db.apply_roster(1, {}, removed=['a@example.org'], version='v3')
+    assert changed == [] and gone == ['a@example.org']
+
+    version, items = db.get_roster_cache(1)
+    assert version == 'v3'
+    assert set(items) == {'b@example.org', 'c@example.org'}
+    assert items['c@example.org']['subscription'] == 'to'
+
+
+def test_full_roster_replaces_cache_but_keeps_local_columns(db):
+    """Test a full result drops missing contacts and preserves blocked/pending-in flags."""
+    db.apply_roster(1, roster('a@example.org', 'b@example.org'), version='v1', replace=True)
+    db.execute("""
+        UPDATE roster SET blocked = 1
+        WHERE jid_id = (SELECT id FROM jid WHERE bare_jid = 'b@example.org')
+    """)
+    db.execute("INSERT INTO jid (bare_jid) VALUES ('stranger@example.org')")
+    db.execute("""
+        INSERT INTO roster (account_id, jid_id, they_requested_subscription)
+        VALUES (1, (SELECT id FROM jid WHERE bare_jid = 'stranger@example.org'), 1)
+    """)
+    db.commit()
+
+    renamed = roster('b@example.org')
+    renamed['b@example.org']['name'] = 'Bob'
+    changed, gone = db.apply_roster(1, renamed, version='v9', replace=True)
+
+    assert changed == ['b@example.org']
+    assert gone == ['a@example.org']
+    row = db.fetchone("""
+        SELECT r.name, r.blocked FROM roster r JOIN jid j ON r.jid_id = j.id
+        WHERE j.bare_jid = 'b@example.org'
+    """)
+    assert (row['name'], row['blocked']) == ('Bob', 1)
+    assert 'stranger@example.org' in db.get_roster_cache(1)[1]
+
+
+def test_clear_roster_version(db):
+    """Test the stored version can be dropped to force a full fetch."""
+    db.apply_roster(1, roster('a@example.org'), version='v1', replace=True)
+    db.clear_roster_version(1)
+
+    version, items = db.get_roster_cache(1)
+    assert version is None
+    assert set(items) == {'a@example.org'}
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the spell check verdict cache and budgeted SpellChecker
+(used by EnchantHighlighter), including a 5,000-word paste benchmark.
+
+Run with: pytest tests/test_spell_cache.py -v -s
+"""
+
+import sys
+import re
+import time
+import random
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from siproxylin.utils.spell_cache import SpellCache, SpellChecker, iter_words
+
+
+VOCABULARY = ['hello', 'world', "don't", 'message', 'tomorrow', 'meeting', 'the', 'of',
+              'conference', 'encryption', 'a', 'room', 'call', 'audio', 'server', 'later']
+TYPOS = ['teh', 'recieve', 'tommorow', 'mesage']
+
+
+class FakeDict:
+    """enchant.Dict stand-in with a per-lookup cost."""
+
+    def __init__(self, words, cost=300):
+        self.words = set(words)
+        self.cost = cost
+        self.calls = 0
+
+    def check(self, word):
+        self.calls += 1
+        sum(range(self.cost))  # dictionary lookup work
+        return word.lower() in self.words
+
+
+def paste(count, seed=1):
+    rng = random.Random(seed)
+    return ' '.join(rng.choice(VOCABULARY + TYPOS) for _ in range(count))
+
+
+def uncached_misspellings(dictionary, text):
+    """highlightBlock before caching: regex compiled and every word checked per call."""
+    word_pattern = re.compile(r"\b[a-zA-Z']+\b")
+    result = []
+    for match in word_pattern.finditer(text):
+        word = match.group()
+        if len(word) > 1 and not dictionary.check(word):
+            result.append((match.start(), len(word), word))
+    return result
+
+
+def test_cache_is_bounded_lru():
+    """Test the least recently used verdict is evicted first."""
+    cache = SpellCache(max_size=2)
+    cache.put('one', True)
+    cache.put('two', False)
+    assert cache.get('one') is True  # 'two' is now least recently used
+    cache.put('three', True)
+
+    assert cache.get('two') is None and cache.get('three') is True
+    assert len(cache) == 2 and (cache.hits, cache.misses) == (2, 1)
+
+
+def test_budget_queues_unknown_words_until_next_tick():
+    """Test at most K unknown words are checked per tick, the rest resolve later."""
+    dictionary = FakeDict(VOCABULARY)
+    checker = SpellChecker(dictionary, budget=3)
+    text = 'hello recieve world teh meeting mesage'
+
+    first = checker.misspellings(text)
+    assert dictionary.calls == 3 and [w for _, _, w in first] == ['recieve']
+    assert list(checker.pending) == ['teh', 'meeting', 'mesage'] and checker.needs_tick
+
+    assert checker.next_tick() == ['teh', 'mesage']
+    assert not checker.pending
+    assert [w for _, _, w in checker.misspellings(text)] == ['recieve', 'teh', 'mesage']
+    assert dictionary.calls == 6  # every word checked once
+
+
+def test_added_word_is_no_longer_misspelled():
+    """Test add_word() overrides a cached 'misspelled' verdict."""
+    checker = SpellChecker(FakeDict(VOCABULARY), budget=None)
+    assert checker.misspellings('siproxylin rocks')
+    checker.add_word('siproxylin')
+    assert [w for _, _, w in checker.misspellings('siproxylin rocks')] == ['rocks']
+
+
+def test_benchmark_5000_word_paste():
+    """Benchmark: paste 5,000 words, then 20 keystrokes re-highlight the block."""
+    text = paste(5000)
+    keystrokes = [text + ' x' * i for i in range(1, 21)]
+
+    before_dict = FakeDict(VOCABULARY)
+    start = time.perf_counter()
+    before = [uncached_misspellings(before_dict, t) for t in [text] + keystrokes]
+    before_s = time.perf_counter() - start
+
+    after_dict = FakeDict(VOCABULARY)
+    checker = SpellChecker(after_dict, budget=None)
+    start = time.perf_counter()
+    after = [checker.misspellings(t) for t in [text] + keystrokes]
+    after_s = time.perf_counter() - start
+
+    # Budgeted: the paste itself costs at most K lookups in the keystroke's tick
+    budgeted = SpellChecker(FakeDict(VOCABULARY), budget=5)
+    start = time.perf_counter()
+    budgeted.misspellings(text)
+    paste_ms = (time.perf_counter() - start) * 1000
+
+    print(f"\n5,000-word paste + 20 keystrokes: uncached {before_s * 1000:.1f} ms "
+          f"({before_dict.calls} checks), cached {after_s * 1000:.1f} ms "
+          f"({after_dict.calls} checks); budgeted paste tick {paste_ms:.1f} ms")
+
+    assert after == before
+    unique_words = {word for _, _, word in iter_words(text)}
+    assert after_dict.calls == len(unique_words)
+    assert before_dict.calls > 20 * len(unique_words) * 100
+    assert budgeted.dictionary.calls == 5
+    assert after_s < before_s
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Unit tests for StartupPipeline - dependency-aware session start steps.
+
+Run with: pytest tests/test_startup_pipeline.py -v
+"""
+
+import sys
+import time
+import asyncio
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from drunk_xmpp.startup import StartupPipeline
+
+
+def step(log, name, delay=0.0, fail=False):
+    async def run():
+        log.append(('start', name))
+        await asyncio.sleep(delay)
+        log.append(('end', name))
+        if fail:
+            raise RuntimeError(f"{name} failed")
+    return run
+
+
+def test_independent_steps_run_concurrently():
+    """Test independent round trips overlap instead of adding up."""
+    log = []
+    pipeline = StartupPipeline('test')
+    for name in ('carbons', 'roster', 'bookmarks', 'nickname'):
+        pipeline.add(name, step(log, name, delay=0.1))
+
+    start = time.monotonic()
+    timings = asyncio.run(pipeline.run())
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.3
+    assert set(timings) == {'carbons', 'roster', 'bookmarks', 'nickname'}
+    assert [event for event, _ in log[:4]] == ['start'] * 4
+
+
+def test_dependencies_wait_for_all_prerequisites():
+    """Test a step starts only after every step it depends on has finished."""
+    log = []
+    pipeline = StartupPipeline('test')
+    pipeline.add('carbons', step(log, 'carbons', delay=0.02))
+    pipeline.add('bookmarks', step(log, 'bookmarks', delay=0.05))
+    pipeline.add('presence', step(log, 'presence'), after=('carbons',))
+    pipeline.add('rooms', step(log, 'rooms'), after=('presence', 'bookmarks'))
+
+    asyncio.run(pipeline.run())
+
+    assert log.index(('start', 'presence')) > log.index(('end', 'carbons'))
+    assert log.index(('start', 'rooms')) > log.index(('end', 'bookmarks'))
+    assert log.index(('start', 'rooms')) > log.index(('end', 'presence'))
+
+
+def test_failed_step_does_not_block_others():
+    """Test a failing step is logged, and dependents and siblings still run."""
+    log = []
+    pipeline = StartupPipeline('test')
+    pipeline.add('bookmarks', step(log, 'bookmarks', fail=True))
+    pipeline.add('roster', step(log, 'roster'))
+    pipeline.add('rooms', step(log, 'rooms'), after=('bookmarks',))
+
+    timings = asyncio.run(pipeline.run())
+
+    assert ('end', 'roster') in log
+    assert ('end', 'rooms') in log
+    assert set(timings) == {'bookmarks', 'roster', 'rooms'}
+
+
+def test_unknown_dependencies_are_ignored():
+    """Test optional steps that weren't added don't block dependents."""
+    log = []
+    pipeline = StartupPipeline('test')
+    pipeline.add('rooms', step(log, 'rooms'), after=('bookmarks',))
+
+    asyncio.run(pipeline.run())
+    assert log == [('start', 'rooms'), ('end', 'rooms')]
+
+
+def test_duplicate_step_is_rejected():
+    """Test step names are unique."""
+    pipeline = StartupPipeline('test')
+    pipeline.add('roster', step([], 'roster'))
+    with pytest.raises(ValueError):
+        pipeline.add('roster', step([], 'roster'))
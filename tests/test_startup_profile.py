@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Startup regression tests: startup profiler timeline and import cost of
+everything loaded before the first frame (measured with python -X importtime).
+
+Run with: pytest tests/test_startup_profile.py -v
+"""
+
+import sys
+import os
+import subprocess
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+from siproxylin.utils.startup_profiler import StartupProfiler
+
+ROOT = Path(__file__).parent.parent
+
+# Cumulative import time budget for what main.py imports before the first paint
+FIRST_PAINT_IMPORT_BUDGET = 3.0  # seconds
+
+# Loaded on first use only, never before the first paint
+DEFERRED_MODULES = [
+    'enchant',
+    'vlc',
+    'siproxylin.gui.dialogs.emoji_data',
+    'siproxylin.gui.account_dialog',
+    'siproxylin.gui.registration_wizard',
+    'siproxylin.gui.contact_details_dialog',
+    'siproxylin.gui.log_viewer',
+    'siproxylin.utils.audio_profiles',
+]
+
+
+def import_times(*modules):
+    """
+    Import modules in a fresh interpreter with -X importtime.
+
+    Returns:
+        Dict {module name: cumulative import time in seconds}
+    """
+    code = '; '.join(f'import {module}' for module in modules)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True,
+        env={**os.environ, 'QT_QPA_PLATFORM': 'offscreen'}
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line.split('|'))
+        times[name] = int(cumulative) / 1_000_000
+    return times
+
+
+def test_timeline_records_phases_in_order():
+    """Test phases are recorded in order as offsets from process start."""
+    profiler = StartupProfiler()
+    first = profiler.mark('imports')
+    second = profiler.mark('first paint')
+
+    assert second >= first
+    assert profiler.elapsed('first paint') == second
+    assert profiler.elapsed('accounts') is None
+
+    lines = profiler.timeline().splitlines()
+    assert [line.split('ms)')[-1].strip() for line in lines] == ['imports', 'first paint']
+
+
+def test_report_only_once(capsys):
+    """Test the timeline is printed once, and only when enabled."""
+    profiler = StartupProfiler()
+    profiler.mark('imports')
+    profiler.report()
+    assert capsys.readouterr().err == ''
+
+    profiler = StartupProfiler()
+    profiler.enable()
+    profiler.mark('imports')
+    profiler.report()
+    profiler.report()
+    assert capsys.readouterr().err.count('Startup timeline') == 1
+
+
+def test_import_times_parses_importtime_output():
+    """Test the importtime parser (used by the budget test below)."""
+    times = import_times('siproxylin.utils.startup_profiler')
+    assert 'siproxylin.utils.startup_profiler' in times
+    assert times['siproxylin'] >= 0
+
+
+def test_first_paint_imports_skip_deferred_modules():
+    """Test spell check, emoji data, VLC, dialogs and audio tools load on first use only."""
+    pytest.importorskip('PySide6')
+    pytest.importorskip('qasync')
+
+    times = import_times('siproxylin.gui.main_window', 'siproxylin.core')
+
+    loaded = [module for module in DEFERRED_MODULES if module in times]
+    assert loaded == []
+    total = sum(seconds for name, seconds in times.items() if '.' not in name)
+    assert total < FIRST_PAINT_IMPORT_BUDGET
@@ -0,0 +1,92 @@
+"""
+Shared fixtures for the HTTP upload tests (test_http_client.py, test_file_uploads.py):
+a local aiohttp PUT/GET endpoint and a minimal FileUploadMixin client
+whose XEP-0363 slots point at it.
+"""
+
+import asyncio
+import logging
+
+from aiohttp import web
+
+from drunk_xmpp.http_client import HttpClient
+from drunk_xmpp.file_uploads import FileUploadMixin
+
+
+class UploadServer:
+    """PUT/GET endpoint recording bodies, request headers and client ports."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay  # Seconds to stall after each received chunk
+        self.uploads = {}
+        self.headers = {}
+        self.client_ports = []
+
+    async def handle_put(self, request):
+        name = request.match_info['name']
+        self.client_ports.append(request.transport.get_extra_info('peername')[1])
+        self.headers[name] = dict(request.headers)
+        body = bytearray()
+        async for chunk in request.content.iter_any():
+            body += chunk
+            if self.delay:
+                await asyncio.sleep(self.delay)
+        self.uploads[name] = bytes(body)
+        return web.Response(status=201)
+
+    async def handle_get(self, request):
+        self.client_ports.append(request.transport.get_extra_info('peername')[1])
+        return web.Response(body=self.uploads.get(request.match_info['name'], b''))
+
+
+class FakeHttpUpload:
+    """xep_0363 stand-in handing out slots on the local server."""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+        self.upload_service = 'upload.example.org'
+        self.max_file_size = 64 * 1024 * 1024
+
+    async def request_slot(self, service, file_name, size, content_type, timeout=None):
+        url = f'{self.base_url}/{file_name}'
+        return {'http_upload_slot': {'put': {'url': url, 'headers': []}, 'get': {'url': url}}}
+
+
+class FakeMediaSharing:
+    """xep_0454 stand-in (the real format_url only accepts https://)."""
+
+    @staticmethod
+    def map_extensions(ext):
+        return ext.lower()
+
+    @staticmethod
+    def format_url(url, fragment):
+        return 'aesgcm://' + url.split('://', 1)[1] + '#' + fragment
+
+
+class FakeClient(FileUploadMixin):
+    """Minimal DrunkXMPP stand-in for FileUploadMixin."""
+
+    def __init__(self, base_url):
+        self.plugins = {'xep_0363': FakeHttpUpload(base_url), 'xep_0454': FakeMediaSharing()}
+        self.http_client = HttpClient()
+        self.logger = logging.getLogger('test')
+
+    def __getitem__(self, name):
+        return self.plugins[name]
+
+
+async def with_server(server, body):
+    """Run body(base_url) against a local UploadServer, then shut it down."""
+    app = web.Application(client_max_size=128 * 1024 * 1024)
+    app.router.add_put('/{name}', server.handle_put)
+    app.router.add_get('/{name}', server.handle_get)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    try:
+        return await body(f'http://127.0.0.1:{port}')
+    finally:
+        await runner.cleanup()